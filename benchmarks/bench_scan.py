@@ -0,0 +1,62 @@
+"""Benchmark serial vs. parallel ``scan_project`` on simulated slow storage.
+
+Every ``os.scandir`` call is delayed to mimic a readdir round-trip on NFS or
+an overlay filesystem, so the numbers reflect latency rather than CPU.
+
+Usage:
+    python benchmarks/bench_scan.py [--dirs 400] [--delay-ms 5] [--workers 1 4 8 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from ctxforge.analysis.scanner import scan_project
+
+
+def _build_tree(root: Path, n_dirs: int, files_per_dir: int = 5) -> None:
+    for i in range(n_dirs):
+        d = root / f"pkg{i % 20:02d}" / f"mod{i:04d}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_dir):
+            (d / f"file{j}.py").write_text("x = 1\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=400)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    real_scandir = os.scandir
+    delay = args.delay_ms / 1000
+
+    def slow_scandir(path):  # type: ignore[no-untyped-def]
+        time.sleep(delay)
+        return real_scandir(path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_tree(root, args.dirs)
+        baseline = None
+        with patch("ctxforge.analysis.scanner.os.scandir", slow_scandir):
+            for workers in args.workers:
+                start = time.perf_counter()
+                report = scan_project(root, workers=workers)
+                elapsed = time.perf_counter() - start
+                if baseline is None:
+                    baseline = elapsed
+                print(
+                    f"workers={workers:<3} {elapsed * 1000:8.1f} ms  "
+                    f"speedup x{baseline / elapsed:5.1f}  files={report.file_count}"
+                )
+
+
+if __name__ == "__main__":
+    main()
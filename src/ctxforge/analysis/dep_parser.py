@@ -0,0 +1,415 @@
+"""Dependency and framework facts from manifests and lockfiles."""
+
+from __future__ import annotations
+
+import json
+import re
+import tomllib
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ctxforge.storage.cache import cache_path, read_cache, write_cache
+
+DEPS_FILE = "deps.json"
+DEPS_VERSION = 2
+
+
+@dataclass
+class Manifest:
+    """Direct dependencies declared by one manifest file."""
+
+    path: str  # relative to the project root, e.g. "pyproject.toml"
+    ecosystem: str  # "python", "node", "go" or "rust"
+    name: str | None = None
+    runtime: str | None = None  # e.g. "python >=3.11", "go 1.22"
+    # Name -> version: the locked one when a lockfile pins it, else the spec.
+    dependencies: dict[str, str] = field(default_factory=dict)
+    dev_dependencies: dict[str, str] = field(default_factory=dict)
+    lockfile: str | None = None
+    locked_packages: int = 0  # all packages in the lockfile, transitive included
+
+
+@dataclass
+class DependencySummary:
+    """Manifests found at the project root and the frameworks they use."""
+
+    manifests: list[Manifest] = field(default_factory=list)
+    frameworks: list[str] = field(default_factory=list)
+
+
+# ── Frameworks ──────────────────────────────────────────────────────────────
+
+# Dependency name (normalised) -> framework label, per ecosystem.  Listed
+# in display order: application frameworks before tooling.
+_FRAMEWORKS: dict[str, dict[str, str]] = {
+    "python": {
+        "django": "Django",
+        "flask": "Flask",
+        "fastapi": "FastAPI",
+        "starlette": "Starlette",
+        "aiohttp": "aiohttp",
+        "tornado": "Tornado",
+        "typer": "Typer",
+        "click": "Click",
+        "sqlalchemy": "SQLAlchemy",
+        "pydantic": "Pydantic",
+        "celery": "Celery",
+        "torch": "PyTorch",
+        "tensorflow": "TensorFlow",
+        "jax": "JAX",
+        "numpy": "NumPy",
+        "pandas": "pandas",
+        "scikit-learn": "scikit-learn",
+        "pytest": "pytest",
+    },
+    "node": {
+        "next": "Next.js",
+        "nuxt": "Nuxt",
+        "@remix-run/react": "Remix",
+        "@sveltejs/kit": "SvelteKit",
+        "astro": "Astro",
+        "react": "React",
+        "vue": "Vue",
+        "svelte": "Svelte",
+        "@angular/core": "Angular",
+        "solid-js": "Solid",
+        "express": "Express",
+        "fastify": "Fastify",
+        "koa": "Koa",
+        "@nestjs/core": "NestJS",
+        "hono": "Hono",
+        "electron": "Electron",
+        "prisma": "Prisma",
+        "typescript": "TypeScript",
+        "tailwindcss": "Tailwind CSS",
+        "vite": "Vite",
+        "webpack": "webpack",
+        "jest": "Jest",
+        "vitest": "Vitest",
+    },
+    "go": {
+        "github.com/gin-gonic/gin": "Gin",
+        "github.com/labstack/echo/v4": "Echo",
+        "github.com/gofiber/fiber/v2": "Fiber",
+        "github.com/go-chi/chi/v5": "chi",
+        "github.com/gorilla/mux": "gorilla/mux",
+        "google.golang.org/grpc": "gRPC",
+        "gorm.io/gorm": "GORM",
+        "github.com/spf13/cobra": "Cobra",
+    },
+    "rust": {
+        "actix-web": "Actix Web",
+        "axum": "Axum",
+        "rocket": "Rocket",
+        "warp": "warp",
+        "tokio": "Tokio",
+        "tauri": "Tauri",
+        "bevy": "Bevy",
+        "diesel": "Diesel",
+        "sqlx": "SQLx",
+        "serde": "Serde",
+        "clap": "clap",
+    },
+}
+
+
+# ── Manifests ───────────────────────────────────────────────────────────────
+
+_PEP508_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*([^;]*)")
+
+
+def _normalize(name: str) -> str:
+    """PEP 503 name normalisation, so lockfile and manifest names match."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _pep508(requirements: Any) -> dict[str, str]:
+    deps: dict[str, str] = {}
+    for req in requirements if isinstance(requirements, list) else []:
+        m = _PEP508_NAME.match(str(req))
+        if m:
+            deps[_normalize(m.group(1))] = m.group(2).strip() or "*"
+    return deps
+
+
+def _poetry_deps(table: Any) -> dict[str, str]:
+    deps: dict[str, str] = {}
+    for name, spec in (table or {}).items():
+        if name == "python":
+            continue
+        if isinstance(spec, dict):
+            spec = spec.get("version", "*")
+        deps[_normalize(name)] = str(spec)
+    return deps
+
+
+def _parse_pyproject(text: str) -> Manifest:
+    data = tomllib.loads(text)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+    manifest = Manifest("pyproject.toml", "python", project.get("name") or poetry.get("name"))
+
+    manifest.dependencies = _pep508(project.get("dependencies"))
+    manifest.dependencies.update(_poetry_deps(poetry.get("dependencies")))
+    # Optional dependency groups are mostly dev/test/docs tooling.
+    for group in project.get("optional-dependencies", {}).values():
+        manifest.dev_dependencies.update(_pep508(group))
+    for group in data.get("dependency-groups", {}).values():
+        manifest.dev_dependencies.update(_pep508(group))
+    manifest.dev_dependencies.update(_poetry_deps(poetry.get("dev-dependencies")))
+    for group in poetry.get("group", {}).values():
+        manifest.dev_dependencies.update(_poetry_deps(group.get("dependencies")))
+
+    python = project.get("requires-python") or poetry.get("dependencies", {}).get("python")
+    if python:
+        manifest.runtime = f"python {python}"
+    return manifest
+
+
+def _parse_requirements(text: str) -> Manifest:
+    lines = [
+        line.split("#", 1)[0].strip()
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith(("#", "-"))
+    ]
+    return Manifest("requirements.txt", "python", dependencies=_pep508(lines))
+
+
+def _parse_package_json(text: str) -> Manifest:
+    data = json.loads(text)
+    manifest = Manifest("package.json", "node", data.get("name"))
+    manifest.dependencies = {str(k): str(v) for k, v in data.get("dependencies", {}).items()}
+    manifest.dev_dependencies = {
+        str(k): str(v) for k, v in data.get("devDependencies", {}).items()
+    }
+    if node := data.get("engines", {}).get("node"):
+        manifest.runtime = f"node {node}"
+    return manifest
+
+
+_GO_REQUIRE = re.compile(r"^\s*(?:require\s+)?([^\s()]+)\s+(v[^\s]+)(\s*//\s*indirect)?", re.M)
+
+
+def _parse_go_mod(text: str) -> Manifest:
+    manifest = Manifest("go.mod", "go")
+    in_block = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("module "):
+            manifest.name = stripped.split()[1]
+        elif stripped.startswith("go ") and manifest.runtime is None:
+            manifest.runtime = f"go {stripped.split()[1]}"
+        elif stripped.startswith("require ("):
+            in_block = True
+        elif in_block and stripped == ")":
+            in_block = False
+        elif in_block or stripped.startswith("require "):
+            m = _GO_REQUIRE.match(stripped)
+            if m and not m.group(3):
+                manifest.dependencies[m.group(1)] = m.group(2)
+    return manifest
+
+
+def _cargo_deps(table: Any) -> dict[str, str]:
+    deps: dict[str, str] = {}
+    for name, spec in (table or {}).items():
+        if isinstance(spec, dict):
+            spec = spec.get("version", "workspace" if spec.get("workspace") else "path")
+        deps[str(name)] = str(spec)
+    return deps
+
+
+def _parse_cargo_toml(text: str) -> Manifest:
+    data = tomllib.loads(text)
+    package = data.get("package", {})
+    workspace = data.get("workspace", {})
+    manifest = Manifest("Cargo.toml", "rust", package.get("name"))
+    manifest.dependencies = _cargo_deps(data.get("dependencies"))
+    manifest.dependencies.update(_cargo_deps(workspace.get("dependencies")))
+    manifest.dev_dependencies = _cargo_deps(data.get("dev-dependencies"))
+    runtime: list[str] = []
+    if isinstance(version := package.get("rust-version"), str):
+        runtime.append(f"rust {version}")
+    if isinstance(edition := package.get("edition"), str):
+        runtime.append(f"edition {edition}")
+    manifest.runtime = ", ".join(runtime) or None
+    return manifest
+
+
+# Manifest file name -> parser, in display order.
+_MANIFESTS: dict[str, Callable[[str], Manifest]] = {
+    "pyproject.toml": _parse_pyproject,
+    "requirements.txt": _parse_requirements,
+    "package.json": _parse_package_json,
+    "go.mod": _parse_go_mod,
+    "Cargo.toml": _parse_cargo_toml,
+}
+
+
+# ── Lockfiles ───────────────────────────────────────────────────────────────
+
+
+def _toml_packages(text: str) -> dict[str, str]:
+    """``[[package]]`` name/version pairs (uv, Poetry, PDM, Cargo)."""
+    return {
+        str(pkg["name"]): str(pkg.get("version", ""))
+        for pkg in tomllib.loads(text).get("package", [])
+        if "name" in pkg
+    }
+
+
+def _npm_packages(text: str) -> dict[str, str]:
+    data = json.loads(text)
+    locked: dict[str, str] = {}
+    for key, pkg in data.get("packages", {}).items():
+        # Nested copies ("node_modules/a/node_modules/b") are not top level.
+        if key.startswith("node_modules/") and "/node_modules/" not in key:
+            locked[key[len("node_modules/"):]] = str(pkg.get("version", ""))
+    if not locked:  # lockfileVersion 1
+        for name, pkg in data.get("dependencies", {}).items():
+            locked[name] = str(pkg.get("version", ""))
+    return locked
+
+
+_YARN_ENTRY = re.compile(r'^"?(@?[^@\s"]+)@[^\n]*:\n\s+version:?\s+"?([^"\n]+)"?', re.M)
+
+
+def _yarn_packages(text: str) -> dict[str, str]:
+    return {m.group(1): m.group(2) for m in _YARN_ENTRY.finditer(text)}
+
+
+# pnpm v6 ("/name/1.0.0:" or "/name@1.0.0:") and v9 ("name@1.0.0:") package keys.
+_PNPM_ENTRY = re.compile(r"^  '?/?(@?[^@/\s':]+(?:/[^@/\s':]+)?)[@/](\d[^:'(\s]*)", re.M)
+
+
+def _pnpm_packages(text: str) -> dict[str, str]:
+    start = text.find("\npackages:")
+    section = text[start:] if start >= 0 else ""
+    end = section.find("\nsnapshots:")
+    if end >= 0:
+        section = section[:end]
+    return {m.group(1): m.group(2) for m in _PNPM_ENTRY.finditer(section)}
+
+
+def _go_sum_packages(text: str) -> dict[str, str]:
+    """Modules whose content is hashed in ``go.sum``, without versions.
+
+    ``go.sum`` lists every version in the module graph, selected or not,
+    plus ``/go.mod``-only hashes, so it cannot tell which one is used; the
+    ``require`` versions of ``go.mod`` are the selected ones and are kept.
+    """
+    locked: dict[str, str] = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and not parts[1].endswith("/go.mod"):
+            locked[parts[0]] = ""
+    return locked
+
+
+# Lockfile name -> (ecosystem, parser), in preference order per ecosystem.
+_LOCKFILES: dict[str, tuple[str, Callable[[str], dict[str, str]]]] = {
+    "uv.lock": ("python", _toml_packages),
+    "poetry.lock": ("python", _toml_packages),
+    "pdm.lock": ("python", _toml_packages),
+    "package-lock.json": ("node", _npm_packages),
+    "pnpm-lock.yaml": ("node", _pnpm_packages),
+    "yarn.lock": ("node", _yarn_packages),
+    "go.sum": ("go", _go_sum_packages),
+    "Cargo.lock": ("rust", _toml_packages),
+}
+
+# Files whose contents determine the summary.
+DEPENDENCY_FILES = tuple(_MANIFESTS) + tuple(_LOCKFILES)
+
+
+# ── Summary ─────────────────────────────────────────────────────────────────
+
+
+def summarize_dependencies(root: Path, *, use_cache: bool = False) -> DependencySummary:
+    """Parse the manifests and lockfiles at the root of the project.
+
+    Declared versions are replaced by locked ones when a lockfile of the
+    same ecosystem pins them.  Unparsable files are skipped.
+
+    With *use_cache*, the summary is kept in ``.ctxforge/cache/`` together
+    with the mtime and size of every dependency file, and reused until one
+    of them changes (or appears, or disappears); the cache is written when
+    the project has a ``.ctxforge/`` directory.
+    """
+    stamp: list[list[Any]] = []
+    for name in DEPENDENCY_FILES:
+        try:
+            st = (root / name).stat()
+        except OSError:
+            continue
+        stamp.append([name, st.st_mtime_ns, st.st_size])
+
+    path = cache_path(root, DEPS_FILE)
+    if use_cache and (data := read_cache(path, DEPS_VERSION)) is not None:
+        if data.get("stamp") == stamp:
+            try:
+                return DependencySummary(
+                    [Manifest(**m) for m in data["manifests"]], list(data["frameworks"])
+                )
+            except (KeyError, TypeError):
+                pass
+
+    present = {name for name, _, _ in stamp}
+    summary = _summarize(root, present)
+    if use_cache and (root / ".ctxforge").is_dir():
+        write_cache(
+            path,
+            {
+                "stamp": stamp,
+                "manifests": [asdict(m) for m in summary.manifests],
+                "frameworks": summary.frameworks,
+            },
+            DEPS_VERSION,
+        )
+    return summary
+
+
+def _summarize(root: Path, present: set[str]) -> DependencySummary:
+    locks: dict[str, tuple[str, dict[str, str]]] = {}
+    for name, (ecosystem, parse_lock) in _LOCKFILES.items():
+        if name in present and ecosystem not in locks and (text := _read(root / name)):
+            try:
+                locks[ecosystem] = (name, parse_lock(text))
+            except (ValueError, TypeError, AttributeError, KeyError):
+                continue
+
+    summary = DependencySummary()
+    for name, parse_manifest in _MANIFESTS.items():
+        if name not in present or (text := _read(root / name)) is None:
+            continue
+        try:
+            manifest = parse_manifest(text)
+        except (ValueError, TypeError, AttributeError):
+            continue
+        if manifest.ecosystem in locks:
+            manifest.lockfile, locked = locks[manifest.ecosystem]
+            manifest.locked_packages = len(locked)
+            if manifest.ecosystem == "python":
+                locked = {_normalize(k): v for k, v in locked.items()}
+            for deps in (manifest.dependencies, manifest.dev_dependencies):
+                for dep in deps:
+                    if locked.get(dep):
+                        deps[dep] = locked[dep]
+        summary.manifests.append(manifest)
+
+    for manifest in summary.manifests:
+        known = _FRAMEWORKS.get(manifest.ecosystem, {})
+        names = manifest.dependencies.keys() | manifest.dev_dependencies.keys()
+        for dep, label in known.items():
+            if dep in names and label not in summary.frameworks:
+                summary.frameworks.append(label)
+    return summary
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
@@ -1,19 +1,27 @@
-"""Static detection of documentation and configuration files."""
+"""Static detection and ranking of documentation files."""
 
 from __future__ import annotations
 
+import math
+import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
-# Case-insensitive prefixes for documentation files at project root.
-_DOC_FILE_PREFIXES: list[str] = [
-    "README",
-    "CHANGELOG",
-    "CONTRIBUTING",
-    "LICENSE",
-    "ARCHITECTURE",
-    "SECURITY",
-    "CODE_OF_CONDUCT",
-]
+from ctxforge.analysis.git_history import GitHistory
+from ctxforge.analysis.link_graph import build_doc_graph
+
+# Case-insensitive prefixes for documentation files at project root, with
+# their prior value as model context (README first, boilerplate last).
+_DOC_FILE_PREFIXES: dict[str, float] = {
+    "README": 2.0,
+    "ARCHITECTURE": 1.5,
+    "CONTRIBUTING": 1.0,
+    "CHANGELOG": 0.3,
+    "SECURITY": 0.2,
+    "LICENSE": 0.0,
+    "CODE_OF_CONDUCT": 0.0,
+}
 
 # Directory names whose *.md contents are scanned individually.
 _DOC_DIRS: list[str] = [
@@ -27,55 +35,172 @@ _DOC_DIRS: list[str] = [
 # Maximum number of candidates returned.
 _MAX_RESULTS: int = 30
 
+# Prior of root *.md files without a known prefix, and of doc-dir files.
+_ROOT_MD_PRIOR = 0.8
+_DOC_DIR_PRIOR = 0.5
+
+# Feature weights of the score (each feature is normalised to 0..1).
+_W_LINKS = 1.0
+_W_SIZE = 0.6
+_W_RECENCY = 0.5
+_W_HEADINGS = 0.4
+
+_SIZE_SATURATION = 16 * 1024  # bytes; larger docs are not worth more
+_RANK_SATURATION = 8.0  # PageRank, as a multiple of the uniform share
+_HEADINGS_PER_KB = 2.0  # heading density considered well structured
+_RECENCY_HALF_LIFE_DAYS = 180.0
+
+
+@dataclass
+class DocCandidate:
+    """A documentation file and the features its score is built from."""
+
+    path: str  # relative to the project root, "/"-separated
+    group: int = 0  # 0 root doc (known prefix), 1 other root *.md, 2 doc dir
+    size: int = 0
+    mtime_ns: int = 0
+    last_commit: int | None = None  # Unix time of the latest commit touching it
+    commits: int = 0
+    headings: int = 0
+    inbound_links: int = 0  # number of other docs linking here
+    rank: float = 0.0  # PageRank in the docs' link graph; sums to 1
+    score: float = 0.0
+
 
 def detect_doc_candidates(root: Path) -> list[str]:
-    """Return documentation file paths found under *root*, sorted by priority.
+    """Return documentation file paths found under *root*, best first.
+
+    Only individual files are returned (no directory entries), as relative
+    paths (e.g. ``README.md``, ``docs/guide.md``).  See
+    :func:`rank_doc_candidates` for the selection and ordering.
+    """
+    return [c.path for c in rank_doc_candidates(root)]
+
 
-    Only individual files are returned (no directory entries).
-    Files are returned as relative paths (e.g. ``README.md``, ``docs/guide.md``).
+def rank_doc_candidates(
+    root: Path,
+    *,
+    now: float | None = None,
+    use_cache: bool = False,
+    history: GitHistory | None = None,
+) -> list[DocCandidate]:
+    """Find documentation files under *root* and score them.
 
-    Subdirectory markdown scanning is limited to known doc/design directories.
-    Results are capped at 30 entries, sorted by path length within each group.
+    Subdirectory markdown scanning is limited to known doc/design
+    directories.  Each file is read once for its headings and links (see
+    :func:`~ctxforge.analysis.link_graph.build_doc_graph`, which *use_cache*
+    is passed to); the score combines the group prior with size, heading
+    density, recency (*now* defaults to the current time) and the file's
+    PageRank in the graph of links between the candidates.  Recency is
+    taken from the last commit touching the file when *history* knows it,
+    since checkouts reset filesystem mtimes, and from the mtime otherwise.
 
-    Order: root doc files (known prefixes) → root other \\*.md →
-    doc-dir \\*.md.
+    The 30 best-scoring files are returned, ordered by group — root doc
+    files (known prefixes) → root other \\*.md → doc-dir \\*.md — and by
+    score within each group.
     """
-    doc_files: list[str] = []
-    sub_md_files: list[str] = []
-
-    # --- documentation files (case-insensitive prefix match) ---
-    for prefix in _DOC_FILE_PREFIXES:
-        for entry in sorted(root.iterdir()):
-            if entry.is_file() and entry.name.upper().startswith(prefix.upper()):
-                doc_files.append(entry.name)
-
-    # --- other markdown files at root (*.md not already matched) ---
-    seen = {name.lower() for name in doc_files}
-    for entry in sorted(root.iterdir()):
-        if (
-            entry.is_file()
-            and entry.suffix.lower() == ".md"
-            and entry.name.lower() not in seen
-        ):
-            doc_files.append(entry.name)
-
-    # --- markdown files inside known doc directories only ---
-    seen_all = {name.lower() for name in doc_files}
-    for dir_name in _DOC_DIRS:
-        for entry in sorted(root.iterdir()):
-            if not entry.is_dir() or entry.name.lower() != dir_name.lower():
+    candidates = _collect(root)
+    if not candidates:
+        return []
+
+    doc_graph = build_doc_graph(
+        root, ((c.path, c.mtime_ns, c.size) for c in candidates), use_cache=use_cache
+    )
+    inbound = doc_graph.graph.in_degrees()
+    now = time.time() if now is None else now
+    for c in candidates:
+        c.headings = doc_graph.docs[c.path].headings
+        c.inbound_links = inbound[c.path]
+        c.rank = doc_graph.ranks[c.path]
+        if history is not None and (entry := history.get(c.path)) is not None:
+            c.last_commit = entry.last_touched
+            c.commits = entry.commits
+        c.score = _score(c, now, len(candidates))
+
+    best = sorted(candidates, key=lambda c: (-c.score, c.group, c.path))[:_MAX_RESULTS]
+    best.sort(key=lambda c: (c.group, -c.score, c.path))
+    return best
+
+
+# ── Collection ──────────────────────────────────────────────────────────────
+
+
+def _collect(root: Path) -> list[DocCandidate]:
+    """List candidates with one pass over the root and each doc directory."""
+    candidates: list[DocCandidate] = []
+    doc_dirs: list[os.DirEntry[str]] = []
+    doc_dir_names = {d.lower() for d in _DOC_DIRS}
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return []
+
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                if entry.name.lower() in doc_dir_names:
+                    doc_dirs.append(entry)
+                continue
+            if not entry.is_file():
+                continue
+            upper = entry.name.upper()
+            if any(upper.startswith(prefix) for prefix in _DOC_FILE_PREFIXES):
+                group = 0
+            elif upper.endswith(".MD"):
+                group = 1
+            else:
+                continue
+            st = entry.stat()
+        except OSError:
+            continue
+        candidates.append(DocCandidate(entry.name, group, st.st_size, st.st_mtime_ns))
+
+    for doc_dir in doc_dirs:
+        stack = [(doc_dir.path, doc_dir.name)]
+        while stack:
+            path, rel = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, f"{rel}/{entry.name}"))
+                        elif entry.name.lower().endswith(".md") and entry.is_file():
+                            st = entry.stat()
+                            candidates.append(
+                                DocCandidate(
+                                    f"{rel}/{entry.name}", 2, st.st_size, st.st_mtime_ns
+                                )
+                            )
+            except OSError:
                 continue
-            for md_file in sorted(entry.rglob("*.md")):
-                if not md_file.is_file():
-                    continue
-                rel_str = str(md_file.relative_to(root))
-                if rel_str.lower() not in seen_all:
-                    seen_all.add(rel_str.lower())
-                    sub_md_files.append(rel_str)
-
-    # sort each group by path length, then combine and cap
-    doc_files.sort(key=len)
-    sub_md_files.sort(key=len)
-
-    combined = doc_files + sub_md_files
-    return combined[:_MAX_RESULTS]
+    return candidates
+
+
+# ── Scoring ─────────────────────────────────────────────────────────────────
+
+
+def _prior(c: DocCandidate) -> float:
+    if c.group == 0:
+        upper = c.path.upper()
+        return max(p for prefix, p in _DOC_FILE_PREFIXES.items() if upper.startswith(prefix))
+    return _ROOT_MD_PRIOR if c.group == 1 else _DOC_DIR_PRIOR
+
+
+def _score(c: DocCandidate, now: float, n_docs: int) -> float:
+    size = math.log1p(min(c.size, _SIZE_SATURATION)) / math.log1p(_SIZE_SATURATION)
+    density = c.headings / max(c.size / 1024, 1.0)
+    headings = min(density / _HEADINGS_PER_KB, 1.0)
+    modified = c.last_commit if c.last_commit is not None else c.mtime_ns / 1e9
+    age_days = max(now - modified, 0.0) / 86400
+    recency = math.pow(0.5, age_days / _RECENCY_HALF_LIFE_DAYS)
+    # 0 for a doc nobody links to (uniform share or less), 1 at saturation.
+    relative_rank = max(c.rank * n_docs, 1.0)
+    links = min(math.log(relative_rank) / math.log(_RANK_SATURATION), 1.0)
+    return (
+        _prior(c)
+        + _W_LINKS * links
+        + _W_SIZE * size
+        + _W_RECENCY * recency
+        + _W_HEADINGS * headings
+    )
@@ -0,0 +1,546 @@
+"""Offline BM25 index over the project's Markdown and text documents."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from ctxforge.analysis.file_sections import MARKDOWN_SUFFIXES, parse_headings
+from ctxforge.analysis.fs_watch import watcher_pid
+from ctxforge.analysis.scanner import ProjectWalker, ScanLimits
+from ctxforge.storage.cache import (
+    cache_path,
+    racy_cutoff,
+    read_cache,
+    write_blob,
+    write_cache,
+)
+
+DOCS_FILE = "docs.json"
+DOCS_VERSION = 1
+CHUNKS_FILE = "doc-chunks.json"
+CHUNKS_VERSION = 1
+POSTINGS_FILE = "docs.bm25"
+POSTINGS_VERSION = 1
+
+DOC_EXTENSIONS = (*MARKDOWN_SUFFIXES, ".txt", ".rst")
+
+# Larger documents are not indexed (dumps, generated references).
+MAX_DOC_BYTES = 1024 * 1024
+
+# A chunk ends at the first blank line after this many bytes, or at any
+# line after the larger limit; Markdown chunks also end at every heading.
+_CHUNK_BYTES = 1500
+_MAX_CHUNK_BYTES = 4000
+
+# BM25 parameters (the usual defaults).
+_K1 = 1.2
+_B = 0.75
+
+# Query terms are scored rarest first.  A term with this many times more
+# postings than there are candidates so far only adds to their scores,
+# looked up by bisection; and terms are dropped once this many postings
+# were read.  Both bound query time however common the terms are.
+_RESCORE_RATIO = 8
+_MAX_POSTINGS = 200_000
+
+_MAX_WORD = 40  # longer "words" are hashes, base64 and the like
+_MAX_KNOWN_WORDS = 1_000_000  # words whose term is remembered
+
+# The walk is bounded so a huge checkout cannot stall session start.
+_WALK_LIMITS = ScanLimits(max_files=50_000, max_seconds=5.0)
+
+_MAGIC = b"CFBM25\0\0"
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_WORD = re.compile(f"[^\\W_{_CJK}]+")
+_CJK_RUN = re.compile(f"[{_CJK}]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can do does for from has have how if in into is it "
+    "its may more must no not of on or our should so such than that the their then there "
+    "these they this to was we were what when where which while who will with would you "
+    "your".split()
+)
+
+
+# ── Tokens ──────────────────────────────────────────────────────────────────
+
+
+def term_counts(text: str) -> Counter[str]:
+    """Index terms of *text* and how often each occurs.
+
+    Words are lowercased, split at punctuation and underscores (so
+    ``repo_map`` matches "repo map"), and lose a plural ending; stop
+    words and single characters are dropped.  Runs of CJK characters,
+    which have no spaces, become overlapping character pairs.
+    """
+    if len(_TERMS) > _MAX_KNOWN_WORDS:
+        _TERMS.clear()
+    text = text.lower()
+    # map, filter and Counter all run in C: no Python code per known word.
+    counts = Counter(filter(None, map(_TERMS.__getitem__, _WORD.findall(text))))
+    if not text.isascii():
+        for run in _CJK_RUN.findall(text):
+            counts.update([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+    return counts
+
+
+class _Terms(dict[str, str]):
+    """Index term of each word seen, "" for words that are not indexed."""
+
+    def __missing__(self, word: str) -> str:
+        term = word
+        if not 1 < len(word) <= _MAX_WORD or word in _STOPWORDS:
+            term = ""
+        elif len(word) > 4 and word.endswith("ies"):
+            term = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            term = word[:-1]
+        self[word] = term
+        return term
+
+
+_TERMS = _Terms()
+
+
+def _term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ── Chunks ──────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    """A heading section or a run of paragraphs of a document."""
+
+    title: str  # enclosing headings, "Storage > Caches"; "" outside any
+    start: int  # byte offsets in the file
+    end: int
+    first_line: int  # 1-based, inclusive
+    last_line: int
+    terms: str = field(default="", compare=False)  # space-separated, each as often as it occurs
+
+
+def chunk_document(rel: str, data: bytes) -> list[Chunk]:
+    """Split the document *data* at *rel* into chunks, with their terms.
+
+    Markdown is split at every heading (outside code fences), and long
+    sections or plain text at blank lines once a chunk is large enough.
+    The headings above a chunk are its title and count as its terms.
+    """
+    headings = {}
+    if rel.lower().endswith(MARKDOWN_SUFFIXES):
+        headings = {h.line: h for h in parse_headings(data)}
+    chunks: list[Chunk] = []
+    trail: list[tuple[int, str]] = []  # (level, title) of the enclosing headings
+    title = ""
+    start = offset = 0
+    first = lineno = 1
+
+    def close(last: int) -> None:
+        terms = term_counts(data[start:offset].decode("utf-8", "replace"))
+        if not terms:
+            return
+        terms.update(term_counts(title))
+        chunks.append(Chunk(title, start, offset, first, last, " ".join(terms.elements())))
+
+    for lineno, line in enumerate(data.splitlines(keepends=True), 1):
+        heading = headings.get(lineno)
+        size = offset - start
+        if size and (
+            heading is not None
+            or size >= _CHUNK_BYTES and not line.strip()
+            or size >= _MAX_CHUNK_BYTES
+        ):
+            close(lineno - 1)
+            start, first = offset, lineno
+        if heading is not None:
+            while trail and trail[-1][0] >= heading.level:
+                trail.pop()
+            trail.append((heading.level, heading.title))
+            title = " > ".join(t for _, t in trail)
+        offset += len(line)
+    if offset > start:
+        close(lineno)
+    return chunks
+
+
+# ── Index ───────────────────────────────────────────────────────────────────
+
+
+class DocIndex:
+    """Chunks and terms of every document, compiled into a postings file.
+
+    A document is re-read only when its mtime or size changed, and
+    re-chunked only when its content hash changed too; documents with
+    identical content share their chunks.  Saving after a change
+    compiles all chunks into :data:`POSTINGS_FILE`, which
+    :class:`DocSearcher` maps without parsing.  The chunks themselves
+    are loaded only when a document changed.
+    """
+
+    def __init__(self, root: Path, files: dict[str, tuple[int, int, str]] | None = None) -> None:
+        self._root = root
+        self._files = files or {}  # rel -> (mtime_ns, size, digest)
+        self._chunks: dict[str, list[Chunk]] | None = None  # digest -> chunks
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @classmethod
+    def load(cls, root: Path) -> DocIndex:
+        data = read_cache(cache_path(root, DOCS_FILE), DOCS_VERSION)
+        if data is None:
+            return cls(root)
+        try:
+            files = {rel: (int(m), int(s), str(d)) for rel, (m, s, d) in data["files"].items()}
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return cls(root)
+        return cls(root, files)
+
+    def add(self, rel: str, mtime_ns: int, size: int) -> None:
+        """Index the document *rel* (``/``-separated) unless it is unchanged."""
+        self._seen.add(rel)
+        known = self._files.get(rel)
+        if known is not None and known[:2] == (mtime_ns, size):
+            return
+        if size > MAX_DOC_BYTES:
+            self._seen.discard(rel)
+            return
+        try:
+            data = (self._root / rel).read_bytes()
+        except OSError:
+            self._seen.discard(rel)
+            return
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        chunks = self._load_chunks()
+        if digest not in chunks:
+            chunks[digest] = chunk_document(rel, data)
+        self._files[rel] = (mtime_ns, size, digest)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the documents added since loading and recompile the postings.
+
+        Nothing is written outside a ctxforge project; nothing at all
+        when no document was added, changed or removed.
+        """
+        postings = cache_path(self._root, POSTINGS_FILE)
+        if not (self._root / ".ctxforge").is_dir():
+            return
+        if not self._dirty and self._seen == self._files.keys() and postings.is_file():
+            return
+        files = {rel: entry for rel, entry in sorted(self._files.items()) if rel in self._seen}
+        chunks = self._load_chunks()
+        for rel, (mtime_ns, size, digest) in list(files.items()):
+            if digest not in chunks:  # the chunk cache was lost: re-chunk
+                try:
+                    chunks[digest] = chunk_document(rel, (self._root / rel).read_bytes())
+                except OSError:
+                    del files[rel]
+        live = {digest: chunks[digest] for _, _, digest in files.values()}
+        # Documents modified within the racy window get mtime 0, so the
+        # next update re-reads them; their chunks stay indexed meanwhile.
+        cutoff = racy_cutoff()
+        write_cache(
+            cache_path(self._root, DOCS_FILE),
+            {
+                "files": {
+                    rel: [mtime_ns if mtime_ns < cutoff else 0, size, digest]
+                    for rel, (mtime_ns, size, digest) in files.items()
+                }
+            },
+            DOCS_VERSION,
+        )
+        write_cache(
+            cache_path(self._root, CHUNKS_FILE),
+            {"chunks": {d: [_dump(c) for c in cs] for d, cs in live.items()}},
+            CHUNKS_VERSION,
+        )
+        write_blob(postings, _compile([(rel, live[entry[2]]) for rel, entry in files.items()]))
+        self._files = files
+        self._chunks = live
+        self._dirty = False
+
+    def _load_chunks(self) -> dict[str, list[Chunk]]:
+        if self._chunks is None:
+            self._chunks = {}
+            data = read_cache(cache_path(self._root, CHUNKS_FILE), CHUNKS_VERSION)
+            try:
+                if data is not None:
+                    self._chunks = {
+                        digest: [Chunk(*fields) for fields in entries]
+                        for digest, entries in data["chunks"].items()
+                    }
+            except (KeyError, TypeError, AttributeError):
+                self._chunks = {}
+        return self._chunks
+
+
+def update_doc_index(root: Path, *, use_watcher: bool = True) -> int:
+    """Index the new and changed documents of *root*; the number indexed.
+
+    While ``ctxforge watch`` runs for *root* (and *use_watcher* is set),
+    the index it keeps fresh is used as is, without a walk.
+    """
+    index = DocIndex.load(root)
+    if use_watcher and watcher_pid(root) is not None and cache_path(root, POSTINGS_FILE).is_file():
+        return len(index)
+    for entry in ProjectWalker(root, use_cache=True, limits=_WALK_LIMITS):
+        if entry.is_dir or entry.generated or entry.path.startswith(".ctxforge/"):
+            continue
+        if not entry.name.lower().endswith(DOC_EXTENSIONS):
+            continue
+        # Listings cached by the walk miss in-place edits; stat afresh.
+        try:
+            st = os.stat(root / entry.path)
+        except OSError:
+            continue
+        index.add(entry.path, st.st_mtime_ns, st.st_size)
+    index.save()
+    return len(index)
+
+
+def _dump(chunk: Chunk) -> list[Any]:
+    return [chunk.title, chunk.start, chunk.end, chunk.first_line, chunk.last_line, chunk.terms]
+
+
+# ── Postings file ───────────────────────────────────────────────────────────
+#
+# _MAGIC, a 4-byte little-endian header length, a JSON header, then the
+# arrays it lists as name -> [typecode, offset, count], each 8-byte
+# aligned and in native byte order:
+#   hashes   Q  sorted 64-bit hashes of the terms
+#   starts   I  per term, its first posting (plus a final end)
+#   postings Q  chunk id << 16 | frequency of the term in the chunk
+#   norms    f  per chunk, the BM25 length normalization K1 * (1 - B + B * len / avgdl)
+#   spans    I  per chunk, file id, start, end, first line, last line
+#   titles   I  per chunk, the start of its title in "text" (plus a final end)
+#   paths    I  per file, the start of its path in "text" (plus a final end)
+#   text     B  UTF-8 titles then paths
+
+
+def _compile(docs: list[tuple[str, list[Chunk]]]) -> list[bytes]:
+    """The postings file of the chunks of *docs*, as parts to concatenate."""
+    postings: defaultdict[str, list[int]] = defaultdict(list)
+    lengths: list[int] = []
+    spans = array("I")
+    titles, paths = array("I"), array("I")
+    text = bytearray()
+    for file_id, (_, chunks) in enumerate(docs):
+        for chunk in chunks:
+            words = chunk.terms.split()
+            counts = Counter(words)
+            if counts and max(counts.values()) > 0xFFFF:
+                counts = Counter({term: min(tf, 0xFFFF) for term, tf in counts.items()})
+            base = len(lengths) << 16
+            for term, tf in counts.items():
+                postings[term].append(base | tf)
+            lengths.append(len(words))
+            spans.extend((file_id, chunk.start, chunk.end, chunk.first_line, chunk.last_line))
+            titles.append(len(text))
+            text += chunk.title.encode("utf-8")
+    titles.append(len(text))
+    for rel, _ in docs:
+        paths.append(len(text))
+        text += rel.encode("utf-8")
+    paths.append(len(text))
+
+    avgdl = sum(lengths) / len(lengths) if lengths else 1.0
+    norms = array("f", (_K1 * (1 - _B + _B * n / avgdl) for n in lengths))
+    hashes, starts, packed = array("Q"), array("I"), array("Q")
+    for term_hash, term in sorted((_term_hash(t), t) for t in postings):
+        if hashes and hashes[-1] == term_hash:
+            continue  # a 64-bit collision: keep the first term
+        hashes.append(term_hash)
+        starts.append(len(packed))
+        packed.extend(postings[term])
+    starts.append(len(packed))
+
+    arrays: dict[str, array[Any]] = {
+        "hashes": hashes, "starts": starts, "postings": packed, "norms": norms,
+        "spans": spans, "titles": titles, "paths": paths, "text": array("B", text),
+    }
+    layout: dict[str, list[Any]] = {}
+    body: list[bytes] = []
+    offset = 0
+    for name, values in arrays.items():
+        data = values.tobytes()
+        layout[name] = [values.typecode, offset, len(values)]
+        body.extend((data, b"\0" * (_aligned(len(data)) - len(data))))
+        offset += _aligned(len(data))
+    header = json.dumps({
+        "version": POSTINGS_VERSION,
+        "byteorder": sys.byteorder,
+        "chunks": len(lengths),
+        "arrays": layout,  # offsets relative to the first array
+    }).encode("utf-8")
+    pad = _aligned(len(_MAGIC) + 4 + len(header)) - len(_MAGIC) - 4 - len(header)
+    return [_MAGIC, len(header).to_bytes(4, "little"), header, b"\0" * pad, *body]
+
+
+def _aligned(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ── Search ──────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True, slots=True)
+class DocHit:
+    """A chunk matching a query."""
+
+    path: str
+    title: str
+    start: int
+    end: int
+    first_line: int
+    last_line: int
+    score: float
+
+    @property
+    def label(self) -> str:
+        """Where the chunk is, for prompts: path, headings and lines."""
+        where = f"lines {self.first_line}-{self.last_line}"
+        if self.title:
+            where = f'"{self.title}", {where}'
+        return f"{self.path} ({where})"
+
+
+class DocSearcher:
+    """BM25 queries over a memory-mapped postings file.
+
+    Opening maps the file and reads its small header; the arrays are
+    used in place, so the cost of a query depends on the postings of
+    its terms, not on the size of the index.
+    """
+
+    def __init__(self, mm: mmap.mmap, header: dict[str, Any], base: int) -> None:
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._chunks = int(header["chunks"])
+        self._arrays: dict[str, memoryview] = {}
+        for name, (code, offset, count) in header["arrays"].items():
+            size = array(code).itemsize
+            self._arrays[name] = self._view[base + offset:base + offset + count * size].cast(code)
+
+    def __len__(self) -> int:
+        return self._chunks
+
+    def __enter__(self) -> DocSearcher:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @classmethod
+    def open(cls, root: Path) -> DocSearcher | None:
+        """The searcher of *root*'s postings file; None if there is none or it is unusable."""
+        try:
+            with open(cache_path(root, POSTINGS_FILE), "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            if mm[:len(_MAGIC)] != _MAGIC:
+                raise ValueError("not a postings file")
+            size = int.from_bytes(mm[len(_MAGIC):len(_MAGIC) + 4], "little")
+            start = len(_MAGIC) + 4
+            header = json.loads(mm[start:start + size])
+            if (header.get("version"), header.get("byteorder")) != (
+                POSTINGS_VERSION, sys.byteorder
+            ):
+                raise ValueError("incompatible postings file")
+            return cls(mm, header, _aligned(start + size))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            mm.close()
+            return None
+
+    def close(self) -> None:
+        for view in self._arrays.values():
+            view.release()
+        self._arrays.clear()
+        self._view.release()
+        self._mm.close()
+
+    def search(self, query: str, k: int, skip: Collection[str] = ()) -> list[DocHit]:
+        """The *k* chunks that best match *query*, best first.
+
+        Chunks of the documents in *skip* (``/``-separated paths) are
+        left out.  Terms are scored from the rarest; see
+        :data:`_RESCORE_RATIO` for how common ones are bounded.
+        """
+        hashes, starts = self._arrays["hashes"], self._arrays["starts"]
+        terms: list[tuple[int, int, float]] = []  # (start, end, weight)
+        for term, count in term_counts(query).items():
+            h = _term_hash(term)
+            i = bisect_left(hashes, h)
+            if i < len(hashes) and hashes[i] == h:
+                lo, hi = starts[i], starts[i + 1]
+                idf = math.log(1 + (self._chunks - (hi - lo) + 0.5) / (hi - lo + 0.5))
+                terms.append((lo, hi, idf * (_K1 + 1) * (1 + math.log(count))))
+        terms.sort(key=lambda t: t[1] - t[0])
+
+        postings, norms = self._arrays["postings"], self._arrays["norms"]
+        scores: dict[int, float] = {}
+        get = scores.get
+        read = 0
+        for lo, hi, weight in terms:
+            if scores and hi - lo > _RESCORE_RATIO * len(scores):
+                for chunk_id in list(scores):
+                    i = bisect_left(postings, chunk_id << 16, lo, hi)
+                    if i < hi and postings[i] >> 16 == chunk_id:
+                        tf = postings[i] & 0xFFFF
+                        scores[chunk_id] += weight * tf / (tf + norms[chunk_id])
+                continue
+            if read and read + hi - lo > _MAX_POSTINGS:
+                break
+            read += hi - lo
+            for posting in postings[lo:hi]:
+                chunk_id, tf = posting >> 16, posting & 0xFFFF
+                scores[chunk_id] = get(chunk_id, 0.0) + weight * tf / (tf + norms[chunk_id])
+
+        spans = self._arrays["spans"]
+        if skip:
+            skipped = {i for i in range(len(self._arrays["paths"]) - 1) if self._path(i) in skip}
+            if skipped:
+                scores = {c: s for c, s in scores.items() if spans[5 * c] not in skipped}
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        hits: list[DocHit] = []
+        for chunk_id, score in best:
+            file_id, start, end, first, last = spans[5 * chunk_id:5 * chunk_id + 5].tolist()
+            hits.append(DocHit(
+                self._path(file_id), self._text("titles", chunk_id),
+                start, end, first, last, score,
+            ))
+        return hits
+
+    def _path(self, file_id: int) -> str:
+        return self._text("paths", file_id)
+
+    def _text(self, table: str, i: int) -> str:
+        offsets = self._arrays[table]
+        return bytes(self._arrays["text"][offsets[i]:offsets[i + 1]]).decode("utf-8")
@@ -0,0 +1,91 @@
+"""Bounded reads of text files for embedding into prompts."""
+
+from __future__ import annotations
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# Bytes inspected for NUL when deciding whether a file is binary.
+_SNIFF_BYTES = 8192
+
+# How far before the cap a truncated file may be cut back to a line break.
+_LINE_SLACK = 512
+
+TEXT = "text"
+BINARY = "binary"
+NOT_UTF8 = "not-utf8"
+
+
+@dataclass(frozen=True)
+class FileContent:
+    """The start of a file, decoded as UTF-8."""
+
+    kind: str  # TEXT, BINARY or NOT_UTF8
+    text: str  # "" unless kind is TEXT
+    size: int  # bytes in the whole file
+    shown: int  # bytes of the file that *text* covers
+
+    @property
+    def truncated(self) -> bool:
+        return self.shown < self.size
+
+
+def read_capped(path: Path, max_bytes: int) -> FileContent | None:
+    """Read at most *max_bytes* of *path* as UTF-8 text.
+
+    The file is memory-mapped so only the pages actually inspected are
+    read, however large it is.  A file is BINARY when its first
+    :data:`_SNIFF_BYTES` contain a NUL byte and NOT_UTF8 when the part
+    read does not decode.  A truncated file is cut at the last line
+    break shortly before the cap, and never inside a UTF-8 sequence.
+
+    Returns:
+        The content, or None if *path* is not a readable regular file.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return FileContent(TEXT, "", 0, 0)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\0", 0, min(size, _SNIFF_BYTES)) >= 0:
+                    return FileContent(BINARY, "", size, 0)
+                data = mm[:max(max_bytes, 0)]
+    except (OSError, ValueError):
+        return None
+    return _decode(data, size)
+
+
+def cap_text(text: str, max_bytes: int) -> FileContent:
+    """*text* cut like a file by :func:`read_capped` to at most *max_bytes* of UTF-8."""
+    data = text.encode("utf-8", "surrogatepass")
+    return _decode(data[:max(max_bytes, 0)], len(data))
+
+
+def _decode(data: bytes, size: int) -> FileContent:
+    """The capped prefix *data* of *size* bytes, cut and decoded."""
+    if len(data) < size:
+        data = _cut(data)
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return FileContent(NOT_UTF8, "", size, 0)
+    return FileContent(TEXT, text, size, len(data))
+
+
+def _cut(data: bytes) -> bytes:
+    """*data* shortened to a line break near its end, or a character boundary."""
+    newline = data.rfind(b"\n", max(len(data) - _LINE_SLACK, 0))
+    if newline >= 0:
+        return data[:newline + 1]
+    # Drop the last character if the cap split it.
+    start = len(data)
+    while start > 0 and data[start - 1] & 0xC0 == 0x80:
+        start -= 1
+    if start == 0 or data[start - 1] < 0xC0:
+        return data
+    lead = data[start - 1]
+    width = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return data if len(data) - start + 1 >= width else data[:start - 1]
@@ -0,0 +1,210 @@
+"""Key file references to one Markdown section or a range of lines."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import astuple, dataclass
+from pathlib import Path
+
+from ctxforge.analysis.file_stats import FileStats
+from ctxforge.storage.cache import cache_path, read_cache, write_cache
+
+HEADINGS_FILE = "headings.json"
+HEADINGS_VERSION = 1
+
+MARKDOWN_SUFFIXES = (".md", ".markdown", ".mdx")
+
+_LINES = re.compile(r"(.+):(\d+)-(\d+)")
+_ATX = re.compile(rb"(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*\r?\n?")
+_NOT_SLUG = re.compile(r"[^\w\- ]")
+
+
+@dataclass(frozen=True)
+class KeyFileRef:
+    """A parsed ``[key_files].paths`` entry.
+
+    ``docs/ARCH.md#Storage`` selects the section under the heading
+    "Storage" of a Markdown file, ``src/x.py:10-80`` lines 10 to 80;
+    anything else is a whole file.
+    """
+
+    path: str
+    heading: str | None = None
+    lines: tuple[int, int] | None = None
+
+    @property
+    def whole(self) -> bool:
+        return self.heading is None and self.lines is None
+
+
+def parse_ref(entry: str) -> KeyFileRef:
+    """Split a key file entry into its path and section selector."""
+    m = _LINES.fullmatch(entry)
+    if m:
+        return KeyFileRef(m.group(1), lines=(int(m.group(2)), int(m.group(3))))
+    # The selector follows the "#" that ends a Markdown file name, so
+    # "docs/C#.md#Intro" and "ARCH.md#C# usage" split where expected.
+    i = entry.rfind("#")
+    while i > 0:
+        path, heading = entry[:i], entry[i + 1 :].strip()
+        if heading and path.lower().endswith(MARKDOWN_SUFFIXES):
+            return KeyFileRef(path, heading=heading)
+        i = entry.rfind("#", 0, i)
+    return KeyFileRef(entry)
+
+
+@dataclass(frozen=True, slots=True)
+class Heading:
+    """An ATX heading and the extent of its section."""
+
+    level: int
+    title: str
+    line: int  # 1-based line of the heading
+    end_line: int  # last line before the next heading of the same or higher level
+    start: int  # byte offset of the heading line
+    end: int  # byte offset just past the section
+
+
+def parse_headings(data: bytes) -> list[Heading]:
+    """Headings of Markdown *data*, skipping fenced code blocks."""
+    found: list[tuple[int, str, int, int]] = []  # level, title, line, start
+    fenced = False
+    offset = 0
+    lineno = 0
+    for line in data.splitlines(keepends=True):
+        lineno += 1
+        if line.startswith((b"```", b"~~~")):
+            fenced = not fenced
+        elif not fenced and line.startswith(b"#"):
+            m = _ATX.fullmatch(line)
+            if m:
+                title = m.group(2).decode("utf-8", "replace")
+                found.append((len(m.group(1)), title, lineno, offset))
+        offset += len(line)
+    headings: list[Heading] = []
+    for i, (level, title, line_no, start) in enumerate(found):
+        end_line, end = lineno, offset
+        for next_level, _, next_line, next_start in found[i + 1:]:
+            if next_level <= level:
+                end_line, end = next_line - 1, next_start
+                break
+        headings.append(Heading(level, title, line_no, end_line, start, end))
+    return headings
+
+
+def slug(title: str) -> str:
+    """GitHub-style anchor of a heading title ("Storage Layer" → "storage-layer")."""
+    return _NOT_SLUG.sub("", title.strip().lower()).replace(" ", "-")
+
+
+def find_heading(headings: list[Heading], query: str) -> Heading | None:
+    """The first heading titled *query*, compared exactly, then ignoring case, then as anchors."""
+    folded = query.casefold()
+    anchor = slug(query.lstrip("#"))
+    for match in (
+        lambda h: h.title == query,
+        lambda h: h.title.casefold() == folded,
+        lambda h: slug(h.title) == anchor,
+    ):
+        for heading in headings:
+            if match(heading):
+                return heading
+    return None
+
+
+@dataclass(frozen=True)
+class FileSlice:
+    """The part of a file a key file reference selects."""
+
+    ref: KeyFileRef
+    text: str
+    first_line: int
+    last_line: int
+
+    @property
+    def label(self) -> str:
+        """Where the slice is, for prompts: path, heading and lines."""
+        where = f"lines {self.first_line}-{self.last_line}"
+        if self.ref.heading is not None:
+            where = f'section "{self.ref.heading}", {where}'
+        return f"{self.ref.path} ({where})"
+
+
+class SectionIndex:
+    """Headings of Markdown key files, re-parsed only when a file's content changes.
+
+    Resolving ``path#heading`` is then a lookup and a read of the
+    section's bytes.  Entries are keyed by path and content hash (see
+    :class:`~ctxforge.analysis.file_stats.FileStatsIndex`).
+    """
+
+    def __init__(self, root: Path, entries: dict[str, tuple[str, list[Heading]]] | None = None):
+        self._root = root
+        self._entries = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path) -> SectionIndex:
+        data = read_cache(cache_path(root, HEADINGS_FILE), HEADINGS_VERSION)
+        if data is None:
+            return cls(root)
+        try:
+            entries = {
+                rel: (entry["digest"], [Heading(*fields) for fields in entry["headings"]])
+                for rel, entry in data["files"].items()
+            }
+        except (KeyError, TypeError, AttributeError):
+            return cls(root)
+        return cls(root, entries)
+
+    def headings(self, rel: str, stats: FileStats) -> list[Heading]:
+        """Headings of the Markdown file *rel* whose current stats are *stats*."""
+        entry = self._entries.get(rel)
+        if entry is not None and entry[0] == stats.digest:
+            return entry[1]
+        try:
+            data = (self._root / rel).read_bytes()
+        except OSError:
+            return []
+        headings = parse_headings(data)
+        self._entries[rel] = (stats.digest, headings)
+        self._dirty = True
+        return headings
+
+    def resolve(self, ref: KeyFileRef, stats: FileStats | None) -> FileSlice | None:
+        """The text *ref* selects, or None if the file, heading or lines do not exist."""
+        if stats is None or ref.whole:
+            return None
+        path = self._root / ref.path
+        try:
+            if ref.heading is not None:
+                if Path(ref.path).suffix.lower() not in MARKDOWN_SUFFIXES:
+                    return None
+                heading = find_heading(self.headings(ref.path, stats), ref.heading)
+                if heading is None:
+                    return None
+                with open(path, "rb") as f:
+                    f.seek(heading.start)
+                    data = f.read(heading.end - heading.start)
+                first, last = heading.line, heading.end_line
+            else:
+                first, last = ref.lines or (0, 0)
+                lines = path.read_bytes().splitlines(keepends=True)
+                if first < 1 or first > len(lines) or last < first:
+                    return None
+                last = min(last, len(lines))
+                data = b"".join(lines[first - 1:last])
+        except OSError:
+            return None
+        return FileSlice(ref, data.decode("utf-8", "replace"), first, last)
+
+    def save(self) -> None:
+        """Persist the index if a lookup changed it; nothing outside a project."""
+        if not self._dirty or not (self._root / ".ctxforge").is_dir():
+            return
+        files = {
+            rel: {"digest": digest, "headings": [list(astuple(h)) for h in headings]}
+            for rel, (digest, headings) in self._entries.items()
+        }
+        write_cache(cache_path(self._root, HEADINGS_FILE), {"files": files}, HEADINGS_VERSION)
+        self._dirty = False
@@ -0,0 +1,109 @@
+"""Cached size, line count and content hash of key files."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+from collections.abc import Iterable
+from dataclasses import astuple, dataclass
+from pathlib import Path
+
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+
+STATS_FILE = "file-stats.json"
+STATS_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class FileStats:
+    """What ``ctx files`` and prompt assembly need to know about a file."""
+
+    mtime_ns: int
+    size: int
+    chars: int  # decoded characters (invalid UTF-8 replaced)
+    lines: int
+    digest: str  # blake2b of the raw bytes
+
+
+class FileStatsIndex:
+    """Stats of project files, recomputed only when mtime or size changed.
+
+    A lookup costs one ``stat``; the file is read only the first time it
+    is seen and after it changes.  ``ctxforge watch`` refreshes the index
+    for every profile's key files and work records, so later commands
+    find it warm.
+    """
+
+    def __init__(self, path: Path, entries: dict[str, FileStats] | None = None) -> None:
+        self._path = path
+        self._entries = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path) -> FileStatsIndex:
+        path = cache_path(root, STATS_FILE)
+        data = read_cache(path, STATS_VERSION)
+        if data is None:
+            return cls(path)
+        try:
+            entries = {rel: FileStats(*fields) for rel, fields in data["files"].items()}
+        except (KeyError, TypeError):
+            return cls(path)
+        return cls(path, entries)
+
+    def stats(self, root: Path, rel: str) -> FileStats | None:
+        """Stats of *rel* (relative to *root*), or None if it is not a file."""
+        try:
+            st = os.stat(root / rel)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        known = self._entries.get(rel)
+        if known is not None and (known.mtime_ns, known.size) == (st.st_mtime_ns, st.st_size):
+            return known
+        try:
+            data = (root / rel).read_bytes()
+        except OSError:
+            return None
+        text = data.decode("utf-8", errors="replace")
+        entry = FileStats(
+            st.st_mtime_ns,
+            st.st_size,
+            len(text),
+            text.count("\n"),
+            hashlib.blake2b(data, digest_size=16).hexdigest(),
+        )
+        self._entries[rel] = entry
+        self._dirty = True
+        return entry
+
+    def digests(self) -> set[str]:
+        """Content hashes of all indexed files."""
+        return {entry.digest for entry in self._entries.values()}
+
+    def refresh(self, root: Path, paths: Iterable[str]) -> None:
+        """Look up all of *paths* and drop entries for any other file."""
+        wanted = set(paths)
+        for rel in wanted:
+            self.stats(root, rel)
+        stale = self._entries.keys() - wanted
+        for rel in stale:
+            del self._entries[rel]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        """Persist the index if a lookup changed it.
+
+        Files modified within the racy window are left out, so they are
+        read again next time.
+        """
+        if not self._dirty:
+            return
+        cutoff = racy_cutoff()
+        files = {
+            rel: list(astuple(s)) for rel, s in self._entries.items() if s.mtime_ns < cutoff
+        }
+        write_cache(self._path, {"files": files}, STATS_VERSION)
+        self._dirty = False
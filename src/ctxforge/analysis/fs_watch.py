@@ -0,0 +1,269 @@
+"""Filesystem change notification: inotify with a polling fallback."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Protocol
+
+from ctxforge.analysis.scanner import DEFAULT_EXCLUDES
+from ctxforge.analysis.vendor_detector import is_vendored_dir
+from ctxforge.storage.cache import cache_path, read_cache, write_cache
+
+WATCH_FILE = "watch.json"
+WATCH_VERSION = 1
+
+# inotify(7) constants.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; the name follows
+_READ_SIZE = 64 * 1024
+
+
+class Watcher(Protocol):
+    """Source of batches of changed paths under a project root."""
+
+    def changes(self, timeout: float | None = None) -> set[str] | None:
+        """Wait up to *timeout* seconds for changes.
+
+        Returns:
+            ``/``-separated paths (relative to the root) of files and
+            directories that changed — empty on timeout — or None when
+            events were lost and everything must be assumed changed.
+        """
+        ...
+
+    def close(self) -> None: ...
+
+
+def _watched(name: str) -> bool:
+    return name not in DEFAULT_EXCLUDES and not is_vendored_dir(name)
+
+
+# ── inotify ─────────────────────────────────────────────────────────────────
+
+
+class _Libc:
+    """Minimal ctypes binding to the inotify system calls."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        try:
+            self.init1 = lib.inotify_init1
+            self.add_watch = lib.inotify_add_watch
+            self.rm_watch = lib.inotify_rm_watch
+        except AttributeError as e:
+            raise OSError(errno.ENOSYS, "libc has no inotify support") from e
+        self.init1.argtypes = [ctypes.c_int]
+        self.add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+
+class InotifyWatcher:
+    """Recursive watch of a project tree through inotify(7).
+
+    Every directory not excluded by name (VCS metadata, caches, vendored
+    trees) gets a watch; directories created later are added as their
+    creation is seen.  Raises OSError when inotify is unavailable or the
+    per-user watch limit is too low for the tree.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._libc = _Libc()
+        self._fd = self._libc.init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}  # watch descriptor -> relative dir
+        try:
+            self._add_tree("")
+        except OSError:
+            self.close()
+            raise
+
+    def _add_tree(self, rel: str) -> None:
+        stack = [rel]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self._root, rel) if rel else str(self._root)
+            wd = self._libc.add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue  # removed or unreadable meanwhile
+                raise OSError(err, f"inotify_add_watch failed for {path}")
+            self._dirs[wd] = rel
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and _watched(entry.name):
+                            stack.append(f"{rel}/{entry.name}" if rel else entry.name)
+            except OSError:
+                continue
+
+    def changes(self, timeout: float | None = None) -> set[str] | None:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                base = self._dirs.get(wd)
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if base is None or (name and not _watched(name)):
+                    continue
+                rel = f"{base}/{name}" if base and name else base or name
+                changed.add(rel)
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    try:
+                        self._add_tree(rel)
+                    except OSError:
+                        overflow = True  # watch limit reached: changes may be missed
+        return None if overflow else changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+# ── Polling ─────────────────────────────────────────────────────────────────
+
+
+class PollingWatcher:
+    """Detect changes by re-statting the tree every *interval* seconds.
+
+    Portable but proportional to the size of the tree; used where inotify
+    is not available.
+    """
+
+    def __init__(self, root: Path, interval: float = 2.0) -> None:
+        self._root = root
+        self._interval = interval
+        self._snapshot = self._take()
+
+    def _take(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                with os.scandir(os.path.join(self._root, rel)) as it:
+                    for entry in it:
+                        path = f"{rel}/{entry.name}" if rel else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if _watched(entry.name):
+                                stack.append(path)
+                                snapshot[path] = (-1, -1)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            snapshot[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def changes(self, timeout: float | None = None) -> set[str] | None:
+        time.sleep(self._interval if timeout is None else min(self._interval, timeout))
+        old, new = self._snapshot, self._take()
+        self._snapshot = new
+        changed = {p for p, stat in new.items() if old.get(p) != stat}
+        changed.update(p for p in old if p not in new)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(root: Path, *, poll: bool = False, interval: float = 2.0) -> Watcher:
+    """Watch *root* with inotify, or by polling if asked to or if unavailable."""
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval)
+
+
+# ── Watcher state ───────────────────────────────────────────────────────────
+
+
+def write_watch_state(root: Path, refreshed: float | None = None) -> None:
+    """Record that this process watches *root*, last refreshed at *refreshed*."""
+    write_cache(
+        cache_path(root, WATCH_FILE),
+        {"pid": os.getpid(), "refreshed": refreshed or time.time()},
+        WATCH_VERSION,
+    )
+
+
+def clear_watch_state(root: Path) -> None:
+    try:
+        cache_path(root, WATCH_FILE).unlink()
+    except OSError:
+        pass
+
+
+def _cmdline(pid: int) -> bytes | None:
+    try:
+        return Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return None  # no procfs
+
+
+def watcher_pid(root: Path) -> int | None:
+    """PID of the live ``ctxforge watch`` process for *root*, if any."""
+    data = read_cache(cache_path(root, WATCH_FILE), WATCH_VERSION)
+    if data is None or not isinstance(data.get("pid"), int):
+        return None
+    pid: int = data["pid"]
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass  # alive, owned by someone else
+    cmdline = _cmdline(pid)
+    if cmdline is None:
+        return pid  # cannot tell: trust the pid
+    return pid if b"ctxforge" in cmdline else None  # pid reused by another program
@@ -0,0 +1,236 @@
+"""Per-file churn and recency mined from git history."""
+
+from __future__ import annotations
+
+import subprocess
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from ctxforge.storage.cache import cache_path, read_cache, write_cache
+
+HISTORY_FILE = "git-history.json"
+HISTORY_VERSION = 1
+
+# Commit header line in the ``git log`` output; file names follow it.
+_COMMIT_MARK = "\0"
+_LOG_FORMAT = "--format=%x00%H %ct"
+
+# Hash of the empty tree: diffing against it lists every file of a commit.
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+@dataclass(frozen=True, slots=True)
+class FileHistory:
+    """History of one path."""
+
+    commits: int  # non-merge commits that touched the file
+    last_touched: int  # commit time (Unix seconds) of the latest of them
+
+
+class GitHistory:
+    """Index of per-file churn and last-touched time.
+
+    Built from a single streamed ``git log --name-only`` and cached under
+    ``.ctxforge/cache/`` keyed by the last processed commit, so a later
+    :meth:`load` only parses the commits made since.  Lookups are dict
+    accesses.  Renames are not followed: history is per path.
+    """
+
+    def __init__(
+        self, head: str | None = None, files: dict[str, FileHistory] | None = None
+    ) -> None:
+        self.head = head
+        self._files = files or {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._files
+
+    def get(self, path: str) -> FileHistory | None:
+        """History of a ``/``-separated path relative to the repository root."""
+        return self._files.get(path)
+
+    def churn(self, path: str) -> int:
+        entry = self._files.get(path)
+        return entry.commits if entry is not None else 0
+
+    def last_touched(self, path: str) -> int | None:
+        entry = self._files.get(path)
+        return entry.last_touched if entry is not None else None
+
+    def age_days(self, path: str, now: float | None = None) -> float | None:
+        """Days since the last commit touching *path*, or None if never committed."""
+        last = self.last_touched(path)
+        if last is None:
+            return None
+        now = time.time() if now is None else now
+        return max(now - last, 0.0) / 86400
+
+    def touched_since(self, paths: Iterable[str], since: float) -> list[str]:
+        """Those of *paths* committed to after the Unix time *since*."""
+        return [p for p in paths if (self.last_touched(p) or 0) > since]
+
+    @classmethod
+    def load(cls, root: Path, *, use_cache: bool = True) -> GitHistory | None:
+        """Index the history of the git repository at *root*.
+
+        With *use_cache*, the cached index is extended with the commits
+        since its head (or rebuilt if that commit is no longer an ancestor
+        of HEAD) and written back when the project has a ``.ctxforge/``
+        directory.
+
+        Returns:
+            The index (empty for a repository without commits), or None if
+            *root* is not a git checkout or git is unavailable.
+        """
+        if not (root / ".git").exists():
+            return None
+        head = _git(root, "rev-parse", "--verify", "--quiet", "HEAD")
+        if head is None:
+            return None if _git(root, "rev-parse", "--git-dir") is None else cls()
+        head = head.strip()
+
+        path = cache_path(root, HISTORY_FILE)
+        history = cls._from_cache(path) if use_cache else None
+        if history is not None and history.head == head:
+            return history
+        if history is not None and history.head and _is_ancestor(root, history.head):
+            revs = f"{history.head}..{head}"
+        else:
+            history, revs = cls(), head
+
+        try:
+            history._ingest(_stream_log(root, revs))
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        history.head = head
+        if use_cache and (root / ".ctxforge").is_dir():
+            history._save(path)
+        return history
+
+    def _ingest(self, commits: Iterable[tuple[int, list[str]]]) -> None:
+        files = self._files
+        for commit_time, paths in commits:
+            for rel in paths:
+                entry = files.get(rel)
+                if entry is None:
+                    files[rel] = FileHistory(1, commit_time)
+                else:
+                    files[rel] = FileHistory(
+                        entry.commits + 1, max(entry.last_touched, commit_time)
+                    )
+
+    @classmethod
+    def _from_cache(cls, path: Path) -> GitHistory | None:
+        data = read_cache(path, HISTORY_VERSION)
+        if data is None:
+            return None
+        try:
+            files = {
+                rel: FileHistory(int(commits), int(last))
+                for rel, (commits, last) in data["files"].items()
+            }
+            return cls(str(data["head"]), files)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _save(self, path: Path) -> None:
+        files = {rel: [h.commits, h.last_touched] for rel, h in self._files.items()}
+        write_cache(path, {"head": self.head, "files": files}, HISTORY_VERSION)
+
+
+def changed_paths(root: Path, old: str, new: str = "HEAD") -> list[str] | None:
+    """Paths that differ between the commits *old* and *new*.
+
+    Paths are ``/``-separated and relative to *root*, which may be a
+    subdirectory of the checkout (changes outside it are left out).
+    Renames are reported as a deletion plus an addition.
+
+    Returns:
+        The paths, or None if git failed (unknown revision, no checkout).
+    """
+    out = _git(
+        root, "-c", "core.quotePath=off",
+        "diff", "--name-only", "--no-renames", "--relative", old, new, "--",
+    )
+    if out is None:
+        return None
+    return [line for line in out.splitlines() if line]
+
+
+def commit_paths(root: Path, rev: str = "HEAD") -> list[str] | None:
+    """Paths changed by commit *rev* relative to its first parent.
+
+    Every path of the commit for a root commit; otherwise as
+    :func:`changed_paths`.
+    """
+    parent = _git(root, "rev-parse", "--verify", "--quiet", f"{rev}^")
+    return changed_paths(root, parent.strip() if parent else _EMPTY_TREE, rev)
+
+
+def current_branch(root: Path) -> str | None:
+    """Name of the branch checked out at *root*; None if detached or not in a checkout."""
+    out = _git(root, "symbolic-ref", "--quiet", "--short", "HEAD")
+    if out is None:
+        return None
+    return out.strip() or None
+
+
+def _stream_log(root: Path, revs: str) -> Iterator[tuple[int, list[str]]]:
+    """Yield (commit time, paths) per commit, parsing ``git log`` as it runs."""
+    proc = subprocess.Popen(
+        [
+            "git", "-C", str(root), "-c", "core.quotePath=off",
+            "log", "--name-only", "--no-renames", _LOG_FORMAT, revs, "--",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="surrogateescape",
+    )
+    assert proc.stdout is not None
+    commit_time: int | None = None
+    paths: list[str] = []
+    try:
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(_COMMIT_MARK):
+                if commit_time is not None:
+                    yield commit_time, paths
+                commit_time = int(line.rpartition(" ")[2])
+                paths = []
+            elif line and commit_time is not None:
+                paths.append(line)
+        if commit_time is not None:
+            yield commit_time, paths
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, "git log")
+
+
+def _is_ancestor(root: Path, sha: str) -> bool:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), "merge-base", "--is-ancestor", sha, "HEAD"],
+            capture_output=True,
+        )
+    except OSError:
+        return False
+    return result.returncode == 0
+
+
+def _git(root: Path, *args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), *args], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout
@@ -0,0 +1,205 @@
+"""Gitignore-style path matching for the project scanner."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class _Group:
+    """Consecutive rules with the same sign and dir-only flag, as one regex."""
+
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+class IgnoreRules:
+    """Patterns from one source (a ``.gitignore`` file, a config list, ...).
+
+    Patterns follow gitignore syntax and are matched against paths relative
+    to the directory the source applies to.  Consecutive rules of the same
+    kind are merged into a single alternation regex, so matching a path costs
+    a handful of regex calls regardless of the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        groups: list[_Group] = []
+        pending: list[str] = []
+        kind: tuple[bool, bool] | None = None
+        for line in patterns:
+            parsed = _parse_pattern(line)
+            if parsed is None:
+                continue
+            regex, negate, dir_only = parsed
+            if kind is not None and kind != (negate, dir_only):
+                groups.append(_make_group(pending, *kind))
+                pending = []
+            kind = (negate, dir_only)
+            pending.append(regex)
+        if kind is not None:
+            groups.append(_make_group(pending, *kind))
+        self._groups = tuple(groups)
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """Match a ``/``-separated relative path.
+
+        Returns True if ignored, False if re-included by a negation, and
+        None if no rule applies.  As in git, the last matching rule wins.
+        """
+        for group in reversed(self._groups):
+            if group.dir_only and not is_dir:
+                continue
+            if group.regex.fullmatch(rel):
+                return not group.negate
+        return None
+
+    @classmethod
+    def from_file(cls, path: Path) -> IgnoreRules:
+        """Read rules from a gitignore-format file (empty if unreadable)."""
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return cls(())
+        return cls(text.splitlines())
+
+
+class IgnoreMatcher:
+    """A stack of rule sources, highest precedence first.
+
+    Each source is anchored at a directory (``""`` for the project root).
+    The first source with an opinion about a path decides, mirroring git's
+    precedence of deeper ``.gitignore`` files over shallower ones.
+    """
+
+    __slots__ = ("_sources", "_overrides")
+
+    def __init__(
+        self,
+        sources: tuple[tuple[str, IgnoreRules], ...] = (),
+        overrides: IgnoreRules | None = None,
+    ) -> None:
+        self._sources = sources
+        self._overrides = overrides if overrides else None
+
+    def __bool__(self) -> bool:
+        return bool(self._sources) or self._overrides is not None
+
+    def push(self, base: str, rules: IgnoreRules) -> IgnoreMatcher:
+        """Return a matcher with *rules* (anchored at *base*) taking priority.
+
+        Overrides (e.g. ``[scan].exclude`` from project.toml) always stay on top.
+        """
+        if not rules:
+            return self
+        return IgnoreMatcher(((base, rules), *self._sources), self._overrides)
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        """Return True if the ``/``-separated path *rel* is ignored."""
+        if self._overrides is not None:
+            result = self._overrides.match(rel, is_dir)
+            if result is not None:
+                return result
+        for base, rules in self._sources:
+            if base:
+                if not rel.startswith(base + "/"):
+                    continue
+                sub = rel[len(base) + 1 :]
+            else:
+                sub = rel
+            result = rules.match(sub, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
+def _make_group(regexes: list[str], negate: bool, dir_only: bool) -> _Group:
+    return _Group(re.compile("|".join(f"(?:{r})" for r in regexes)), negate, dir_only)
+
+
+def _parse_pattern(line: str) -> tuple[str, bool, bool] | None:
+    """Translate one gitignore line into (regex, negate, dir_only)."""
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped with a backslash.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line:
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to its base directory.
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    try:
+        re.compile(regex)
+    except re.error:
+        return None  # e.g. a reversed range "[z-a]": git ignores the line too
+    return regex, negate, dir_only
+
+
+def _translate(pattern: str) -> str:
+    """Translate gitignore glob syntax into a regex (without anchors)."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")  # "foo/**" — everything inside
+                        i += 2
+                    else:
+                        out.append("(?:.*/)?")  # "**/foo" and "a/**/b"
+                        i += 3
+                    continue
+            out.append("[^/]*")
+            while i < n and pattern[i] == "*":
+                i += 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            start = i + 2 if pattern.startswith("[!", i) else i + 1
+            # A "]" right after "[" or "[!" is a member, not the end.
+            j = pattern.find("]", start + 1 if pattern.startswith("]", start) else start)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[start:j].replace("\\", "\\\\").replace("[", "\\[")
+                if body.startswith("]"):
+                    body = "\\" + body
+                out.append(f"[{'^' if start > i + 1 else ''}{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
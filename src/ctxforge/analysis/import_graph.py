@@ -0,0 +1,368 @@
+"""Import graph over source files, ranked by centrality."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import posixpath
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+from ctxforge.analysis.link_graph import LinkGraph
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+
+IMPORTS_FILE = "import-graph.json"
+IMPORTS_VERSION = 1
+
+_PY_EXTENSIONS = (".py",)
+_JS_EXTENSIONS = (".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs")
+
+# Extensions whose imports are resolved into the graph.
+IMPORT_EXTENSIONS = frozenset(_PY_EXTENSIONS + _JS_EXTENSIONS)
+
+# Files above this size are not parsed (bundles, fixtures, generated code).
+MAX_SOURCE_BYTES = 512 * 1024
+
+# Below this many files to parse, a process pool costs more than it saves.
+_PARALLEL_MIN_FILES = 256
+_CHUNK_SIZE = 64
+
+# ``from 'x'`` (import/export … from), ``import 'x'``, ``require('x')``, ``import('x')``.
+_JS_IMPORT = re.compile(
+    r"""(?:\bfrom|\bimport\s*\(|\bimport|\brequire\s*\()\s*(['"])([^'"\n]+)\1"""
+)
+# A relative module specifier written with the compiled extension.
+_JS_COMPILED = re.compile(r"\.(?:m|c)?jsx?$")
+
+
+@dataclass
+class ImportGraph:
+    """Resolved imports with their graph and PageRank scores."""
+
+    imports: dict[str, list[str]]  # file -> project files it imports
+    graph: LinkGraph
+    ranks: dict[str, float]  # sums to 1 over all files
+
+
+@dataclass
+class SourceCandidate:
+    """A source file ranked by how central it is in the import graph."""
+
+    path: str  # relative to the project root, "/"-separated
+    size: int = 0
+    imported_by: int = 0  # number of project files importing it
+    rank: float = 0.0  # PageRank in the import graph; sums to 1
+
+
+# ── Parsing ─────────────────────────────────────────────────────────────────
+
+
+def parse_imports(path: str, text: str) -> list[str]:
+    """Module references made by the source *text* of the file *path*.
+
+    Python references are dotted module names, with leading dots for
+    relative imports; ``from a import b`` yields both ``a.b`` and ``a``
+    since *b* may be a submodule.  JS/TS references are the specifiers of
+    ``import``/``export … from``, ``require()`` and dynamic ``import()``.
+    Unknown extensions and unparsable Python yield nothing.
+    """
+    ext = _extension(path)
+    if ext in _PY_EXTENSIONS:
+        return _python_imports(text)
+    if ext in _JS_EXTENSIONS:
+        return list(dict.fromkeys(m.group(2) for m in _JS_IMPORT.finditer(text)))
+    return []
+
+
+def _python_imports(text: str) -> list[str]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    found: dict[str, None] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                found[alias.name] = None
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            sep = "." if node.module else ""
+            for alias in node.names:
+                if alias.name != "*":
+                    found[f"{module}{sep}{alias.name}"] = None
+            if node.module:
+                found[module] = None
+    return list(found)
+
+
+def _parse_file(
+    root: str, rel: str, previous: str | None
+) -> tuple[str, str, list[str] | None] | None:
+    """Read and parse one file; runs in worker processes.
+
+    Returns ``(rel, digest, references)`` with references None when the
+    digest equals *previous*, or None if the file cannot be read.
+    """
+    try:
+        with open(os.path.join(root, rel), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    digest = _digest(rel, data)
+    if digest == previous:
+        return rel, digest, None
+    return rel, digest, parse_imports(rel, data.decode("utf-8", errors="replace"))
+
+
+def _digest(rel: str, data: bytes) -> str:
+    # The language is part of the key: the same bytes parse differently.
+    lang = "py" if _extension(rel) in _PY_EXTENSIONS else "js"
+    return f"{lang}:{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+
+
+def _extension(path: str) -> str:
+    name = path.rpartition("/")[2]
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
+# ── Resolution ──────────────────────────────────────────────────────────────
+
+
+class _Resolver:
+    """Map module references to project files."""
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self._paths = set(paths)
+        py = [p for p in self._paths if p.endswith(".py")]
+        packages = {posixpath.dirname(p) for p in py if p.rpartition("/")[2] == "__init__.py"}
+        # Module name -> file.  A module's name starts below the outermost
+        # directory of its chain of packages, so ``src/`` layouts resolve.
+        self._modules: dict[str, str] = {}
+        self._module_of: dict[str, str] = {}
+        for p in sorted(py):
+            parts = p[:-3].split("/")
+            dirs = parts[:-1]
+            top = len(dirs)
+            while top > 0 and "/".join(dirs[:top]) in packages:
+                top -= 1
+            names = parts[top:] if parts[-1] != "__init__" else parts[top:-1]
+            if not names:
+                continue
+            module = ".".join(names)
+            self._modules.setdefault(module, p)
+            self._module_of[p] = module
+
+    def resolve(self, source: str, references: list[str]) -> list[str]:
+        """Project files imported by *source*, deduplicated, in reference order."""
+        resolve = self._resolve_py if source.endswith(".py") else self._resolve_js
+        found: dict[str, None] = {}
+        for ref in references:
+            target = resolve(source, ref)
+            if target is not None and target != source:
+                found[target] = None
+        return list(found)
+
+    def _resolve_py(self, source: str, ref: str) -> str | None:
+        level = len(ref) - len(ref.lstrip("."))
+        if level:
+            module = self._module_of.get(source)
+            if module is None:
+                return None
+            package = module.split(".")
+            if source.rpartition("/")[2] != "__init__.py":
+                package = package[:-1]
+            if level > 1:
+                package = package[: -(level - 1)] if level - 1 < len(package) else []
+            rest = ref[level:]
+            ref = ".".join([*package, rest] if rest else package)
+            if not ref:
+                return None
+        return self._modules.get(ref)
+
+    def _resolve_js(self, source: str, ref: str) -> str | None:
+        if not ref.startswith(("./", "../")) and ref not in (".", ".."):
+            return None  # a package, an alias or an absolute path
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(source), ref))
+        if target.startswith("../"):
+            return None
+        if target in self._paths:
+            return target
+        stems = [target]
+        if _JS_COMPILED.search(target):
+            # TypeScript sources import "./x.js" for ./x.ts.
+            stems.append(target[: target.rfind(".")])
+        for stem in stems:
+            for ext in _JS_EXTENSIONS:
+                if stem + ext in self._paths:
+                    return stem + ext
+        for ext in _JS_EXTENSIONS:
+            index = f"{target}/index{ext}"
+            if index in self._paths:
+                return index
+        return None
+
+
+# ── Graph ───────────────────────────────────────────────────────────────────
+
+
+def build_import_graph(
+    root: Path,
+    files: Iterable[tuple[str, int, int]],
+    *,
+    use_cache: bool = False,
+    workers: int | None = None,
+) -> ImportGraph:
+    """Parse the imports of source *files* and rank the files by PageRank.
+
+    Edges point from the importing file to the imported one, so a file
+    ranks high when many (and central) files depend on it.  Only project
+    files are nodes; third-party imports are dropped.
+
+    Args:
+        root: Project root directory.
+        files: ``(path, mtime_ns, size)`` for each source file, paths
+            relative to *root* and ``/``-separated.
+        use_cache: Reuse the references of files whose mtime and size are
+            unchanged, or whose content hash is, and the ranks when nothing
+            changed, from ``.ctxforge/cache/``.  Files are stat-ed afresh
+            for this, since listings cached by a walk miss in-place edits.
+            The cache is written back when the project has a
+            ``.ctxforge/`` directory.
+        workers: Processes parsing files when there are many to parse;
+            defaults to the CPU count.
+
+    Returns:
+        An :class:`ImportGraph`; files that cannot be read import nothing.
+    """
+    path = cache_path(root, IMPORTS_FILE)
+    cached_files: dict[str, tuple[int, int, str]] = {}
+    cached_refs: dict[str, list[str]] = {}
+    cached_ranks: dict[str, float] | None = None
+    if use_cache and (data := read_cache(path, IMPORTS_VERSION)) is not None:
+        try:
+            cached_files = {
+                rel: (int(m), int(s), str(d)) for rel, (m, s, d) in data["files"].items()
+            }
+            cached_refs = {str(d): list(refs) for d, refs in data["imports"].items()}
+            cached_ranks = dict(data["ranks"])
+        except (KeyError, TypeError, ValueError):
+            cached_files, cached_refs, cached_ranks = {}, {}, None
+
+    entries: dict[str, tuple[int, int, str]] = {}
+    refs: dict[str, list[str]] = {}
+    stale: list[tuple[str, int, int, str | None]] = []
+    for rel, mtime_ns, size in files:
+        if use_cache:
+            try:
+                st = os.stat(root / rel)
+            except OSError:
+                continue
+            mtime_ns, size = st.st_mtime_ns, st.st_size
+        if size > MAX_SOURCE_BYTES:
+            continue
+        known = cached_files.get(rel)
+        if known is not None and known[:2] == (mtime_ns, size) and known[2] in cached_refs:
+            entries[rel] = known
+            refs[known[2]] = cached_refs[known[2]]
+        else:
+            stale.append((rel, mtime_ns, size, known[2] if known else None))
+
+    stats = {rel: (mtime_ns, size) for rel, mtime_ns, size, _ in stale}
+    for result in _parse_all(root, stale, workers):
+        rel, digest, references = result
+        if references is None:
+            references = cached_refs.get(digest)
+        if references is None:  # the previous digest's entry was dropped
+            parsed = _parse_file(str(root), rel, None)
+            if parsed is None or parsed[2] is None:
+                continue
+            digest, references = parsed[1], parsed[2]
+        entries[rel] = (*stats[rel], digest)
+        refs[digest] = references
+
+    resolver = _Resolver(entries)
+    imports = {rel: resolver.resolve(rel, refs[entry[2]]) for rel, entry in entries.items()}
+    graph = LinkGraph.from_edges(imports)
+    changed = bool(stale) or entries.keys() != cached_files.keys()
+    if not changed and cached_ranks is not None and cached_ranks.keys() == imports.keys():
+        ranks = cached_ranks
+    else:
+        ranks = graph.pagerank()
+        if use_cache and (root / ".ctxforge").is_dir():
+            # Files modified within the racy window are parsed again next time.
+            cutoff = racy_cutoff()
+            write_cache(
+                path,
+                {
+                    "files": {
+                        rel: list(entry) for rel, entry in entries.items() if entry[0] < cutoff
+                    },
+                    "imports": refs,
+                    "ranks": ranks,
+                },
+                IMPORTS_VERSION,
+            )
+    return ImportGraph(imports, graph, ranks)
+
+
+def _parse_all(
+    root: Path, stale: list[tuple[str, int, int, str | None]], workers: int | None
+) -> list[tuple[str, str, list[str] | None]]:
+    """Parse *stale* files, across a process pool when there are many."""
+    base = str(root)
+    rels = [rel for rel, _, _, _ in stale]
+    previous = [digest for _, _, _, digest in stale]
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if len(stale) >= _PARALLEL_MIN_FILES and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(
+                    pool.map(
+                        _parse_file, [base] * len(rels), rels, previous,
+                        chunksize=_CHUNK_SIZE,
+                    )
+                )
+            return [r for r in results if r is not None]
+        except (OSError, BrokenProcessPool):
+            pass  # no usable process support (sandbox, /dev/shm): parse here
+    return [
+        r for rel, prev in zip(rels, previous) if (r := _parse_file(base, rel, prev)) is not None
+    ]
+
+
+def rank_source_files(
+    root: Path,
+    files: Iterable[tuple[str, int, int]],
+    *,
+    limit: int = 10,
+    use_cache: bool = False,
+    workers: int | None = None,
+) -> list[SourceCandidate]:
+    """The *limit* most central source files among *files*, best first.
+
+    *files* are ``(path, mtime_ns, size)`` as for :func:`build_import_graph`
+    (which *use_cache* and *workers* are passed to); files other than
+    Python and JS/TS are ignored.  Only files some other file imports are
+    returned, so a project without internal imports yields nothing.
+    """
+    sources = [f for f in files if _extension(f[0]) in IMPORT_EXTENSIONS]
+    if not sources:
+        return []
+    sizes = {rel: size for rel, _, size in sources}
+    import_graph = build_import_graph(root, sources, use_cache=use_cache, workers=workers)
+    inbound = import_graph.graph.in_degrees()
+    ranked = sorted(
+        (
+            SourceCandidate(rel, sizes[rel], inbound[rel], rank)
+            for rel, rank in import_graph.ranks.items()
+            if inbound[rel] and sizes[rel]
+        ),
+        key=lambda c: (-c.rank, c.path),
+    )
+    return ranked[:limit]
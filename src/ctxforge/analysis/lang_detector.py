@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+import heapq
+import os
+import re
+import zlib
 from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
 # Map file extensions to language names
 EXTENSION_MAP: dict[str, str] = {
@@ -29,32 +36,248 @@ EXTENSION_MAP: dict[str, str] = {
     ".exs": "elixir",
     ".lua": "lua",
     ".r": "r",
-    ".R": "r",
     ".dart": "dart",
     ".zig": "zig",
     ".vue": "vue",
     ".svelte": "svelte",
 }
 
+# Interpreter named on a shebang line → language (extensionless scripts).
+SHEBANG_MAP: dict[str, str] = {
+    "python": "python",
+    "python2": "python",
+    "python3": "python",
+    "node": "javascript",
+    "nodejs": "javascript",
+    "deno": "typescript",
+    "ruby": "ruby",
+    "php": "php",
+    "lua": "lua",
+    "Rscript": "r",
+    "elixir": "elixir",
+    "swift": "swift",
+}
+
 # Minimum file count to consider a language significant
 MIN_FILES = 2
 
+Weight = Literal["files", "bytes"]
+
+# Content sampling bounds: files read per ambiguous extension / for shebangs,
+# and bytes read from each.
+_SAMPLES_PER_EXT = 16
+_SHEBANG_SAMPLES = 64
+_SNIFF_BYTES = 4096
+
+_CPP_HINTS = re.compile(
+    rb"\b(?:class|namespace|template|virtual)\b|\b(?:public|private|protected)\s*:|std::"
+    rb"|#include\s*<(?:iostream|string|vector|memory|map|algorithm)>"
+)
+
+
+def _sniff_header(head: bytes) -> str | None:
+    """``.h`` is shared by C and C++."""
+    return "cpp" if _CPP_HINTS.search(head) else "c"
+
+
+def _sniff_ts(head: bytes) -> str | None:
+    """``.ts`` is also used for Qt translations (XML) and MPEG transport streams."""
+    if b"\0" in head or head[:1] == b"\x47" and head[188:189] == b"\x47":
+        return None
+    if head.lstrip().startswith((b"<?xml", b"<!DOCTYPE")):
+        return None
+    return "typescript"
+
+
+# Extensions whose language is decided by sniffing a sample of files.
+_SNIFFERS: dict[str, Callable[[bytes], str | None]] = {
+    ".h": _sniff_header,
+    ".ts": _sniff_ts,
+}
+
+
+def file_extension(name: str) -> str:
+    """Lower-cased extension of a file *name*; ``""`` for none and dotfiles."""
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
+@dataclass(frozen=True)
+class LanguageShare:
+    """Aggregated statistics for one detected language."""
+
+    name: str
+    files: int
+    bytes: int
+    percent: float  # share of all source bytes (of files, if sizes are unknown)
+
+
+class LanguageStats:
+    """Accumulate per-file observations and rank languages by size.
 
-def detect_languages(files: list[Path], min_files: int = MIN_FILES) -> list[str]:
-    """Detect project languages by counting file extensions.
+    Each ``add`` costs two counter updates keyed by extension; extensions are
+    mapped to languages once per extension at the end, so aggregation stays
+    linear and cheap over millions of files.  Ambiguous extensions
+    (``_SNIFFERS``) and extensionless scripts are resolved by reading the
+    first few KB of a bounded, deterministic sample of files (the ones
+    whose path hashes lowest), independent of walk order.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self._root = root
+        self._files: Counter[str] = Counter()
+        self._bytes: Counter[str] = Counter()
+        self._samples: dict[str, list[tuple[int, str, int]]] = {}
+
+    def add(self, path: str, size: int = 0) -> None:
+        """Record a file by its ``/``-separated path (relative to *root*) and size."""
+        name = path.rpartition("/")[2]
+        dot = name.rfind(".")
+        ext = name[dot:].lower() if dot > 0 else ""
+        self._files[ext] += 1
+        self._bytes[ext] += size
+        if ext in _SNIFFERS:
+            self._sample(ext, path, size, _SAMPLES_PER_EXT)
+        elif not ext and not name.startswith("."):
+            self._sample("", path, size, _SHEBANG_SAMPLES)
+
+    @staticmethod
+    def needs_paths(ext: str) -> bool:
+        """Whether files with *ext* must be recorded one by one with :meth:`add`.
+
+        Their language is decided by sampling file contents; other
+        extensions can be recorded in bulk with :meth:`add_counts`.
+        """
+        return not ext or ext in _SNIFFERS
+
+    def add_counts(self, ext: str, files: int, size: int) -> None:
+        """Record pre-aggregated totals for an extension (see :meth:`needs_paths`)."""
+        self._files[ext] += files
+        self._bytes[ext] += size
+
+    def _sample(self, key: str, path: str, size: int, k: int) -> None:
+        # Bottom-k by path hash: a max-heap (negated keys) of the k lowest.
+        heap = self._samples.setdefault(key, [])
+        neg = -zlib.crc32(path.encode("utf-8", "surrogateescape"))
+        if len(heap) < k:
+            heapq.heappush(heap, (neg, path, size))
+        elif neg > heap[0][0]:
+            heapq.heapreplace(heap, (neg, path, size))
+
+    def totals(self) -> dict[str, tuple[int, int]]:
+        """Return language → (files, bytes), resolving sampled extensions."""
+        totals: dict[str, list[float]] = {}
+
+        def credit(lang: str | None, files: float, size: float) -> None:
+            if lang:
+                acc = totals.setdefault(lang, [0.0, 0.0])
+                acc[0] += files
+                acc[1] += size
+
+        for ext, count in self._files.items():
+            size = self._bytes[ext]
+            samples = self._samples.get(ext)
+            if ext in _SNIFFERS and samples:
+                sniffer = _SNIFFERS[ext]
+                votes = Counter(
+                    sniffer(head) if (head := self._read(p, _SNIFF_BYTES)) is not None
+                    else EXTENSION_MAP.get(ext)
+                    for _, p, _ in samples
+                )
+                for lang, n in votes.items():
+                    credit(lang, count * n / len(samples), size * n / len(samples))
+            elif not ext and samples:
+                # Extrapolate from the sampled scripts to all extensionless files.
+                scale = count / len(samples)
+                for _, p, file_size in samples:
+                    credit(self._shebang(p), scale, file_size * scale)
+            else:
+                credit(EXTENSION_MAP.get(ext), count, size)
+
+        return {lang: (round(f), round(b)) for lang, (f, b) in totals.items()}
+
+    def breakdown(self, min_files: int = MIN_FILES) -> list[LanguageShare]:
+        """Languages with at least *min_files* files, largest first."""
+        totals = {
+            lang: fb for lang, fb in self.totals().items() if fb[0] >= min_files
+        }
+        all_bytes = sum(b for _, b in totals.values())
+        all_files = sum(f for f, _ in totals.values())
+        shares = [
+            LanguageShare(
+                name=lang,
+                files=files,
+                bytes=size,
+                percent=round(
+                    100 * (size / all_bytes if all_bytes else files / all_files), 1
+                ),
+            )
+            for lang, (files, size) in totals.items()
+        ]
+        shares.sort(key=lambda s: (-s.bytes, -s.files, s.name))
+        return shares
+
+    def languages(self, min_files: int = MIN_FILES, weight: Weight = "bytes") -> list[str]:
+        """Detected language names, most significant first."""
+        shares = self.breakdown(min_files)
+        if weight == "files":
+            shares.sort(key=lambda s: (-s.files, s.name))
+        return [s.name for s in shares]
+
+    def _read(self, path: str, limit: int) -> bytes | None:
+        full = self._root / path if self._root is not None else Path(path)
+        try:
+            with open(full, "rb") as f:
+                return f.read(limit)
+        except OSError:
+            return None
+
+    def _shebang(self, path: str) -> str | None:
+        head = self._read(path, 128)
+        if not head or not head.startswith(b"#!"):
+            return None
+        words = head[2:].split(b"\n", 1)[0].decode("ascii", "replace").split()
+        if not words:
+            return None
+        interpreter = os.path.basename(words[0])
+        if interpreter == "env":
+            args = [w for w in words[1:] if not w.startswith("-")]
+            if not args:
+                return None
+            interpreter = args[0]
+        lang = SHEBANG_MAP.get(interpreter)
+        if lang is None:
+            # "python3.12" → "python3"
+            lang = SHEBANG_MAP.get(interpreter.rstrip("0123456789.").rstrip("-"))
+        return lang
+
+
+def detect_languages(
+    files: Iterable[str | os.PathLike[str]],
+    min_files: int = MIN_FILES,
+    *,
+    weight: Weight = "files",
+) -> list[str]:
+    """Detect project languages from file paths.
 
     Args:
-        files: List of file paths.
+        files: File paths; any iterable works and is consumed lazily, e.g.
+            ``(e.path for e in ProjectWalker(root) if not e.is_dir)``.
         min_files: Minimum number of files to consider a language.
+        weight: Rank by file count (default) or by total size, which is
+            read with ``os.stat`` for each path.
 
     Returns:
-        List of detected language names, sorted by frequency (most common first).
+        List of detected language names, most significant first.
     """
-    counter: Counter[str] = Counter()
+    stats = LanguageStats()
     for f in files:
-        suffix = f.suffix.lower()
-        lang = EXTENSION_MAP.get(suffix)
-        if lang:
-            counter[lang] += 1
-
-    return [lang for lang, count in counter.most_common() if count >= min_files]
+        path = os.fspath(f).replace(os.sep, "/")
+        size = 0
+        if weight == "bytes":
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                pass
+        stats.add(path, size)
+    return stats.languages(min_files, weight)
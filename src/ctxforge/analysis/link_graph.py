@@ -0,0 +1,208 @@
+"""Link graph over markdown documents, ranked with PageRank."""
+
+from __future__ import annotations
+
+import posixpath
+import re
+from array import array
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+
+GRAPH_FILE = "link-graph.json"
+GRAPH_VERSION = 1
+
+# Only this much of each file is read for headings and links, so a stray
+# multi-megabyte markdown file cannot dominate detection time.
+_READ_LIMIT = 256 * 1024
+
+_HEADING = re.compile(rb"^#{1,6}[ \t]", re.MULTILINE)
+# Inline links/images ``[text](target)`` and reference definitions ``[id]: target``.
+_LINK = re.compile(
+    rb"\]\(\s*<?([^)\s>]+)|^[ \t]{0,3}\[[^\]]+\]:[ \t]*<?([^\s>]+)", re.MULTILINE
+)
+_SCHEME = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+@dataclass(slots=True)
+class DocLinks:
+    """What one markdown file contributes to the graph."""
+
+    mtime_ns: int
+    size: int
+    headings: int = 0
+    targets: list[str] = field(default_factory=list)  # project-relative, deduplicated
+
+
+@dataclass
+class DocGraph:
+    """Parsed documents with their link graph and PageRank scores."""
+
+    docs: dict[str, DocLinks]
+    graph: LinkGraph
+    ranks: dict[str, float]  # sums to 1 over all documents
+
+
+def parse_markdown(source: str, text: bytes) -> DocLinks:
+    """Count headings and resolve local link targets of the file *source*.
+
+    Links are resolved relative to the directory of *source* (or to the
+    project root for ``/``-prefixed targets); URLs, pure anchors and paths
+    leaving the project are dropped.  ``mtime_ns`` and ``size`` are left 0.
+    """
+    base = posixpath.dirname(source)
+    targets: dict[str, None] = {}
+    for m in _LINK.finditer(text):
+        raw = (m.group(1) or m.group(2)).decode("utf-8", "replace")
+        if _SCHEME.match(raw) or raw.startswith("#"):
+            continue
+        raw = raw.split("#", 1)[0].split("?", 1)[0]
+        if not raw:
+            continue
+        if raw.startswith("/"):
+            target = posixpath.normpath(raw.lstrip("/"))
+        else:
+            target = posixpath.normpath(posixpath.join(base, raw))
+        if target != source and not target.startswith("../") and target != "..":
+            targets[target] = None
+    return DocLinks(0, 0, len(_HEADING.findall(text)), list(targets))
+
+
+class LinkGraph:
+    """Directed graph in compressed sparse row form.
+
+    Node *i*'s out-neighbours are ``targets[offsets[i]:offsets[i + 1]]``;
+    links to files outside the node set are dropped, so memory is linear
+    in the number of edges.
+    """
+
+    def __init__(self, nodes: list[str], offsets: array[int], targets: array[int]) -> None:
+        self.nodes = nodes
+        self._offsets = offsets
+        self._targets = targets
+
+    @classmethod
+    def from_docs(cls, docs: Mapping[str, DocLinks]) -> LinkGraph:
+        return cls.from_edges({path: doc.targets for path, doc in docs.items()})
+
+    @classmethod
+    def from_edges(cls, edges: Mapping[str, Iterable[str]]) -> LinkGraph:
+        """Graph over the keys of *edges*, each mapped to its out-neighbours."""
+        nodes = sorted(edges)
+        ids = {path: i for i, path in enumerate(nodes)}
+        offsets = array("I", [0])
+        targets = array("I")
+        for path in nodes:
+            targets.extend(ids[t] for t in edges[path] if t in ids)
+            offsets.append(len(targets))
+        return cls(nodes, offsets, targets)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._targets)
+
+    def in_degrees(self) -> dict[str, int]:
+        counts = [0] * len(self.nodes)
+        for j in self._targets:
+            counts[j] += 1
+        return dict(zip(self.nodes, counts))
+
+    def pagerank(
+        self, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100
+    ) -> dict[str, float]:
+        """Power-iteration PageRank; dangling nodes spread their rank evenly."""
+        n = len(self.nodes)
+        if n == 0:
+            return {}
+        offsets, targets = self._offsets, self._targets
+        dangling = [i for i in range(n) if offsets[i] == offsets[i + 1]]
+        rank = [1.0 / n] * n
+        for _ in range(max_iter):
+            leaked = sum(rank[i] for i in dangling)
+            base = (1.0 - damping + damping * leaked) / n
+            new = [base] * n
+            for i in range(n):
+                start, end = offsets[i], offsets[i + 1]
+                if start != end:
+                    share = damping * rank[i] / (end - start)
+                    for j in targets[start:end]:
+                        new[j] += share
+            delta = sum(abs(a - b) for a, b in zip(new, rank))
+            rank = new
+            if delta < tol:
+                break
+        return dict(zip(self.nodes, rank))
+
+
+def build_doc_graph(
+    root: Path, files: Iterable[tuple[str, int, int]], *, use_cache: bool = False
+) -> DocGraph:
+    """Parse markdown *files* and rank them by how the others link to them.
+
+    Args:
+        root: Project root directory.
+        files: ``(path, mtime_ns, size)`` for each document, paths relative
+            to *root* and ``/``-separated.
+        use_cache: Reuse parses of files whose mtime and size are unchanged,
+            and the ranks when no file changed, from ``.ctxforge/cache/``.
+            The cache is written back when the project has a ``.ctxforge/``
+            directory.
+
+    Returns:
+        A :class:`DocGraph`; files that cannot be read have no links.
+    """
+    path = cache_path(root, GRAPH_FILE)
+    cached: dict[str, DocLinks] = {}
+    cached_ranks: dict[str, float] | None = None
+    if use_cache and (data := read_cache(path, GRAPH_VERSION)) is not None:
+        try:
+            for rel, (mtime_ns, size, headings, targets) in data["docs"].items():
+                cached[rel] = DocLinks(mtime_ns, size, headings, targets)
+            cached_ranks = dict(data["ranks"])
+        except (KeyError, TypeError, ValueError):
+            cached, cached_ranks = {}, None
+
+    docs: dict[str, DocLinks] = {}
+    changed = False
+    for rel, mtime_ns, size in files:
+        doc = cached.get(rel)
+        if doc is None or doc.mtime_ns != mtime_ns or doc.size != size:
+            doc = parse_markdown(rel, _read_head(root / rel))
+            doc.mtime_ns, doc.size = mtime_ns, size
+            changed = True
+        docs[rel] = doc
+
+    graph = LinkGraph.from_docs(docs)
+    if not changed and cached_ranks is not None and cached_ranks.keys() == docs.keys():
+        ranks = cached_ranks
+    else:
+        ranks = graph.pagerank()
+        if use_cache and (root / ".ctxforge").is_dir():
+            # Files modified within the racy window are parsed again next time.
+            cutoff = racy_cutoff()
+            write_cache(
+                path,
+                {
+                    "docs": {
+                        rel: [d.mtime_ns, d.size, d.headings, d.targets]
+                        for rel, d in docs.items()
+                        if d.mtime_ns < cutoff
+                    },
+                    "ranks": ranks,
+                },
+                GRAPH_VERSION,
+            )
+    return DocGraph(docs, graph, ranks)
+
+
+def _read_head(path: Path) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read(_READ_LIMIT)
+    except OSError:
+        return b""
@@ -0,0 +1,98 @@
+"""Persistent directory-listing index that makes repeated scans incremental."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+
+INDEX_FILE = "scan-index.json"
+INDEX_VERSION = 3
+
+
+@dataclass(slots=True)
+class DirListing:
+    """Raw contents of one directory, before any exclude rules are applied."""
+
+    mtime_ns: int
+    # (name, size, mtime_ns, generated); generated is None until sniffed
+    files: list[tuple[str, int, int, bool | None]] = field(default_factory=list)
+    dirs: list[str] = field(default_factory=list)
+
+
+class ScanIndex:
+    """Directory listings keyed by path relative to the project root.
+
+    A listing is reused while its directory mtime is unchanged, so a warm
+    scan costs one ``stat`` per directory instead of a full ``readdir`` plus
+    one ``stat`` per file.  File sizes and mtimes are refreshed whenever
+    their directory is re-listed; a file's generated flag is carried over
+    while its size and mtime match.
+    """
+
+    def __init__(self, path: Path, dirs: dict[str, DirListing] | None = None) -> None:
+        self._path = path
+        self._old = dirs or {}
+        self._new: dict[str, DirListing] = {}
+
+    @classmethod
+    def load(cls, root: Path) -> ScanIndex:
+        """Load the index for *root*, or start an empty one."""
+        path = cache_path(root, INDEX_FILE)
+        data = read_cache(path, INDEX_VERSION)
+        dirs: dict[str, DirListing] = {}
+        if data is not None:
+            try:
+                for rel, (mtime_ns, files, subdirs) in data["dirs"].items():
+                    dirs[rel] = DirListing(
+                        mtime_ns, [(n, s, m, g) for n, s, m, g in files], subdirs
+                    )
+            except (KeyError, TypeError, ValueError):
+                dirs = {}
+        return cls(path, dirs)
+
+    def lookup(self, rel: str, mtime_ns: int) -> DirListing | None:
+        """Return the cached listing for *rel* if its mtime still matches."""
+        listing = self._old.get(rel)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            return listing
+        return None
+
+    def previous(self, rel: str) -> DirListing | None:
+        """Return the cached listing for *rel*, whatever its mtime."""
+        return self._old.get(rel)
+
+    def forget(self, rels: Iterable[str] | None = None) -> None:
+        """Drop the listings of *rels* (all if None) so the next scan re-lists them.
+
+        Needed when files change in place, which leaves their directory's
+        mtime untouched.
+        """
+        if rels is None:
+            self._old.clear()
+            self._new.clear()
+            return
+        for rel in rels:
+            self._old.pop(rel, None)
+            self._new.pop(rel, None)
+
+    def record(self, rel: str, listing: DirListing) -> None:
+        """Record the listing seen for *rel* during the current scan."""
+        self._new[rel] = listing
+
+    def save(self, prune: bool = True) -> None:
+        """Persist the listings recorded during this scan.
+
+        With *prune*, directories not visited this time (deleted or now
+        excluded) drop out; pass False after a scan that stopped early.
+        """
+        cutoff = racy_cutoff()
+        listings = {**self._old, **self._new} if not prune else self._new
+        dirs = {
+            rel: [lst.mtime_ns, lst.files, lst.dirs]
+            for rel, lst in listings.items()
+            if lst.mtime_ns < cutoff
+        }
+        write_cache(self._path, {"dirs": dirs}, INDEX_VERSION)
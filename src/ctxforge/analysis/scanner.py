@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+import os
+import re
+import subprocess
+import sys
+import time
+from array import array
+from collections import Counter
+from collections.abc import Collection, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from ctxforge.analysis.lang_detector import detect_languages
+from ctxforge.analysis.ignore import IgnoreMatcher, IgnoreRules
+from ctxforge.analysis.lang_detector import LanguageStats, file_extension
+from ctxforge.analysis.scan_index import DirListing, ScanIndex
+from ctxforge.analysis.vendor_detector import is_generated, is_vendored_dir
 
 # Default patterns to exclude from scanning
 DEFAULT_EXCLUDES = frozenset(
@@ -28,6 +40,9 @@ DEFAULT_EXCLUDES = frozenset(
     }
 )
 
+# Repository-local ignore file (not shared through .gitignore).
+_GIT_EXCLUDE = Path(".git") / "info" / "exclude"
+
 
 @dataclass
 class ScanReport:
@@ -36,60 +51,700 @@ class ScanReport:
     project_name: str = ""
     dir_tree: list[str] = field(default_factory=list)
     languages: list[str] = field(default_factory=list)
+    language_shares: dict[str, float] = field(default_factory=dict)  # % of source bytes
     config_files: list[str] = field(default_factory=list)
+    file_count: int = 0
+    generated_files: int = 0  # counted in file_count, left out of language stats
+    vendored_dirs: list[str] = field(default_factory=list)  # pruned, not walked
+    partial: bool = False  # a ScanLimits bound stopped the walk early
+    files: FileTable | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_table(cls, root: Path, table: FileTable) -> ScanReport:
+        """Report on the files of *table*, found under *root*.
+
+        Vendored directories and ``partial`` are left to the caller, who
+        knows how the table was filled.
+        """
+        report = cls(project_name=root.name, files=table)
+        report.dir_tree = [os.path.join(*d.split("/")) for d in table.dirs(max_depth=3)]
+        report.file_count = len(table)
+        report.generated_files = table.generated_count()
+
+        # Detect languages, weighted by size
+        shares = table.language_stats(root).breakdown()
+        report.languages = [s.name for s in shares]
+        report.language_shares = {s.name: s.percent for s in shares}
+
+        # Find config files
+        report.config_files = _find_config_files(root)
+        return report
+
+
+@dataclass(frozen=True, slots=True)
+class ScanEntry:
+    """A file or directory yielded by :class:`ProjectWalker`."""
+
+    path: str  # relative to the project root, "/"-separated
+    size: int = 0  # bytes; 0 for directories
+    is_dir: bool = False
+    generated: bool = False  # lockfile, minified bundle, codegen output
+    mtime_ns: int = 0  # 0 for directories
+
+    @property
+    def name(self) -> str:
+        return self.path.rpartition("/")[2]
+
+    @property
+    def depth(self) -> int:
+        """1 for entries directly under the root."""
+        return self.path.count("/") + 1
+
+
+@dataclass(frozen=True)
+class ScanLimits:
+    """Bounds that stop a walk early.  ``None`` means unlimited."""
+
+    max_files: int | None = None
+    max_depth: int | None = None  # deepest entry depth reported
+    max_seconds: float | None = None  # wall-clock budget
+
+
+class FileTable:
+    """Column-oriented store of scanned files, a few dozen bytes per file.
+
+    Directories form a trie: each has an id, its parent's id and an
+    interned name, and is always numbered after its parent.  Files are rows
+    across parallel ``array`` columns (directory id, interned extension id,
+    size, mtime, generated flag) with their names packed into one buffer,
+    so no path string or object is kept per file.  Aggregations are single
+    passes over the columns; paths are rebuilt from the trie on demand.
+    """
+
+    def __init__(self) -> None:
+        # Directory trie; id 0 is the project root.
+        self._dir_ids: dict[str, int] = {"": 0}
+        self._dir_parent = array("i", [-1])
+        self._dir_name: list[str] = [""]
+        self._dir_depth = array("H", [0])
+        # Interned extensions, indexed by extension id.
+        self._ext_ids: dict[str, int] = {}
+        self.extensions: list[str] = []
+        # File columns, indexed by row.
+        self.dir_id = array("I")
+        self.ext_id = array("I")
+        self.size = array("Q")
+        self.mtime_ns = array("q")
+        self.generated = bytearray()
+        self._names = bytearray()
+        self._name_ends = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the file columns."""
+        columns = (self.dir_id, self.ext_id, self.size, self.mtime_ns, self._name_ends)
+        fixed = sum(len(c) * c.itemsize for c in columns)
+        return fixed + len(self.generated) + len(self._names)
+
+    def add(self, entry: ScanEntry) -> None:
+        """Append a walker entry; directories only extend the trie."""
+        if entry.is_dir:
+            self._dir(entry.path)
+            return
+        dirname, _, name = entry.path.rpartition("/")
+        self._append(
+            self._dir(dirname),
+            name.encode("utf-8", "surrogateescape"),
+            file_extension(name),
+            entry.size,
+            entry.mtime_ns,
+            entry.generated,
+        )
+
+    def subtree(self, path: str) -> FileTable:
+        """The files under the directory *path*, with paths relative to it."""
+        table = FileTable()
+        top = self._dir_ids.get(path)
+        if top is None:
+            return table
+        # Parents are numbered before their children, so one pass finds
+        # every directory beneath *top*.
+        skip = len(path) + 1 if path else 0
+        new_ids = {top: 0}
+        for dir_id in range(top + 1, len(self._dir_name)):
+            if self._dir_parent[dir_id] in new_ids:
+                new_ids[dir_id] = table._dir(self.dir_path(dir_id)[skip:])
+        start = 0
+        for row, end in enumerate(self._name_ends):
+            new_id = new_ids.get(self.dir_id[row])
+            if new_id is not None:
+                table._append(
+                    new_id,
+                    bytes(self._names[start:end]),
+                    self.extensions[self.ext_id[row]],
+                    self.size[row],
+                    self.mtime_ns[row],
+                    bool(self.generated[row]),
+                )
+            start = end
+        return table
 
+    def _append(
+        self, dir_id: int, name: bytes, ext: str, size: int, mtime_ns: int, generated: bool
+    ) -> None:
+        ext_id = self._ext_ids.get(ext)
+        if ext_id is None:
+            ext_id = self._ext_ids[ext] = len(self.extensions)
+            self.extensions.append(ext)
+        self.dir_id.append(dir_id)
+        self.ext_id.append(ext_id)
+        self.size.append(size)
+        self.mtime_ns.append(mtime_ns)
+        self.generated.append(generated)
+        self._names += name
+        self._name_ends.append(len(self._names))
 
-def scan_project(root: Path, excludes: frozenset[str] | None = None) -> ScanReport:
+    def _dir(self, path: str) -> int:
+        dir_id = self._dir_ids.get(path)
+        if dir_id is None:
+            parent_path, _, name = path.rpartition("/")
+            parent = self._dir(parent_path)
+            dir_id = self._dir_ids[path] = len(self._dir_name)
+            self._dir_parent.append(parent)
+            self._dir_name.append(sys.intern(name))
+            self._dir_depth.append(self._dir_depth[parent] + 1)
+        return dir_id
+
+    # ── Reconstruction ──────────────────────────────────────────────────────
+
+    def name(self, row: int) -> str:
+        start = self._name_ends[row - 1] if row else 0
+        return self._names[start : self._name_ends[row]].decode("utf-8", "surrogateescape")
+
+    def dir_path(self, dir_id: int) -> str:
+        """``/``-separated path of a directory (``""`` for the root)."""
+        parts: list[str] = []
+        while dir_id > 0:
+            parts.append(self._dir_name[dir_id])
+            dir_id = self._dir_parent[dir_id]
+        return "/".join(reversed(parts))
+
+    def path(self, row: int) -> str:
+        """``/``-separated path of a file, relative to the project root."""
+        dirname = self.dir_path(self.dir_id[row])
+        return f"{dirname}/{self.name(row)}" if dirname else self.name(row)
+
+    def paths(self) -> Iterator[str]:
+        for row in range(len(self)):
+            yield self.path(row)
+
+    def find(self, names: Collection[str]) -> Iterator[str]:
+        """Paths of the files named one of *names*, in row order."""
+        wanted = {n.encode("utf-8", "surrogateescape") for n in names}
+        start = 0
+        for row, end in enumerate(self._name_ends):
+            if bytes(self._names[start:end]) in wanted:
+                yield self.path(row)
+            start = end
+
+    def select(
+        self, extensions: Collection[str], include_generated: bool = False
+    ) -> Iterator[tuple[str, int, int]]:
+        """``(path, mtime_ns, size)`` of the files with one of *extensions*."""
+        wanted = {i for i, ext in enumerate(self.extensions) if ext in extensions}
+        for row, ext_id in enumerate(self.ext_id):
+            if ext_id in wanted and (include_generated or not self.generated[row]):
+                yield self.path(row), self.mtime_ns[row], self.size[row]
+
+    def dirs(self, max_depth: int | None = None) -> list[str]:
+        """Directory paths (root excluded), sorted component-wise."""
+        paths = [
+            self.dir_path(d)
+            for d in range(1, len(self._dir_name))
+            if max_depth is None or self._dir_depth[d] <= max_depth
+        ]
+        paths.sort(key=lambda p: p.split("/"))
+        return paths
+
+    # ── Aggregations ────────────────────────────────────────────────────────
+
+    def generated_count(self) -> int:
+        return self.generated.count(1)
+
+    def extension_totals(
+        self, include_generated: bool = False
+    ) -> dict[str, tuple[int, int]]:
+        """Extension → (files, bytes)."""
+        files = [0] * len(self.extensions)
+        sizes = [0] * len(self.extensions)
+        for ext_id, size, generated in zip(self.ext_id, self.size, self.generated):
+            if include_generated or not generated:
+                files[ext_id] += 1
+                sizes[ext_id] += size
+        return {
+            ext: (files[i], sizes[i]) for i, ext in enumerate(self.extensions) if files[i]
+        }
+
+    def language_stats(self, root: Path | None = None) -> LanguageStats:
+        """Language statistics over the non-generated files.
+
+        Extensions are credited in bulk; only rows whose extension needs
+        content sampling are visited individually.
+        """
+        stats = LanguageStats(root)
+        sampled: set[int] = set()
+        for ext, (files, size) in self.extension_totals().items():
+            if LanguageStats.needs_paths(ext):
+                sampled.add(self._ext_ids[ext])
+            else:
+                stats.add_counts(ext, files, size)
+        if sampled:
+            for row, ext_id in enumerate(self.ext_id):
+                if ext_id in sampled and not self.generated[row]:
+                    stats.add(self.path(row), self.size[row])
+        return stats
+
+    def size_histogram(self) -> list[int]:
+        """File counts per power-of-two size class.
+
+        Bucket *k* counts files of ``2**(k-1)`` to ``2**k - 1`` bytes;
+        bucket 0 counts empty files.
+        """
+        counts = Counter(map(int.bit_length, self.size))
+        return [counts.get(k, 0) for k in range(max(counts, default=-1) + 1)]
+
+    def dir_totals(self, max_depth: int | None = None) -> dict[str, tuple[int, int]]:
+        """Directory → (files, bytes) for everything beneath it, recursively.
+
+        The root is ``""``.  Totals are summed per directory in one pass
+        over the rows, then folded into parents from the deepest id up.
+        """
+        n = len(self._dir_name)
+        files = [0] * n
+        sizes = [0] * n
+        for dir_id, size in zip(self.dir_id, self.size):
+            files[dir_id] += 1
+            sizes[dir_id] += size
+        for dir_id in range(n - 1, 0, -1):
+            parent = self._dir_parent[dir_id]
+            files[parent] += files[dir_id]
+            sizes[parent] += sizes[dir_id]
+        return {
+            self.dir_path(d): (files[d], sizes[d])
+            for d in range(n)
+            if max_depth is None or self._dir_depth[d] <= max_depth
+        }
+
+
+def scan_project(
+    root: Path,
+    excludes: frozenset[str] | None = None,
+    *,
+    use_cache: bool = False,
+    ignore_patterns: list[str] | None = None,
+    respect_gitignore: bool = True,
+    use_git: bool = False,
+    workers: int = 1,
+    limits: ScanLimits | None = None,
+    skip_vendored: bool = True,
+) -> ScanReport:
     """Scan a project directory and produce a structured report.
 
     Only collects raw data: directory tree, languages, config files, entry points.
     Deeper analysis (frameworks, architecture, conventions) is left to LLM in P2.
+
+    Entries are streamed from :class:`ProjectWalker` into a compact
+    :class:`FileTable` (``report.files``) that all statistics are computed
+    from.  See :class:`ProjectWalker` for the arguments.  When *limits*
+    stop the walk early the report is marked ``partial``.
     """
-    if excludes is None:
-        excludes = DEFAULT_EXCLUDES
+    walker = ProjectWalker(
+        root,
+        excludes,
+        use_cache=use_cache,
+        ignore_patterns=ignore_patterns,
+        respect_gitignore=respect_gitignore,
+        use_git=use_git,
+        workers=workers,
+        limits=limits,
+        skip_vendored=skip_vendored,
+    )
+    table = FileTable()
+    for entry in walker:
+        table.add(entry)
 
-    report = ScanReport()
-    report.project_name = root.name
+    report = ScanReport.from_table(root, table)
+    report.vendored_dirs = sorted(walker.vendored)
+    report.partial = walker.truncated
+    return report
 
-    # Collect all files (respecting excludes)
-    all_files = _collect_files(root, excludes)
 
-    # Build directory tree (relative paths)
-    report.dir_tree = _build_dir_tree(root, excludes)
+# A directory still to be listed: (absolute path, parts relative to root,
+# ignore rules in effect for its entries).
+_Task = tuple[str, tuple[str, ...], IgnoreMatcher]
 
-    # Detect languages
-    report.languages = detect_languages(all_files)
+# Result of reading one directory: raw listing + its .gitignore rules, if any.
+_DirRead = tuple[DirListing, IgnoreRules | None]
 
-    # Find config files
-    report.config_files = _find_config_files(root)
 
-    return report
+class ProjectWalker:
+    """Lazily walk a project tree, yielding :class:`ScanEntry` objects.
 
+    The tree is walked once; excluded and ignored directories are pruned
+    before they are entered, so walk time depends only on the part of the
+    tree that is actually reported.  Nothing is accumulated between
+    entries, so consumers can stop at any point.  After iteration,
+    ``truncated`` tells whether *limits* cut the walk short.
 
-def _collect_files(root: Path, excludes: frozenset[str]) -> list[Path]:
-    """Collect all files under root, skipping excluded directories."""
-    files: list[Path] = []
-    for item in root.rglob("*"):
-        if any(part in excludes for part in item.parts):
-            continue
-        if item.is_file():
-            files.append(item)
-    return files
-
-
-def _build_dir_tree(root: Path, excludes: frozenset[str], max_depth: int = 3) -> list[str]:
-    """Build a list of directory paths relative to root, up to max_depth."""
-    dirs: list[str] = []
-    for item in sorted(root.rglob("*")):
-        if not item.is_dir():
-            continue
-        rel = item.relative_to(root)
-        if any(part in excludes for part in rel.parts):
-            continue
-        if len(rel.parts) > max_depth:
-            continue
-        dirs.append(str(rel))
-    return dirs
+    Args:
+        root: Project root directory.
+        excludes: Directory names to skip. Defaults to DEFAULT_EXCLUDES.
+        use_cache: Reuse directory listings from ``.ctxforge/cache/`` for
+            directories whose mtime is unchanged.  The refreshed index is
+            written back when the project has a ``.ctxforge/`` directory.
+        ignore_patterns: Extra gitignore-style patterns (``[scan].exclude``
+            in project.toml); they take precedence over ``.gitignore`` files.
+        respect_gitignore: Honour nested ``.gitignore`` files and
+            ``.git/info/exclude``.
+        use_git: In a git checkout, list tracked files from the git index
+            instead of walking the filesystem.  Untracked files are not
+            reported in this mode.  Falls back to walking if git fails.
+        workers: Number of threads listing directories concurrently.  Values
+            above 1 help on high-latency storage (NFS, overlay filesystems);
+            the entries are the same as with a serial walk, in another order.
+        limits: Stop after a number of files, below a depth, or after a
+            wall-clock budget.
+        skip_vendored: Prune vendored trees (``vendor/``, ``third_party/``,
+            ...) and flag generated files (lockfiles, minified bundles,
+            codegen output) on each entry.  Pruned paths are collected in
+            ``vendored``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        excludes: frozenset[str] | None = None,
+        *,
+        use_cache: bool = False,
+        ignore_patterns: list[str] | None = None,
+        respect_gitignore: bool = True,
+        use_git: bool = False,
+        workers: int = 1,
+        limits: ScanLimits | None = None,
+        skip_vendored: bool = True,
+    ) -> None:
+        self._root = root
+        self._excludes = DEFAULT_EXCLUDES if excludes is None else excludes
+        self._use_cache = use_cache
+        self._overrides = IgnoreRules(ignore_patterns or ())
+        self._respect_gitignore = respect_gitignore
+        self._use_git = use_git
+        self._workers = workers
+        self._limits = limits or ScanLimits()
+        self._skip_vendored = skip_vendored
+        self.truncated = False
+        self.vendored: list[str] = []
+        self._files = 0
+        self._deadline: float | None = None
+        self._halted = False
+
+    def __iter__(self) -> Iterator[ScanEntry]:
+        self.truncated = False
+        self.vendored = []
+        self._halted = False
+        self._files = 0
+        if self._limits.max_seconds is not None:
+            self._deadline = time.monotonic() + self._limits.max_seconds
+
+        tracked = _git_tracked_files(self._root) if self._use_git else None
+        if tracked is not None:
+            yield from self._iter_paths(tracked)
+            return
+
+        index = ScanIndex.load(self._root) if self._use_cache else None
+        finished = False
+        try:
+            yield from self._iter_tree(index)
+            finished = True
+        finally:
+            if index is not None and (self._root / ".ctxforge").is_dir():
+                # Keep listings of directories a cut-short walk never reached.
+                index.save(prune=finished and not self.truncated)
+
+    # ── Limits ──────────────────────────────────────────────────────────────
+
+    def _halt(self) -> bool:
+        """Stop the walk for good; always marks the result as truncated."""
+        self._halted = True
+        self.truncated = True
+        return True
+
+    def _out_of_time(self) -> bool:
+        return (
+            self._deadline is not None
+            and time.monotonic() >= self._deadline
+            and self._halt()
+        )
+
+    def _file_budget_spent(self) -> bool:
+        max_files = self._limits.max_files
+        return max_files is not None and self._files >= max_files and self._halt()
+
+    def _below_max_depth(self, depth: int) -> bool:
+        """Whether entries at *depth* may be reported."""
+        max_depth = self._limits.max_depth
+        if max_depth is not None and depth > max_depth:
+            self.truncated = True
+            return False
+        return True
+
+    # ── Filesystem walk ─────────────────────────────────────────────────────
+
+    def _iter_tree(self, index: ScanIndex | None) -> Iterator[ScanEntry]:
+        matcher = IgnoreMatcher(overrides=self._overrides)
+        if self._respect_gitignore:
+            matcher = matcher.push("", IgnoreRules.from_file(self._root / _GIT_EXCLUDE))
+        root_task: _Task = (str(self._root), (), matcher)
+
+        if self._workers <= 1:
+            stack = [root_task]
+            while stack and not self._out_of_time():
+                task = stack.pop()
+                children = yield from self._expand(task, self._read(task, index), index)
+                stack.extend(children)
+            return
+
+        # Directory reads (the only I/O) run on a bounded pool; filtering,
+        # index updates and yielding stay on the consuming thread.
+        with ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="ctxforge-scan"
+        ) as pool:
+            pending: dict[Future[_DirRead | None], _Task] = {
+                pool.submit(self._read, root_task, index): root_task
+            }
+            try:
+                while pending and not self._out_of_time():
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = pending.pop(future)
+                        children = yield from self._expand(task, future.result(), index)
+                        for child in children:
+                            pending[pool.submit(self._read, child, index)] = child
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _read(self, task: _Task, index: ScanIndex | None) -> _DirRead | None:
+        return _read_dir(
+            task[0], "/".join(task[1]), index, self._respect_gitignore, self._skip_vendored
+        )
+
+    def _expand(
+        self, task: _Task, result: _DirRead | None, index: ScanIndex | None
+    ) -> Generator[ScanEntry, None, list[_Task]]:
+        """Yield the entries of one directory read; return subdirectories to walk."""
+        if result is None or self._halted:
+            return []
+        path, rel_parts, matcher = task
+        listing, rules = result
+        rel = "/".join(rel_parts)
+        if index is not None:
+            index.record(rel, listing)
+        if rules is not None:
+            matcher = matcher.push(rel, rules)
+        prefix = rel + "/" if rel else ""
+        depth = len(rel_parts) + 1
+        if not self._below_max_depth(depth):
+            return []
+
+        for name, size, mtime_ns, generated in listing.files:
+            if matcher and matcher.ignored(prefix + name, is_dir=False):
+                continue
+            if self._file_budget_spent():
+                return []
+            self._files += 1
+            generated = self._skip_vendored and bool(generated)
+            yield ScanEntry(prefix + name, size, generated=generated, mtime_ns=mtime_ns)
+
+        children: list[_Task] = []
+        for name in listing.dirs:
+            if name in self._excludes:
+                continue
+            if matcher and matcher.ignored(prefix + name, is_dir=True):
+                continue
+            if self._skip_vendored and is_vendored_dir(name):
+                self.vendored.append(prefix + name)
+                continue
+            yield ScanEntry(prefix + name, is_dir=True)
+            if self._below_max_depth(depth + 1):
+                children.append((os.path.join(path, name), (*rel_parts, name), matcher))
+        return children
+
+    # ── Git index ───────────────────────────────────────────────────────────
+
+    def _iter_paths(self, tracked: list[tuple[str, int, int]]) -> Iterator[ScanEntry]:
+        """Yield entries for ``/``-separated relative paths from the git index."""
+        matcher = IgnoreMatcher(overrides=self._overrides)
+        dirs: dict[str, bool] = {}  # dir path -> excluded/ignored
+        for n, (rel, size, mtime_ns) in enumerate(tracked):
+            if n % 1024 == 0 and self._out_of_time():
+                return
+            parts = rel.split("/")
+            skip = False
+            for i in range(1, len(parts)):
+                d = "/".join(parts[:i])
+                hidden = dirs.get(d)
+                if hidden is None:
+                    hidden = skip or (
+                        parts[i - 1] in self._excludes
+                        or bool(matcher and matcher.ignored(d, is_dir=True))
+                    )
+                    if not hidden and self._skip_vendored and is_vendored_dir(parts[i - 1]):
+                        self.vendored.append(d)
+                        hidden = True
+                    dirs[d] = hidden
+                    if not hidden and self._below_max_depth(i):
+                        yield ScanEntry(d, is_dir=True)
+                skip = hidden
+            if skip or not self._below_max_depth(len(parts)):
+                continue
+            if matcher and matcher.ignored(rel, is_dir=False):
+                continue
+            if self._file_budget_spent():
+                return
+            self._files += 1
+            yield self._file_entry(rel, size, mtime_ns)
+
+    def _file_entry(self, rel: str, size: int, mtime_ns: int) -> ScanEntry:
+        generated = self._skip_vendored and is_generated(self._root, rel, size)
+        return ScanEntry(rel, size, generated=generated, mtime_ns=mtime_ns)
+
+
+# One record of ``git ls-files --debug``: the path, then indented stat lines.
+_GIT_DEBUG_RECORD = re.compile(
+    rb"(.*?)\0(?:  [a-z]+: [^\n]*\n)*?"
+    rb"  mtime: (\d+):(\d+)\n(?:  [a-z]+: [^\n]*\n)*?"
+    rb"  size: (\d+)\t[^\n]*\n",
+    re.DOTALL,
+)
+
+
+def _git_tracked_files(root: Path) -> list[tuple[str, int, int]] | None:
+    """List (path, size, mtime_ns) for files in the git index.
+
+    Sizes and mtimes come from the stat data git keeps in its index
+    (``--debug``), so no file is touched.  If that output cannot be parsed,
+    both are 0.  Returns None if git is unavailable.
+    """
+    if not (root / ".git").exists():
+        return None
+    out = _git_ls_files(root, "--debug")
+    if out is None:
+        return None
+    tracked = [
+        (
+            m.group(1).decode("utf-8", errors="surrogateescape"),
+            int(m.group(4)),
+            int(m.group(2)) * 1_000_000_000 + int(m.group(3)),
+        )
+        for m in _GIT_DEBUG_RECORD.finditer(out)
+    ]
+    if tracked or not out:
+        return tracked
+    out = _git_ls_files(root)
+    if out is None:
+        return None
+    return [
+        (name.decode("utf-8", errors="surrogateescape"), 0, 0)
+        for name in out.split(b"\0")
+        if name
+    ]
+
+
+def _git_ls_files(root: Path, *args: str) -> bytes | None:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z", "--cached", *args],
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout
+
+
+def _read_dir(
+    path: str, rel: str, index: ScanIndex | None, read_gitignore: bool, sniff: bool
+) -> _DirRead | None:
+    """Read one directory (from *index* when its mtime is unchanged).
+
+    With *sniff*, files are also classified as generated.  Safe to call
+    from worker threads: the index is only read here.
+    """
+    previous = None
+    try:
+        if index is None:
+            listing = _scandir(path, 0)
+        else:
+            mtime_ns = os.stat(path).st_mtime_ns
+            cached = index.lookup(rel, mtime_ns)
+            if cached is None:
+                listing = _scandir(path, mtime_ns)
+                previous = index.previous(rel)
+            else:
+                listing = cached
+    except OSError:
+        return None
+    if sniff and any(f[3] is None for f in listing.files):
+        listing = _sniff_generated(path, listing, previous)
+    rules = None
+    if read_gitignore and any(f[0] == ".gitignore" for f in listing.files):
+        rules = IgnoreRules.from_file(Path(path, ".gitignore"))
+    return listing, rules
+
+
+def _scandir(path: str, mtime_ns: int) -> DirListing:
+    """Read a directory with ``os.scandir``.
+
+    Entry types come from the ``DirEntry`` cache (``d_type`` on most
+    filesystems); only regular files are ``stat``-ed, for size and mtime.
+    Symlinked directories are not followed.
+    """
+    listing = DirListing(mtime_ns)
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    listing.dirs.append(entry.name)
+                elif entry.is_file():
+                    st = entry.stat()
+                    listing.files.append((entry.name, st.st_size, st.st_mtime_ns, None))
+            except OSError:
+                continue
+    return listing
+
+
+def _sniff_generated(
+    path: str, listing: DirListing, previous: DirListing | None
+) -> DirListing:
+    """Fill in the generated flags of *listing*.
+
+    Flags from the *previous* listing of the directory are reused for files
+    whose size and mtime are unchanged, so only new or edited files are read.
+    """
+    known = {f[:3]: f[3] for f in previous.files} if previous is not None else {}
+    root = Path(path)
+    files: list[tuple[str, int, int, bool | None]] = []
+    for name, size, mtime_ns, generated in listing.files:
+        if generated is None:
+            generated = known.get((name, size, mtime_ns))
+            if generated is None:
+                generated = is_generated(root, name, size)
+        files.append((name, size, mtime_ns, generated))
+    return DirListing(listing.mtime_ns, files, listing.dirs)
 
 
 def _find_config_files(root: Path) -> list[str]:
@@ -0,0 +1,254 @@
+"""Top-level symbol extraction for the repo map."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+
+SYMBOLS_FILE = "symbols.json"
+SYMBOLS_VERSION = 1
+
+# Files above this size are not parsed (bundles, fixtures, generated code).
+MAX_SOURCE_BYTES = 512 * 1024
+
+_MAX_SIGNATURE = 160
+
+
+@dataclass(frozen=True, slots=True)
+class Symbol:
+    """A class, function or type declared at module level (or a method)."""
+
+    kind: str  # "class", "function", "method", "type", ...
+    name: str
+    signature: str  # declaration header, e.g. "def f(x: int) -> str"
+    line: int
+    depth: int = 0  # 1 for members of a class
+
+
+# ── Python ──────────────────────────────────────────────────────────────────
+
+
+def _python_symbols(text: str) -> list[Symbol]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    symbols: list[Symbol] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if not node.name.startswith("_"):
+                symbols.append(Symbol("function", node.name, _py_def(node), node.lineno))
+        elif isinstance(node, ast.ClassDef) and not node.name.startswith("_"):
+            bases = ", ".join(ast.unparse(b) for b in [*node.bases, *node.keywords])
+            header = f"class {node.name}({bases})" if bases else f"class {node.name}"
+            symbols.append(Symbol("class", node.name, header, node.lineno))
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+                    not member.name.startswith("_") or member.name == "__init__"
+                ):
+                    symbols.append(
+                        Symbol("method", member.name, _py_def(member), member.lineno, 1)
+                    )
+    return symbols
+
+
+def _py_def(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return _clip(f"{prefix} {node.name}({ast.unparse(node.args)}){returns}")
+
+
+# ── Regex-based languages ───────────────────────────────────────────────────
+
+# Declarations at column 0 only: indented ones are members or locals.
+_TS_DECL = re.compile(
+    r"^(?:export\s+(?:default\s+)?)?(?:declare\s+)?"
+    r"(?:(?:async\s+)?function\*?|(?:abstract\s+)?class|interface|type|enum|const\s+enum)"
+    r"\s+([A-Za-z_$][\w$]*)[^{=;]*(?:=(?!>)[^{;]*)?",
+    re.MULTILINE,
+)
+_TS_ARROW = re.compile(
+    r"^export\s+const\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s*)?"
+    r"(?:\([^)]*\)|[A-Za-z_$][\w$]*)\s*(?::\s*[^=]+)?=>",
+    re.MULTILINE,
+)
+_GO_DECL = re.compile(
+    r"^(?:func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)[^{\n]*|type\s+([A-Za-z_]\w*)\s+[^{\n]*)",
+    re.MULTILINE,
+)
+_RUST_DECL = re.compile(
+    r"^(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?(?:extern\s+\"\w+\"\s+)?"
+    r"(?:fn|struct|enum|trait|type|union|mod)\s+([A-Za-z_]\w*)[^{;\n]*",
+    re.MULTILINE,
+)
+_KIND = re.compile(
+    r"\b(function|class|interface|type|enum|func|fn|struct|trait|union|mod)\b"
+)
+_KIND_NAMES = {"func": "function", "fn": "function"}
+
+
+def _regex_symbols(
+    *patterns: re.Pattern[str], exported: Callable[[str, str], bool] | None = None
+) -> Callable[[str], list[Symbol]]:
+    def extract(text: str) -> list[Symbol]:
+        found: list[tuple[int, Symbol]] = []
+        for pattern in patterns:
+            for m in pattern.finditer(text):
+                name = next(g for g in m.groups() if g)
+                header = m.group(0)
+                if exported is not None and not exported(name, header):
+                    continue
+                kind_match = _KIND.search(header)
+                kind = kind_match.group(1) if kind_match else "function"
+                line = text.count("\n", 0, m.start()) + 1
+                found.append(
+                    (m.start(), Symbol(_KIND_NAMES.get(kind, kind), name, _clip(header), line))
+                )
+        found.sort(key=lambda item: item[0])
+        return [symbol for _, symbol in found]
+
+    return extract
+
+
+def _go_exported(name: str, header: str) -> bool:
+    return name[:1].isupper()
+
+
+def _rust_public(name: str, header: str) -> bool:
+    return header.startswith("pub")
+
+
+_EXTRACTORS: dict[str, Callable[[str], list[Symbol]]] = {
+    ".py": _python_symbols,
+    ".pyi": _python_symbols,
+    ".ts": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".tsx": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".mts": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".js": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".jsx": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".mjs": _regex_symbols(_TS_DECL, _TS_ARROW),
+    ".go": _regex_symbols(_GO_DECL, exported=_go_exported),
+    ".rs": _regex_symbols(_RUST_DECL, exported=_rust_public),
+}
+
+# Extensions symbols can be extracted from.
+SOURCE_EXTENSIONS = frozenset(_EXTRACTORS)
+
+
+def extract_symbols(path: str, text: str) -> list[Symbol]:
+    """Extract top-level symbols from source *text*, in file order.
+
+    The language is picked from the extension of *path*; unknown
+    extensions yield no symbols.  Python is parsed with :mod:`ast`, other
+    languages with line-anchored regexes that only see column-0
+    declarations (and, for Go and Rust, only exported/``pub`` ones).
+    """
+    dot = path.rfind(".")
+    extractor = _EXTRACTORS.get(path[dot:].lower()) if dot > 0 else None
+    return extractor(text) if extractor is not None else []
+
+
+def _clip(header: str) -> str:
+    header = " ".join(header.split()).rstrip("{ ").strip()
+    return header if len(header) <= _MAX_SIGNATURE else header[: _MAX_SIGNATURE - 1] + "…"
+
+
+# ── Index ───────────────────────────────────────────────────────────────────
+
+
+class SymbolIndex:
+    """Symbols per file, cached by content hash.
+
+    A file is re-read only when its mtime or size changed, and re-parsed
+    only when its content hash changed too (a touched file, a branch
+    switch back and forth).  Files with identical content share one entry.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        files: dict[str, tuple[int, int, str]] | None = None,
+        symbols: dict[str, list[Symbol]] | None = None,
+    ) -> None:
+        self._path = path
+        self._files = files or {}  # rel -> (mtime_ns, size, digest)
+        self._symbols = symbols or {}  # digest -> symbols
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path) -> SymbolIndex:
+        path = cache_path(root, SYMBOLS_FILE)
+        data = read_cache(path, SYMBOLS_VERSION)
+        if data is None:
+            return cls(path)
+        try:
+            files = {rel: (int(m), int(s), str(d)) for rel, (m, s, d) in data["files"].items()}
+            symbols = {
+                digest: [Symbol(*fields) for fields in entries]
+                for digest, entries in data["symbols"].items()
+            }
+        except (KeyError, TypeError, ValueError):
+            return cls(path)
+        return cls(path, files, symbols)
+
+    def symbols(self, root: Path, rel: str, mtime_ns: int, size: int) -> list[Symbol]:
+        """Symbols of the file *rel* (``/``-separated, relative to *root*)."""
+        self._seen.add(rel)
+        known = self._files.get(rel)
+        if known is not None and known[:2] == (mtime_ns, size) and known[2] in self._symbols:
+            return self._symbols[known[2]]
+        if size > MAX_SOURCE_BYTES:
+            return []
+        try:
+            data = (root / rel).read_bytes()
+        except OSError:
+            return []
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if digest not in self._symbols:
+            self._symbols[digest] = extract_symbols(
+                rel, data.decode("utf-8", errors="replace")
+            )
+        self._files[rel] = (mtime_ns, size, digest)
+        self._dirty = True
+        return self._symbols[digest]
+
+    def outline(self) -> dict[str, list[Symbol]]:
+        """Symbols of every indexed file with any, without touching the files."""
+        return {
+            rel: self._symbols[digest]
+            for rel, (_, _, digest) in sorted(self._files.items())
+            if self._symbols.get(digest)
+        }
+
+    def save(self) -> None:
+        """Persist entries for the files looked up since loading.
+
+        Files modified within the racy window are stored with mtime 0, so
+        the next lookup re-hashes them while the outline keeps them.
+        """
+        if not self._dirty and self._seen == self._files.keys():
+            return
+        cutoff = racy_cutoff()
+        files = {
+            rel: (mtime_ns if mtime_ns < cutoff else 0, size, digest)
+            for rel, (mtime_ns, size, digest) in self._files.items()
+            if rel in self._seen
+        }
+        digests = {entry[2] for entry in files.values()}
+        symbols = {
+            digest: [[s.kind, s.name, s.signature, s.line, s.depth] for s in entries]
+            for digest, entries in self._symbols.items()
+            if digest in digests
+        }
+        write_cache(
+            self._path,
+            {"files": {rel: list(entry) for rel, entry in files.items()}, "symbols": symbols},
+            SYMBOLS_VERSION,
+        )
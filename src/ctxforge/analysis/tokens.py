@@ -0,0 +1,230 @@
+"""Token estimates calibrated per CLI, memoized by content hash."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from ctxforge.analysis.file_stats import FileStats, FileStatsIndex
+from ctxforge.storage.cache import cache_path, read_cache, write_cache
+
+TOKENS_FILE = "tokens.json"
+# Counts are memoized by model name and content hash only: bump this
+# whenever an estimate changes, or stale counts keep being served.
+TOKENS_VERSION = 2
+
+# Texts shorter than this are estimated directly; hashing them costs as much.
+_MEMO_MIN_CHARS = 2048
+
+
+@dataclass(frozen=True)
+class TokenModel:
+    """Approximation of one tokenizer family.
+
+    Text is classified byte by byte into Latin letters, digits, code
+    punctuation, whitespace, CJK and other non-ASCII characters, the way
+    byte-level BPE pre-tokenizers split it.  Each run of letters, digits
+    or punctuation costs at least one token, more when it is longer than
+    the tokenizer's typical merge; CJK is costed per character and other
+    non-ASCII text per UTF-8 byte.
+    """
+
+    name: str
+    word_chars: float  # letters (plus leading space) per token within a word
+    digits_per_token: float
+    punct_chars: float  # ASCII punctuation per token within a run
+    cjk_chars: float  # CJK characters per token (below 1: several tokens each)
+    non_ascii_bytes: float  # UTF-8 bytes per token for other non-ASCII text
+    bytes_per_token: float  # average over mixed files, when only the size is known
+
+    def estimate(self, text: str) -> int:
+        """Estimated number of tokens in *text*."""
+        return self.estimate_bytes(text.encode("utf-8", "surrogatepass"))
+
+    def estimate_bytes(self, data: bytes) -> int:
+        """Estimated number of tokens in UTF-8 *data*.
+
+        Runs in a fixed number of C-level passes over the buffer
+        (``bytes.translate`` and ``bytes.count``), so multi-MB files
+        cost milliseconds.
+        """
+        if not data:
+            return 0
+        classes = data.translate(_CLASS_TABLE)
+        letters, digits, punct, spaces, breaks, cjk = (
+            classes.count(c) for c in (_LETTER, _DIGIT, _PUNCT, _SPACE, _BREAK, _CJK)
+        )
+        # Bytes of other multi-byte characters, continuation bytes included.
+        other = len(data) - letters - digits - punct - spaces - breaks - 3 * cjk
+        tokens = (
+            max(_runs(data, _LETTER), letters / self.word_chars)
+            + max(_runs(data, _DIGIT), digits / self.digits_per_token)
+            + max(_runs(data, _PUNCT), punct / self.punct_chars)
+            # Line breaks (with the indentation after them) and inner
+            # alignment; a single space merges into the next piece.
+            + _runs(data, _BREAK)
+            + sum(classes.count(bytes((c, _SPACE, _SPACE))) for c in (_LETTER, _DIGIT, _PUNCT))
+            + cjk / self.cjk_chars
+            + max(other, 0) / self.non_ascii_bytes
+        )
+        return max(1, round(tokens))
+
+    def estimate_size(self, size: int) -> int:
+        """Estimated tokens of a file of *size* bytes, without reading it."""
+        return max(1, round(size / self.bytes_per_token)) if size > 0 else 0
+
+
+# ── Byte classes ────────────────────────────────────────────────────────────
+
+_LETTER, _DIGIT, _PUNCT, _SPACE, _BREAK, _CJK, _OTHER, _CONT = b"LDPSNCOc"
+
+
+def _class_table() -> bytes:
+    table = bytearray(b"O" * 256)
+    for byte in range(256):
+        char = chr(byte)
+        if byte < 0x80:
+            if char.isalpha():
+                table[byte] = _LETTER
+            elif char.isdigit():
+                table[byte] = _DIGIT
+            elif char == " ":
+                table[byte] = _SPACE
+            elif char.isspace() or byte < 0x20 or byte == 0x7F:
+                table[byte] = _BREAK
+            else:
+                table[byte] = _PUNCT
+        elif byte < 0xC0:
+            table[byte] = _CONT
+        elif 0xE3 <= byte <= 0xED or byte == 0xEF:
+            # Lead bytes of U+3000–U+DFFF and U+F000–U+FFFF: CJK symbols
+            # and punctuation, kana, Han, Yi, Hangul, CJK compatibility
+            # and fullwidth forms.
+            table[byte] = _CJK
+    return bytes(table)
+
+
+_CLASS_TABLE = _class_table()
+# Per class, a table mapping each byte to b"1" if it is of that class, else b"0".
+_MASK_TABLES = {
+    c: bytes(ord("1") if cls == c else ord("0") for cls in _CLASS_TABLE)
+    for c in (_LETTER, _DIGIT, _PUNCT, _BREAK)
+}
+
+
+def _runs(data: bytes, c: int) -> int:
+    """Number of maximal runs of bytes of class *c* in *data*."""
+    mask = data.translate(_MASK_TABLES[c])
+    return mask.count(b"01") + mask.startswith(b"1")
+
+
+# Calibrated on English prose, Chinese Markdown and Python/TypeScript source.
+GENERIC = TokenModel("generic", 6.0, 3.0, 1.5, 0.9, 2.5, 3.8)
+TOKEN_MODELS: dict[str, TokenModel] = {
+    "generic": GENERIC,
+    # Claude tokenizers merge less: shorter words and punctuation runs,
+    # more tokens per Han character.
+    "claude": TokenModel("claude", 5.2, 3.0, 1.3, 0.75, 2.2, 3.3),
+    # o200k-style vocabularies behind codex merge longer pieces and hold
+    # many more CJK words.
+    "codex": TokenModel("codex", 6.5, 3.0, 1.6, 1.2, 3.0, 4.1),
+}
+
+
+def token_model(cli_name: str | None) -> TokenModel:
+    """The token model for the CLI *cli_name* (generic if unknown or None)."""
+    return TOKEN_MODELS.get(cli_name or "", GENERIC)
+
+
+class TokenCounter:
+    """Token counts of texts and project files, memoized by content hash.
+
+    A file lookup costs one ``stat`` when its (mtime, size) is unchanged
+    (see :class:`~ctxforge.analysis.file_stats.FileStatsIndex`); a file
+    whose content hash was counted before is not re-read for counting.
+    Counts are kept per model under ``.ctxforge/cache/``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        model: TokenModel,
+        stats: FileStatsIndex,
+        memo: dict[str, dict[str, int]] | None = None,
+    ) -> None:
+        self._root = root
+        self.model = model
+        self._stats = stats
+        self._memo = memo or {}
+        self._counts = self._memo.setdefault(model.name, {})
+        self._touched: set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path, model: TokenModel = GENERIC) -> TokenCounter:
+        stats = FileStatsIndex.load(root)
+        data = read_cache(cache_path(root, TOKENS_FILE), TOKENS_VERSION)
+        memo: dict[str, dict[str, int]] = {}
+        if data is not None and isinstance(data.get("models"), dict):
+            memo = {
+                name: counts
+                for name, counts in data["models"].items()
+                if isinstance(counts, dict)
+            }
+        return cls(root, model, stats, memo)
+
+    def count(self, text: str) -> int:
+        """Tokens in *text*."""
+        if len(text) < _MEMO_MIN_CHARS:
+            return self.model.estimate(text)
+        data = text.encode("utf-8", "surrogatepass")
+        return self._memoized(_digest(data), lambda: data)
+
+    def file_stats(self, rel: str) -> FileStats | None:
+        """Stats of the ``/``-separated path *rel*, or None if it is not a file."""
+        return self._stats.stats(self._root, rel)
+
+    def count_file(self, rel: str) -> int | None:
+        """Tokens in the file *rel* (``/``-separated), or None if it is not a file."""
+        stats = self._stats.stats(self._root, rel)
+        if stats is None:
+            return None
+        try:
+            return self._memoized(stats.digest, lambda: (self._root / rel).read_bytes())
+        except OSError:
+            return None
+
+    def _memoized(self, digest: str, data: Callable[[], bytes]) -> int:
+        self._touched.add(digest)
+        tokens = self._counts.get(digest)
+        if tokens is None:
+            tokens = self.model.estimate_bytes(data())
+            self._counts[digest] = tokens
+            self._dirty = True
+        return tokens
+
+    def save(self) -> None:
+        """Persist the file stats and the counts still in use.
+
+        Counts are kept for content seen in this session or still
+        referenced by the file stats; nothing is written outside a
+        ctxforge project.
+        """
+        if not (self._root / ".ctxforge").is_dir():
+            return
+        self._stats.save()
+        live = self._stats.digests() | self._touched
+        pruned = {
+            name: {d: n for d, n in counts.items() if d in live}
+            for name, counts in self._memo.items()
+        }
+        if not self._dirty and pruned == self._memo:
+            return
+        write_cache(cache_path(self._root, TOKENS_FILE), {"models": pruned}, TOKENS_VERSION)
+        self._dirty = False
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
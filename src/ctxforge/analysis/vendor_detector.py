@@ -0,0 +1,138 @@
+"""Detect vendored third-party trees and generated files."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+# Directory names holding third-party code checked into the repository.
+VENDORED_DIRS = frozenset(
+    {
+        "vendor",
+        "vendors",
+        "third_party",
+        "third-party",
+        "thirdparty",
+        "3rdparty",
+        "extern",
+        "external",
+        "bower_components",
+        "jspm_packages",
+        "Pods",
+        "Carthage",
+        "__generated__",
+    }
+)
+
+# Files that are always machine-written, by exact name.
+GENERATED_NAMES = frozenset(
+    {
+        "package-lock.json",
+        "npm-shrinkwrap.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "bun.lockb",
+        "poetry.lock",
+        "Pipfile.lock",
+        "uv.lock",
+        "Cargo.lock",
+        "Gemfile.lock",
+        "composer.lock",
+        "go.sum",
+        "mix.lock",
+        "pubspec.lock",
+    }
+)
+
+# Name suffixes of minified bundles, source maps and codegen output.
+GENERATED_SUFFIXES: tuple[str, ...] = (
+    ".min.js",
+    ".min.css",
+    "-min.js",
+    ".bundle.js",
+    ".map",
+    "_pb2.py",
+    "_pb2_grpc.py",
+    "_pb2.pyi",
+    ".pb.go",
+    ".pb.gw.go",
+    ".pb.cc",
+    ".pb.h",
+    "_pb.js",
+    "_pb.d.ts",
+    "_grpc_pb.js",
+    ".g.dart",
+    ".freezed.dart",
+    ".designer.cs",
+    ".generated.cs",
+)
+
+# Only files with these extensions are sniffed, and only from this size up:
+# tiny generated files barely move the statistics and are not worth an open().
+_SNIFF_EXTENSIONS = frozenset(
+    {
+        ".py", ".js", ".mjs", ".cjs", ".ts", ".tsx", ".jsx", ".go", ".rs",
+        ".java", ".kt", ".cs", ".c", ".h", ".cc", ".cpp", ".hpp", ".swift",
+        ".dart", ".php", ".rb", ".css", ".json",
+    }
+)
+_SNIFF_MIN_SIZE = 4096
+_SNIFF_BYTES = 1024
+
+# Markers code generators put in the file header.
+_GENERATED_MARKERS = re.compile(
+    rb"Code generated .{0,200}DO NOT EDIT"
+    rb"|@generated\b"
+    rb"|<auto-?generated"
+    rb"|Generated by the protocol buffer compiler"
+    rb"|(?:automatically|auto-) ?generated (?:file|code|by)"
+    rb"|DO NOT EDIT[.!]? *(?:this file|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# A full sniff window with at most one line break means minified output.
+_MINIFIED_EXTENSIONS = frozenset({".js", ".mjs", ".cjs", ".css", ".json"})
+
+
+def is_vendored_dir(name: str) -> bool:
+    """Return True for directory names that hold vendored or generated trees."""
+    return name in VENDORED_DIRS
+
+
+def is_generated_name(name: str) -> bool:
+    """Classify a file as generated from its name alone."""
+    return name in GENERATED_NAMES or name.endswith(GENERATED_SUFFIXES)
+
+
+def is_generated(root: Path, rel_path: str, size: int) -> bool:
+    """Classify a file as generated, reading at most ``_SNIFF_BYTES`` of it.
+
+    Name rules are checked first; the header is only sniffed for source
+    files of at least ``_SNIFF_MIN_SIZE`` bytes.
+    """
+    name = rel_path.rpartition("/")[2]
+    if is_generated_name(name):
+        return True
+    if size < _SNIFF_MIN_SIZE:
+        return False
+    dot = name.rfind(".")
+    ext = name[dot:].lower() if dot > 0 else ""
+    if ext not in _SNIFF_EXTENSIONS:
+        return False
+    try:
+        with open(root / rel_path, "rb") as f:
+            head = f.read(_SNIFF_BYTES)
+    except OSError:
+        return False
+    return sniff_generated(head, ext)
+
+
+def sniff_generated(head: bytes, ext: str) -> bool:
+    """Inspect a file prefix for generator markers or minified content."""
+    if _GENERATED_MARKERS.search(head):
+        return True
+    return (
+        ext in _MINIFIED_EXTENSIONS
+        and len(head) >= _SNIFF_BYTES
+        and head.count(b"\n") <= 1
+    )
@@ -0,0 +1,238 @@
+"""Monorepo workspace detection and per-package scans."""
+
+from __future__ import annotations
+
+import json
+import posixpath
+import re
+import tomllib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ctxforge.analysis.scanner import ScanReport, scan_project
+
+# Manifests marking a package directory, per workspace kind.
+_PACKAGE_MANIFESTS: dict[str, str] = {
+    "pnpm": "package.json",
+    "npm": "package.json",
+    "cargo": "Cargo.toml",
+    "go": "go.mod",
+    "python": "pyproject.toml",
+}
+
+@dataclass(frozen=True)
+class Workspace:
+    """A package of a monorepo."""
+
+    path: str  # relative to the project root, "/"-separated, never ""
+    kind: str  # "pnpm", "npm" (npm/yarn workspaces), "cargo", "go" or "python"
+
+
+@dataclass
+class WorkspaceReport:
+    """Scan of a monorepo: the whole tree plus one report per package."""
+
+    root: ScanReport  # rollup over the whole project
+    packages: dict[str, ScanReport] = field(default_factory=dict)  # by package path
+    workspaces: list[Workspace] = field(default_factory=list)
+
+
+# ── Detection ───────────────────────────────────────────────────────────────
+
+
+def detect_workspaces(root: Path, files: Iterable[str]) -> list[Workspace]:
+    """Find the packages of the monorepo at *root*.
+
+    Declared workspaces are used where present: ``pnpm-workspace.yaml``,
+    ``workspaces`` in ``package.json`` (npm/yarn), ``[workspace]`` in
+    ``Cargo.toml``, ``go.work`` and ``[tool.uv.workspace]``.  Without a
+    declaration, every nested ``go.mod`` or ``pyproject.toml`` directory is
+    a package.  Member globs are matched against the directories holding
+    the ecosystem's manifest among *files* (project-relative paths, e.g.
+    ``report.files.find(...)``), so the disk is not walked again.
+
+    Returns:
+        Packages sorted by path; empty for a single-package project.
+    """
+    manifest_dirs: dict[str, set[str]] = {name: set() for name in _PACKAGE_MANIFESTS.values()}
+    for rel in files:
+        dirname, _, name = rel.rpartition("/")
+        if dirname and name in manifest_dirs:
+            manifest_dirs[name].add(dirname)
+
+    found: dict[str, Workspace] = {}
+
+    def add(kind: str, patterns: list[str]) -> None:
+        candidates = manifest_dirs[_PACKAGE_MANIFESTS[kind]]
+        for path in _expand(patterns, candidates):
+            found.setdefault(path, Workspace(path, kind))
+
+    if (pnpm := _read(root / "pnpm-workspace.yaml")) is not None:
+        add("pnpm", _pnpm_packages(pnpm))
+    if (package := _load_json(root / "package.json")) is not None:
+        add("npm", _npm_workspaces(package))
+    if (cargo := _load_toml(root / "Cargo.toml")) is not None:
+        workspace = cargo.get("workspace", {})
+        add("cargo", _strings(workspace.get("members")) + [
+            f"!{p}" for p in _strings(workspace.get("exclude"))
+        ])
+
+    go_work = _read(root / "go.work")
+    if go_work is not None:
+        add("go", _go_work_uses(go_work))
+    else:
+        add("go", ["**"])
+
+    pyproject = _load_toml(root / "pyproject.toml")
+    uv = (pyproject or {}).get("tool", {}).get("uv", {}).get("workspace")
+    if uv is not None:
+        add("python", _strings(uv.get("members")) + [
+            f"!{p}" for p in _strings(uv.get("exclude"))
+        ])
+    else:
+        add("python", ["**"])
+
+    return [found[p] for p in sorted(found)]
+
+
+def _expand(patterns: list[str], candidates: set[str]) -> list[str]:
+    """Candidate directories matched by the include and ``!``-exclude globs."""
+    include = [_glob(p) for p in patterns if not p.startswith("!")]
+    exclude = [_glob(p[1:]) for p in patterns if p.startswith("!")]
+    return [
+        path
+        for path in candidates
+        if any(r.fullmatch(path) for r in include) and not any(r.fullmatch(path) for r in exclude)
+    ]
+
+
+def _glob(pattern: str) -> re.Pattern[str]:
+    """Compile a workspace glob: ``*`` stays within a segment, ``**`` spans them."""
+    pattern = posixpath.normpath(pattern.strip().removeprefix("./")).rstrip("/")
+    regex = ""
+    for part in re.split(r"(\*\*/?|\*|\?)", pattern):
+        if part in ("**", "**/"):
+            regex += ".*"
+        elif part == "*":
+            regex += "[^/]*"
+        elif part == "?":
+            regex += "[^/]"
+        else:
+            regex += re.escape(part)
+    return re.compile(regex)
+
+
+_YAML_ITEM = re.compile(r"""^\s+-\s*['"]?([^'"#\n]+?)['"]?\s*(?:#.*)?$""")
+
+
+def _pnpm_packages(text: str) -> list[str]:
+    patterns: list[str] = []
+    in_packages = False
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            in_packages = line.split(":", 1)[0].strip() == "packages"
+        elif in_packages and (m := _YAML_ITEM.match(line)):
+            patterns.append(m.group(1))
+    return patterns
+
+
+def _npm_workspaces(package: dict[str, Any]) -> list[str]:
+    workspaces = package.get("workspaces")
+    if isinstance(workspaces, dict):  # yarn classic: {"packages": [...]}
+        workspaces = workspaces.get("packages")
+    return _strings(workspaces)
+
+
+def _go_work_uses(text: str) -> list[str]:
+    uses: list[str] = []
+    in_block = False
+    for line in text.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if line.startswith("use ("):
+            in_block = True
+        elif in_block and line == ")":
+            in_block = False
+        elif in_block and line:
+            uses.append(line)
+        elif line.startswith("use "):
+            uses.append(line[4:].strip())
+    return [u for u in uses if u not in (".", "./")]
+
+
+def _strings(value: Any) -> list[str]:
+    return [str(v) for v in value] if isinstance(value, list) else []
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _load_json(path: Path) -> dict[str, Any] | None:
+    text = _read(path)
+    try:
+        data = json.loads(text) if text is not None else None
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _load_toml(path: Path) -> dict[str, Any] | None:
+    text = _read(path)
+    try:
+        return tomllib.loads(text) if text is not None else None
+    except tomllib.TOMLDecodeError:
+        return None
+
+
+# ── Scanning ────────────────────────────────────────────────────────────────
+
+
+def scan_workspace(
+    root: Path, report: ScanReport | None = None, **scan_options: Any
+) -> WorkspaceReport:
+    """Scan the project at *root* and report on each of its workspace packages.
+
+    Package reports are cut from the rollup's file table, so the disk is
+    walked once and the project's ignore rules (root ``.gitignore``,
+    ``.git/info/exclude``, ``[scan].exclude``, ``use_git``) apply to
+    every package.
+
+    Args:
+        root: Project root directory.
+        report: An existing ``scan_project`` report of *root* to use as the
+            rollup (it must carry its file table); *root* is scanned first
+            otherwise.
+        **scan_options: Passed to :func:`scan_project` for that scan.
+
+    Returns:
+        The rollup with a report per package; ``packages`` is empty for a
+        single-package project.
+    """
+    if report is None or report.files is None:
+        report = scan_project(root, **scan_options)
+    assert report.files is not None
+    workspaces = detect_workspaces(root, report.files.find(set(_PACKAGE_MANIFESTS.values())))
+    result = WorkspaceReport(report, workspaces=workspaces)
+    for workspace in workspaces:
+        result.packages[workspace.path] = _package_report(root, report, workspace.path)
+    return result
+
+
+def _package_report(root: Path, report: ScanReport, path: str) -> ScanReport:
+    """The part of the rollup *report* under the package directory *path*."""
+    assert report.files is not None
+    package = ScanReport.from_table(root / path, report.files.subtree(path))
+    package.project_name = path
+    prefix = path + "/"
+    package.vendored_dirs = [
+        d.removeprefix(prefix) for d in report.vendored_dirs if d.startswith(prefix)
+    ]
+    package.partial = report.partial
+    return package
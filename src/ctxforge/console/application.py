@@ -8,10 +8,12 @@ from setproctitle import setproctitle
 from ctxforge.__version__ import __version__
 from ctxforge.console.commands.clean import clean_command
 from ctxforge.console.commands.ctx import ctx_app
+from ctxforge.console.commands.hooks import hooks_app
 from ctxforge.console.commands.init import init_command
 from ctxforge.console.commands.profile import profile_app
 from ctxforge.console.commands.run import run_command
 from ctxforge.console.commands.tool import tool_app
+from ctxforge.console.commands.watch import watch_command
 
 app = typer.Typer(
     name="ctxforge",
@@ -44,9 +46,11 @@ def main_callback(
 app.command(name="init")(init_command)
 app.command(name="run")(run_command)
 app.command(name="clean")(clean_command)
+app.command(name="watch")(watch_command)
 app.add_typer(profile_app, name="profile")
 app.add_typer(ctx_app, name="ctx")
 app.add_typer(tool_app, name="tool")
+app.add_typer(hooks_app, name="hooks")
 
 
 def main() -> None:
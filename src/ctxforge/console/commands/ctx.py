@@ -9,6 +9,14 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
+from ctxforge.analysis.file_sections import (
+    MARKDOWN_SUFFIXES,
+    Heading,
+    SectionIndex,
+    parse_ref,
+)
+from ctxforge.analysis.git_history import GitHistory
+from ctxforge.analysis.tokens import TokenCounter, token_model
 from ctxforge.core.injection import SimpleInjection
 from ctxforge.core.migration import migrate_profile, needs_migration
 from ctxforge.core.profile import ProfileManager
@@ -124,6 +132,42 @@ def _ensure_context_files(profile_dir: Path, profile_config: ProfileConfig) -> N
             path.write_text("", encoding="utf-8")
 
 
+def _format_age(days: float) -> str:
+    if days < 1:
+        return "today"
+    if days < 2:
+        return "yesterday"
+    return f"{int(days)} days ago"
+
+
+def _print_stale_key_files(
+    profile_dir: Path, profile_config: ProfileConfig, history: GitHistory | None
+) -> None:
+    """List key files committed to since the work record was last written."""
+    if history is None or not profile_config.key_files.paths:
+        return
+    record_mtimes = [
+        (profile_dir / name).stat().st_mtime
+        for name in profile_config.work_record.files
+        if (profile_dir / name).is_file()
+    ]
+    if not record_mtimes:
+        return
+    key_files = list(dict.fromkeys(
+        Path(parse_ref(p).path).as_posix() for p in profile_config.key_files.paths
+    ))
+    stale = history.touched_since(key_files, max(record_mtimes))
+    if not stale:
+        return
+    console.print("  [yellow]Key files changed since the last update:[/yellow]")
+    for path in stale:
+        age = history.age_days(path) or 0.0
+        console.print(
+            f"    {path} (last commit {_format_age(age)}, "
+            f"{history.churn(path)} commits total)"
+        )
+
+
 def _run_ai_prompt(
     project: Project, pm: ProfileManager,
     profile_name: str, prompt: str,
@@ -205,8 +249,16 @@ def profile_command(
 @ctx_app.command("files")
 def files_command(
     profile: str | None = typer.Argument(None, help="Profile name."),
+    sections: bool = typer.Option(
+        False, "--sections", "-s",
+        help="Break Markdown key files down by top-level section.",
+    ),
 ) -> None:
-    """List key files and their sizes."""
+    """List key files with their sizes and token estimates.
+
+    Section (``path#heading``) and line range (``path:10-80``) entries
+    report the part they select.
+    """
     project, pm = _load_project()
     resolved = _resolve_profile(profile, pm)
 
@@ -216,14 +268,62 @@ def files_command(
         console.print(f"[red]Error:[/red] {e}")
         raise typer.Exit(1)
 
-    def _file_row(fp: Path) -> tuple[str, str, str]:
-        if fp.exists() and fp.is_file():
-            content = fp.read_text(encoding="utf-8", errors="replace")
-            lines = content.count("\n")
-            chars = len(content)
-            status = "[green]yes[/green]" if chars > 0 else "[yellow]empty[/yellow]"
-            return status, str(lines), f"{chars:,}"
-        return "[red]no[/red]", "-", "-"
+    counter = TokenCounter.load(project.root, token_model(config.cli.name))
+    index = SectionIndex.load(project.root)
+
+    def _file_row(rel: str) -> tuple[str, str, str, str]:
+        posix = Path(rel).as_posix()
+        stats = counter.file_stats(posix)
+        tokens = counter.count_file(posix)
+        if stats is not None and tokens is not None:
+            status = "[green]yes[/green]" if stats.chars > 0 else "[yellow]empty[/yellow]"
+            return status, str(stats.lines), f"{stats.chars:,}", f"~{tokens:,}"
+        return "[red]no[/red]", "-", "-", "-"
+
+    def _key_rows(entry: str) -> list[tuple[str, str, str, str, str]]:
+        ref = parse_ref(entry)
+        posix = Path(ref.path).as_posix()
+        if ref.whole:
+            rows = [(entry, *_file_row(entry))]
+            stats = counter.file_stats(posix)
+            if sections and stats is not None and posix.lower().endswith(MARKDOWN_SUFFIXES):
+                rows.extend(_section_rows(posix, index.headings(posix, stats)))
+            return rows
+        stats = counter.file_stats(posix)
+        piece = index.resolve(ref, stats)
+        if piece is None:
+            missing = "[red]no[/red]" if stats is None else "[red]no section[/red]"
+            return [(entry, missing, "-", "-", "-")]
+        return [(
+            entry,
+            "[green]yes[/green]" if piece.text.strip() else "[yellow]empty[/yellow]",
+            str(piece.last_line - piece.first_line + 1),
+            f"{len(piece.text):,}",
+            f"~{counter.count(piece.text):,}",
+        )]
+
+    def _section_rows(
+        posix: str, headings: list[Heading]
+    ) -> list[tuple[str, str, str, str, str]]:
+        top = min((h.level for h in headings), default=0)
+        try:
+            data = (project.root / posix).read_bytes()
+        except OSError:
+            return []
+        rows = []
+        for h in headings:
+            if h.level > top + 1:
+                continue
+            text = data[h.start:h.end].decode("utf-8", "replace")
+            indent = "  " * (h.level - top + 1)
+            rows.append((
+                f"[dim]{indent}#{h.title}[/dim]",
+                "",
+                str(h.end_line - h.line + 1),
+                f"{len(text):,}",
+                f"~{counter.count(text):,}",
+            ))
+        return rows
 
     # Work record table
     record_table = Table(title=f"Work record — {resolved}")
@@ -231,15 +331,16 @@ def files_command(
     record_table.add_column("Status", justify="center")
     record_table.add_column("Lines", justify="right")
     record_table.add_column("Chars", justify="right")
+    record_table.add_column("Tokens", justify="right")
 
     for p in SimpleInjection.work_record_paths(config):
-        status, lines, chars = _file_row(project.root / p)
-        record_table.add_row(p, status, lines, chars)
+        record_table.add_row(p, *_file_row(p))
     console.print(record_table)
 
     # Key files table
     paths = config.key_files.paths
     if not paths:
+        counter.save()
         console.print(
             f"\n[yellow]No key files configured for "
             f"profile '{resolved}'.[/yellow]"
@@ -251,11 +352,14 @@ def files_command(
     key_table.add_column("Status", justify="center")
     key_table.add_column("Lines", justify="right")
     key_table.add_column("Chars", justify="right")
+    key_table.add_column("Tokens", justify="right")
 
     for p in paths:
-        status, lines, chars = _file_row(project.root / p)
-        key_table.add_row(p, status, lines, chars)
+        for row in _key_rows(p):
+            key_table.add_row(*row)
 
+    counter.save()
+    index.save()
     console.print(key_table)
 
 
@@ -269,6 +373,7 @@ def update_command(
     """AI-update outdated key files."""
     project, pm = _load_project()
     targets = _resolve_profiles(profile, all_, pm)
+    history = GitHistory.load(project.root)
 
     for name in targets:
         try:
@@ -284,6 +389,7 @@ def update_command(
         console.print(
             f"[bold]Updating[/bold] profile=[cyan]{name}[/cyan]"
         )
+        _print_stale_key_files(pm.profile_path(name).parent, config, history)
         exit_code = _run_ai_prompt(project, pm, name, prompt)
         if exit_code != 0:
             raise typer.Exit(exit_code)
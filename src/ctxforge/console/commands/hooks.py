@@ -0,0 +1,74 @@
+"""ctxforge hooks — refresh caches from git hooks."""
+
+from __future__ import annotations
+
+import typer
+from rich.console import Console
+
+from ctxforge.core.project import Project
+from ctxforge.core.refresh import hook_changes, refresh_indexes
+from ctxforge.exceptions import CForgeError
+from ctxforge.storage.hooks_writer import HOOK_NAMES, install_hooks, uninstall_hooks
+
+console = Console()
+
+hooks_app = typer.Typer(
+    help="Refresh caches at commit, checkout and merge via git hooks.",
+    no_args_is_help=True,
+)
+
+
+def _load_project() -> Project:
+    try:
+        return Project.load()
+    except CForgeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+@hooks_app.command("install")
+def install_command() -> None:
+    """Add ctxforge to the post-commit, post-checkout and post-merge hooks."""
+    project = _load_project()
+    try:
+        paths = install_hooks(project.root)
+    except CForgeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    for path in paths:
+        console.print(f"  [green]✓[/green] {path}")
+    console.print(
+        "[dim]Caches now refresh in the background after each commit, "
+        "checkout and merge.[/dim]"
+    )
+
+
+@hooks_app.command("uninstall")
+def uninstall_command() -> None:
+    """Remove ctxforge from the git hooks."""
+    project = _load_project()
+    try:
+        paths = uninstall_hooks(project.root)
+    except CForgeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    if not paths:
+        console.print("No ctxforge hooks installed.")
+    for path in paths:
+        console.print(f"  [red]✗[/red] {path}")
+
+
+@hooks_app.command("refresh", hidden=True)
+def refresh_command(
+    hook: str = typer.Argument(..., help="Name of the calling hook."),
+    args: list[str] | None = typer.Argument(None, help="Arguments git passed to the hook."),
+) -> None:
+    """Refresh the caches for the paths changed by a git operation."""
+    if hook not in HOOK_NAMES:
+        console.print(f"[red]Error:[/red] Unknown hook '{hook}'.")
+        raise typer.Exit(1)
+    project = _load_project()
+    changed = hook_changes(project.root, hook, args or [])
+    result = refresh_indexes(project, changed)
+    what = "everything" if changed is None else f"{len(changed):,} paths"
+    console.print(f"Refreshed after {hook} ({what}) in {result.seconds * 1000:.0f} ms")
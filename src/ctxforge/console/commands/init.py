@@ -9,15 +9,23 @@ import typer
 from rich.console import Console
 
 from ctxforge.analysis.cli_detector import detect_ai_clis
-from ctxforge.analysis.doc_detector import detect_doc_candidates
-from ctxforge.analysis.scanner import ScanReport, scan_project
+from ctxforge.analysis.doc_detector import DocCandidate, rank_doc_candidates
+from ctxforge.analysis.git_history import GitHistory
+from ctxforge.analysis.import_graph import IMPORT_EXTENSIONS, rank_source_files
+from ctxforge.analysis.scanner import ScanLimits, ScanReport, scan_project
+from ctxforge.analysis.tokens import GENERIC, TokenCounter, TokenModel, token_model
+from ctxforge.analysis.workspace import scan_workspace
 from ctxforge.console.commands.run import launch_session
 from ctxforge.core.profile import ProfileManager
+from ctxforge.exceptions import CForgeError
+from ctxforge.spec.loader import load_project
 from ctxforge.spec.schema import (
+    BudgetSection,
     CliConfig,
     DefaultsConfig,
     ProjectConfig,
     ProjectSection,
+    ScanConfig,
 )
 from ctxforge.storage.commands_writer import write_commands
 from ctxforge.storage.project_writer import write_project
@@ -26,6 +34,19 @@ console = Console()
 
 CTXFORGE_DIR = ".ctxforge"
 
+# Docs preselected in the key-file checkbox: the best-scoring ones, up to
+# this many and this share of the token budget.
+_PRESELECT_MAX = 5
+_PRESELECT_MIN_SCORE = 1.5
+_PRESELECT_BUDGET_SHARE = 0.5
+
+# Most central source files offered (unchecked) after the docs.
+_SOURCE_CANDIDATES = 8
+
+# Best docs offered per workspace package, and packages listed after the scan.
+_PACKAGE_DOCS = 2
+_PACKAGES_SHOWN = 10
+
 
 def _prompt(text: str, default: str = "") -> str:
     """Prompt for input with proper CJK wide-character handling."""
@@ -55,20 +76,9 @@ def _confirm(text: str, default: bool = False) -> bool:
     return value in ("y", "yes")
 
 
-def _estimate_tokens(char_count: int) -> int:
-    """Rough token estimate: ~4 chars per token for mixed content."""
-    return max(1, char_count // 4)
-
-
-def _file_char_count(root: Path, rel_path: str) -> int:
-    """Count characters for a single file."""
-    full = root / rel_path
-    if full.is_file():
-        try:
-            return len(full.read_text(encoding="utf-8"))
-        except Exception:
-            return 0
-    return 0
+def _count_tokens(counter: TokenCounter, rel_path: str) -> int:
+    """Token estimate of one file (0 if it is missing or not a file)."""
+    return counter.count_file(Path(rel_path).as_posix()) or 0
 
 
 def _format_tokens(tokens: int) -> str:
@@ -106,16 +116,53 @@ def _resolve_custom_path(raw: str, root: Path) -> str:
     return str(rel)
 
 
+def _preselect_docs(
+    docs: list[DocCandidate], budget: int = 24000, model: TokenModel = GENERIC
+) -> set[str]:
+    """Pick the highest-value docs to check by default (sizes only, no reads)."""
+    selected: set[str] = set()
+    remaining = int(budget * _PRESELECT_BUDGET_SHARE)
+    for doc in sorted(docs, key=lambda d: -d.score):
+        if len(selected) >= _PRESELECT_MAX or doc.score < _PRESELECT_MIN_SCORE:
+            break
+        tokens = model.estimate_size(doc.size)
+        if tokens <= remaining:
+            selected.add(doc.path)
+            remaining -= tokens
+    return selected
+
+
 def _select_key_files(
-    candidates: list[str], root: Path, budget: int = 24000
+    candidates: list[str],
+    root: Path,
+    budget: int = 24000,
+    preselected: set[str] | None = None,
+    scores: dict[str, float] | None = None,
+    groups: list[tuple[str, list[str]]] | None = None,
+    counter: TokenCounter | None = None,
 ) -> list[str]:
-    """Interactive checkbox with per-file token estimates and budget summary."""
+    """Interactive checkbox with per-file token estimates and budget summary.
+
+    With *scores*, candidates are listed highest score first.  *groups* of
+    further files (title, paths) are listed after them, each under a
+    separator and unchecked.
+    """
     import questionary  # lazy import
 
-    # Pre-compute sizes
-    char_counts: dict[str, int] = {}
-    for c in candidates:
-        char_counts[c] = _file_char_count(root, c)
+    if scores:
+        candidates = sorted(candidates, key=lambda c: -scores.get(c, 0.0))
+    listed = set(candidates)
+    extra: list[tuple[str, list[str]]] = []
+    for title, paths in groups or ():
+        paths = [p for p in paths if p not in listed]
+        listed.update(paths)
+        if paths:
+            extra.append((title, paths))
+
+    # Pre-compute token estimates
+    counter = counter or TokenCounter.load(root)
+    token_counts = {c: _count_tokens(counter, c) for c in listed}
+    counter.save()
 
     style = questionary.Style([
         ("highlighted", "bold"),
@@ -124,18 +171,30 @@ def _select_key_files(
     ])
 
     while True:
-        # ── Checkbox (default unchecked) ──────────────────────────────
-        choices = [
+        # ── Checkbox (highest-value docs checked) ─────────────────────
+        choices: list[questionary.Choice | questionary.Separator] = [
             questionary.Choice(
                 title=(
                     f"{c}  "
-                    f"(~{_format_tokens(_estimate_tokens(char_counts[c]))} tok)"
+                    f"(~{_format_tokens(token_counts[c])} tok)"
                 ),
                 value=c,
-                checked=False,
+                checked=c in (preselected or ()),
             )
             for c in candidates
         ]
+        for title, paths in extra:
+            choices.append(questionary.Separator(f"── {title} ──"))
+            choices.extend(
+                questionary.Choice(
+                    title=(
+                        f"{c}  "
+                        f"(~{_format_tokens(token_counts[c])} tok)"
+                    ),
+                    value=c,
+                )
+                for c in paths
+            )
         selected: list[str] | None = questionary.checkbox(
             "Select key files:",
             choices=choices,
@@ -159,8 +218,7 @@ def _select_key_files(
                     f"  [yellow]Already selected: {rel_str}[/yellow]"
                 )
                 continue
-            char_counts[rel_str] = _file_char_count(root, rel_str)
-            tok = _estimate_tokens(char_counts[rel_str])
+            tok = token_counts[rel_str] = _count_tokens(counter, rel_str)
             console.print(
                 f"  [green]+ {rel_str}[/green] "
                 f"(~{_format_tokens(tok)} tok)"
@@ -168,8 +226,7 @@ def _select_key_files(
             selected.append(rel_str)
 
         # ── Summary ───────────────────────────────────────────────────
-        total_chars = sum(char_counts.get(s, 0) for s in selected)
-        total_tokens = _estimate_tokens(total_chars)
+        total_tokens = sum(token_counts.get(s, 0) for s in selected)
         console.print(
             f"\n  Selected {len(selected)} files, "
             f"~[bold]{_format_tokens(total_tokens)}[/bold] tokens"
@@ -220,9 +277,41 @@ def init_command(
     console.print(f"[bold]Initializing ctxforge in[/bold] {path}\n")
 
     # ── Static analysis ──────────────────────────────────────────────────
+    scan_config = _existing_scan_config(ctxforge_dir) if reinit else ScanConfig()
     console.print("[dim]Scanning project...[/dim]")
-    report = scan_project(path)
-    console.print(f"  Languages: {', '.join(report.languages) or 'unknown'}")
+    report = scan_project(
+        path,
+        use_cache=True,
+        ignore_patterns=scan_config.exclude,
+        use_git=scan_config.use_git,
+        workers=scan_config.workers,
+        limits=ScanLimits(
+            max_files=scan_config.max_files,
+            max_seconds=scan_config.max_seconds,
+        ),
+        skip_vendored=scan_config.skip_vendored,
+    )
+    if report.partial:
+        console.print(
+            f"  [yellow]Scan stopped early after {report.file_count:,} files "
+            f"(see [scan] limits in project.toml).[/yellow]"
+        )
+    languages = ", ".join(
+        f"{lang} ({report.language_shares[lang]:g}%)" for lang in report.languages
+    )
+    console.print(f"  Languages: {languages or 'unknown'}")
+    if report.vendored_dirs:
+        console.print(f"  Vendored (skipped): {', '.join(report.vendored_dirs)}")
+    workspace = scan_workspace(path, report)
+    if workspace.packages:
+        console.print(f"  Workspace packages: {len(workspace.packages)}")
+        for package, package_report in list(workspace.packages.items())[:_PACKAGES_SHOWN]:
+            console.print(
+                f"    {package}: {', '.join(package_report.languages[:3]) or 'unknown'} "
+                f"({package_report.file_count:,} files)"
+            )
+        if len(workspace.packages) > _PACKAGES_SHOWN:
+            console.print(f"    … {len(workspace.packages) - _PACKAGES_SHOWN} more")
     console.print(
         f"  Config files: {', '.join(report.config_files) or 'none'}"
     )
@@ -254,7 +343,8 @@ def init_command(
             if not _confirm("Create a new profile?"):
                 # Skip profile creation, just update project.toml
                 _write_project_toml(
-                    ctxforge_dir, report, cli_config, language
+                    ctxforge_dir, report, cli_config, language,
+                    scan=scan_config,
                 )
                 console.print(
                     f"\n[bold green]Done.[/bold green] "
@@ -263,9 +353,36 @@ def init_command(
                 return
 
     # ── Detect key files ────────────────────────────────────────────────
-    candidates = detect_doc_candidates(path)
-    if candidates:
-        key_files = _select_key_files(candidates, root=path)
+    docs = rank_doc_candidates(
+        path, use_cache=True, history=GitHistory.load(path, use_cache=True)
+    )
+    package_docs = [
+        f"{package}/{doc.path}"
+        for package in workspace.packages
+        for doc in sorted(
+            rank_doc_candidates(path / package), key=lambda d: -d.score
+        )[:_PACKAGE_DOCS]
+    ]
+    sources = rank_source_files(
+        path,
+        report.files.select(IMPORT_EXTENSIONS) if report.files is not None else (),
+        limit=_SOURCE_CANDIDATES,
+        use_cache=True,
+    )
+    if docs or package_docs or sources:
+        # The profile's CLI is chosen later; estimate for the likeliest one.
+        model = token_model(detected_clis[0] if detected_clis else None)
+        key_files = _select_key_files(
+            [d.path for d in docs],
+            root=path,
+            preselected=_preselect_docs(docs, model=model),
+            scores={d.path: d.score for d in docs},
+            groups=[
+                ("Package docs", package_docs),
+                ("Central source files", [s.path for s in sources]),
+            ],
+            counter=TokenCounter.load(path, model),
+        )
     else:
         key_files_raw = _prompt("Key files (comma-separated, optional)")
         key_files = (
@@ -289,7 +406,9 @@ def init_command(
         )
 
     # ── Write project.toml ───────────────────────────────────────────────
-    _write_project_toml(ctxforge_dir, report, cli_config, language)
+    _write_project_toml(
+        ctxforge_dir, report, cli_config, language, scan=scan_config,
+    )
 
     # ── Write profile ────────────────────────────────────────────────────
     pm.create(
@@ -312,9 +431,10 @@ def init_command(
         console.print("  .claude/commands/ (slash commands)")
 
     # ── Post-init: offer to launch a session ─────────────────────────────
-    budget = 24000
-    total_chars = sum(_file_char_count(path, f) for f in key_files)
-    total_tokens = _estimate_tokens(total_chars)
+    budget = BudgetSection().max_tokens
+    counter = TokenCounter.load(path, token_model(cli_name))
+    total_tokens = sum(_count_tokens(counter, f) for f in key_files)
+    counter.save()
     over_budget = total_tokens > budget
 
     if over_budget:
@@ -338,12 +458,21 @@ def init_command(
         raise typer.Exit(exit_code)
 
 
+def _existing_scan_config(ctxforge_dir: Path) -> ScanConfig:
+    """Return the ``[scan]`` section of an existing project.toml, if readable."""
+    try:
+        return load_project(ctxforge_dir / "project.toml").scan
+    except CForgeError:
+        return ScanConfig()
+
+
 def _write_project_toml(
     ctxforge_dir: Path,
     report: ScanReport,
     cli_config: CliConfig,
     language: str,
     model: str = "",
+    scan: ScanConfig | None = None,
 ) -> None:
     project_config = ProjectConfig(
         project=ProjectSection(
@@ -355,6 +484,7 @@ def _write_project_toml(
             language=language,
             model=model or None,
         ),
+        scan=scan or ScanConfig(),
     )
     ctxforge_dir.mkdir(exist_ok=True)
     write_project(ctxforge_dir / "project.toml", project_config)
@@ -10,6 +10,8 @@ import typer
 from rich.console import Console
 from setproctitle import setproctitle
 
+from ctxforge.analysis.tokens import token_model
+from ctxforge.core.budget import DROPPED, PATH, SUMMARY, BudgetReport
 from ctxforge.core.injection import SimpleInjection
 from ctxforge.core.migration import migrate_profile, needs_migration
 from ctxforge.core.profile import ProfileManager
@@ -51,6 +53,7 @@ def _print_injection_summary(
     system_prompt: str,
     language: str | None,
     tool_summary: list[tuple[str, str]] | None = None,
+    budget: BudgetReport | None = None,
 ) -> None:
     """Print a summary of what is being injected."""
     console.print(f"[bold]ctxforge[/bold] profile=[cyan]{profile_name}[/cyan]"
@@ -85,11 +88,38 @@ def _print_injection_summary(
     if language:
         console.print(f"  [dim]Language:[/dim] {language}")
 
-    prompt_chars = len(system_prompt)
-    console.print(f"  [dim]System prompt:[/dim] ~{prompt_chars:,} chars")
+    prompt_tokens = token_model(cli_name).estimate(system_prompt)
+    console.print(
+        f"  [dim]System prompt:[/dim] ~{prompt_tokens:,} tokens "
+        f"({len(system_prompt):,} chars)"
+    )
+    if budget is not None:
+        _print_budget(budget)
     console.print()
 
 
+_LEVEL_LABELS = {
+    SUMMARY: "shrunk to outline",
+    PATH: "path only",
+    DROPPED: "dropped",
+}
+
+
+def _print_budget(budget: BudgetReport) -> None:
+    """Report the context size and any section shrunk to fit the budget."""
+    style = "yellow" if budget.degraded else "dim"
+    console.print(
+        f"  [dim]Context:[/dim] ~{budget.used_tokens:,} / {budget.max_tokens:,} tokens"
+        + (f" [{style}](~{budget.full_tokens:,} before fitting)[/{style}]"
+           if budget.degraded else "")
+    )
+    for d in budget.degraded:
+        console.print(
+            f"    [yellow]{_LEVEL_LABELS[d.level]}:[/yellow] {d.name} "
+            f"[dim](~{d.full_tokens:,} → ~{d.tokens:,} tok)[/dim]"
+        )
+
+
 def _ensure_migrated(
     pm: ProfileManager,
     profile_name: str,
@@ -185,22 +215,13 @@ def launch_session(
         session_id = str(uuid.uuid4())
         _save_session_id(profile_dir, session_id)
 
-    builder = PromptBuilder(project.root)
-    language = project.config.defaults.language
-    system_prompt = builder.build_system(profile_config, language)
-
-    if compress:
-        greeting = builder.build_compress_greeting(profile_config, language)
-    else:
-        greeting = builder.build_greeting(profile_config, language)
-
     # ── Resolve tools ──────────────────────────────────────────────────
     tool_summary: list[tuple[str, str]] | None = None
+    available_tools: list[tuple[str, str]] = []  # (name, description)
     mcp_config_path = None
     if project.config.tools:
         results = resolve_tools(profile_config, project.config)
         tool_summary = []
-        available_tools: list[tuple[str, str]] = []  # (name, description)
         for r in results:
             tool_def = project.config.tools[r.name]
             if r.ok:
@@ -211,24 +232,29 @@ def launch_session(
             else:
                 tool_summary.append((r.name, f"missing {', '.join(r.missing_env)}"))
 
-        # Inject tool descriptions into system prompt
-        if available_tools:
-            lines = ["[Available MCP Tools]",
-                     "The following MCP tools are connected and ready to use:"]
-            for tname, tdesc in available_tools:
-                desc_part = f" — {tdesc}" if tdesc else ""
-                lines.append(f"- {tname}{desc_part}")
-            system_prompt += "\n\n" + "\n".join(lines)
-
         mcp_config_path = build_mcp_config(profile_config, project.config)
 
+    builder = PromptBuilder(project.root)
+    language = project.config.defaults.language
+    try:
+        composed = builder.compose_system(profile_config, language, available_tools)
+    except CForgeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        return 1
+    system_prompt = composed.text
+
+    if compress:
+        greeting = builder.build_compress_greeting(profile_config, language)
+    else:
+        greeting = builder.build_greeting(profile_config, language)
+
     # ── Sync slash commands for this profile (claude only) ──────────────
     write_commands(project.root, profile_name, cli_name, profile_config)
 
     if not resume_id:
         _print_injection_summary(
             profile_name, cli_name, profile_config, system_prompt, language,
-            tool_summary=tool_summary,
+            tool_summary=tool_summary, budget=composed.budget,
         )
 
     # Set terminal title to show the active profile
@@ -0,0 +1,159 @@
+"""ctxforge watch command."""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from types import FrameType
+
+import typer
+from rich.console import Console
+
+from ctxforge.analysis.fs_watch import (
+    InotifyWatcher,
+    Watcher,
+    clear_watch_state,
+    open_watcher,
+    watcher_pid,
+    write_watch_state,
+)
+from ctxforge.core.project import Project
+from ctxforge.core.refresh import refresh_indexes
+from ctxforge.exceptions import CForgeError, ProjectNotFoundError
+from ctxforge.storage.cache import cache_path
+
+console = Console()
+
+WATCH_LOG = "watch.log"
+
+
+def _load_project() -> Project:
+    try:
+        return Project.load()
+    except ProjectNotFoundError:
+        console.print(
+            "[red]Error:[/red] No ctxforge project found. "
+            "Run [bold]ctxforge init[/bold] first."
+        )
+        raise typer.Exit(1)
+    except CForgeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+def _next_batch(watcher: Watcher, debounce: float) -> set[str] | None:
+    """Block until something changes, then gather changes until quiet.
+
+    Returns the changed paths, or None if events were lost.
+    """
+    changed = watcher.changes()
+    while changed is not None and not changed:
+        changed = watcher.changes()
+    while True:
+        more = watcher.changes(timeout=debounce)
+        if more is None:
+            changed = None
+        elif not more:
+            return changed
+        elif changed is not None:
+            changed |= more
+
+
+def watch_loop(
+    project: Project,
+    watcher: Watcher,
+    debounce: float = 0.3,
+    max_batches: int | None = None,
+) -> None:
+    """Refresh the caches of *project* after every batch of changes.
+
+    Records this process as the project's watcher while it runs, so
+    session start trusts the caches instead of walking the tree.
+    """
+    root = project.root
+    result = refresh_indexes(project)
+    write_watch_state(root)
+    docs = f", {result.doc_files:,} documents" if result.doc_files else ""
+    console.print(
+        f"Watching {root} ({result.source_files:,} source files{docs} indexed "
+        f"in {result.seconds:.2f}s)"
+    )
+    try:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            changed = _next_batch(watcher, debounce)
+            result = refresh_indexes(project, changed)
+            write_watch_state(root)
+            batches += 1
+            what = "everything" if changed is None else f"{len(changed):,} paths"
+            console.print(
+                f"[dim]{time.strftime('%H:%M:%S')}[/dim] refreshed after changes to "
+                f"{what} in {result.seconds * 1000:.0f} ms"
+            )
+    finally:
+        clear_watch_state(root)
+        watcher.close()
+
+
+def _stop(signum: int, frame: FrameType | None) -> None:
+    raise KeyboardInterrupt
+
+
+def watch_command(
+    poll: bool = typer.Option(
+        False, "--poll", help="Poll the tree instead of using inotify.",
+    ),
+    interval: float = typer.Option(
+        2.0, "--interval", min=0.1, help="Polling interval in seconds.",
+    ),
+    detach: bool = typer.Option(
+        False, "--detach", help="Run in the background, logging to .ctxforge/cache/.",
+    ),
+    stop: bool = typer.Option(False, "--stop", help="Stop the running watcher."),
+) -> None:
+    """Keep the analysis caches fresh as files change."""
+    project = _load_project()
+    root = project.root
+    pid = watcher_pid(root)
+
+    if stop:
+        if pid is None:
+            console.print("No watcher running.")
+            return
+        os.kill(pid, signal.SIGTERM)
+        console.print(f"Stopped watcher (pid {pid}).")
+        return
+
+    if pid is not None:
+        console.print(f"[yellow]Already watching (pid {pid}).[/yellow]")
+        raise typer.Exit(1)
+
+    if detach:
+        log = cache_path(root, WATCH_LOG)
+        log.parent.mkdir(parents=True, exist_ok=True)
+        args = [sys.executable, "-m", "ctxforge", "watch", "--interval", str(interval)]
+        if poll:
+            args.append("--poll")
+        with open(log, "ab") as out:
+            proc = subprocess.Popen(
+                args,
+                cwd=root,
+                stdin=subprocess.DEVNULL,
+                stdout=out,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        console.print(f"Watching in the background (pid {proc.pid}, log {log}).")
+        return
+
+    watcher = open_watcher(root, poll=poll, interval=interval)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {interval:g}s"
+    console.print(f"[dim]Using {mode}. Press Ctrl+C to stop.[/dim]")
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        watch_loop(project, watcher)
+    except KeyboardInterrupt:
+        console.print("Stopped.")
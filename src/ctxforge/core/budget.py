@@ -0,0 +1,149 @@
+"""Fit system prompt sections into the profile's token budget."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# Variant levels, from most to least complete.
+FULL = "full"
+SUMMARY = "summary"
+PATH = "path"
+DROPPED = "dropped"
+
+# Share of a section's value kept by each level.
+_LEVEL_VALUE = {FULL: 1.0, SUMMARY: 0.6, PATH: 0.15, DROPPED: 0.0}
+
+# Frontier size past which states are merged onto a token grid.
+_MAX_STATES = 4096
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One way of including a section."""
+
+    level: str  # FULL, SUMMARY, PATH or DROPPED
+    text: str  # what goes into the prompt ("" when dropped)
+    tokens: int  # context it costs, including files the CLI is told to read
+
+
+@dataclass
+class Section:
+    """A budgeted part of the system prompt.
+
+    *full* is used as is whenever everything fits; *degrade* is only
+    called under budget pressure and returns the cheaper variants.  A
+    DROPPED variant is always available unless the section is *required*.
+    """
+
+    name: str
+    weight: float  # priority: value of including the section in full
+    full: Variant
+    degrade: Callable[[], list[Variant]] = field(default=lambda: [])
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class BudgetDecision:
+    """What became of one section."""
+
+    name: str
+    level: str
+    tokens: int
+    full_tokens: int
+
+
+@dataclass
+class BudgetReport:
+    """Outcome of fitting the sections of a system prompt."""
+
+    max_tokens: int
+    decisions: list[BudgetDecision] = field(default_factory=list)
+
+    @property
+    def used_tokens(self) -> int:
+        return sum(d.tokens for d in self.decisions)
+
+    @property
+    def full_tokens(self) -> int:
+        return sum(d.full_tokens for d in self.decisions)
+
+    @property
+    def degraded(self) -> list[BudgetDecision]:
+        """Sections shrunk or dropped to fit."""
+        return [d for d in self.decisions if d.level != FULL]
+
+
+def fit_sections(sections: list[Section], max_tokens: int) -> tuple[list[Variant], BudgetReport]:
+    """Choose one variant per section so the total stays within *max_tokens*.
+
+    When the full variants fit, they are taken without degrading
+    anything.  Otherwise this solves the multiple-choice knapsack over
+    all variants, maximising the sum of ``weight * level value``.
+    Required sections are always kept in full, even over budget.
+
+    Returns:
+        The chosen variant of each section, in order, and the report.
+    """
+    if sum(s.full.tokens for s in sections) <= max_tokens:
+        chosen = [s.full for s in sections]
+    else:
+        chosen = _solve(sections, max_tokens)
+    report = BudgetReport(max_tokens, [
+        BudgetDecision(s.name, v.level, v.tokens, s.full.tokens)
+        for s, v in zip(sections, chosen)
+    ])
+    return chosen, report
+
+
+def _options(section: Section) -> list[Variant]:
+    if section.required:
+        return [section.full]
+    options = [section.full, *section.degrade()]
+    if all(v.level != DROPPED for v in options):
+        options.append(Variant(DROPPED, "", 0))
+    return options
+
+
+def _solve(sections: list[Section], max_tokens: int) -> list[Variant]:
+    """Exact multiple-choice knapsack over the Pareto frontier of states.
+
+    A state is (tokens, value, choices); after each section only states
+    not dominated by a cheaper, at-least-as-valuable one are kept.
+    """
+    capacity = max_tokens - sum(s.full.tokens for s in sections if s.required)
+    options = [_options(s) for s in sections]
+    states: list[tuple[int, float, tuple[int, ...]]] = [(0, 0.0, ())]
+    for section, variants in zip(sections, options):
+        if section.required:
+            states = [(t, v, (*c, 0)) for t, v, c in states]
+            continue
+        grown = [
+            (tokens + variant.tokens, value + section.weight * _LEVEL_VALUE[variant.level],
+             (*choice, i))
+            for tokens, value, choice in states
+            for i, variant in enumerate(variants)
+            if tokens + variant.tokens <= max(capacity, 0)
+        ]
+        states = _frontier(grown)
+    _, _, best = max(states, key=lambda s: (s[1], -s[0]))
+    return [variants[i] for variants, i in zip(options, best)]
+
+
+def _frontier(
+    states: list[tuple[int, float, tuple[int, ...]]],
+) -> list[tuple[int, float, tuple[int, ...]]]:
+    states.sort(key=lambda s: (s[0], -s[1]))
+    kept: list[tuple[int, float, tuple[int, ...]]] = []
+    for state in states:
+        if not kept or state[1] > kept[-1][1]:
+            kept.append(state)
+    if len(kept) > _MAX_STATES:
+        # Keep the most valuable state per grid cell so the frontier
+        # stays bounded however many sections there are.
+        step = kept[-1][0] // _MAX_STATES + 1
+        cells: dict[int, tuple[int, float, tuple[int, ...]]] = {}
+        for state in kept:
+            cells[state[0] // step] = state  # later states are more valuable
+        kept = list(cells.values())
+    return kept
@@ -2,56 +2,170 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+from ctxforge.analysis.file_reader import TEXT, FileContent, cap_text, read_capped
+from ctxforge.analysis.file_sections import (
+    MARKDOWN_SUFFIXES,
+    FileSlice,
+    SectionIndex,
+    parse_headings,
+    parse_ref,
+)
+from ctxforge.analysis.symbols import SOURCE_EXTENSIONS, extract_symbols
+from ctxforge.analysis.tokens import TokenCounter, token_model
+from ctxforge.core.budget import (
+    FULL,
+    PATH,
+    SUMMARY,
+    BudgetReport,
+    Section,
+    Variant,
+    fit_sections,
+)
+from ctxforge.core.section_cache import SectionCache
+from ctxforge.enhancers.base import DEFAULT_MAX_TOKENS, Enhancer
+from ctxforge.enhancers.registry import get_enhancer
 from ctxforge.spec.schema import ProfileConfig
 
+# Section priorities for the token budget (see SimpleInjection.compose_system).
+_RECORD_WEIGHT = 100.0
+_KEY_FILE_WEIGHT = 10.0  # first key file 2x this, last one about 1x
+_TOOLS_WEIGHT = 8.0
+_ENHANCER_WEIGHT = 5.0
+
+# Lines kept in the outline that stands in for a key file over budget.
+_OUTLINE_LINES = 30
+
+# Name prefix of key file sections whose content is embedded (InlineInjection).
+_INLINE = "inline:"
+# A truncated file showing less than this is listed rather than embedded.
+_MIN_INLINE_BYTES = 256
+
+
+@dataclass
+class SystemPrompt:
+    """A system prompt and how the token budget shaped it."""
+
+    text: str
+    budget: BudgetReport
+
 
 class SimpleInjection:
     """Concatenate role prompt + key file contents + user prompt."""
 
     def __init__(self, project_root: Path) -> None:
         self._root = project_root
+        self._index: SectionIndex | None = None  # loaded for the first section reference
 
     def build(self, profile: ProfileConfig, user_prompt: str) -> str:
         """Assemble the full prompt.
 
         Order is determined by profile.injection.order:
-          - "role_first": role → work record → key files → user prompt
-          - "files_first": key files → work record → role → user prompt
+          - "role_first": role → work record → key files → context → user prompt
+          - "files_first": key files → context → work record → role → user prompt
+
+        The context part is whatever the strategy adds for *user_prompt*
+        (see :meth:`_context_sections`).
         """
         role_part = self._role_section(profile)
         record_part = self._work_record_section(profile)
         files_part = self._files_section(profile)
+        context = self._context_sections(profile, self._counter(profile), user_prompt)
+        context_part = self._render_context(context, [c.full for c in context])
         user_part = user_prompt.strip()
 
         if profile.injection.order == "files_first":
-            parts = [files_part, record_part, role_part, user_part]
+            parts = [files_part, context_part, record_part, role_part, user_part]
         else:
-            parts = [role_part, record_part, files_part, user_part]
+            parts = [role_part, record_part, files_part, context_part, user_part]
 
         return "\n\n".join(p for p in parts if p)
 
     def build_system(
-        self, profile: ProfileConfig, language: str | None = None
+        self,
+        profile: ProfileConfig,
+        language: str | None = None,
+        tools: Sequence[tuple[str, str]] = (),
     ) -> str:
         """Build a system prompt (no user prompt) for interactive mode.
 
+        See :meth:`compose_system`, which also reports how the token
+        budget was applied.
+        """
+        return self.compose_system(profile, language, tools).text
+
+    def compose_system(
+        self,
+        profile: ProfileConfig,
+        language: str | None = None,
+        tools: Sequence[tuple[str, str]] = (),
+    ) -> SystemPrompt:
+        """Build a system prompt that fits ``profile.budget.max_tokens``.
+
         Sections are ordered according to ``profile.injection.order``:
-          - "role_first": role → work record → key files → language
-          - "files_first": key files → work record → role → language
+          - "role_first": role → work record → key files → context → enhancers → tools
+            → language
+          - "files_first": key files → context → enhancers → work record → role → tools
+            → language
+
+        *tools* are the (name, description) pairs of the available MCP
+        tools.  Work record files and key files cost their full size, as
+        the CLI is told to read them.  When everything does not fit,
+        :func:`~ctxforge.core.budget.fit_sections` picks cheaper variants
+        by priority (work record, then key files in profile order, then
+        context, tools and enhancers): outlines or bare paths for files, shorter
+        renderings or names only for the rest, or nothing.  The role and
+        language sections are always kept.
+
+        Raises:
+            EnhancerNotFoundError: If the profile enables an unknown enhancer.
         """
+        counter = self._counter(profile)
+        cache = self._section_cache(profile)
+        records = self._record_sections(profile, counter, cache)
+        files = self._key_file_sections(profile, counter, cache)
+        context = self._context_sections(profile, counter, "")
+        enhancers = self._enhancer_budget_sections(profile, counter)
+        tool_sections = _tool_sections(tools, counter)
         role_part = self._role_section(profile)
-        record_part = self._work_record_section(profile)
-        files_part = self._files_section(profile)
         lang_part = self._language_section(language)
+        fixed = [
+            Section(name, 0, Variant(FULL, text, counter.count(text)), required=True)
+            for name, text in (("role", role_part), ("language", lang_part)) if text
+        ]
 
+        sections = [*records, *files, *context, *tool_sections, *enhancers, *fixed]
+        chosen, report = fit_sections(sections, profile.budget.max_tokens)
+        counter.save()
+        cache.save()
+        self._save_index()
+        variants = iter(chosen)
+        record_variants = [next(variants) for _ in records]
+        file_variants = [next(variants) for _ in files]
+        context_variants = [next(variants) for _ in context]
+        tools_part = "".join(next(variants).text for _ in tool_sections)
+        enhancer_parts = [next(variants).text for _ in enhancers]
+
+        record_part = _render_work_record(records, record_variants)
+        files_part = _render_key_files(files, file_variants)
+        context_part = self._render_context(context, context_variants)
         if profile.injection.order == "files_first":
-            parts = [files_part, record_part, role_part, lang_part]
+            parts = [
+                files_part, context_part, *enhancer_parts, record_part, role_part,
+                tools_part, lang_part,
+            ]
         else:
-            parts = [role_part, record_part, files_part, lang_part]
+            parts = [
+                role_part, record_part, files_part, context_part, *enhancer_parts,
+                tools_part, lang_part,
+            ]
 
-        return "\n\n".join(p for p in parts if p)
+        return SystemPrompt("\n\n".join(p for p in parts if p), report)
 
     def _role_section(self, profile: ProfileConfig) -> str:
         prompt = profile.role.prompt.strip()
@@ -60,53 +174,173 @@ class SimpleInjection:
         return f"[Role: {profile.profile.name}]\n{prompt}"
 
     def _work_record_section(self, profile: ProfileConfig) -> str:
-        if not profile.work_record.files:
-            return ""
-        profile_dir = (
-            Path(".ctxforge") / "profiles" / profile.profile.name
+        records = self._record_sections(
+            profile, self._counter(profile), self._section_cache(profile)
+        )
+        return _render_work_record(records, [r.full for r in records])
+
+    def _files_section(self, profile: ProfileConfig) -> str:
+        files = self._key_file_sections(
+            profile, self._counter(profile), self._section_cache(profile)
         )
-        entries: list[str] = []
-        memo_entries: list[str] = []
+        self._save_index()
+        return _render_key_files(files, [f.full for f in files])
+
+    def _counter(self, profile: ProfileConfig) -> TokenCounter:
+        return TokenCounter.load(self._root, token_model(profile.cli.name))
+
+    def _section_cache(self, profile: ProfileConfig) -> SectionCache:
+        strategy = f"{type(self).__module__}.{type(self).__qualname__}"
+        return SectionCache.load(self._root, profile, strategy)
+
+    def _record_sections(
+        self, profile: ProfileConfig, counter: TokenCounter, cache: SectionCache
+    ) -> list[Section]:
+        """One section per existing work record file; memos are named ``memo:<path>``."""
+        profile_dir = Path(".ctxforge") / "profiles" / profile.profile.name
+        sections: list[Section] = []
         for filename, desc in profile.work_record.files.items():
             rel = profile_dir / filename
-            full = self._root / rel
-            if full.is_file():
-                if "memo" in filename:
-                    memo_entries.append(f"- {rel}  ({desc})")
-                else:
-                    entries.append(f"- {rel}  ({desc})")
-        if not entries and not memo_entries:
-            return ""
-        parts: list[str] = [
-            "[Work Record]\n"
-            "IMPORTANT: Read these files first. They contain the AI's working "
-            "memory for this profile and take priority over key files:",
-        ]
-        parts.extend(entries)
-        if memo_entries:
-            parts.append(
-                "\nThe following are user memos — persistent notes and "
-                "instructions from the user. Read and follow them, but do NOT "
-                "modify unless the user explicitly asks:"
+            section = cache.section(
+                f"record:{rel.as_posix()}",
+                [self._root / rel],
+                partial(self._record_section, profile_dir, filename, desc, counter),
             )
-            parts.extend(memo_entries)
-        return "\n".join(parts)
+            if section is not None:
+                sections.append(section)
+        return sections
 
-    def _files_section(self, profile: ProfileConfig) -> str:
-        if not profile.key_files.paths:
-            return ""
-        lines: list[str] = []
-        for rel_path in profile.key_files.paths:
-            full = self._root / rel_path
-            if full.is_file():
-                lines.append(f"- {rel_path}")
-        if not lines:
-            return ""
-        header = (
-            "[Key Files]\n"
-            "Read the following files to understand the project context:"
+    def _record_section(
+        self, profile_dir: Path, filename: str, desc: str, counter: TokenCounter
+    ) -> Section | None:
+        rel = profile_dir / filename
+        tokens = counter.count_file(rel.as_posix())
+        if tokens is None:
+            return None
+        line = f"- {rel}  ({desc})"
+        short = f"{line} — over the token budget: read only the latest entries"
+        return Section(
+            f"memo:{rel}" if "memo" in filename else str(rel),
+            _RECORD_WEIGHT,
+            Variant(FULL, line, counter.count(line) + tokens),
+            degrade=partial(path_only, short, counter),
         )
-        return header + "\n" + "\n".join(lines)
+
+    def _key_file_sections(
+        self, profile: ProfileConfig, counter: TokenCounter, cache: SectionCache
+    ) -> list[Section]:
+        """One section per existing key file or file section, earlier ones weighing more.
+
+        ``path#heading`` and ``path:first-last`` entries (see
+        :func:`~ctxforge.analysis.file_sections.parse_ref`) cost only
+        the part they select; the CLI is told which lines to read.
+        """
+        paths = profile.key_files.paths
+        sections: list[Section] = []
+        for i, entry in enumerate(paths):
+            section = cache.section(
+                f"key:{entry}",
+                [self._root / parse_ref(entry).path],
+                partial(self._key_file_section, entry, _key_file_weight(i, len(paths)), counter),
+            )
+            if section is not None:
+                sections.append(section)
+        return sections
+
+    def _key_file_section(
+        self, entry: str, weight: float, counter: TokenCounter
+    ) -> Section | None:
+        ref = parse_ref(entry)
+        if not ref.whole:
+            piece = self._slice(entry, counter)
+            if piece is None:
+                return None
+            line = f"- {piece.label}"
+            return Section(
+                entry,
+                weight,
+                Variant(FULL, line, counter.count(line) + counter.count(piece.text)),
+                degrade=partial(self._slice_variants, piece, counter),
+            )
+        tokens = counter.count_file(Path(entry).as_posix())
+        if tokens is None:
+            return None
+        line = f"- {entry}"
+        return Section(
+            entry,
+            weight,
+            Variant(FULL, line, counter.count(line) + tokens),
+            degrade=partial(self._key_file_variants, entry, counter),
+        )
+
+    def _slice(self, entry: str, counter: TokenCounter) -> FileSlice | None:
+        """The part of a file the key file *entry* selects (None if it does not exist)."""
+        ref = parse_ref(entry)
+        if self._index is None:
+            self._index = SectionIndex.load(self._root)
+        return self._index.resolve(ref, counter.file_stats(Path(ref.path).as_posix()))
+
+    def _save_index(self) -> None:
+        if self._index is not None:
+            self._index.save()
+
+    def _slice_variants(self, piece: FileSlice, counter: TokenCounter) -> list[Variant]:
+        line = f"- {piece.label}"
+        variants = [Variant(PATH, line, counter.count(line))]
+        outline = _outline(piece.ref.path, piece.text) if piece.ref.heading else []
+        if len(outline) > 1:
+            summary = "\n".join([line, *(f"  {entry}" for entry in outline)])
+            variants.insert(0, Variant(SUMMARY, summary, counter.count(summary)))
+        return variants
+
+    def _key_file_variants(self, rel_path: str, counter: TokenCounter) -> list[Variant]:
+        line = f"- {rel_path}"
+        variants = [Variant(PATH, line, counter.count(line))]
+        try:
+            text = (self._root / rel_path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return variants
+        outline = _outline(rel_path, text)
+        if outline:
+            summary = "\n".join([line, *(f"  {entry}" for entry in outline)])
+            variants.insert(0, Variant(SUMMARY, summary, counter.count(summary)))
+        return variants
+
+    def _context_sections(
+        self, profile: ProfileConfig, counter: TokenCounter, task: str
+    ) -> list[Section]:
+        """Sections a strategy adds after the key files; none here.
+
+        *task* is the user prompt of a one-shot run, "" for a session.
+        """
+        return []
+
+    def _render_context(self, sections: list[Section], variants: list[Variant]) -> str:
+        """The text of the chosen *variants* of :meth:`_context_sections`."""
+        return ""
+
+    def _enhancer_budget_sections(
+        self, profile: ProfileConfig, counter: TokenCounter
+    ) -> list[Section]:
+        max_tokens = profile.enhancers.max_tokens or DEFAULT_MAX_TOKENS
+        sections: list[Section] = []
+        for name in profile.enhancers.enabled:
+            enhancer = get_enhancer(name)
+            text = enhancer.render(self._root, profile, max_tokens)
+
+            def shorter(enhancer: Enhancer = enhancer, full: str = text) -> list[Variant]:
+                short = enhancer.render(self._root, profile, max(max_tokens // 4, 1))
+                if not short or len(short) >= len(full):
+                    return []
+                return [Variant(SUMMARY, short, counter.count(short))]
+
+            sections.append(Section(
+                f"enhancer:{name}",
+                _ENHANCER_WEIGHT,
+                Variant(FULL, text, counter.count(text)),
+                degrade=shorter,
+            ))
+        return sections
 
     @staticmethod
     def _language_section(language: str | None) -> str:
@@ -164,3 +398,187 @@ class SimpleInjection:
             f"After compression, briefly confirm you are ready.{lang_hint}"
         )
 
+
+class InlineInjection(SimpleInjection):
+    """Embed key file contents in the prompt instead of listing their paths.
+
+    Saves the CLI a read per key file at the start of the session.  Each
+    file is read through :func:`~ctxforge.analysis.file_reader.read_capped`,
+    up to ``injection.max_file_bytes``, and all of them together up to
+    ``injection.max_total_bytes``; truncated files say so.  Section and
+    line range entries embed only the part they select.  Binary and
+    non-UTF-8 files, and those left with too little of the total cap,
+    are listed as by :class:`SimpleInjection`.  Over the token budget,
+    embedded files degrade to outlines and paths like listed ones.
+    """
+
+    def _key_file_sections(
+        self, profile: ProfileConfig, counter: TokenCounter, cache: SectionCache
+    ) -> list[Section]:
+        paths = profile.key_files.paths
+        remaining = profile.injection.max_total_bytes
+        sections: list[Section] = []
+        for i, entry in enumerate(paths):
+            cap = max(min(profile.injection.max_file_bytes, remaining), 0)
+            section = cache.section(
+                f"key:{entry}:{cap}",
+                [self._root / parse_ref(entry).path],
+                partial(self._inline_section, entry, _key_file_weight(i, len(paths)),
+                        counter, cap),
+            )
+            if section is None:
+                continue
+            if section.name.startswith(_INLINE):
+                remaining -= len(section.full.text.encode("utf-8"))
+            sections.append(section)
+        return sections
+
+    def _inline_section(
+        self, entry: str, weight: float, counter: TokenCounter, cap: int
+    ) -> Section | None:
+        """The key file *entry* embedded up to *cap* bytes, or listed if it cannot be."""
+        listed = self._key_file_section(entry, weight, counter)
+        if listed is None or cap <= 0:
+            return listed
+        if parse_ref(entry).whole:
+            source = entry
+            content = read_capped(self._root / entry, cap)
+        else:
+            piece = self._slice(entry, counter)
+            if piece is None:
+                return listed
+            source = piece.label
+            content = cap_text(piece.text, cap)
+        if (
+            content is None
+            or content.kind != TEXT
+            or content.truncated and content.shown < _MIN_INLINE_BYTES
+        ):
+            return listed
+        block = inline_block(source, content)
+        return Section(
+            _INLINE + entry,
+            weight,
+            Variant(FULL, block, counter.count(block)),
+            degrade=listed.degrade,
+        )
+
+
+# ── Budgeted sections ───────────────────────────────────────────────────────
+
+
+def _key_file_weight(index: int, count: int) -> float:
+    return _KEY_FILE_WEIGHT * (2 - index / count)
+
+
+def path_only(text: str, counter: TokenCounter) -> list[Variant]:
+    """The degraded variants of a section that shrinks to the pointer *text*."""
+    return [Variant(PATH, text, counter.count(text))]
+
+
+def _outline(rel_path: str, text: str) -> list[str]:
+    """Headings of a Markdown file or top-level signatures of a source file."""
+    suffix = Path(rel_path).suffix.lower()
+    if suffix in MARKDOWN_SUFFIXES:
+        headings = parse_headings(text.encode("utf-8", "surrogatepass"))
+        return [f"{'#' * h.level} {h.title}" for h in headings[:_OUTLINE_LINES]]
+    if suffix in SOURCE_EXTENSIONS:
+        symbols = extract_symbols(rel_path, text)
+        return [s.signature for s in symbols if s.depth == 0][:_OUTLINE_LINES]
+    return []
+
+
+def _tool_sections(tools: Sequence[tuple[str, str]], counter: TokenCounter) -> list[Section]:
+    if not tools:
+        return []
+    header = (
+        "[Available MCP Tools]\n"
+        "The following MCP tools are connected and ready to use:\n"
+    )
+    full = header + "\n".join(
+        f"- {name} — {desc}" if desc else f"- {name}" for name, desc in tools
+    )
+    names = header + "\n".join(f"- {name}" for name, _ in tools)
+    return [Section(
+        "tools",
+        _TOOLS_WEIGHT,
+        Variant(FULL, full, counter.count(full)),
+        degrade=lambda: [Variant(SUMMARY, names, counter.count(names))] if names != full else [],
+    )]
+
+
+def inline_block(source: str, content: FileContent) -> str:
+    """*content* of *source* (a path or slice label) in a fence no line of it can close."""
+    runs = re.findall(r"`{3,}", content.text)
+    fence = "`" * (max(map(len, runs), default=2) + 1)
+    body = content.text
+    if body and not body.endswith("\n"):
+        body += "\n"
+    parts = [f"### {source}", f"{fence}\n{body}{fence}"]
+    if content.truncated:
+        parts.append(
+            f"[truncated: first {content.shown:,} of {content.size:,} bytes shown; "
+            f"read {source} for the rest]"
+        )
+    return "\n".join(parts)
+
+
+def _render_work_record(sections: list[Section], variants: list[Variant]) -> str:
+    entries: list[str] = []
+    memo_entries: list[str] = []
+    for section, variant in zip(sections, variants):
+        if variant.text:
+            memo = section.name.startswith("memo:")
+            (memo_entries if memo else entries).append(variant.text)
+    if not entries and not memo_entries:
+        return ""
+    parts: list[str] = [
+        "[Work Record]\n"
+        "IMPORTANT: Read these files first. They contain the AI's working "
+        "memory for this profile and take priority over key files:",
+    ]
+    parts.extend(entries)
+    if memo_entries:
+        parts.append(
+            "\nThe following are user memos — persistent notes and "
+            "instructions from the user. Read and follow them, but do NOT "
+            "modify unless the user explicitly asks:"
+        )
+        parts.extend(memo_entries)
+    return "\n".join(parts)
+
+
+def _render_key_files(sections: list[Section], variants: list[Variant]) -> str:
+    inline = [
+        v.text for s, v in zip(sections, variants)
+        if v.level == FULL and s.name.startswith(_INLINE)
+    ]
+    groups = {
+        level: [
+            v.text for s, v in zip(sections, variants)
+            if v.level == level and not (level == FULL and s.name.startswith(_INLINE))
+        ]
+        for level in (FULL, SUMMARY, PATH)
+    }
+    if not inline and not any(groups.values()):
+        return ""
+    parts = ["[Key Files]"]
+    if groups[FULL]:
+        parts.append("Read the following files to understand the project context:")
+        parts.extend(groups[FULL])
+    if groups[SUMMARY]:
+        parts.append(
+            "Only the outlines of these files fit the token budget; "
+            "read the parts you need:"
+        )
+        parts.extend(groups[SUMMARY])
+    if groups[PATH]:
+        parts.append("Also relevant, but over the token budget; read only when needed:")
+        parts.extend(groups[PATH])
+    if inline:
+        parts.append(
+            "The contents of these files are included below; "
+            "do not read them again unless they change:"
+        )
+        parts.append("\n\n".join(inline))
+    return "\n".join(parts)
@@ -2,32 +2,64 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from ctxforge.core.injection import SimpleInjection
+from ctxforge.core.strategies import InjectionStrategy, get_strategy
 from ctxforge.spec.schema import ProfileConfig
 
+if TYPE_CHECKING:
+    from ctxforge.core.injection import SystemPrompt
+
 
 class PromptBuilder:
-    """Build a context-injected prompt from a profile and user input."""
+    """Build a context-injected prompt from a profile and user input.
+
+    The injection strategy is the one named by ``profile.injection.strategy``
+    (see :mod:`ctxforge.core.strategies`); it is imported on first use.
+
+    Raises:
+        StrategyNotFoundError: From any method, if the profile selects an
+            unknown injection strategy.
+    """
 
     def __init__(self, project_root: Path) -> None:
-        self._injector = SimpleInjection(project_root)
+        self._root = project_root
+        self._injectors: dict[str, InjectionStrategy] = {}
+
+    def _injector(self, profile: ProfileConfig) -> InjectionStrategy:
+        name = profile.injection.strategy
+        injector = self._injectors.get(name)
+        if injector is None:
+            injector = self._injectors[name] = get_strategy(name, self._root)
+        return injector
 
     def build(self, profile: ProfileConfig, user_prompt: str) -> str:
-        return self._injector.build(profile, user_prompt)
+        return self._injector(profile).build(profile, user_prompt)
 
     def build_system(
-        self, profile: ProfileConfig, language: str | None = None
+        self,
+        profile: ProfileConfig,
+        language: str | None = None,
+        tools: Sequence[tuple[str, str]] = (),
     ) -> str:
-        return self._injector.build_system(profile, language)
+        return self.compose_system(profile, language, tools).text
+
+    def compose_system(
+        self,
+        profile: ProfileConfig,
+        language: str | None = None,
+        tools: Sequence[tuple[str, str]] = (),
+    ) -> SystemPrompt:
+        return self._injector(profile).compose_system(profile, language, tools)
 
     def build_greeting(
         self, profile: ProfileConfig, language: str | None = None
     ) -> str:
-        return self._injector.build_greeting(profile, language)
+        return self._injector(profile).build_greeting(profile, language)
 
     def build_compress_greeting(
         self, profile: ProfileConfig, language: str | None = None
     ) -> str:
-        return self._injector.build_compress_greeting(profile, language)
+        return self._injector(profile).build_compress_greeting(profile, language)
@@ -0,0 +1,132 @@
+"""Refresh the analysis caches a session start reads."""
+
+from __future__ import annotations
+
+import posixpath
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from ctxforge.analysis.doc_index import POSTINGS_FILE, update_doc_index
+from ctxforge.analysis.file_sections import MARKDOWN_SUFFIXES, SectionIndex, parse_ref
+from ctxforge.analysis.file_stats import FileStatsIndex
+from ctxforge.analysis.git_history import GitHistory, changed_paths, commit_paths
+from ctxforge.analysis.scan_index import ScanIndex
+from ctxforge.core.profile import ProfileManager
+from ctxforge.core.project import Project
+from ctxforge.enhancers.repo_map import RepoMapEnhancer
+from ctxforge.exceptions import CForgeError
+from ctxforge.storage.cache import cache_path
+
+
+@dataclass
+class RefreshResult:
+    """What a refresh covered."""
+
+    source_files: int  # files in the repo map outline
+    tracked_files: int  # key files and work records with cached stats
+    doc_files: int  # documents in the retrieval index (0 if none is kept)
+    seconds: float
+
+
+def tracked_paths(project: Project) -> list[str]:
+    """Key files and work records of every profile, ``/``-separated."""
+    pm = ProfileManager(project.profiles_dir)
+    paths: dict[str, None] = {}
+    for name in pm.list_names():
+        try:
+            config = pm.load(name)
+        except CForgeError:
+            continue
+        for entry in config.key_files.paths:
+            paths[Path(parse_ref(entry).path).as_posix()] = None
+        for filename in config.work_record.files:
+            paths[f".ctxforge/profiles/{name}/{filename}"] = None
+    return list(paths)
+
+
+def uses_retrieval(project: Project) -> bool:
+    """Whether any profile injects context with the "retrieval" strategy."""
+    pm = ProfileManager(project.profiles_dir)
+    for name in pm.list_names():
+        try:
+            if pm.load(name).injection.strategy == "retrieval":
+                return True
+        except CForgeError:
+            continue
+    return False
+
+
+_NULL_SHA = "0" * 40
+
+
+def hook_changes(root: Path, hook: str, args: list[str]) -> list[str] | None:
+    """Paths changed by the git operation that ran *hook* with *args*.
+
+    Returns None when they cannot be told (file checkouts, a fresh
+    clone, git errors): the caller then refreshes everything.
+    """
+    if hook == "post-commit":
+        return commit_paths(root)
+    if hook == "post-merge":
+        return changed_paths(root, "ORIG_HEAD")
+    if hook == "post-checkout" and len(args) == 3:
+        old, new, branch_checkout = args
+        if branch_checkout == "1" and old != _NULL_SHA:
+            return changed_paths(root, old, new)
+    return None
+
+
+def refresh_indexes(project: Project, changed: Iterable[str] | None = None) -> RefreshResult:
+    """Bring the scan index, symbol cache, churn index and key-file caches up to date.
+
+    The document index is refreshed too when a profile uses the
+    "retrieval" strategy or it was built before.
+
+    Args:
+        project: The project whose caches under ``.ctxforge/cache/`` are
+            refreshed.
+        changed: ``/``-separated paths known to have changed since the
+            last refresh; their directories are re-listed even if the
+            directory mtime did not move (in-place edits).  None means
+            unknown: every directory is re-listed.
+
+    Only files whose mtime or size changed are re-read, and only those
+    whose content hash changed are re-parsed.
+    """
+    start = time.perf_counter()
+    root = project.root
+
+    index = ScanIndex.load(root)
+    if changed is None:
+        index.forget()
+    else:
+        dirs = set()
+        for rel in changed:
+            dirs.add(rel)
+            dirs.add(posixpath.dirname(rel))
+        index.forget(dirs)
+    index.save(prune=False)
+
+    outline = RepoMapEnhancer.collect(root, use_watcher=False)
+    GitHistory.load(root)  # parses only the commits since the cached head
+
+    paths = tracked_paths(project)
+    stats = FileStatsIndex.load(root)
+    stats.refresh(root, paths)
+    stats.save()
+
+    sections = SectionIndex.load(root)
+    for rel in paths:
+        if rel.lower().endswith(MARKDOWN_SUFFIXES) and not rel.startswith(".ctxforge/"):
+            file_stats = stats.stats(root, rel)
+            if file_stats is not None:
+                sections.headings(rel, file_stats)
+    sections.save()
+
+    docs = 0
+    if cache_path(root, POSTINGS_FILE).is_file() or uses_retrieval(project):
+        docs = update_doc_index(root, use_watcher=False)
+
+    return RefreshResult(len(outline), len(paths), docs, time.perf_counter() - start)
@@ -0,0 +1,115 @@
+"""Retrieval injection — add the project docs most relevant to the profile's work."""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+
+from ctxforge.analysis.doc_index import DocHit, DocSearcher, update_doc_index
+from ctxforge.analysis.file_reader import TEXT, FileContent
+from ctxforge.analysis.file_sections import parse_ref
+from ctxforge.analysis.git_history import current_branch
+from ctxforge.analysis.tokens import TokenCounter
+from ctxforge.core.budget import FULL, PATH, Section, Variant
+from ctxforge.core.injection import SimpleInjection, inline_block, path_only
+from ctxforge.spec.schema import ProfileConfig
+
+# Priority of the best matching chunk; the others weigh less in proportion
+# to their score.  Below key files and tools: retrieved text is a guess.
+_RETRIEVED_WEIGHT = 6.0
+
+# Branches whose name says nothing about the work at hand.
+_TRUNK_BRANCHES = frozenset({"main", "master", "trunk", "develop", "dev"})
+
+
+def retrieval_query(profile: ProfileConfig, root: Path, task: str = "") -> str:
+    """The text searched for *profile*: who it is, what it works on and *task*.
+
+    That is the profile's name, description and role prompt,
+    ``retrieval.query``, the last component of the current git branch
+    (feature branches name their topic; trunk branches are left out)
+    and *task*.
+    """
+    parts = [
+        profile.profile.name,
+        profile.profile.description,
+        profile.role.prompt,
+        profile.retrieval.query,
+        task,
+    ]
+    branch = current_branch(root)
+    if branch is not None and branch not in _TRUNK_BRANCHES:
+        parts.append(branch.rpartition("/")[2])
+    return "\n".join(p for p in parts if p)
+
+
+class RetrievalInjection(SimpleInjection):
+    """List key files, then embed the documentation chunks that match the profile.
+
+    Markdown and text files of the project are indexed offline by
+    :func:`~ctxforge.analysis.doc_index.update_doc_index` (only changed
+    files are re-read) and searched with BM25 for
+    :func:`retrieval_query`.  The ``retrieval.top_k`` best chunks are
+    embedded, best first, as long as they fit ``retrieval.max_tokens``;
+    chunks of whole key files are skipped since those are read anyway.
+    Over the profile's token budget, the weakest chunks degrade to
+    pointers (path and lines), then are dropped.
+    """
+
+    def _context_sections(
+        self, profile: ProfileConfig, counter: TokenCounter, task: str
+    ) -> list[Section]:
+        query = retrieval_query(profile, self._root, task)
+        update_doc_index(self._root)
+        searcher = DocSearcher.open(self._root)
+        if searcher is None:
+            return []
+        skip = {Path(e).as_posix() for e in profile.key_files.paths if parse_ref(e).whole}
+        with searcher:
+            hits = searcher.search(query, profile.retrieval.top_k, skip)
+        sections: list[Section] = []
+        remaining = profile.retrieval.max_tokens
+        for hit in hits:
+            block = self._chunk_block(hit)
+            if block is None:
+                continue
+            tokens = counter.count(block)
+            if tokens > remaining:
+                continue
+            remaining -= tokens
+            line = f"- {hit.label}"
+            sections.append(Section(
+                f"doc:{hit.path}:{hit.first_line}",
+                _RETRIEVED_WEIGHT * hit.score / hits[0].score,
+                Variant(FULL, block, tokens),
+                degrade=partial(path_only, line, counter),
+            ))
+        return sections
+
+    def _render_context(self, sections: list[Section], variants: list[Variant]) -> str:
+        embedded = [v.text for v in variants if v.level == FULL]
+        pointers = [v.text for v in variants if v.level == PATH]
+        if not embedded and not pointers:
+            return ""
+        parts = ["[Relevant Docs]"]
+        if embedded:
+            parts.append(
+                "Excerpts from the project documentation that match this profile's "
+                "work, most relevant first:"
+            )
+            parts.append("\n\n".join(embedded))
+        if pointers:
+            parts.append("Also relevant, but over the token budget; read only when needed:")
+            parts.extend(pointers)
+        return "\n".join(parts)
+
+    def _chunk_block(self, hit: DocHit) -> str | None:
+        """The text of *hit* in a fenced block, or None if it cannot be read."""
+        try:
+            with open(self._root / hit.path, "rb") as f:
+                f.seek(hit.start)
+                data = f.read(hit.end - hit.start)
+        except OSError:
+            return None
+        text = data.decode("utf-8", "replace").rstrip() + "\n"
+        return inline_block(hit.label, FileContent(TEXT, text, len(data), len(data)))
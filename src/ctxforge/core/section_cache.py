@@ -0,0 +1,185 @@
+"""On-disk cache of system prompt sections, keyed by input fingerprints."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from ctxforge.__version__ import __version__
+from ctxforge.core.budget import Section, Variant
+from ctxforge.spec.schema import ProfileConfig
+from ctxforge.storage.cache import cache_path, racy_cutoff, read_cache, write_cache
+from ctxforge.storage.profile_writer import profile_toml
+
+SECTIONS_FILE = "prompt-sections.json"
+SECTIONS_VERSION = 1
+
+# (st_mtime_ns, st_size, st_ino) of each input, None if it does not exist.
+_Fingerprint = list[list[int] | None]
+
+
+class SectionCache:
+    """Prompt sections of one profile, reused while their inputs are unchanged.
+
+    Entries are valid for one *scope*: the hash of the profile's TOML,
+    the injection strategy and the ctxforge version.  Within it, an
+    entry is reused when the (mtime, size, inode) of each of its input
+    files is unchanged, so a warm lookup costs one ``stat`` per input.
+    Entries whose inputs changed within the last couple of seconds are
+    not persisted, as a further change in the same mtime tick would go
+    unnoticed.
+    The degraded variants of a section are stored once computed.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        profile_name: str,
+        scope: str,
+        entries: dict[str, Any] | None = None,
+        others: dict[str, Any] | None = None,
+    ) -> None:
+        self._root = root
+        self._profile = profile_name
+        self._scope = scope
+        self._entries = entries or {}
+        self._others = others or {}  # other profiles' caches, kept as is
+        self._used: set[str] = set()
+        self._stats: dict[Path, os.stat_result | None] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path, profile: ProfileConfig, strategy: str) -> SectionCache:
+        """The cache of *profile* built with the injection *strategy*."""
+        scope = hashlib.blake2b(
+            "\0".join([__version__, strategy, profile_toml(profile)]).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        name = profile.profile.name
+        data = read_cache(cache_path(root, SECTIONS_FILE), SECTIONS_VERSION)
+        profiles = data.get("profiles") if data is not None else None
+        if not isinstance(profiles, dict):
+            return cls(root, name, scope)
+        mine = profiles.pop(name, None)
+        entries = None
+        if isinstance(mine, dict) and mine.get("scope") == scope:
+            if isinstance(mine.get("sections"), dict):
+                entries = mine["sections"]
+        return cls(root, name, scope, entries, profiles)
+
+    def stat(self, path: Path) -> os.stat_result | None:
+        """``os.stat`` of *path* (None if missing), once per cache instance."""
+        if path not in self._stats:
+            try:
+                self._stats[path] = os.stat(path)
+            except OSError:
+                self._stats[path] = None
+        return self._stats[path]
+
+    def section(
+        self,
+        key: str,
+        inputs: Sequence[Path],
+        build: Callable[[], Section | None],
+    ) -> Section | None:
+        """The section stored under *key*, rebuilt with *build* if an input changed."""
+        self._used.add(key)
+        fingerprint = self._fingerprint(inputs)
+        entry = self._entries.get(key)
+        if isinstance(entry, dict) and entry.get("inputs") == fingerprint:
+            try:
+                return self._restore(entry, build)
+            except (KeyError, TypeError, ValueError):
+                pass  # written by an incompatible version: rebuild
+        section = build()
+        entry = {"inputs": fingerprint, "section": None}
+        if section is not None:
+            entry["section"] = {
+                "name": section.name,
+                "weight": section.weight,
+                "required": section.required,
+                "full": _dump(section.full),
+                "degraded": None,
+            }
+            section = self._remembering(entry, section)
+        self._entries[key] = entry
+        self._dirty = True
+        return section
+
+    def save(self) -> None:
+        """Persist the entries used this session; nothing outside a project."""
+        if not (self._root / ".ctxforge").is_dir():
+            return
+        cutoff = racy_cutoff()
+        live = {
+            k: v for k, v in self._entries.items() if k in self._used and _settled(v, cutoff)
+        }
+        if not self._dirty and live == self._entries:
+            return
+        profiles = {**self._others, self._profile: {"scope": self._scope, "sections": live}}
+        write_cache(cache_path(self._root, SECTIONS_FILE), {"profiles": profiles}, SECTIONS_VERSION)
+        self._entries = live
+        self._dirty = False
+
+    def _fingerprint(self, inputs: Sequence[Path]) -> _Fingerprint:
+        fingerprint: _Fingerprint = []
+        for path in inputs:
+            st = self.stat(path)
+            fingerprint.append(None if st is None else [st.st_mtime_ns, st.st_size, st.st_ino])
+        return fingerprint
+
+    def _restore(
+        self, entry: dict[str, Any], build: Callable[[], Section | None]
+    ) -> Section | None:
+        data = entry["section"]
+        if data is None:
+            return None
+        section = Section(
+            data["name"], float(data["weight"]), _load(data["full"]),
+            required=bool(data["required"]),
+        )
+        degraded = data["degraded"]
+        if degraded is not None:
+            variants = [_load(v) for v in degraded]
+            section.degrade = lambda: list(variants)
+            return section
+
+        def rebuild() -> list[Variant]:
+            fresh = build()
+            return self._remembering(entry, fresh).degrade() if fresh is not None else []
+
+        section.degrade = rebuild
+        return section
+
+    def _remembering(self, entry: dict[str, Any], section: Section) -> Section:
+        """*section*, storing its degraded variants in *entry* once computed."""
+        degrade = section.degrade
+
+        def remember() -> list[Variant]:
+            variants = degrade()
+            entry["section"]["degraded"] = [_dump(v) for v in variants]
+            self._dirty = True
+            return variants
+
+        section.degrade = remember
+        return section
+
+
+def _settled(entry: Any, cutoff: int) -> bool:
+    """Whether every input of *entry* was last modified before *cutoff*."""
+    try:
+        return all(f is None or f[0] < cutoff for f in entry["inputs"])
+    except (KeyError, TypeError, IndexError):
+        return False
+
+
+def _dump(variant: Variant) -> list[Any]:
+    return [variant.level, variant.text, variant.tokens]
+
+
+def _load(data: list[Any]) -> Variant:
+    level, text, tokens = data
+    return Variant(str(level), str(text), int(tokens))
@@ -0,0 +1,109 @@
+"""Injection strategy registry — map strategy names to implementations."""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Sequence
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+from ctxforge.exceptions import StrategyNotFoundError
+from ctxforge.spec.schema import ProfileConfig
+
+if TYPE_CHECKING:
+    from ctxforge.core.injection import SystemPrompt
+
+# Entry point group through which other packages add strategies, e.g. in
+# their pyproject.toml:
+#   [project.entry-points."ctxforge.injection"]
+#   summarized = "my_package.injection:SummarizedInjection"
+ENTRY_POINT_GROUP = "ctxforge.injection"
+
+# Built-in strategies keyed by ``[injection].strategy``.  Targets are
+# "module:attribute" strings so only the selected strategy is imported.
+_STRATEGIES: dict[str, str] = {
+    "simple": "ctxforge.core.injection:SimpleInjection",
+    "inline": "ctxforge.core.injection:InlineInjection",
+    "retrieval": "ctxforge.core.retrieval:RetrievalInjection",
+}
+
+# Strategy factories already imported, by name.
+_LOADED: dict[str, Callable[[Path], InjectionStrategy]] = {}
+
+
+class InjectionStrategy(Protocol):
+    """Protocol that all injection strategies must implement.
+
+    A strategy is created with the project root.  Subclassing
+    :class:`~ctxforge.core.injection.SimpleInjection` and overriding how
+    sections are built is the easiest way to write one.
+    """
+
+    def build(self, profile: ProfileConfig, user_prompt: str) -> str:
+        """Return the full prompt for a one-shot run."""
+        ...
+
+    def compose_system(
+        self,
+        profile: ProfileConfig,
+        language: str | None = None,
+        tools: Sequence[tuple[str, str]] = (),
+    ) -> SystemPrompt:
+        """Return the system prompt for an interactive session."""
+        ...
+
+    def build_greeting(self, profile: ProfileConfig, language: str | None = None) -> str:
+        """Return the initial user prompt, or "" for none."""
+        ...
+
+    def build_compress_greeting(
+        self, profile: ProfileConfig, language: str | None = None
+    ) -> str:
+        """Return the initial user prompt asking to compress key files."""
+        ...
+
+
+def available_strategies() -> list[str]:
+    """Names of the built-in strategies and those installed via entry points."""
+    names = list(_STRATEGIES)
+    names.extend(ep.name for ep in entry_points(group=ENTRY_POINT_GROUP) if ep.name not in names)
+    return names
+
+
+def get_strategy(name: str, project_root: Path) -> InjectionStrategy:
+    """Look up, import and instantiate an injection strategy by name.
+
+    Built-in strategies take precedence over entry points of the same
+    name; installed entry points are only scanned for other names.
+
+    Raises:
+        StrategyNotFoundError: If no strategy is registered for the given
+            name, or it cannot be imported.
+    """
+    factory = _LOADED.get(name)
+    if factory is None:
+        factory = _load(name)
+        _LOADED[name] = factory
+    return factory(project_root)
+
+
+def _load(name: str) -> Callable[[Path], InjectionStrategy]:
+    target = _STRATEGIES.get(name)
+    try:
+        if target is not None:
+            module, _, attr = target.partition(":")
+            loaded = getattr(importlib.import_module(module), attr)
+        else:
+            matches = entry_points(group=ENTRY_POINT_GROUP, name=name)
+            if not matches:
+                raise StrategyNotFoundError(
+                    f"No injection strategy registered for '{name}'. "
+                    f"Available: {', '.join(available_strategies())}"
+                )
+            loaded = next(iter(matches)).load()
+    except (ImportError, AttributeError) as e:
+        raise StrategyNotFoundError(f"Cannot load injection strategy '{name}': {e}") from e
+    if not callable(loaded):
+        raise StrategyNotFoundError(f"Injection strategy '{name}' is not a class: {loaded!r}")
+    return loaded  # type: ignore[no-any-return]
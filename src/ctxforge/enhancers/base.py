@@ -0,0 +1,31 @@
+"""Enhancer protocol."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Protocol
+
+from ctxforge.spec.schema import ProfileConfig
+
+# Rough size of a token, used to turn token caps into character budgets.
+CHARS_PER_TOKEN = 4
+
+# Token cap for each enhancer's section when ``[enhancers].max_tokens`` is unset.
+DEFAULT_MAX_TOKENS = 2000
+
+
+class Enhancer(Protocol):
+    """Protocol that all context enhancers must implement.
+
+    An enhancer contributes one optional section to the system prompt,
+    derived from the project rather than from the profile's own files.
+    """
+
+    name: str
+
+    def render(self, root: Path, profile: ProfileConfig, max_tokens: int) -> str:
+        """Return the section text (header included), or "" to contribute nothing.
+
+        The result must stay within about *max_tokens* tokens.
+        """
+        ...
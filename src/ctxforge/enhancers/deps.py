@@ -0,0 +1,82 @@
+"""Dependencies enhancer — frameworks and versions from manifests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ctxforge.analysis.dep_parser import DependencySummary, Manifest, summarize_dependencies
+from ctxforge.enhancers.base import CHARS_PER_TOKEN
+from ctxforge.spec.schema import ProfileConfig
+
+_HEADER = (
+    "[Dependencies]\n"
+    "Summary of the project's manifests and lockfiles (locked versions where "
+    "pinned); no need to open them for this:"
+)
+
+# Direct dependencies listed per manifest before the rest is counted.
+_MAX_LISTED = 40
+
+
+class DepsEnhancer:
+    """Render frameworks, runtimes and direct dependencies.
+
+    The summary is cached by the mtime of the manifests and lockfiles (see
+    :func:`~ctxforge.analysis.dep_parser.summarize_dependencies`), so large
+    lockfiles are only parsed after they change.  Dev dependencies are
+    dropped first, then runtime ones from the end, to stay within the cap.
+    """
+
+    name = "deps"
+
+    def render(self, root: Path, profile: ProfileConfig, max_tokens: int) -> str:
+        summary = summarize_dependencies(root, use_cache=True)
+        return render_summary(summary, max_tokens)
+
+
+def render_summary(summary: DependencySummary, max_tokens: int) -> str:
+    """Render a summary within about *max_tokens* tokens ("" if nothing fits)."""
+    if not summary.manifests:
+        return ""
+    budget = max_tokens * CHARS_PER_TOKEN
+    text = _render(summary, _MAX_LISTED, with_dev=True)
+    limit = _MAX_LISTED
+    while len(text) > budget:
+        if limit < 0:
+            return ""
+        text = _render(summary, limit, with_dev=False)
+        limit = limit // 2 if limit else -1
+    return text
+
+
+def _render(summary: DependencySummary, limit: int, with_dev: bool) -> str:
+    lines = [_HEADER]
+    if summary.frameworks:
+        lines.append(f"Frameworks: {', '.join(summary.frameworks)}")
+    for m in summary.manifests:
+        lines.append(_manifest_line(m))
+        if m.dependencies:
+            lines.append(f"  deps: {_deps(m.dependencies, limit)}")
+        if with_dev and m.dev_dependencies:
+            lines.append(f"  dev: {_deps(m.dev_dependencies, limit)}")
+    return "\n".join(lines)
+
+
+def _manifest_line(m: Manifest) -> str:
+    source = m.path
+    if m.lockfile:
+        source += f", {m.lockfile}: {m.locked_packages} packages"
+    facts = [f"{m.ecosystem} ({source})"]
+    if m.name:
+        facts.append(f"name {m.name}")
+    if m.runtime:
+        facts.append(m.runtime)
+    return " — ".join(facts)
+
+
+def _deps(deps: dict[str, str], limit: int) -> str:
+    names = sorted(deps)
+    shown = [f"{n} {deps[n]}" if deps[n] not in ("", "*") else n for n in names[:limit]]
+    if len(names) > limit:
+        shown.append(f"… +{len(names) - limit} more")
+    return ", ".join(shown)
@@ -0,0 +1,30 @@
+"""Enhancer registry — map enhancer names to implementations."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ctxforge.enhancers.deps import DepsEnhancer
+from ctxforge.enhancers.repo_map import RepoMapEnhancer
+from ctxforge.exceptions import EnhancerNotFoundError
+
+# Built-in enhancers keyed by the name used in ``[enhancers].enabled``.
+_ENHANCERS: dict[str, Any] = {
+    "repo_map": RepoMapEnhancer,
+    "deps": DepsEnhancer,
+}
+
+
+def get_enhancer(name: str) -> Any:
+    """Look up and instantiate an enhancer by name.
+
+    Raises:
+        EnhancerNotFoundError: If no enhancer is registered for the given name.
+    """
+    enhancer_cls = _ENHANCERS.get(name)
+    if enhancer_cls is None:
+        raise EnhancerNotFoundError(
+            f"No enhancer registered for '{name}'. "
+            f"Available: {', '.join(_ENHANCERS)}"
+        )
+    return enhancer_cls()
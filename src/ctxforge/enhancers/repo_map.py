@@ -0,0 +1,100 @@
+"""Repo map enhancer — an outline of the project's top-level symbols."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from ctxforge.analysis.fs_watch import watcher_pid
+from ctxforge.analysis.scanner import ProjectWalker, ScanLimits
+from ctxforge.analysis.symbols import SOURCE_EXTENSIONS, Symbol, SymbolIndex
+from ctxforge.enhancers.base import CHARS_PER_TOKEN
+from ctxforge.spec.schema import ProfileConfig
+
+_HEADER = (
+    "[Repo Map]\n"
+    "Top-level symbols per source file. Use it to locate code before "
+    "opening files:"
+)
+
+# The walk is bounded so a huge checkout cannot stall session start.
+_WALK_LIMITS = ScanLimits(max_files=50_000, max_seconds=5.0)
+
+
+class RepoMapEnhancer:
+    """Render classes, functions and their signatures, file by file.
+
+    Symbols come from :class:`~ctxforge.analysis.symbols.SymbolIndex`, so
+    only files changed since the last session are parsed.  When the full
+    outline exceeds the token cap, files fall back to a one-line list of
+    names, shallow paths first, and whatever still does not fit is
+    counted in a trailing note.
+    """
+
+    name = "repo_map"
+
+    def render(self, root: Path, profile: ProfileConfig, max_tokens: int) -> str:
+        outline = self.collect(root)
+        return render_outline(outline, max_tokens)
+
+    @staticmethod
+    def collect(root: Path, *, use_watcher: bool = True) -> dict[str, list[Symbol]]:
+        """Map source files (relative paths) to their symbols.
+
+        While ``ctxforge watch`` runs for *root* (and *use_watcher* is set),
+        the symbol cache it keeps fresh is returned as is, without a walk.
+        """
+        index = SymbolIndex.load(root)
+        if use_watcher and watcher_pid(root) is not None:
+            return index.outline()
+        outline: dict[str, list[Symbol]] = {}
+        for entry in ProjectWalker(root, use_cache=True, limits=_WALK_LIMITS):
+            if entry.is_dir or entry.generated:
+                continue
+            dot = entry.name.rfind(".")
+            if dot <= 0 or entry.name[dot:].lower() not in SOURCE_EXTENSIONS:
+                continue
+            # Listings cached by the walk miss in-place edits; stat afresh.
+            try:
+                st = os.stat(root / entry.path)
+            except OSError:
+                continue
+            symbols = index.symbols(root, entry.path, st.st_mtime_ns, st.st_size)
+            if symbols:
+                outline[entry.path] = symbols
+        if (root / ".ctxforge").is_dir():
+            index.save()
+        return outline
+
+
+def render_outline(outline: dict[str, list[Symbol]], max_tokens: int) -> str:
+    """Render an outline within about *max_tokens* tokens ("" if nothing fits)."""
+    if not outline:
+        return ""
+    budget = max_tokens * CHARS_PER_TOKEN - len(_HEADER)
+    full = {path: _full_block(path, symbols) for path, symbols in outline.items()}
+    if sum(len(block) + 1 for block in full.values()) <= budget:
+        return _HEADER + "\n" + "\n".join(full[p] for p in sorted(full))
+
+    chosen: dict[str, str] = {}
+    for path in sorted(outline, key=lambda p: (p.count("/"), p)):
+        block = _compact_block(path, outline[path])
+        if len(block) + 1 > budget:
+            continue
+        chosen[path] = block
+        budget -= len(block) + 1
+    if not chosen:
+        return ""
+    lines = [chosen[p] for p in sorted(chosen)]
+    omitted = len(outline) - len(chosen)
+    if omitted:
+        lines.append(f"(… {omitted} more files not shown)")
+    return _HEADER + "\n" + "\n".join(lines)
+
+
+def _full_block(path: str, symbols: list[Symbol]) -> str:
+    return "\n".join([path, *("  " * (s.depth + 1) + s.signature for s in symbols)])
+
+
+def _compact_block(path: str, symbols: list[Symbol]) -> str:
+    return f"{path}: {', '.join(s.name for s in symbols if s.depth == 0)}"
@@ -27,3 +27,15 @@ class CliNotFoundError(CForgeError):
 
 class RunnerError(CForgeError):
     """Raised when a CLI runner fails to execute."""
+
+
+class EnhancerNotFoundError(CForgeError):
+    """Raised when a profile enables an unknown enhancer."""
+
+
+class HookInstallError(CForgeError):
+    """Raised when git hooks cannot be installed."""
+
+
+class StrategyNotFoundError(CForgeError):
+    """Raised when a profile selects an unknown injection strategy."""
@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+from typing import TYPE_CHECKING
 
 from ctxforge.llm.provider import SDKNotInstalledError, call_llm
 
+if TYPE_CHECKING:
+    from ctxforge.analysis.scanner import ScanReport
+    from ctxforge.analysis.workspace import WorkspaceReport
+
 # Re-export for backward compatibility with init command imports.
 LLMNotAvailableError = SDKNotInstalledError
 
@@ -42,6 +48,56 @@ def suggest_key_files(
     return _parse_file_list(content)
 
 
+def suggest_key_files_for_report(
+    model: str, report: ScanReport, language: str = "English"
+) -> list[str]:
+    """Suggest key files from a (possibly cached) ``scan_project`` report.
+
+    Raises:
+        SDKNotInstalledError: If the required SDK is not installed.
+    """
+    return suggest_key_files(
+        model,
+        report.project_name,
+        report.languages,
+        report.dir_tree,
+        report.config_files,
+        language,
+    )
+
+
+def suggest_key_files_for_workspace(
+    model: str, workspace: WorkspaceReport, language: str = "English"
+) -> list[str]:
+    """Suggest key files for a monorepo from its per-package reports.
+
+    The directory tree shows the top level of the project followed by each
+    package's own tree (prefixed with the package path), so packages below
+    the global depth limit are still visible.  Single-package projects fall
+    back to :func:`suggest_key_files_for_report`.
+
+    Raises:
+        SDKNotInstalledError: If the required SDK is not installed.
+    """
+    if not workspace.packages:
+        return suggest_key_files_for_report(model, workspace.root, language)
+    dir_tree = [d for d in workspace.root.dir_tree if os.sep not in d]
+    config_files = list(workspace.root.config_files)
+    for path, report in workspace.packages.items():
+        package_dir = os.path.join(*path.split("/"))
+        dir_tree.append(package_dir)
+        dir_tree.extend(os.path.join(package_dir, d) for d in report.dir_tree)
+        config_files.extend(f"{path}/{c}" for c in report.config_files)
+    return suggest_key_files(
+        model,
+        workspace.root.project_name,
+        workspace.root.languages,
+        dir_tree,
+        config_files,
+        language,
+    )
+
+
 def _build_prompt(
     project_name: str,
     languages: list[str],
@@ -27,6 +27,15 @@ class DefaultsConfig(BaseModel):
     model: str | None = None  # LLM model for project analysis, e.g. "gpt-4o-mini"
 
 
+class ScanConfig(BaseModel):
+    exclude: list[str] = Field(default_factory=list)  # gitignore-style patterns
+    use_git: bool = False  # list tracked files from the git index instead of walking
+    workers: int = Field(default=1, ge=1)  # threads listing directories (NFS, overlayfs)
+    max_files: int | None = None  # stop scanning after this many files
+    max_seconds: float | None = 30.0  # wall-clock budget for a scan
+    skip_vendored: bool = True  # prune vendor/third_party trees, ignore generated files
+
+
 class ToolDefinition(BaseModel):
     description: str = ""
     command: str
@@ -40,6 +49,7 @@ class ProjectConfig(BaseModel):
     project: ProjectSection = Field(default_factory=ProjectSection)
     cli: CliConfig = Field(default_factory=CliConfig)
     defaults: DefaultsConfig = Field(default_factory=DefaultsConfig)
+    scan: ScanConfig = Field(default_factory=ScanConfig)
     tools: dict[str, ToolDefinition] = Field(default_factory=dict)
 
 
@@ -56,13 +66,21 @@ class RoleSection(BaseModel):
 
 
 class KeyFilesSection(BaseModel):
-    paths: list[str] = Field(default_factory=list)
+    paths: list[str] = Field(default_factory=list)  # "path", "path#heading" or "path:10-80"
 
 
 class InjectionSection(BaseModel):
-    strategy: str = "simple"
+    strategy: str = "simple"  # "simple" (list key files) | "inline" (embed them) | "retrieval"
     order: str = "role_first"  # "role_first" | "files_first"
     greeting: bool = True  # ask AI to confirm context on session start
+    max_file_bytes: int = Field(default=32_000, ge=1)  # inline: cap per key file
+    max_total_bytes: int = Field(default=96_000, ge=1)  # inline: cap over all key files
+
+
+class RetrievalSection(BaseModel):
+    top_k: int = Field(default=8, ge=1)  # doc chunks embedded by the "retrieval" strategy
+    max_tokens: int = Field(default=4000, ge=1)  # cap over all retrieved chunks
+    query: str = ""  # extra search terms, e.g. the current task
 
 
 class BudgetSection(BaseModel):
@@ -87,6 +105,7 @@ class WorkRecordSection(BaseModel):
 
 class EnhancersSection(BaseModel):
     enabled: list[str] = Field(default_factory=list)
+    max_tokens: int | None = Field(default=None, ge=1)  # cap per section; None = 2000
 
 
 class ToolsSection(BaseModel):
@@ -100,6 +119,7 @@ class ProfileConfig(BaseModel):
     work_record: WorkRecordSection = Field(default_factory=WorkRecordSection)
     key_files: KeyFilesSection = Field(default_factory=KeyFilesSection)
     injection: InjectionSection = Field(default_factory=InjectionSection)
+    retrieval: RetrievalSection = Field(default_factory=RetrievalSection)
     cli: ProfileCliSection = Field(default_factory=ProfileCliSection)
     budget: BudgetSection = Field(default_factory=BudgetSection)
     enhancers: EnhancersSection = Field(default_factory=EnhancersSection)
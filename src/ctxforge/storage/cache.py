@@ -0,0 +1,81 @@
+"""Read and write derived-data caches under .ctxforge/cache/."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR = Path(".ctxforge") / "cache"
+
+# Written once per cache directory so caches never end up in version control.
+_GITIGNORE = "# Created by ctxforge — derived data, safe to delete.\n*\n"
+
+# Entries keyed by an mtime this close to "now" are not persisted: a change
+# within the same timestamp tick would leave (mtime, size) as they were and
+# go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def cache_path(root: Path, name: str) -> Path:
+    """Return the path of cache file *name* for the project at *root*."""
+    return root / CACHE_DIR / name
+
+
+def racy_cutoff() -> int:
+    """The mtime from which entries are too recent to persist in a cache written now."""
+    return time.time_ns() - RACY_WINDOW_NS
+
+
+def read_cache(path: Path, version: int) -> dict[str, Any] | None:
+    """Load a JSON cache file.
+
+    Returns None when the file is missing, unreadable, corrupt, or was
+    written with a different *version* — callers then rebuild from scratch.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def write_cache(path: Path, data: dict[str, Any], version: int) -> None:
+    """Atomically write *data* as a JSON cache file tagged with *version*.
+
+    Errors are swallowed: a cache that cannot be written is simply rebuilt
+    on the next run.
+    """
+    payload = {**data, "version": version}
+    write_blob(path, [json.dumps(payload, separators=(",", ":")).encode("utf-8")])
+
+
+def write_blob(path: Path, parts: Iterable[bytes]) -> None:
+    """Atomically write the concatenated *parts* as a binary cache file.
+
+    Readers never see a partly written file, even while they map the
+    old one.  Errors are swallowed as by :func:`write_cache`.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        gitignore = path.parent / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text(_GITIGNORE, encoding="utf-8")
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for part in parts:
+                    f.write(part)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
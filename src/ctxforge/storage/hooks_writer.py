@@ -0,0 +1,130 @@
+"""Install and remove the ctxforge block in git hooks."""
+
+from __future__ import annotations
+
+import os
+import shlex
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+from ctxforge.exceptions import HookInstallError
+
+HOOK_NAMES = ("post-commit", "post-checkout", "post-merge")
+
+_BEGIN = "# >>> ctxforge >>>"
+_END = "# <<< ctxforge <<<"
+_SHEBANG = "#!/bin/sh"
+
+
+def hooks_dir(root: Path) -> Path:
+    """Directory git runs hooks from for the checkout containing *root*.
+
+    Honours ``core.hooksPath`` and linked worktrees.
+
+    Raises:
+        HookInstallError: If *root* is not inside a git checkout.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "--git-path", "hooks"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise HookInstallError(f"{root} is not inside a git checkout") from e
+    return root / result.stdout.strip()  # relative paths are relative to root
+
+
+def hook_block(project_root: Path, hook: str) -> str:
+    """Lines added to hook *hook*: a niced refresh detached from git."""
+    exe = shlex.quote(sys.executable)
+    return "\n".join([
+        _BEGIN,
+        "# Refresh ctxforge caches for the changed paths without delaying git.",
+        f"if [ -x {exe} ]; then",
+        f"    (cd {shlex.quote(str(project_root))} && nohup nice -n 10 {exe} -m ctxforge"
+        f' hooks refresh {hook} "$@" </dev/null >/dev/null 2>&1 &)',
+        "fi",
+        _END,
+    ]) + "\n"
+
+
+def _strip_block(text: str) -> str:
+    """*text* without the ctxforge block (unchanged if it has none)."""
+    start = text.find(_BEGIN)
+    if start < 0:
+        return text
+    end = text.find(_END, start)
+    end = len(text) if end < 0 else end + len(_END)
+    if text.startswith("\n", end):
+        end += 1
+    return text[:start] + text[end:]
+
+
+def install_hooks(project_root: Path) -> list[Path]:
+    """Add (or update) the ctxforge block in each of :data:`HOOK_NAMES`.
+
+    Existing hooks keep their content; the block is appended to them.
+
+    Returns:
+        The hook files written.
+
+    Raises:
+        HookInstallError: Outside a git checkout, or if an existing hook
+            is not a shell script the block can be appended to.
+    """
+    directory = hooks_dir(project_root)
+    written: list[Path] = []
+    for hook in HOOK_NAMES:
+        path = directory / hook
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            text = _SHEBANG + "\n"
+        except (OSError, UnicodeDecodeError) as e:
+            raise HookInstallError(f"Cannot read {path}: {e}") from e
+        first = text.split("\n", 1)[0]
+        if first.startswith("#!") and not first.rstrip().endswith(("sh", "bash")):
+            raise HookInstallError(
+                f"{path} is not a shell script ({first}); add "
+                f"'ctxforge hooks refresh {hook} \"$@\"' to it by hand"
+            )
+        text = _strip_block(text)
+        if not text.endswith("\n"):
+            text += "\n"
+        text += hook_block(project_root, hook)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+            mode = path.stat().st_mode
+            path.chmod(mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        except OSError as e:
+            raise HookInstallError(f"Cannot write {path}: {e}") from e
+        written.append(path)
+    return written
+
+
+def uninstall_hooks(project_root: Path) -> list[Path]:
+    """Remove the ctxforge block from the hooks, deleting hooks left empty.
+
+    Returns:
+        The hook files changed or deleted.
+    """
+    directory = hooks_dir(project_root)
+    changed: list[Path] = []
+    for hook in HOOK_NAMES:
+        path = directory / hook
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        remaining = _strip_block(text)
+        if remaining == text:
+            continue
+        if remaining.strip() in ("", _SHEBANG):
+            os.unlink(path)
+        else:
+            path.write_text(remaining, encoding="utf-8")
+        changed.append(path)
+    return changed
@@ -17,10 +17,15 @@ def write_profile(path: Path, config: ProfileConfig) -> None:
         path: Target file path (e.g. .ctxforge/profiles/architect/profile.toml).
         config: Validated ProfileConfig instance.
     """
-    data = _clean_empty(config.model_dump(exclude_none=True))
+    text = profile_toml(config)
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "wb") as f:
-        tomli_w.dump(data, f)
+        f.write(text.encode("utf-8"))
+
+
+def profile_toml(config: ProfileConfig) -> str:
+    """The TOML text :func:`write_profile` writes for *config*."""
+    return tomli_w.dumps(_clean_empty(config.model_dump(exclude_none=True)))
 
 
 def _clean_empty(d: Any) -> Any:
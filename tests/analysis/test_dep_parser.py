@@ -0,0 +1,185 @@
+"""Tests for the dependency manifest parser."""
+
+import json
+from pathlib import Path
+
+from ctxforge.analysis import dep_parser
+from ctxforge.analysis.dep_parser import summarize_dependencies
+
+PYPROJECT = """\
+[project]
+name = "demo"
+requires-python = ">=3.11"
+dependencies = ["FastAPI[all]>=0.100", "pydantic_core>=2; python_version>'3'"]
+
+[project.optional-dependencies]
+dev = ["pytest>=8"]
+"""
+
+UV_LOCK = """\
+version = 1
+
+[[package]]
+name = "fastapi"
+version = "0.110.0"
+
+[[package]]
+name = "pydantic-core"
+version = "2.16.3"
+
+[[package]]
+name = "starlette"
+version = "0.36.3"
+"""
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for name, text in files.items():
+        (root / name).write_text(text)
+
+
+class TestManifests:
+    def test_pyproject_with_lockfile(self, tmp_path: Path):
+        _write(tmp_path, {"pyproject.toml": PYPROJECT, "uv.lock": UV_LOCK})
+        summary = summarize_dependencies(tmp_path)
+        [manifest] = summary.manifests
+        assert manifest.name == "demo"
+        assert manifest.runtime == "python >=3.11"
+        assert manifest.dependencies == {"fastapi": "0.110.0", "pydantic-core": "2.16.3"}
+        assert manifest.dev_dependencies == {"pytest": ">=8"}
+        assert (manifest.lockfile, manifest.locked_packages) == ("uv.lock", 3)
+        assert summary.frameworks == ["FastAPI", "pytest"]
+
+    def test_poetry(self, tmp_path: Path):
+        _write(tmp_path, {"pyproject.toml": (
+            "[tool.poetry]\nname = 'p'\n"
+            "[tool.poetry.dependencies]\npython = '^3.10'\ndjango = {version = '^5.0'}\n"
+            "[tool.poetry.group.test.dependencies]\npytest = '*'\n"
+        )})
+        [manifest] = summarize_dependencies(tmp_path).manifests
+        assert manifest.runtime == "python ^3.10"
+        assert manifest.dependencies == {"django": "^5.0"}
+        assert manifest.dev_dependencies == {"pytest": "*"}
+
+    def test_package_json_with_npm_lock(self, tmp_path: Path):
+        _write(tmp_path, {
+            "package.json": json.dumps({
+                "name": "web",
+                "engines": {"node": ">=18"},
+                "dependencies": {"react": "^18.2.0", "next": "^14.0.0"},
+                "devDependencies": {"typescript": "^5.3.0"},
+            }),
+            "package-lock.json": json.dumps({"packages": {
+                "": {"name": "web"},
+                "node_modules/react": {"version": "18.2.0"},
+                "node_modules/next": {"version": "14.1.0"},
+                "node_modules/next/node_modules/react": {"version": "17.0.0"},
+            }}),
+        })
+        summary = summarize_dependencies(tmp_path)
+        [manifest] = summary.manifests
+        assert manifest.dependencies == {"react": "18.2.0", "next": "14.1.0"}
+        assert manifest.dev_dependencies == {"typescript": "^5.3.0"}
+        assert manifest.runtime == "node >=18"
+        assert summary.frameworks == ["Next.js", "React", "TypeScript"]
+
+    def test_yarn_and_pnpm_locks(self, tmp_path: Path):
+        _write(tmp_path, {
+            "package.json": json.dumps({"dependencies": {"vue": "^3", "@vue/shared": "^3"}}),
+            "yarn.lock": (
+                '"@vue/shared@^3":\n  version "3.4.0"\n\n'
+                'vue@^3:\n  version "3.4.1"\n'
+            ),
+        })
+        assert summarize_dependencies(tmp_path).manifests[0].dependencies == {
+            "vue": "3.4.1", "@vue/shared": "3.4.0",
+        }
+        (tmp_path / "yarn.lock").unlink()
+        _write(tmp_path, {"pnpm-lock.yaml": (
+            "lockfileVersion: '9.0'\n\npackages:\n\n"
+            "  vue@3.4.2:\n    resolution: {}\n\n"
+            "  '@vue/shared@3.4.2':\n    resolution: {}\n"
+        )})
+        assert summarize_dependencies(tmp_path).manifests[0].dependencies == {
+            "vue": "3.4.2", "@vue/shared": "3.4.2",
+        }
+
+    def test_go_mod(self, tmp_path: Path):
+        _write(tmp_path, {"go.mod": (
+            "module example.com/app\n\ngo 1.22\n\n"
+            "require github.com/spf13/cobra v1.8.0\n"
+            "require (\n"
+            "\tgithub.com/gin-gonic/gin v1.9.1\n"
+            "\tgolang.org/x/sys v0.15.0 // indirect\n"
+            ")\n"
+        )})
+        summary = summarize_dependencies(tmp_path)
+        [manifest] = summary.manifests
+        assert manifest.name == "example.com/app"
+        assert manifest.runtime == "go 1.22"
+        assert manifest.dependencies == {
+            "github.com/spf13/cobra": "v1.8.0",
+            "github.com/gin-gonic/gin": "v1.9.1",
+        }
+        assert summary.frameworks == ["Gin", "Cobra"]
+
+    def test_go_sum_does_not_override_go_mod(self, tmp_path: Path):
+        _write(tmp_path, {
+            "go.mod": "module example.com/app\n\nrequire github.com/gin-gonic/gin v1.9.1\n",
+            "go.sum": (
+                "github.com/gin-gonic/gin v1.9.1 h1:aaa=\n"
+                "github.com/gin-gonic/gin v1.9.1/go.mod h1:bbb=\n"
+                "github.com/gin-gonic/gin v1.10.0/go.mod h1:ccc=\n"
+                "golang.org/x/sys v0.15.0 h1:ddd=\n"
+                "golang.org/x/net v0.20.0/go.mod h1:eee=\n"
+            ),
+        })
+        [manifest] = summarize_dependencies(tmp_path).manifests
+        assert manifest.dependencies == {"github.com/gin-gonic/gin": "v1.9.1"}
+        assert manifest.lockfile == "go.sum"
+        assert manifest.locked_packages == 2
+
+    def test_cargo(self, tmp_path: Path):
+        _write(tmp_path, {
+            "Cargo.toml": (
+                "[package]\nname = 'svc'\nedition = '2021'\n"
+                "[dependencies]\naxum = '0.7'\ntokio = { version = '1', features = ['full'] }\n"
+                "local = { path = '../local' }\n"
+            ),
+            "Cargo.lock": "[[package]]\nname = 'axum'\nversion = '0.7.4'\n",
+        })
+        [manifest] = summarize_dependencies(tmp_path).manifests
+        assert manifest.runtime == "edition 2021"
+        assert manifest.dependencies == {"axum": "0.7.4", "tokio": "1", "local": "path"}
+
+    def test_invalid_manifest_skipped(self, tmp_path: Path):
+        _write(tmp_path, {
+            "package.json": "{not json",
+            "requirements.txt": "flask==3.0\n-r dev.txt\n",
+        })
+        [manifest] = summarize_dependencies(tmp_path).manifests
+        assert manifest.path == "requirements.txt"
+        assert manifest.dependencies == {"flask": "==3.0"}
+
+    def test_no_manifests(self, tmp_path: Path):
+        assert summarize_dependencies(tmp_path).manifests == []
+
+
+class TestCache:
+    def test_reused_until_a_manifest_changes(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        _write(tmp_path, {"pyproject.toml": PYPROJECT})
+        first = summarize_dependencies(tmp_path, use_cache=True)
+
+        calls = []
+        original = dep_parser._summarize
+        monkeypatch.setattr(
+            dep_parser, "_summarize", lambda *a: calls.append(a) or original(*a)
+        )
+        assert summarize_dependencies(tmp_path, use_cache=True) == first
+        assert calls == []
+
+        _write(tmp_path, {"uv.lock": UV_LOCK})
+        summary = summarize_dependencies(tmp_path, use_cache=True)
+        assert len(calls) == 1
+        assert summary.manifests[0].lockfile == "uv.lock"
@@ -1,8 +1,12 @@
 """Tests for static documentation/config file detection."""
 
+import os
 from pathlib import Path
 
-from ctxforge.analysis.doc_detector import detect_doc_candidates
+from ctxforge.analysis.doc_detector import detect_doc_candidates, rank_doc_candidates
+from ctxforge.analysis.git_history import FileHistory, GitHistory
+
+_NOW = 2_000_000_000.0
 
 
 class TestDetectDocCandidates:
@@ -100,3 +104,70 @@ class TestDetectDocCandidates:
         claude_idx = result.index("CLAUDE.md")
         docs_api_idx = result.index("docs/api.md")
         assert readme_idx < claude_idx < docs_api_idx
+
+
+class TestRankDocCandidates:
+    def _doc(self, path: Path, text: str, age_days: float = 0) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        mtime = _NOW - age_days * 86400
+        os.utime(path, (mtime, mtime))
+
+    def test_features(self, tmp_path: Path):
+        self._doc(tmp_path / "README.md", "# Title\n\nSee [guide](docs/guide.md#usage).\n")
+        self._doc(
+            tmp_path / "docs" / "api.md",
+            "## API\n[guide](./guide.md) [ext](https://example.com/guide.md)\n",
+        )
+        self._doc(tmp_path / "docs" / "guide.md", "# Guide\n## Usage\n")
+
+        docs = {d.path: d for d in rank_doc_candidates(tmp_path, now=_NOW)}
+
+        assert docs["docs/guide.md"].inbound_links == 2
+        assert docs["docs/guide.md"].headings == 2
+        assert docs["README.md"].inbound_links == 0
+        assert docs["README.md"].group == 0
+        assert docs["docs/api.md"].group == 2
+
+    def test_linked_recent_doc_ranks_first_in_group(self, tmp_path: Path):
+        self._doc(tmp_path / "README.md", "[arch](docs/zz-arch.md)\n")
+        self._doc(tmp_path / "docs" / "a.md", "old notes", age_days=2000)
+        self._doc(tmp_path / "docs" / "zz-arch.md", "# Architecture\n" + "text\n" * 500)
+
+        paths = [d.path for d in rank_doc_candidates(tmp_path, now=_NOW)]
+
+        assert paths == ["README.md", "docs/zz-arch.md", "docs/a.md"]
+
+    def test_cap_keeps_best_scores(self, tmp_path: Path):
+        self._doc(tmp_path / "docs" / "hub.md", "# Hub\n" + "".join(
+            f"[x](deep/file_{i:03d}.md)\n" for i in range(3)
+        ))
+        for i in range(40):
+            self._doc(tmp_path / "docs" / "deep" / f"file_{i:03d}.md", "x", age_days=1000)
+
+        paths = detect_doc_candidates(tmp_path)
+
+        assert len(paths) == 30
+        assert "docs/hub.md" in paths
+        assert {"docs/deep/file_000.md", "docs/deep/file_002.md"} <= set(paths)
+
+    def test_boilerplate_scores_low(self, tmp_path: Path):
+        self._doc(tmp_path / "LICENSE", "MIT License\n" * 100)
+        self._doc(tmp_path / "README.md", "# Project\n")
+
+        docs = rank_doc_candidates(tmp_path, now=_NOW)
+
+        assert [d.path for d in docs] == ["README.md", "LICENSE"]
+        assert docs[0].score > docs[1].score
+
+    def test_git_history_overrides_mtime(self, tmp_path: Path):
+        # Both files were just checked out; git knows one is years old.
+        self._doc(tmp_path / "docs" / "fresh.md", "x")
+        self._doc(tmp_path / "docs" / "stale.md", "x")
+        history = GitHistory("abc", {"docs/stale.md": FileHistory(3, int(_NOW) - 3000 * 86400)})
+
+        docs = rank_doc_candidates(tmp_path, now=_NOW, history=history)
+
+        assert [d.path for d in docs] == ["docs/fresh.md", "docs/stale.md"]
+        assert docs[1].commits == 3
+        assert docs[0].last_commit is None
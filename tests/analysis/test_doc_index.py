@@ -0,0 +1,191 @@
+"""Tests for the BM25 document index."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis import doc_index
+from ctxforge.analysis.doc_index import (
+    POSTINGS_FILE,
+    DocIndex,
+    DocSearcher,
+    chunk_document,
+    term_counts,
+    update_doc_index,
+)
+from ctxforge.analysis.scan_index import ScanIndex
+from ctxforge.storage.cache import cache_path
+
+_OLD = 1_600_000_000  # a timestamp well outside the racy window
+
+_GUIDE = """\
+# Guide
+
+Intro to the project.
+
+## Storage
+
+Caches live under the cache directory and are written atomically.
+
+```
+# not a heading
+```
+
+## Tokens
+
+Token budgets decide which sections fit.
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / ".ctxforge").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text(_GUIDE)
+    (tmp_path / "notes.txt").write_text("Release checklist: bump the version, tag.\n")
+    (tmp_path / "app.py").write_text("# caches are not docs\n")
+    return tmp_path
+
+
+def _edit(root: Path, rel: str, text: str) -> None:
+    """Rewrite *rel* in place, leaving its directory's mtime as it was."""
+    (root / rel).write_text(text)
+    os.utime(root / rel, (_OLD + 10, _OLD + 10))
+    os.utime((root / rel).parent, (_OLD, _OLD))
+
+
+class TestTermCounts:
+    def test_words(self):
+        counts = term_counts("The repo_map caches the Libraries; a CACHE is x")
+        assert counts == {"repo": 1, "map": 1, "cache": 2, "library": 1}
+
+    def test_non_ascii_words(self):
+        assert term_counts("Café Straße") == {"café": 1, "straße": 1}
+
+    def test_cjk_bigrams(self):
+        assert term_counts("存储层 缓") == {"存储": 1, "储层": 1, "缓": 1}
+
+
+class TestChunkDocument:
+    def test_splits_at_headings(self):
+        data = _GUIDE.encode()
+        chunks = chunk_document("docs/guide.md", data)
+        assert [c.title for c in chunks] == ["Guide", "Guide > Storage", "Guide > Tokens"]
+        storage = chunks[1]
+        assert (storage.first_line, storage.last_line) == (5, 12)
+        assert data[storage.start:storage.end].decode().startswith("## Storage\n")
+        assert "# not a heading" in data[storage.start:storage.end].decode()
+        assert "storage" in storage.terms.split()
+
+    def test_long_text_splits_at_blank_lines(self):
+        paragraph = "word " * 100 + "\n"
+        data = "\n".join([paragraph] * 10).encode()
+        chunks = chunk_document("notes.txt", data)
+        assert len(chunks) > 1
+        assert all(c.title == "" for c in chunks)
+        assert chunks[0].start == 0 and chunks[-1].end == len(data)
+        assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+        assert all(data[c.start:c.end].startswith(b"\n") for c in chunks[1:])
+
+    def test_empty(self):
+        assert chunk_document("a.md", b"") == []
+        assert chunk_document("a.md", b"\n\n") == []
+
+
+class TestDocIndex:
+    def test_search(self, project: Path):
+        assert update_doc_index(project) == 2
+        with DocSearcher.open(project) as searcher:
+            assert len(searcher) == 4
+            hits = searcher.search("where are caches written", 2)
+        assert hits[0].path == "docs/guide.md"
+        assert hits[0].label == 'docs/guide.md ("Guide > Storage", lines 5-12)'
+        assert len(hits) == 1 or hits[0].score > hits[1].score
+
+    def test_skip_and_no_match(self, project: Path):
+        update_doc_index(project)
+        with DocSearcher.open(project) as searcher:
+            assert searcher.search("release checklist", 3)[0].path == "notes.txt"
+            assert searcher.search("release checklist", 3, skip={"notes.txt"}) == []
+            assert searcher.search("nonexistentterm", 3) == []
+
+    def test_common_terms_rescore_candidates(self, project: Path, monkeypatch):
+        body = "\n\n".join(f"## Part {i}\n\nshared text {i}" for i in range(40))
+        (project / "docs" / "many.md").write_text(body + "\n\n## Rare\n\nshared zebra\n")
+        update_doc_index(project)
+        monkeypatch.setattr(doc_index, "_RESCORE_RATIO", 2)
+        with DocSearcher.open(project) as searcher:
+            hits = searcher.search("zebra shared", 5)
+        assert [h.title for h in hits] == ["Rare"]
+
+    def test_unchanged_docs_are_not_rechunked(self, project: Path, monkeypatch):
+        for d in (project, project / "docs"):
+            os.utime(d, (_OLD, _OLD))  # let the walk cache their listings
+        update_doc_index(project)
+        assert ScanIndex.load(project).lookup("", os.stat(project).st_mtime_ns) is not None
+        chunked: list[str] = []
+        real = doc_index.chunk_document
+        monkeypatch.setattr(
+            doc_index, "chunk_document", lambda rel, data: chunked.append(rel) or real(rel, data)
+        )
+        update_doc_index(project)
+        assert chunked == []
+
+        _edit(project, "notes.txt", "Deployment runbook.\n")
+        update_doc_index(project)
+        assert chunked == ["notes.txt"]
+        with DocSearcher.open(project) as searcher:
+            assert searcher.search("runbook", 1)[0].path == "notes.txt"
+            assert searcher.search("checklist", 1) == []
+
+    def test_same_tick_edit_is_seen(self, project: Path):
+        notes = project / "notes.txt"
+        update_doc_index(project)
+        st = notes.stat()
+        notes.write_text("Release checklist: bump the version, zzz.\n")
+        os.utime(notes, ns=(st.st_atime_ns, st.st_mtime_ns))  # same size, same mtime
+        update_doc_index(project)
+        with DocSearcher.open(project) as searcher:
+            assert searcher.search("zzz", 1)[0].path == "notes.txt"
+
+    def test_removed_docs_leave_the_index(self, project: Path):
+        update_doc_index(project)
+        (project / "notes.txt").unlink()
+        assert update_doc_index(project) == 1
+        with DocSearcher.open(project) as searcher:
+            assert searcher.search("release checklist", 3) == []
+
+    def test_lost_chunk_cache_is_rebuilt(self, project: Path):
+        update_doc_index(project)
+        cache_path(project, doc_index.CHUNKS_FILE).unlink()
+        cache_path(project, POSTINGS_FILE).unlink()
+        update_doc_index(project)
+        with DocSearcher.open(project) as searcher:
+            assert searcher.search("checklist", 1)[0].path == "notes.txt"
+
+    def test_watcher_index_used_as_is(self, project: Path, monkeypatch):
+        update_doc_index(project)
+        (project / "more.md").write_text("# More\n\nfresh words\n")
+        monkeypatch.setattr(doc_index, "watcher_pid", lambda root: 123)
+        assert update_doc_index(project) == 2
+        assert update_doc_index(project, use_watcher=False) == 3
+
+    def test_outside_a_project(self, tmp_path: Path):
+        (tmp_path / "README.md").write_text("# Readme\n\nhello\n")
+        assert update_doc_index(tmp_path) == 1
+        assert DocSearcher.open(tmp_path) is None
+        assert not (tmp_path / ".ctxforge").exists()
+
+    def test_corrupt_postings(self, project: Path):
+        path = cache_path(project, POSTINGS_FILE)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"garbage")
+        assert DocSearcher.open(project) is None
+        path.write_bytes(b"")
+        assert DocSearcher.open(project) is None
+
+    def test_oversized_docs_are_skipped(self, project: Path, monkeypatch):
+        monkeypatch.setattr(doc_index, "MAX_DOC_BYTES", 100)
+        assert update_doc_index(project) == 1
+        assert len(DocIndex.load(project)) == 1
@@ -0,0 +1,54 @@
+"""Tests for bounded file reads."""
+
+from pathlib import Path
+
+from ctxforge.analysis.file_reader import BINARY, NOT_UTF8, TEXT, read_capped
+
+
+class TestReadCapped:
+    def test_whole_file(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("# Title\nbody\n")
+        content = read_capped(tmp_path / "a.md", 1000)
+        assert content is not None
+        assert (content.kind, content.text, content.size) == (TEXT, "# Title\nbody\n", 13)
+        assert not content.truncated
+
+    def test_empty_file(self, tmp_path: Path):
+        (tmp_path / "e.txt").write_bytes(b"")
+        content = read_capped(tmp_path / "e.txt", 100)
+        assert content is not None
+        assert (content.kind, content.text, content.truncated) == (TEXT, "", False)
+
+    def test_missing_or_directory(self, tmp_path: Path):
+        assert read_capped(tmp_path / "nope", 100) is None
+        assert read_capped(tmp_path, 100) is None
+
+    def test_truncated_at_line_break(self, tmp_path: Path):
+        (tmp_path / "f.txt").write_text("".join(f"line {i}\n" for i in range(1000)))
+        content = read_capped(tmp_path / "f.txt", 100)
+        assert content is not None
+        assert content.truncated
+        assert content.text.endswith("\n")
+        assert len(content.text) <= 100
+        assert content.shown == len(content.text.encode())
+
+    def test_truncated_inside_character(self, tmp_path: Path):
+        (tmp_path / "zh.md").write_text("中" * 100, encoding="utf-8")
+        for cap in (30, 31, 32):
+            content = read_capped(tmp_path / "zh.md", cap)
+            assert content is not None
+            assert content.kind == TEXT
+            assert content.text == "中" * 10
+            assert content.truncated
+
+    def test_binary(self, tmp_path: Path):
+        (tmp_path / "img.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" + b"\xff" * 100)
+        content = read_capped(tmp_path / "img.png", 1000)
+        assert content is not None
+        assert (content.kind, content.text, content.size) == (BINARY, "", 116)
+
+    def test_not_utf8(self, tmp_path: Path):
+        (tmp_path / "latin1.txt").write_bytes("café crème\n".encode("latin-1"))
+        content = read_capped(tmp_path / "latin1.txt", 1000)
+        assert content is not None
+        assert content.kind == NOT_UTF8
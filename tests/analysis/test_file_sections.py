@@ -0,0 +1,130 @@
+"""Tests for key file section references."""
+
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis.file_sections import (
+    HEADINGS_FILE,
+    KeyFileRef,
+    SectionIndex,
+    find_heading,
+    parse_headings,
+    parse_ref,
+    slug,
+)
+from ctxforge.analysis.file_stats import FileStatsIndex
+from ctxforge.storage.cache import cache_path
+
+_DOC = (
+    "# Architecture\n"
+    "intro\n"
+    "## Storage Layer\n"
+    "tables\n"
+    "```\n"
+    "# not a heading\n"
+    "```\n"
+    "### Caches ###\n"
+    "json\n"
+    "## API\n"
+    "routes\n"
+)
+
+
+class TestParseRef:
+    @pytest.mark.parametrize("entry, ref", [
+        ("docs/ARCH.md", KeyFileRef("docs/ARCH.md")),
+        ("docs/ARCH.md#Storage", KeyFileRef("docs/ARCH.md", heading="Storage")),
+        ("docs/ARCH.md#Storage Layer", KeyFileRef("docs/ARCH.md", heading="Storage Layer")),
+        ("src/x.py:10-80", KeyFileRef("src/x.py", lines=(10, 80))),
+        ("docs/C#.md#Intro", KeyFileRef("docs/C#.md", heading="Intro")),
+        ("docs/C#.md", KeyFileRef("docs/C#.md")),
+        ("ARCH.md#C# usage", KeyFileRef("ARCH.md", heading="C# usage")),
+        ("notes.txt#Intro", KeyFileRef("notes.txt#Intro")),
+        ("notes#", KeyFileRef("notes#")),
+        ("#top", KeyFileRef("#top")),
+        ("a:b.txt", KeyFileRef("a:b.txt")),
+    ])
+    def test_entries(self, entry: str, ref: KeyFileRef):
+        assert parse_ref(entry) == ref
+        assert ref.whole == (ref.heading is None and ref.lines is None)
+
+
+class TestHeadings:
+    def test_extents(self):
+        headings = parse_headings(_DOC.encode())
+        assert [(h.level, h.title, h.line, h.end_line) for h in headings] == [
+            (1, "Architecture", 1, 11),
+            (2, "Storage Layer", 3, 9),
+            (3, "Caches", 8, 9),
+            (2, "API", 10, 11),
+        ]
+        storage = headings[1]
+        assert _DOC.encode()[storage.start:storage.end].decode().startswith("## Storage Layer\n")
+        assert _DOC.encode()[storage.start:storage.end].decode().endswith("json\n")
+
+    def test_find(self):
+        headings = parse_headings(_DOC.encode())
+        assert find_heading(headings, "API") is headings[3]
+        assert find_heading(headings, "storage layer") is headings[1]
+        assert find_heading(headings, "storage-layer") is headings[1]
+        assert find_heading(headings, "Missing") is None
+
+    def test_slug(self):
+        assert slug("Storage Layer") == "storage-layer"
+        assert slug("What's new? (v2)") == "whats-new-v2"
+
+
+class TestSectionIndex:
+    def _resolve(self, root: Path, entry: str):
+        index = SectionIndex.load(root)
+        ref = parse_ref(entry)
+        piece = index.resolve(ref, FileStatsIndex.load(root).stats(root, ref.path))
+        index.save()
+        return piece
+
+    def test_heading(self, tmp_path: Path):
+        (tmp_path / "ARCH.md").write_text(_DOC)
+        piece = self._resolve(tmp_path, "ARCH.md#Storage Layer")
+        assert piece is not None
+        assert piece.text == (
+            "## Storage Layer\ntables\n```\n# not a heading\n```\n### Caches ###\njson\n"
+        )
+        assert (piece.first_line, piece.last_line) == (3, 9)
+        assert piece.label == 'ARCH.md (section "Storage Layer", lines 3-9)'
+
+    def test_lines(self, tmp_path: Path):
+        (tmp_path / "x.py").write_text("a\nb\nc\nd\n")
+        piece = self._resolve(tmp_path, "x.py:2-3")
+        assert piece is not None
+        assert (piece.text, piece.label) == ("b\nc\n", "x.py (lines 2-3)")
+        clamped = self._resolve(tmp_path, "x.py:3-99")
+        assert clamped is not None and (clamped.text, clamped.last_line) == ("c\nd\n", 4)
+
+    @pytest.mark.parametrize("entry", [
+        "ARCH.md#Nope", "x.py:9-10", "x.py:3-2", "x.py#Heading", "gone.md#A",
+    ])
+    def test_unresolved(self, tmp_path: Path, entry: str):
+        (tmp_path / "ARCH.md").write_text(_DOC)
+        (tmp_path / "x.py").write_text("a\nb\n")
+        assert self._resolve(tmp_path, entry) is None
+
+    def test_index_cached_until_content_changes(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        (tmp_path / "ARCH.md").write_text(_DOC)
+        assert self._resolve(tmp_path, "ARCH.md#API") is not None
+        assert cache_path(tmp_path, HEADINGS_FILE).is_file()
+
+        from ctxforge.analysis import file_sections
+
+        def fail(data: bytes):
+            raise AssertionError("re-parsed")
+
+        monkeypatch.setattr(file_sections, "parse_headings", fail)
+        piece = self._resolve(tmp_path, "ARCH.md#API")
+        assert piece is not None and piece.text == "## API\nroutes\n"
+
+        monkeypatch.undo()
+        (tmp_path / "ARCH.md").write_text(_DOC.replace("## API", "## Public API"))
+        assert self._resolve(tmp_path, "ARCH.md#API") is None
+        assert self._resolve(tmp_path, "ARCH.md#Public API") is not None
@@ -0,0 +1,52 @@
+"""Tests for the key-file stats cache."""
+
+import os
+from pathlib import Path
+
+from ctxforge.analysis.file_stats import FileStatsIndex
+
+_OLD = 1_600_000_000  # a timestamp well outside the racy window
+
+
+class TestFileStatsIndex:
+    def test_stats(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("# Hé\nline\n", encoding="utf-8")
+        stats = FileStatsIndex.load(tmp_path).stats(tmp_path, "a.md")
+        assert stats is not None
+        assert (stats.chars, stats.lines, stats.size) == (10, 2, 11)
+        assert FileStatsIndex.load(tmp_path).stats(tmp_path, "missing.md") is None
+        assert FileStatsIndex.load(tmp_path).stats(tmp_path, ".") is None
+
+    def test_unchanged_file_not_read(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        (tmp_path / "a.md").write_text("hello\n")
+        os.utime(tmp_path / "a.md", (_OLD, _OLD))
+        index = FileStatsIndex.load(tmp_path)
+        first = index.stats(tmp_path, "a.md")
+        index.save()
+
+        monkeypatch.setattr(Path, "read_bytes", lambda self: b"never read")
+        assert FileStatsIndex.load(tmp_path).stats(tmp_path, "a.md") == first
+
+    def test_refresh_drops_untracked(self, tmp_path: Path):
+        (tmp_path / ".ctxforge").mkdir()
+        for name in ("a.md", "b.md"):
+            (tmp_path / name).write_text(name)
+            os.utime(tmp_path / name, (_OLD, _OLD))
+        index = FileStatsIndex.load(tmp_path)
+        index.refresh(tmp_path, ["a.md", "b.md"])
+        index.save()
+        index = FileStatsIndex.load(tmp_path)
+        index.refresh(tmp_path, ["a.md"])
+        index.save()
+        assert set(FileStatsIndex.load(tmp_path)._entries) == {"a.md"}
+
+    def test_racy_entries_not_persisted(self, tmp_path: Path):
+        (tmp_path / ".ctxforge").mkdir()
+        for name in ("old.md", "new.md"):
+            (tmp_path / name).write_text(name)
+        os.utime(tmp_path / "old.md", (_OLD, _OLD))
+        index = FileStatsIndex.load(tmp_path)
+        index.refresh(tmp_path, ["old.md", "new.md"])
+        index.save()
+        assert set(FileStatsIndex.load(tmp_path)._entries) == {"old.md"}
@@ -0,0 +1,88 @@
+"""Tests for filesystem change notification."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis.fs_watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    clear_watch_state,
+    open_watcher,
+    watcher_pid,
+    write_watch_state,
+)
+
+
+def _inotify_available() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        InotifyWatcher(Path(tempfile.mkdtemp())).close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not _inotify_available(), reason="inotify not available")
+class TestInotifyWatcher:
+    def test_reports_changed_paths(self, tmp_path: Path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text("")
+        (tmp_path / "node_modules").mkdir()
+        watcher = InotifyWatcher(tmp_path)
+        try:
+            assert watcher.changes(timeout=0.05) == set()
+            (tmp_path / "src" / "a.py").write_text("x = 1\n")
+            (tmp_path / "node_modules" / "dep.js").write_text("")
+            (tmp_path / "top.md").write_text("")
+            assert watcher.changes(timeout=1.0) == {"src/a.py", "top.md"}
+        finally:
+            watcher.close()
+
+    def test_watches_new_directories(self, tmp_path: Path):
+        watcher = InotifyWatcher(tmp_path)
+        try:
+            (tmp_path / "pkg").mkdir()
+            assert watcher.changes(timeout=1.0) == {"pkg"}
+            (tmp_path / "pkg" / "mod.py").write_text("")
+            assert "pkg/mod.py" in (watcher.changes(timeout=1.0) or set())
+        finally:
+            watcher.close()
+
+
+class TestPollingWatcher:
+    def test_reports_modified_added_and_removed(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("")
+        (tmp_path / "gone.py").write_text("")
+        (tmp_path / ".git").mkdir()
+        watcher = PollingWatcher(tmp_path, interval=0.01)
+        assert watcher.changes() == set()
+
+        (tmp_path / "a.py").write_text("changed")
+        (tmp_path / "gone.py").unlink()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.py").write_text("")
+        (tmp_path / ".git" / "index").write_text("")
+        assert watcher.changes() == {"a.py", "gone.py", "sub", "sub/b.py"}
+
+    def test_open_watcher_polls_on_request(self, tmp_path: Path):
+        assert isinstance(open_watcher(tmp_path, poll=True), PollingWatcher)
+
+
+class TestWatchState:
+    def test_live_pid_recorded(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr("ctxforge.analysis.fs_watch._cmdline", lambda pid: b"ctxforge\0watch")
+        assert watcher_pid(tmp_path) is None
+        write_watch_state(tmp_path)
+        assert watcher_pid(tmp_path) == os.getpid()
+        clear_watch_state(tmp_path)
+        assert watcher_pid(tmp_path) is None
+
+    def test_pid_of_other_program_ignored(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr("ctxforge.analysis.fs_watch._cmdline", lambda pid: b"vim\0notes")
+        write_watch_state(tmp_path)
+        assert watcher_pid(tmp_path) is None
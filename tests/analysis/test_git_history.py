@@ -0,0 +1,136 @@
+"""Tests for the git history index."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis import git_history
+from ctxforge.analysis.git_history import (
+    FileHistory,
+    GitHistory,
+    changed_paths,
+    commit_paths,
+    current_branch,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(root: Path, *args: str, when: int | None = None) -> None:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "t",
+        "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t",
+        "GIT_COMMITTER_EMAIL": "t@example.com",
+    }
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"@{when} +0000"
+    subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True, env=env)
+
+
+def _commit(root: Path, files: dict[str, str], when: int) -> None:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", f"at {when}", when=when)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _commit(tmp_path, {"README.md": "a", "docs/guide.md": "a"}, 1_000_000)
+    _commit(tmp_path, {"README.md": "b"}, 2_000_000)
+    return tmp_path
+
+
+class TestGitHistory:
+    def test_churn_and_last_touched(self, repo: Path):
+        history = GitHistory.load(repo, use_cache=False)
+        assert history is not None
+        assert history.get("README.md") == FileHistory(2, 2_000_000)
+        assert history.get("docs/guide.md") == FileHistory(1, 1_000_000)
+        assert history.churn("missing.md") == 0
+        assert history.last_touched("missing.md") is None
+        assert history.age_days("docs/guide.md", now=1_000_000 + 86400 * 3) == 3
+
+    def test_touched_since(self, repo: Path):
+        history = GitHistory.load(repo, use_cache=False)
+        assert history is not None
+        assert history.touched_since(["README.md", "docs/guide.md"], 1_500_000) == [
+            "README.md"
+        ]
+
+    def test_incremental_update_parses_only_new_commits(self, repo: Path, monkeypatch):
+        (repo / ".ctxforge").mkdir()
+        first = GitHistory.load(repo)
+        assert first is not None
+
+        _commit(repo, {"docs/guide.md": "c"}, 3_000_000)
+        revs: list[str] = []
+        real = git_history._stream_log
+        monkeypatch.setattr(
+            git_history, "_stream_log", lambda root, r: revs.append(r) or real(root, r)
+        )
+        second = GitHistory.load(repo)
+
+        assert second is not None
+        assert revs == [f"{first.head}..{second.head}"]
+        assert second.get("docs/guide.md") == FileHistory(2, 3_000_000)
+        assert second.get("README.md") == FileHistory(2, 2_000_000)
+
+        # Unchanged HEAD: served from the cache without running git log.
+        revs.clear()
+        assert GitHistory.load(repo) is not None
+        assert revs == []
+
+    def test_rewritten_history_rebuilds(self, repo: Path):
+        (repo / ".ctxforge").mkdir()
+        GitHistory.load(repo)
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")
+
+        history = GitHistory.load(repo)
+
+        assert history is not None
+        assert history.get("README.md") == FileHistory(1, 1_000_000)
+
+    def test_not_a_repository(self, tmp_path: Path):
+        assert GitHistory.load(tmp_path) is None
+
+    def test_no_commits(self, tmp_path: Path):
+        _git(tmp_path, "init", "-q")
+        history = GitHistory.load(tmp_path)
+        assert history is not None
+        assert len(history) == 0
+
+
+class TestChangedPaths:
+    def test_commit_paths(self, repo: Path):
+        assert commit_paths(repo) == ["README.md"]
+        assert commit_paths(repo, "HEAD~1") == ["README.md", "docs/guide.md"]
+
+    def test_changed_paths_relative_to_subdirectory(self, repo: Path):
+        _commit(repo, {"docs/guide.md": "b", "docs/new.md": "a", "README.md": "c"}, 3_000_000)
+        assert changed_paths(repo, "HEAD~1") == ["README.md", "docs/guide.md", "docs/new.md"]
+        assert changed_paths(repo / "docs", "HEAD~1") == ["guide.md", "new.md"]
+
+    def test_unknown_revision(self, repo: Path):
+        assert changed_paths(repo, "no-such-rev") is None
+
+
+class TestCurrentBranch:
+    def test_branch(self, repo: Path):
+        _git(repo, "checkout", "-q", "-b", "feature/doc-search")
+        assert current_branch(repo) == "feature/doc-search"
+
+    def test_detached_head(self, repo: Path):
+        _git(repo, "checkout", "-q", "--detach")
+        assert current_branch(repo) is None
+
+    def test_not_a_repository(self, tmp_path: Path):
+        assert current_branch(tmp_path) is None
@@ -0,0 +1,84 @@
+"""Tests for gitignore-style matching."""
+
+from pathlib import Path
+
+from ctxforge.analysis.ignore import IgnoreMatcher, IgnoreRules
+
+
+def _ignored(patterns: list[str], rel: str, is_dir: bool = False) -> bool:
+    return IgnoreMatcher().push("", IgnoreRules(patterns)).ignored(rel, is_dir)
+
+
+class TestIgnoreRules:
+    def test_unanchored_name_matches_any_level(self):
+        assert _ignored(["*.log"], "debug.log")
+        assert _ignored(["*.log"], "a/b/debug.log")
+        assert not _ignored(["*.log"], "debug.txt")
+
+    def test_anchored_pattern(self):
+        assert _ignored(["/build"], "build", is_dir=True)
+        assert not _ignored(["/build"], "src/build", is_dir=True)
+        assert _ignored(["docs/gen"], "docs/gen", is_dir=True)
+        assert not _ignored(["docs/gen"], "x/docs/gen", is_dir=True)
+
+    def test_dir_only(self):
+        assert _ignored(["out/"], "out", is_dir=True)
+        assert not _ignored(["out/"], "out", is_dir=False)
+
+    def test_double_star(self):
+        assert _ignored(["**/gen"], "a/b/gen", is_dir=True)
+        assert _ignored(["a/**/z.txt"], "a/z.txt")
+        assert _ignored(["a/**/z.txt"], "a/b/c/z.txt")
+        assert _ignored(["logs/**"], "logs/x/y.txt")
+
+    def test_negation_last_match_wins(self):
+        patterns = ["*.txt", "!keep.txt"]
+        assert _ignored(patterns, "drop.txt")
+        assert not _ignored(patterns, "keep.txt")
+        assert _ignored(["!keep.txt", "*.txt"], "keep.txt")
+
+    def test_comments_blank_and_escapes(self):
+        rules = IgnoreRules(["# comment", "", "\\#hash", "\\!bang"])
+        assert rules.match("#hash", False) is True
+        assert rules.match("!bang", False) is True
+        assert rules.match("comment", False) is None
+
+    def test_character_class(self):
+        assert _ignored(["file[0-9].py"], "file3.py")
+        assert not _ignored(["file[!0-9].py"], "file3.py")
+
+    def test_leading_bracket_is_a_member(self):
+        assert _ignored(["[]x]"], "]")
+        assert _ignored(["[]x]"], "x")
+        assert _ignored(["[!]]y"], "ay")
+        assert not _ignored(["[!]]y"], "]y")
+
+    def test_invalid_patterns_skipped(self):
+        rules = IgnoreRules(["[z-a]", "*.log"])
+        assert rules.match("z", False) is None
+        assert rules.match("a.log", False) is True
+
+    def test_from_missing_file(self, tmp_path: Path):
+        assert not IgnoreRules.from_file(tmp_path / "missing")
+
+
+class TestIgnoreMatcher:
+    def test_deeper_source_takes_precedence(self):
+        matcher = (
+            IgnoreMatcher()
+            .push("", IgnoreRules(["*.gen"]))
+            .push("pkg", IgnoreRules(["!keep.gen"]))
+        )
+        assert matcher.ignored("pkg/drop.gen", False)
+        assert not matcher.ignored("pkg/keep.gen", False)
+        assert matcher.ignored("other/keep.gen", False)
+
+    def test_overrides_win(self):
+        matcher = IgnoreMatcher(overrides=IgnoreRules(["data/"])).push(
+            "", IgnoreRules(["!data/"])
+        )
+        assert matcher.ignored("data", True)
+
+    def test_empty_matcher_is_falsy(self):
+        assert not IgnoreMatcher()
+        assert not IgnoreMatcher().push("", IgnoreRules([]))
@@ -0,0 +1,169 @@
+"""Tests for the source import graph."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis import import_graph
+from ctxforge.analysis.import_graph import (
+    build_import_graph,
+    parse_imports,
+    rank_source_files,
+)
+
+_OLD = 1_600_000_000  # a timestamp well outside the racy window
+
+
+def _write(root: Path, files: dict[str, str]) -> list[tuple[str, int, int]]:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        os.utime(path, (_OLD, _OLD))
+    return [
+        (rel, (root / rel).stat().st_mtime_ns, (root / rel).stat().st_size)
+        for rel in files
+    ]
+
+
+class TestParseImports:
+    def test_python(self):
+        text = (
+            "import os, pkg.util\n"
+            "from . import sibling\n"
+            "from ..core import engine as e\n"
+            "from pkg.models import *\n"
+            "def f():\n    import lazy\n"
+        )
+        assert parse_imports("pkg/sub/mod.py", text) == [
+            "os", "pkg.util", ".sibling", "..core.engine", "..core", "pkg.models", "lazy",
+        ]
+
+    def test_python_syntax_error(self):
+        assert parse_imports("bad.py", "def (:\n") == []
+
+    def test_javascript(self):
+        text = (
+            "import React from 'react';\n"
+            "import { a, b } from \"./util\";\n"
+            "import './side-effect.css';\n"
+            "export * from '../shared/types';\n"
+            "const x = require('./x');\n"
+            "const y = await import('./lazy.js');\n"
+        )
+        assert parse_imports("src/app.ts", text) == [
+            "react", "./util", "./side-effect.css", "../shared/types", "./x", "./lazy.js",
+        ]
+
+    def test_unknown_extension(self):
+        assert parse_imports("main.go", 'import "fmt"') == []
+
+
+class TestBuildImportGraph:
+    def test_resolves_python_src_layout(self, tmp_path: Path):
+        files = _write(tmp_path, {
+            "src/pkg/__init__.py": "",
+            "src/pkg/core.py": "from pkg import util\nfrom .models import Model\n",
+            "src/pkg/models.py": "from . import util\n",
+            "src/pkg/util.py": "import json\n",
+            "tests/test_core.py": "from pkg.core import run\nimport pkg.models\n",
+        })
+        graph = build_import_graph(tmp_path, files)
+        assert graph.imports["src/pkg/core.py"] == [
+            "src/pkg/util.py", "src/pkg/__init__.py", "src/pkg/models.py"
+        ]
+        assert graph.imports["src/pkg/models.py"] == ["src/pkg/util.py"]
+        assert graph.imports["tests/test_core.py"] == ["src/pkg/core.py", "src/pkg/models.py"]
+        assert graph.imports["src/pkg/util.py"] == []
+        assert max(graph.ranks, key=graph.ranks.__getitem__) == "src/pkg/util.py"
+
+    def test_resolves_js_specifiers(self, tmp_path: Path):
+        files = _write(tmp_path, {
+            "src/app.ts": "import { a } from './lib';\nimport b from './b.js';\n"
+                          "import c from '../../outside';\nimport d from 'react';\n",
+            "src/lib/index.ts": "export const a = require('../util');\n",
+            "src/b.ts": "",
+            "src/util.js": "",
+        })
+        graph = build_import_graph(tmp_path, files)
+        assert graph.imports["src/app.ts"] == ["src/lib/index.ts", "src/b.ts"]
+        assert graph.imports["src/lib/index.ts"] == ["src/util.js"]
+
+    def test_cache_reuses_unchanged_files(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        files = _write(tmp_path, {"a.py": "import b\n", "b.py": ""})
+        first = build_import_graph(tmp_path, files, use_cache=True)
+
+        def fail(*args):
+            raise AssertionError("file re-parsed")
+
+        monkeypatch.setattr(import_graph, "parse_imports", fail)
+        second = build_import_graph(tmp_path, files, use_cache=True)
+        assert second.imports == first.imports
+        assert second.ranks == first.ranks
+
+    def test_cache_skips_reparse_of_touched_file(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        files = _write(tmp_path, {"a.py": "import b\n", "b.py": ""})
+        build_import_graph(tmp_path, files, use_cache=True)
+
+        for name in ("a.py", "b.py"):
+            os.utime(tmp_path / name, ns=(1, 1))
+        monkeypatch.setattr(import_graph, "parse_imports", pytest.fail)
+        graph = build_import_graph(tmp_path, files, use_cache=True)
+        assert graph.imports["a.py"] == ["b.py"]
+
+    def test_cache_sees_in_place_edit(self, tmp_path: Path):
+        (tmp_path / ".ctxforge").mkdir()
+        files = _write(tmp_path, {"a.py": "import os\n", "b.py": ""})
+        build_import_graph(tmp_path, files, use_cache=True)
+
+        (tmp_path / "a.py").write_text("import b\n")
+        os.utime(tmp_path / "a.py", ns=(1, 1))
+        # Stale stats, as from a walk that reused the directory listing.
+        graph = build_import_graph(tmp_path, files, use_cache=True)
+        assert graph.imports["a.py"] == ["b.py"]
+
+    def test_racy_files_not_cached(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        files = _write(tmp_path, {"a.py": "import b\n", "b.py": ""})
+        (tmp_path / "a.py").write_text("import c\n")  # modified just now
+        build_import_graph(tmp_path, files, use_cache=True)
+
+        parsed: list[str] = []
+        real = import_graph.parse_imports
+        monkeypatch.setattr(
+            import_graph, "parse_imports", lambda rel, text: parsed.append(rel) or real(rel, text)
+        )
+        build_import_graph(tmp_path, files, use_cache=True)
+        assert parsed == ["a.py"]
+
+    def test_process_pool_matches_serial(self, tmp_path: Path, monkeypatch):
+        files = _write(tmp_path, {
+            f"m{i}.py": f"import m{(i + 1) % 6}\nimport m0\n" for i in range(6)
+        })
+        serial = build_import_graph(tmp_path, files, workers=1)
+        monkeypatch.setattr(import_graph, "_PARALLEL_MIN_FILES", 2)
+        parallel = build_import_graph(tmp_path, files, workers=2)
+        assert parallel.imports == serial.imports
+        assert parallel.ranks == pytest.approx(serial.ranks)
+
+
+class TestRankSourceFiles:
+    def test_most_imported_first(self, tmp_path: Path):
+        files = _write(tmp_path, {
+            "core.py": "x = 1\n",
+            "helpers.py": "import core\n",
+            "cli.py": "import core, helpers\n",
+            "main.py": "import cli, core\n",
+            "README.md": "[core](core.py)\n",
+        })
+        ranked = rank_source_files(tmp_path, files, limit=2)
+        assert [c.path for c in ranked] == ["core.py", "helpers.py"]
+        assert ranked[0].imported_by == 3
+        assert ranked[0].size == 6
+
+    def test_no_internal_imports(self, tmp_path: Path):
+        files = _write(tmp_path, {"a.py": "import os\n"})
+        assert rank_source_files(tmp_path, files) == []
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from ctxforge.analysis.lang_detector import detect_languages
+from ctxforge.analysis.lang_detector import LanguageStats, detect_languages
 
 
 class TestDetectLanguages:
@@ -31,3 +31,98 @@ class TestDetectLanguages:
 
     def test_empty(self):
         assert detect_languages([]) == []
+
+
+class TestLanguageStats:
+    def test_bytes_outweigh_file_count(self):
+        stats = LanguageStats()
+        for i in range(3000):
+            stats.add(f"web/stub{i}.ts", 40)
+        for i in range(200):
+            stats.add(f"svc/mod{i}.go", 20_000)
+        assert stats.languages() == ["go", "typescript"]
+        assert stats.languages(weight="files") == ["typescript", "go"]
+
+    def test_breakdown_percentages(self):
+        stats = LanguageStats()
+        for i in range(3):
+            stats.add(f"a{i}.py", 300)
+            stats.add(f"b{i}.rs", 100)
+        shares = stats.breakdown()
+        assert [(s.name, s.files, s.bytes, s.percent) for s in shares] == [
+            ("python", 3, 900, 75.0),
+            ("rust", 3, 300, 25.0),
+        ]
+
+    def test_percent_by_files_without_sizes(self):
+        stats = LanguageStats()
+        for i in range(2):
+            stats.add(f"a{i}.py")
+        assert stats.breakdown()[0].percent == 100.0
+
+    def test_header_sniffing(self, tmp_path: Path):
+        for i in range(3):
+            (tmp_path / f"x{i}.h").write_text("class Foo { public: virtual ~Foo(); };\n")
+        stats = LanguageStats(tmp_path)
+        for i in range(3):
+            stats.add(f"x{i}.h", 40)
+        assert stats.languages() == ["cpp"]
+
+    def test_access_specifier_header(self, tmp_path: Path):
+        for i in range(2):
+            (tmp_path / f"x{i}.h").write_text("struct Foo {\npublic:\n  int x;\n};\n")
+        stats = LanguageStats(tmp_path)
+        for i in range(2):
+            stats.add(f"x{i}.h", 30)
+        assert stats.languages() == ["cpp"]
+
+    def test_plain_c_header(self, tmp_path: Path):
+        for i in range(2):
+            (tmp_path / f"x{i}.h").write_text("int add(int a, int b);\n")
+        stats = LanguageStats(tmp_path)
+        for i in range(2):
+            stats.add(f"x{i}.h", 20)
+        assert stats.languages() == ["c"]
+
+    def test_qt_translation_ts_not_typescript(self, tmp_path: Path):
+        for i in range(2):
+            (tmp_path / f"app_{i}.ts").write_text('<?xml version="1.0"?><TS></TS>')
+        stats = LanguageStats(tmp_path)
+        for i in range(2):
+            stats.add(f"app_{i}.ts", 30)
+        assert stats.languages() == []
+
+    def test_shebang_scripts(self, tmp_path: Path):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "deploy").write_text("#!/usr/bin/env python3\nprint('hi')\n")
+        (bin_dir / "serve").write_text("#!/usr/bin/python3.12 -u\n")
+        (bin_dir / "run").write_text("#!/bin/sh\necho hi\n")
+        (tmp_path / "LICENSE").write_text("MIT")
+        stats = LanguageStats(tmp_path)
+        for name in ("bin/deploy", "bin/serve", "bin/run", "LICENSE"):
+            stats.add(name, 10)
+        assert stats.languages() == ["python"]
+
+    def test_sample_independent_of_order(self, tmp_path: Path):
+        names = [f"h{i}.h" for i in range(40)]
+        for i, name in enumerate(names):
+            body = "namespace x {}" if i % 2 else "int x;"
+            (tmp_path / name).write_text(body)
+        forward, backward = LanguageStats(tmp_path), LanguageStats(tmp_path)
+        for name in names:
+            forward.add(name, 10)
+        for name in reversed(names):
+            backward.add(name, 10)
+        assert forward.totals() == backward.totals()
+
+
+class TestDetectLanguagesWeight:
+    def test_weight_by_bytes(self, tmp_path: Path):
+        for i in range(2):
+            (tmp_path / f"big{i}.go").write_text("x" * 1000)
+        for i in range(5):
+            (tmp_path / f"small{i}.py").write_text("x")
+        files = sorted(tmp_path.iterdir())
+        assert detect_languages(files) == ["python", "go"]
+        assert detect_languages(files, weight="bytes") == ["go", "python"]
@@ -0,0 +1,117 @@
+"""Tests for the markdown link graph."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis import link_graph
+from ctxforge.analysis.link_graph import (
+    DocLinks,
+    LinkGraph,
+    build_doc_graph,
+    parse_markdown,
+)
+
+_OLD = 1_600_000_000  # a timestamp well outside the racy window
+
+
+class TestParseMarkdown:
+    def test_resolves_relative_links(self):
+        text = (
+            b"# Title\n## Part\n"
+            b"See [arch](../design/arch.md#overview) and ![img](img/a.png).\n"
+            b"[ref]: ./api.md\n"
+            b"[web](https://example.com/x.md) [anchor](#top) [root](/README.md)\n"
+            b"[up](../../outside.md) [self](guide.md)\n"
+        )
+        doc = parse_markdown("docs/guide.md", text)
+        assert doc.headings == 2
+        assert doc.targets == ["design/arch.md", "docs/img/a.png", "docs/api.md", "README.md"]
+
+    def test_duplicates_collapsed(self):
+        doc = parse_markdown("a.md", b"[x](b.md) [y](b.md) [z](./b.md)")
+        assert doc.targets == ["b.md"]
+
+
+def _docs(edges: dict[str, list[str]]) -> dict[str, DocLinks]:
+    return {path: DocLinks(0, 0, targets=targets) for path, targets in edges.items()}
+
+
+class TestLinkGraph:
+    def test_in_degrees_ignore_unknown_targets(self):
+        graph = LinkGraph.from_docs(
+            _docs({"a.md": ["b.md", "missing.md"], "b.md": ["a.md"], "c.md": ["b.md"]})
+        )
+        assert graph.edge_count == 3
+        assert graph.in_degrees() == {"a.md": 1, "b.md": 2, "c.md": 0}
+
+    def test_pagerank_sums_to_one_and_favours_hubs(self):
+        graph = LinkGraph.from_docs(
+            _docs({
+                "hub.md": [],
+                "a.md": ["hub.md"],
+                "b.md": ["hub.md"],
+                "c.md": ["hub.md", "a.md"],
+            })
+        )
+        ranks = graph.pagerank()
+        assert sum(ranks.values()) == pytest.approx(1.0)
+        assert max(ranks, key=ranks.__getitem__) == "hub.md"
+        assert ranks["a.md"] > ranks["b.md"] == pytest.approx(ranks["c.md"])
+
+    def test_no_links_uniform(self):
+        ranks = LinkGraph.from_docs(_docs({"a.md": [], "b.md": []})).pagerank()
+        assert ranks == {"a.md": pytest.approx(0.5), "b.md": pytest.approx(0.5)}
+
+    def test_empty(self):
+        assert LinkGraph.from_docs({}).pagerank() == {}
+
+
+class TestBuildDocGraph:
+    def _files(self, root: Path) -> list[tuple[str, int, int]]:
+        out = []
+        for p in sorted(root.rglob("*.md")):
+            st = p.stat()
+            out.append((p.relative_to(root).as_posix(), st.st_mtime_ns, st.st_size))
+        return out
+
+    def test_cache_reuses_unchanged_files(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        (tmp_path / "a.md").write_text("[b](b.md)")
+        (tmp_path / "b.md").write_text("# B")
+        for name in ("a.md", "b.md"):
+            os.utime(tmp_path / name, (_OLD, _OLD))
+        first = build_doc_graph(tmp_path, self._files(tmp_path), use_cache=True)
+
+        parsed: list[str] = []
+        real = link_graph.parse_markdown
+        monkeypatch.setattr(
+            link_graph, "parse_markdown", lambda s, t: parsed.append(s) or real(s, t)
+        )
+        (tmp_path / "a.md").write_text("[b](b.md) and more")
+        second = build_doc_graph(tmp_path, self._files(tmp_path), use_cache=True)
+
+        assert parsed == ["a.md"]
+        assert second.ranks == pytest.approx(first.ranks)
+        assert second.docs["b.md"].headings == 1
+
+    def test_racy_files_not_cached(self, tmp_path: Path, monkeypatch):
+        (tmp_path / ".ctxforge").mkdir()
+        (tmp_path / "a.md").write_text("[b](b.md)")
+        (tmp_path / "b.md").write_text("# B")
+        os.utime(tmp_path / "b.md", (_OLD, _OLD))
+        build_doc_graph(tmp_path, self._files(tmp_path), use_cache=True)
+
+        parsed: list[str] = []
+        real = link_graph.parse_markdown
+        monkeypatch.setattr(
+            link_graph, "parse_markdown", lambda s, t: parsed.append(s) or real(s, t)
+        )
+        build_doc_graph(tmp_path, self._files(tmp_path), use_cache=True)
+        assert parsed == ["a.md"]
+
+    def test_no_cache_written_without_ctxforge_dir(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("x")
+        build_doc_graph(tmp_path, self._files(tmp_path), use_cache=True)
+        assert not (tmp_path / ".ctxforge").exists()
@@ -0,0 +1,129 @@
+"""Tests for the incremental scan index."""
+
+import os
+from pathlib import Path
+
+from ctxforge.analysis import scanner
+from ctxforge.analysis.scan_index import INDEX_FILE, DirListing, ScanIndex
+from ctxforge.analysis.scanner import scan_project
+from ctxforge.storage.cache import CACHE_DIR
+
+_OLD = 1_600_000_000  # a timestamp well outside the racy window
+
+
+def _age(*paths: Path) -> None:
+    for p in paths:
+        os.utime(p, (_OLD, _OLD))
+
+
+def _make_project(root: Path) -> None:
+    (root / ".ctxforge").mkdir()
+    src = root / "src"
+    src.mkdir()
+    (src / "a.py").write_text("print('a')")
+    (src / "b.py").write_text("print('b')")
+    _age(src, root)
+
+
+class TestScanIndex:
+    def test_lookup_requires_matching_mtime(self, tmp_path: Path):
+        listing = DirListing(5, [("a.py", 1, 7, None)], [])
+        index = ScanIndex(tmp_path / "idx.json", {"src": listing})
+        assert index.lookup("src", 5) is not None
+        assert index.lookup("src", 6) is None
+        assert index.lookup("other", 5) is None
+
+    def test_save_and_load_roundtrip(self, tmp_path: Path):
+        index = ScanIndex.load(tmp_path)
+        index.record("", DirListing(10, [("README.md", 42, 9, False)], ["src"]))
+        index.save()
+
+        loaded = ScanIndex.load(tmp_path)
+        listing = loaded.lookup("", 10)
+        assert listing is not None
+        assert listing.files == [("README.md", 42, 9, False)]
+        assert listing.dirs == ["src"]
+
+    def test_racy_listings_not_persisted(self, tmp_path: Path):
+        index = ScanIndex.load(tmp_path)
+        index.record("", DirListing(_OLD * 10**9, [], []))
+        index.record("new", DirListing(os.stat(tmp_path).st_mtime_ns, [], []))
+        index.save()
+
+        loaded = ScanIndex.load(tmp_path)
+        assert loaded.lookup("", _OLD * 10**9) is not None
+        assert loaded.lookup("new", os.stat(tmp_path).st_mtime_ns) is None
+
+    def test_corrupt_index_ignored(self, tmp_path: Path):
+        path = tmp_path / CACHE_DIR / INDEX_FILE
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+        index = ScanIndex.load(tmp_path)
+        assert index.lookup("", 0) is None
+
+
+class TestCachedScan:
+    def test_cache_written_when_project_initialized(self, tmp_path: Path):
+        _make_project(tmp_path)
+        scan_project(tmp_path, use_cache=True)
+        assert (tmp_path / CACHE_DIR / INDEX_FILE).is_file()
+
+    def test_cache_not_written_without_ctxforge_dir(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("")
+        scan_project(tmp_path, use_cache=True)
+        assert not (tmp_path / ".ctxforge").exists()
+
+    def test_warm_scan_skips_unchanged_dirs(self, tmp_path: Path, monkeypatch):
+        _make_project(tmp_path)
+        cold = scan_project(tmp_path, use_cache=True)
+
+        calls: list[str] = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):  # type: ignore[no-untyped-def]
+            calls.append(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr("ctxforge.analysis.scanner.os.scandir", recording_scandir)
+        warm = scan_project(tmp_path, use_cache=True)
+
+        assert calls == []
+        assert warm == cold
+
+    def test_changed_dir_is_relisted(self, tmp_path: Path):
+        _make_project(tmp_path)
+        scan_project(tmp_path, use_cache=True)
+
+        src = tmp_path / "src"
+        (src / "c.ts").write_text("")
+        (src / "d.ts").write_text("")
+        _age(src)
+        os.utime(src, (_OLD + 10, _OLD + 10))
+
+        report = scan_project(tmp_path, use_cache=True)
+        assert report.file_count == 4
+        assert "typescript" in report.languages
+
+    def test_generated_flags_cached(self, tmp_path: Path, monkeypatch):
+        _make_project(tmp_path)
+        web = tmp_path / "web"
+        web.mkdir()
+        (web / "app.js").write_text("// Code generated by tool. DO NOT EDIT.\n" * 200)
+        (web / "util.js").write_text("export const x = 1;\n" * 300)
+        _age(web / "app.js", web / "util.js", web, tmp_path)
+        assert scan_project(tmp_path, use_cache=True).generated_files == 1
+
+        sniffed: list[str] = []
+        real = scanner.is_generated
+        monkeypatch.setattr(
+            scanner, "is_generated",
+            lambda root, rel, size: sniffed.append(rel) or real(root, rel, size),
+        )
+        assert scan_project(tmp_path, use_cache=True).generated_files == 1
+        assert sniffed == []
+
+        (web / "new.js").write_text("export const y = 2;\n" * 300)
+        _age(web / "new.js")
+        os.utime(web, (_OLD + 10, _OLD + 10))
+        assert scan_project(tmp_path, use_cache=True).generated_files == 1
+        assert sniffed == ["new.js"]
@@ -1,8 +1,21 @@
 """Tests for project scanner."""
 
+import os
+import shutil
+import subprocess
 from pathlib import Path
 
-from ctxforge.analysis.scanner import scan_project
+import pytest
+
+from ctxforge.analysis.lang_detector import detect_languages
+from ctxforge.analysis.scan_index import ScanIndex
+from ctxforge.analysis.scanner import (
+    FileTable,
+    ProjectWalker,
+    ScanEntry,
+    ScanLimits,
+    scan_project,
+)
 
 
 class TestScanProject:
@@ -21,6 +34,17 @@ class TestScanProject:
         assert "python" in report.languages
         assert "pyproject.toml" in report.config_files
 
+    def test_languages_weighted_by_size(self, tmp_path: Path):
+        for i in range(10):
+            (tmp_path / f"stub{i}.ts").write_text("export {}")
+        for i in range(2):
+            (tmp_path / f"main{i}.go").write_text("package main\n" * 100)
+
+        report = scan_project(tmp_path)
+
+        assert report.languages == ["go", "typescript"]
+        assert report.language_shares["go"] > 90
+
     def test_empty_directory(self, tmp_path: Path):
         """Scan an empty directory should not crash."""
         report = scan_project(tmp_path)
@@ -49,3 +73,369 @@ class TestScanProject:
         report = scan_project(tmp_path)
 
         assert "node_modules" not in report.dir_tree
+
+    def test_nested_excludes_pruned(self, tmp_path: Path):
+        """Excluded directories are skipped at any depth, with their contents."""
+        pkg = tmp_path / "web" / "node_modules" / "lib"
+        pkg.mkdir(parents=True)
+        for i in range(3):
+            (pkg / f"mod{i}.js").write_text("")
+        (tmp_path / "web" / "app.py").write_text("")
+        (tmp_path / "web" / "main.py").write_text("")
+
+        report = scan_project(tmp_path)
+
+        assert report.languages == ["python"]
+        assert "web" in report.dir_tree
+        assert not any("node_modules" in d for d in report.dir_tree)
+
+    def test_excluded_dirs_not_entered(self, tmp_path: Path, monkeypatch):
+        """The walker never lists the contents of an excluded directory."""
+        (tmp_path / ".git" / "objects").mkdir(parents=True)
+        (tmp_path / "src").mkdir()
+        listed: list[str] = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):  # type: ignore[no-untyped-def]
+            listed.append(os.path.basename(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr("ctxforge.analysis.scanner.os.scandir", recording_scandir)
+        scan_project(tmp_path)
+
+        assert "src" in listed
+        assert ".git" not in listed
+        assert "objects" not in listed
+
+    def test_dir_tree_depth_and_order(self, tmp_path: Path):
+        """Directories deeper than three levels are omitted; output is sorted."""
+        (tmp_path / "b" / "c" / "d" / "e").mkdir(parents=True)
+        (tmp_path / "a").mkdir()
+
+        report = scan_project(tmp_path)
+
+        assert report.dir_tree == [
+            "a",
+            "b",
+            str(Path("b", "c")),
+            str(Path("b", "c", "d")),
+        ]
+
+
+class TestGitignoreScan:
+    def test_root_gitignore(self, tmp_path: Path):
+        (tmp_path / ".gitignore").write_text("generated/\n*.js\n")
+        (tmp_path / "generated").mkdir()
+        for i in range(3):
+            (tmp_path / "generated" / f"m{i}.py").write_text("")
+            (tmp_path / f"bundle{i}.js").write_text("")
+        (tmp_path / "src").mkdir()
+
+        report = scan_project(tmp_path)
+
+        assert report.dir_tree == ["src"]
+        assert report.languages == []
+
+    def test_invalid_gitignore_lines_skipped(self, tmp_path: Path):
+        (tmp_path / ".gitignore").write_text("[z-a]\n[]x]\n*.js\n")
+        (tmp_path / "app.js").write_text("")
+        (tmp_path / "x").write_text("")
+        (tmp_path / "main.py").write_text("")
+
+        report = scan_project(tmp_path)
+
+        assert report.file_count == 2  # .gitignore and main.py
+
+    def test_nested_gitignore_and_negation(self, tmp_path: Path):
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (tmp_path / ".gitignore").write_text("*.go\n")
+        (pkg / ".gitignore").write_text("!*.go\n")
+        for i in range(2):
+            (tmp_path / f"root{i}.go").write_text("")
+            (pkg / f"pkg{i}.go").write_text("")
+
+        report = scan_project(tmp_path)
+
+        assert report.languages == ["go"]
+        assert report.file_count == 4  # two .gitignore files + pkg/*.go
+
+    def test_git_info_exclude(self, tmp_path: Path):
+        info = tmp_path / ".git" / "info"
+        info.mkdir(parents=True)
+        (info / "exclude").write_text("scratch/\n")
+        (tmp_path / "scratch").mkdir()
+        (tmp_path / "src").mkdir()
+
+        report = scan_project(tmp_path)
+
+        assert report.dir_tree == ["src"]
+
+    def test_respect_gitignore_disabled(self, tmp_path: Path):
+        (tmp_path / ".gitignore").write_text("out/\n")
+        (tmp_path / "out").mkdir()
+
+        report = scan_project(tmp_path, respect_gitignore=False)
+
+        assert "out" in report.dir_tree
+
+    def test_ignore_patterns_override_gitignore(self, tmp_path: Path):
+        (tmp_path / ".gitignore").write_text("!data/\n")
+        (tmp_path / "data").mkdir()
+        (tmp_path / "src").mkdir()
+
+        report = scan_project(tmp_path, ignore_patterns=["data/"])
+
+        assert report.dir_tree == ["src"]
+
+
+class TestGitFastPath:
+    def _git(self, root: Path, *args: str) -> None:
+        subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_lists_tracked_files_only(self, tmp_path: Path):
+        self._git(tmp_path, "init", "-q")
+        (tmp_path / "src" / "deep").mkdir(parents=True)
+        (tmp_path / "src" / "a.py").write_text("print(1)\n")
+        (tmp_path / "src" / "deep" / "b.py").write_text("")
+        (tmp_path / "untracked.rs").write_text("")
+        self._git(tmp_path, "add", "src")
+
+        report = scan_project(tmp_path, use_git=True)
+        entries = {e.path: e for e in ProjectWalker(tmp_path, use_git=True)}
+
+        assert entries["src/a.py"].size == 9
+        assert entries["src/deep"].is_dir
+        assert report.file_count == 2
+        assert report.languages == ["python"]
+        assert report.dir_tree == ["src", str(Path("src", "deep"))]
+
+    def test_falls_back_without_git_dir(self, tmp_path: Path):
+        (tmp_path / "src").mkdir()
+        report = scan_project(tmp_path, use_git=True)
+        assert report.dir_tree == ["src"]
+
+
+class TestParallelScan:
+    def _make_tree(self, root: Path) -> None:
+        (root / ".gitignore").write_text("*.tmp\n")
+        for pkg in ("alpha", "beta", "gamma"):
+            for sub in ("src", "tests", "docs/api"):
+                d = root / pkg / sub
+                d.mkdir(parents=True)
+                (d / "mod.py").write_text("")
+                (d / "util.ts").write_text("")
+                (d / "scratch.tmp").write_text("")
+        (root / "node_modules" / "x").mkdir(parents=True)
+
+    def test_matches_serial_report(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        serial = scan_project(tmp_path)
+        parallel = scan_project(tmp_path, workers=4)
+        assert parallel == serial
+        assert parallel.file_count == 19
+
+    def test_matches_serial_with_cache(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        (tmp_path / ".ctxforge").mkdir()
+        serial = scan_project(tmp_path, use_cache=True)
+        parallel = scan_project(tmp_path, use_cache=True, workers=3)
+        assert parallel == serial
+
+
+class TestProjectWalker:
+    def _make_tree(self, root: Path) -> None:
+        for d in ("a", "a/b", "a/b/c"):
+            (root / d).mkdir(parents=True, exist_ok=True)
+            for i in range(2):
+                (root / d / f"f{i}.py").write_text("x" * (i + 1))
+
+    def test_yields_files_and_dirs(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        walker = ProjectWalker(tmp_path)
+        entries = {e.path: e for e in walker}
+
+        assert entries["a/b"] == ScanEntry("a/b", is_dir=True)
+        assert entries["a/b/c/f1.py"].size == 2
+        assert entries["a/b/c/f1.py"].depth == 4
+        assert entries["a/b/c/f1.py"].name == "f1.py"
+        assert not walker.truncated
+
+    def test_lazy_consumption(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        files = (e.path for e in ProjectWalker(tmp_path) if not e.is_dir)
+        assert detect_languages(files) == ["python"]
+
+    def test_max_files(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        report = scan_project(tmp_path, limits=ScanLimits(max_files=3))
+        assert report.file_count == 3
+        assert report.partial
+
+    def test_max_depth(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        walker = ProjectWalker(tmp_path, limits=ScanLimits(max_depth=2))
+        paths = {e.path for e in walker}
+        assert paths == {"a", "a/b", "a/f0.py", "a/f1.py"}
+        assert walker.truncated
+
+    def test_max_seconds(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        report = scan_project(tmp_path, limits=ScanLimits(max_seconds=0))
+        assert report.partial
+        assert report.file_count == 0
+
+    def test_parallel_limits(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        report = scan_project(tmp_path, workers=4, limits=ScanLimits(max_files=1))
+        assert report.file_count == 1
+        assert report.partial
+
+    def test_unlimited_scan_not_partial(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        assert not scan_project(tmp_path).partial
+
+    def test_partial_walk_keeps_cached_listings(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        (tmp_path / ".ctxforge").mkdir()
+        for d in ("a/b/c", "a/b", "a", ""):
+            os.utime(tmp_path / d, (1_600_000_000, 1_600_000_000))
+        scan_project(tmp_path, use_cache=True)
+        scan_project(tmp_path, use_cache=True, limits=ScanLimits(max_depth=1))
+        index = ScanIndex.load(tmp_path)
+        mtime = os.stat(tmp_path / "a" / "b" / "c").st_mtime_ns
+        assert index.lookup("a/b/c", mtime) is not None
+
+
+class TestVendoredAndGenerated:
+    def _make_tree(self, root: Path) -> None:
+        (root / "vendor" / "lib").mkdir(parents=True)
+        for i in range(5):
+            (root / "vendor" / "lib" / f"v{i}.go").write_text("package lib\n")
+        (root / "web").mkdir()
+        for i in range(3):
+            (root / "web" / f"app{i}.min.js").write_text("var a=1;")
+        (root / "src").mkdir()
+        for i in range(2):
+            (root / "src" / f"main{i}.py").write_text("print(1)\n")
+
+    def test_vendored_pruned_and_generated_ignored(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+
+        report = scan_project(tmp_path)
+
+        assert report.languages == ["python"]
+        assert report.vendored_dirs == ["vendor"]
+        assert "vendor" not in report.dir_tree
+        assert report.file_count == 5
+        assert report.generated_files == 3
+
+    def test_generated_flag_on_entries(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+        flagged = {e.path for e in ProjectWalker(tmp_path) if e.generated}
+        assert flagged == {f"web/app{i}.min.js" for i in range(3)}
+
+    def test_skip_vendored_disabled(self, tmp_path: Path):
+        self._make_tree(tmp_path)
+
+        report = scan_project(tmp_path, skip_vendored=False)
+
+        assert report.languages == ["go", "javascript", "python"]
+        assert report.vendored_dirs == []
+        assert report.generated_files == 0
+
+
+class TestFileTable:
+    def _table(self) -> FileTable:
+        table = FileTable()
+        for entry in [
+            ScanEntry("src", is_dir=True),
+            ScanEntry("README.md", 100, mtime_ns=1),
+            ScanEntry("src/a.py", 10, mtime_ns=2),
+            ScanEntry("src/pkg/b.py", 3000, mtime_ns=3),
+            ScanEntry("src/pkg/c.PY", 0),
+            ScanEntry("web/app.min.js", 5000, generated=True),
+        ]:
+            table.add(entry)
+        return table
+
+    def test_paths_roundtrip(self):
+        table = self._table()
+        assert list(table.paths()) == [
+            "README.md",
+            "src/a.py",
+            "src/pkg/b.py",
+            "src/pkg/c.PY",
+            "web/app.min.js",
+        ]
+        assert table.dirs() == ["src", "src/pkg", "web"]
+        assert table.dirs(max_depth=1) == ["src", "web"]
+        assert list(table.mtime_ns) == [1, 2, 3, 0, 0]
+
+    def test_subtree(self):
+        sub = self._table().subtree("src")
+        assert list(sub.paths()) == ["a.py", "pkg/b.py", "pkg/c.PY"]
+        assert sub.dirs() == ["pkg"]
+        assert list(sub.select({".py"})) == [
+            ("a.py", 2, 10), ("pkg/b.py", 3, 3000), ("pkg/c.PY", 0, 0)
+        ]
+        assert len(self._table().subtree("missing")) == 0
+
+    def test_find_by_name(self):
+        table = self._table()
+        assert list(table.find({"b.py", "README.md", "missing"})) == [
+            "README.md",
+            "src/pkg/b.py",
+        ]
+
+    def test_select_by_extension(self):
+        table = self._table()
+        assert list(table.select({".py", ".js"})) == [
+            ("src/a.py", 2, 10),
+            ("src/pkg/b.py", 3, 3000),
+            ("src/pkg/c.PY", 0, 0),
+        ]
+        assert ("web/app.min.js", 0, 5000) in table.select({".js"}, include_generated=True)
+
+    def test_extension_totals(self):
+        table = self._table()
+        assert table.extension_totals() == {".md": (1, 100), ".py": (3, 3010)}
+        assert table.extension_totals(include_generated=True)[".js"] == (1, 5000)
+        assert table.generated_count() == 1
+
+    def test_language_stats_skip_generated(self):
+        shares = self._table().language_stats().breakdown(min_files=1)
+        assert [(s.name, s.files, s.bytes) for s in shares] == [("python", 3, 3010)]
+
+    def test_size_histogram(self):
+        # 0 → bucket 0; 10 → 4; 100 → 7; 3000 → 12; 5000 → 13
+        histogram = self._table().size_histogram()
+        assert len(histogram) == 14
+        assert {k: n for k, n in enumerate(histogram) if n} == {
+            0: 1, 4: 1, 7: 1, 12: 1, 13: 1
+        }
+
+    def test_dir_totals_roll_up(self):
+        totals = self._table().dir_totals()
+        assert totals[""] == (5, 8110)
+        assert totals["src"] == (3, 3010)
+        assert totals["src/pkg"] == (2, 3000)
+        assert self._table().dir_totals(max_depth=0) == {"": (5, 8110)}
+
+    def test_compact(self):
+        table = FileTable()
+        for i in range(10_000):
+            table.add(ScanEntry(f"pkg{i % 50}/module_{i}.py", i))
+        assert len(table) == 10_000
+        assert table.nbytes / len(table) < 64
+
+    def test_scan_report_carries_table(self, tmp_path: Path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("x = 1\n")
+
+        report = scan_project(tmp_path)
+
+        assert report.files is not None
+        assert list(report.files.paths()) == ["src/main.py"]
+        assert report.files.mtime_ns[0] == (tmp_path / "src" / "main.py").stat().st_mtime_ns
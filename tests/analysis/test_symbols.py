@@ -0,0 +1,132 @@
+"""Tests for top-level symbol extraction."""
+
+import os
+from pathlib import Path
+
+from ctxforge.analysis import symbols as symbols_module
+from ctxforge.analysis.symbols import SymbolIndex, extract_symbols
+
+
+def _sigs(path: str, text: str) -> list[str]:
+    return [s.signature for s in extract_symbols(path, text)]
+
+
+class TestExtractSymbols:
+    def test_python(self):
+        text = (
+            "import os\n"
+            "def load(path: str, *, strict: bool = False) -> dict:\n    ...\n"
+            "async def fetch(url):\n    ...\n"
+            "def _private():\n    ...\n"
+            "class Store(Base, metaclass=Meta):\n"
+            "    def __init__(self, root):\n        ...\n"
+            "    def get(self, key: str) -> bytes:\n        ...\n"
+            "    def _helper(self):\n        ...\n"
+        )
+        found = extract_symbols("pkg/store.py", text)
+        assert [(s.kind, s.name, s.depth) for s in found] == [
+            ("function", "load", 0),
+            ("function", "fetch", 0),
+            ("class", "Store", 0),
+            ("method", "__init__", 1),
+            ("method", "get", 1),
+        ]
+        assert found[0].signature == "def load(path: str, *, strict: bool=False) -> dict"
+        assert found[1].signature == "async def fetch(url)"
+        assert found[2].signature == "class Store(Base, metaclass=Meta)"
+        assert found[4].line == 11
+
+    def test_python_syntax_error(self):
+        assert extract_symbols("bad.py", "def broken(:\n") == []
+
+    def test_typescript(self):
+        text = (
+            "import x from 'y';\n"
+            "export interface Options {\n  a: string;\n}\n"
+            "export type Id = string | number;\n"
+            "export default async function main(opts: Options): Promise<void> {\n}\n"
+            "export const handler = async (req: Request) => {\n};\n"
+            "class Internal extends Base {\n  method() {}\n}\n"
+            "  function nested() {}\n"
+        )
+        assert _sigs("src/app.ts", text) == [
+            "export interface Options",
+            "export type Id = string | number",
+            "export default async function main(opts: Options): Promise<void>",
+            "export const handler = async (req: Request) =>",
+            "class Internal extends Base",
+        ]
+
+    def test_go_exported_only(self):
+        text = (
+            "package api\n"
+            "type Server struct {\n}\n"
+            "type handler func()\n"
+            "func (s *Server) Serve(addr string) error {\n}\n"
+            "func helper() {}\n"
+            "func New(cfg Config) *Server {\n}\n"
+        )
+        found = extract_symbols("api/server.go", text)
+        assert [(s.kind, s.name) for s in found] == [
+            ("type", "Server"),
+            ("function", "Serve"),
+            ("function", "New"),
+        ]
+        assert found[1].signature == "func (s *Server) Serve(addr string) error"
+
+    def test_rust_pub_only(self):
+        text = (
+            "pub struct Config {\n}\n"
+            "fn private() {}\n"
+            "pub(crate) async fn run(cfg: &Config) -> Result<()> {\n}\n"
+            "pub trait Store: Send {\n}\n"
+        )
+        assert _sigs("src/lib.rs", text) == [
+            "pub struct Config",
+            "pub(crate) async fn run(cfg: &Config) -> Result<()>",
+            "pub trait Store: Send",
+        ]
+
+    def test_unknown_extension(self):
+        assert extract_symbols("notes.txt", "def f(): pass") == []
+
+
+class TestSymbolIndex:
+    def test_reparses_only_changed_content(self, tmp_path: Path, monkeypatch):
+        src = tmp_path / "m.py"
+        src.write_text("def a():\n    pass\n")
+        calls: list[str] = []
+        real = symbols_module.extract_symbols
+        monkeypatch.setattr(
+            symbols_module, "extract_symbols", lambda p, t: calls.append(p) or real(p, t)
+        )
+
+        def lookup() -> list[str]:
+            index = SymbolIndex.load(tmp_path)
+            st = src.stat()
+            names = [s.name for s in index.symbols(tmp_path, "m.py", st.st_mtime_ns, st.st_size)]
+            index.save()
+            return names
+
+        assert lookup() == ["a"]
+        assert lookup() == ["a"]
+        # Touched but identical: re-hashed, not re-parsed.
+        os.utime(src, ns=(1, 1))
+        assert lookup() == ["a"]
+        assert calls == ["m.py"]
+
+        src.write_text("def b():\n    pass\n")
+        assert lookup() == ["b"]
+        assert calls == ["m.py", "m.py"]
+
+    def test_racy_entries_rehashed(self, tmp_path: Path):
+        src = tmp_path / "m.py"
+        src.write_text("def a():\n    pass\n")
+        st = src.stat()
+        index = SymbolIndex.load(tmp_path)
+        index.symbols(tmp_path, "m.py", st.st_mtime_ns, st.st_size)
+        index.save()
+
+        loaded = SymbolIndex.load(tmp_path)
+        assert loaded._files["m.py"][0] == 0
+        assert [s.name for s in loaded.outline()["m.py"]] == ["a"]
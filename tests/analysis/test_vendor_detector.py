@@ -0,0 +1,60 @@
+"""Tests for vendored/generated file detection."""
+
+from pathlib import Path
+
+from ctxforge.analysis.vendor_detector import (
+    is_generated,
+    is_generated_name,
+    is_vendored_dir,
+    sniff_generated,
+)
+
+
+class TestNames:
+    def test_vendored_dirs(self):
+        assert is_vendored_dir("vendor")
+        assert is_vendored_dir("third_party")
+        assert not is_vendored_dir("src")
+
+    def test_generated_names(self):
+        assert is_generated_name("package-lock.json")
+        assert is_generated_name("app.min.js")
+        assert is_generated_name("api_pb2.py")
+        assert is_generated_name("service.pb.go")
+        assert not is_generated_name("main.go")
+
+
+class TestSniff:
+    def test_go_generated_marker(self):
+        head = b"// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n"
+        assert sniff_generated(head, ".go")
+
+    def test_generated_annotation(self):
+        assert sniff_generated(b"/**\n * @generated\n */\n", ".js")
+
+    def test_minified_js(self):
+        assert sniff_generated(b"var a=1;" * 200, ".js")
+        assert not sniff_generated(b"var a = 1;\n" * 200, ".js")
+
+    def test_long_python_line_not_minified(self):
+        assert not sniff_generated(b"x" * 2000, ".py")
+
+
+class TestIsGenerated:
+    def test_small_files_not_read(self, tmp_path: Path):
+        # The file does not exist: a read attempt would still return False,
+        # but size alone must short-circuit before any I/O.
+        assert not is_generated(tmp_path, "small.go", 100)
+
+    def test_large_generated_file(self, tmp_path: Path):
+        body = "// Code generated by mockgen. DO NOT EDIT.\n" + "x := 1\n" * 1000
+        (tmp_path / "mock.go").write_text(body)
+        assert is_generated(tmp_path, "mock.go", len(body))
+
+    def test_large_handwritten_file(self, tmp_path: Path):
+        body = "package main\n" + "x := 1\n" * 1000
+        (tmp_path / "main.go").write_text(body)
+        assert not is_generated(tmp_path, "main.go", len(body))
+
+    def test_lockfile_by_name(self, tmp_path: Path):
+        assert is_generated(tmp_path, "web/yarn.lock", 10)
@@ -0,0 +1,124 @@
+"""Tests for monorepo workspace detection."""
+
+import json
+from pathlib import Path
+
+from ctxforge.analysis.scanner import scan_project
+from ctxforge.analysis.workspace import Workspace, detect_workspaces, scan_workspace
+
+
+def _tree(root: Path, files: dict[str, str]) -> list[str]:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return list(files)
+
+
+class TestDetectWorkspaces:
+    def test_pnpm(self, tmp_path: Path):
+        files = _tree(tmp_path, {
+            "package.json": "{}",
+            "pnpm-workspace.yaml": (
+                "packages:\n  - 'packages/*'\n  - \"apps/**\"  # all apps\n"
+                "  - '!packages/legacy'\ncatalog:\n  - 'ignored/*'\n"
+            ),
+            "packages/ui/package.json": "{}",
+            "packages/legacy/package.json": "{}",
+            "packages/ui/fixtures/package.json": "{}",
+            "apps/web/client/package.json": "{}",
+            "ignored/x/package.json": "{}",
+        })
+        assert detect_workspaces(tmp_path, files) == [
+            Workspace("apps/web/client", "pnpm"),
+            Workspace("packages/ui", "pnpm"),
+        ]
+
+    def test_yarn_workspaces_object(self, tmp_path: Path):
+        files = _tree(tmp_path, {
+            "package.json": json.dumps({"workspaces": {"packages": ["libs/*"]}}),
+            "libs/a/package.json": "{}",
+            "libs/b/README.md": "",
+        })
+        assert detect_workspaces(tmp_path, files) == [Workspace("libs/a", "npm")]
+
+    def test_cargo(self, tmp_path: Path):
+        files = _tree(tmp_path, {
+            "Cargo.toml": "[workspace]\nmembers = ['crates/*']\nexclude = ['crates/old']\n",
+            "crates/core/Cargo.toml": "",
+            "crates/old/Cargo.toml": "",
+        })
+        assert detect_workspaces(tmp_path, files) == [Workspace("crates/core", "cargo")]
+
+    def test_go_work_and_nested_modules(self, tmp_path: Path):
+        files = _tree(tmp_path, {
+            "go.work": "go 1.22\n\nuse (\n\t./svc/api\n\t. // root\n)\n",
+            "go.mod": "",
+            "svc/api/go.mod": "",
+            "svc/worker/go.mod": "",
+        })
+        assert detect_workspaces(tmp_path, files) == [Workspace("svc/api", "go")]
+        (tmp_path / "go.work").unlink()
+        assert [w.path for w in detect_workspaces(tmp_path, files)] == ["svc/api", "svc/worker"]
+
+    def test_multiple_pyprojects(self, tmp_path: Path):
+        files = _tree(tmp_path, {
+            "pyproject.toml": "[project]\nname = 'root'\n",
+            "libs/core/pyproject.toml": "",
+            "tools/cli/pyproject.toml": "",
+        })
+        assert detect_workspaces(tmp_path, files) == [
+            Workspace("libs/core", "python"),
+            Workspace("tools/cli", "python"),
+        ]
+
+    def test_single_package(self, tmp_path: Path):
+        files = _tree(tmp_path, {"pyproject.toml": "", "src/app/__init__.py": ""})
+        assert detect_workspaces(tmp_path, files) == []
+
+
+class TestScanWorkspace:
+    def test_per_package_reports(self, tmp_path: Path):
+        _tree(tmp_path, {
+            "pnpm-workspace.yaml": "packages:\n  - packages/*\n",
+            "package.json": "{}",
+            "packages/api/package.json": "{}",
+            "packages/api/src/deep/er/still/server.ts": "export {}\n",
+            "packages/api/src/index.ts": "export {}\n",
+            "packages/cli/pyproject.toml": "",
+            "packages/cli/cli/main.py": "print()\n",
+        })
+        report = scan_project(tmp_path)
+        result = scan_workspace(tmp_path, report)
+        assert result.root is report
+        assert list(result.packages) == ["packages/api", "packages/cli"]
+
+        api = result.packages["packages/api"]
+        assert api.project_name == "packages/api"
+        assert api.languages == ["typescript"]
+        assert api.file_count == 3
+        # Depth is counted from the package, not the monorepo root.
+        assert str(Path("src", "deep", "er")) in api.dir_tree
+        assert result.packages["packages/cli"].config_files == ["pyproject.toml"]
+
+    def test_package_reports_keep_project_ignores(self, tmp_path: Path):
+        _tree(tmp_path, {
+            ".gitignore": "secret/\n*.log\n",
+            "pnpm-workspace.yaml": "packages:\n  - packages/*\n",
+            "package.json": "{}",
+            "packages/a/package.json": "{}",
+            "packages/a/index.ts": "export {}\n",
+            "packages/a/x.log": "",
+            "packages/a/secret/k.txt": "",
+            "packages/a/generated/out.ts": "export {}\n",
+        })
+        report = scan_project(tmp_path, ignore_patterns=["/packages/a/generated/"])
+        package = scan_workspace(tmp_path, report).packages["packages/a"]
+        assert list(package.files.paths()) == ["index.ts", "package.json"]
+        assert package.file_count == 2
+
+    def test_single_package_has_no_packages(self, tmp_path: Path):
+        _tree(tmp_path, {"main.py": ""})
+        result = scan_workspace(tmp_path)
+        assert result.packages == {}
+        assert result.root.file_count == 1
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 
 from typer.testing import CliRunner
 
+from ctxforge.analysis.doc_detector import DocCandidate
 from ctxforge.console.application import app
 
 runner = CliRunner()
@@ -15,7 +16,7 @@ class TestInitCommand:
         # language → key files prompt → profile name → description → auto_approve → decline run
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
-            patch("ctxforge.console.commands.init.detect_doc_candidates", return_value=[]),
+            patch("ctxforge.console.commands.init.rank_doc_candidates", return_value=[]),
         ):
             result = runner.invoke(
                 app,
@@ -30,7 +31,7 @@ class TestInitCommand:
         # language → key files prompt → profile name → description → auto_approve → decline run
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=[]),
-            patch("ctxforge.console.commands.init.detect_doc_candidates", return_value=[]),
+            patch("ctxforge.console.commands.init.rank_doc_candidates", return_value=[]),
         ):
             result = runner.invoke(
                 app,
@@ -46,8 +47,8 @@ class TestInitCommand:
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
             patch(
-                "ctxforge.console.commands.init.detect_doc_candidates",
-                return_value=candidates,
+                "ctxforge.console.commands.init.rank_doc_candidates",
+                return_value=[DocCandidate(c) for c in candidates],
             ) as mock_detect,
             patch(
                 "ctxforge.console.commands.init._select_key_files",
@@ -69,8 +70,8 @@ class TestInitCommand:
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
             patch(
-                "ctxforge.console.commands.init.detect_doc_candidates",
-                return_value=candidates,
+                "ctxforge.console.commands.init.rank_doc_candidates",
+                return_value=[DocCandidate(c) for c in candidates],
             ),
             patch(
                 "ctxforge.console.commands.init._select_key_files",
@@ -91,8 +92,8 @@ class TestInitCommand:
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
             patch(
-                "ctxforge.console.commands.init.detect_doc_candidates",
-                return_value=candidates,
+                "ctxforge.console.commands.init.rank_doc_candidates",
+                return_value=[DocCandidate(c) for c in candidates],
             ),
             patch(
                 "ctxforge.console.commands.init._select_key_files",
@@ -113,8 +114,8 @@ class TestInitCommand:
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
             patch(
-                "ctxforge.console.commands.init.detect_doc_candidates",
-                return_value=candidates,
+                "ctxforge.console.commands.init.rank_doc_candidates",
+                return_value=[DocCandidate(c) for c in candidates],
             ),
             patch(
                 "ctxforge.console.commands.init._select_key_files",
@@ -142,11 +143,30 @@ class TestInitCommand:
         assert "Existing profiles" in result.output
         assert "Updated" in result.output
 
+    def test_reinit_keeps_scan_config(self, ctxforge_project: Path):
+        """Re-init scans with [scan].exclude and keeps it in project.toml."""
+        from ctxforge.spec.loader import load_project
+        from ctxforge.spec.schema import ProjectConfig, ScanConfig
+        from ctxforge.storage.project_writer import write_project
+
+        toml_path = ctxforge_project / ".ctxforge" / "project.toml"
+        write_project(toml_path, ProjectConfig(scan=ScanConfig(exclude=["data/"])))
+        (ctxforge_project / "data").mkdir()
+
+        with patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]):
+            result = runner.invoke(
+                app,
+                ["init", str(ctxforge_project)],
+                input="English\nn\n",
+            )
+        assert result.exit_code == 0, result.output
+        assert load_project(toml_path).scan.exclude == ["data/"]
+
     def test_reinit_create_new_profile(self, ctxforge_project: Path):
         """Re-init with existing profiles, user creates a new one."""
         with (
             patch("ctxforge.console.commands.init.detect_ai_clis", return_value=["claude"]),
-            patch("ctxforge.console.commands.init.detect_doc_candidates", return_value=[]),
+            patch("ctxforge.console.commands.init.rank_doc_candidates", return_value=[]),
         ):
             # language → accept new profile → key files prompt → name → desc → auto_approve → decline run
             result = runner.invoke(
@@ -160,6 +180,19 @@ class TestInitCommand:
         ).exists()
 
 
+class TestPreselectDocs:
+    def test_best_scores_within_budget(self):
+        from ctxforge.console.commands.init import _preselect_docs
+
+        docs = [
+            DocCandidate("README.md", size=4_000, score=3.0),
+            DocCandidate("docs/huge.md", size=200_000, score=2.5),
+            DocCandidate("docs/guide.md", size=8_000, score=2.0),
+            DocCandidate("LICENSE", size=1_000, score=0.9),
+        ]
+        assert _preselect_docs(docs, budget=24000) == {"README.md", "docs/guide.md"}
+
+
 class TestLaunchSession:
     def test_launch_session_normal(self, ctxforge_project: Path):
         mock_result = MagicMock()
@@ -186,6 +219,26 @@ class TestLaunchSession:
         full_cmd = " ".join(call_args)
         assert "compress" in full_cmd.lower()
 
+    def test_launch_session_reports_budget(self, ctxforge_project: Path, capsys):
+        from ctxforge.core.profile import ProfileManager
+        from ctxforge.storage.profile_writer import write_profile
+
+        (ctxforge_project / "huge.txt").write_text("x" * 200_000)
+        pm = ProfileManager(ctxforge_project / ".ctxforge" / "profiles")
+        config = pm.load("default")
+        config.key_files.paths = ["huge.txt"]
+        write_profile(pm.profile_path("default"), config)
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+
+        with patch("ctxforge.runner.claude.subprocess.run", return_value=mock_result):
+            from ctxforge.console.commands.run import launch_session
+
+            assert launch_session(ctxforge_project, "default") == 0
+        out = capsys.readouterr().out
+        assert "/ 24,000 tokens" in out
+        assert "path only: huge.txt" in out
+
 
 class TestRunCommand:
     def test_run_default_profile(self, ctxforge_project: Path, monkeypatch):
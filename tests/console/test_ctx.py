@@ -72,6 +72,8 @@ class TestCtxFiles:
         assert result.exit_code == 0, result.output
         assert "README.md" in result.output
         assert "yes" in result.output
+        assert "Tokens" in result.output
+        assert (ctxforge_project / ".ctxforge" / "cache" / "tokens.json").is_file()
 
     def test_missing_file(self, ctxforge_project: Path, monkeypatch):
         monkeypatch.chdir(ctxforge_project)
@@ -89,6 +91,48 @@ class TestCtxFiles:
         assert result.exit_code == 0, result.output
         assert "no" in result.output
 
+    def _write_key_files(self, root: Path, paths: list[str]) -> None:
+        from ctxforge.spec.schema import KeyFilesSection, ProfileConfig, ProfileSection
+        from ctxforge.storage.profile_writer import write_profile
+
+        write_profile(
+            root / ".ctxforge" / "profiles" / "default" / "profile.toml",
+            ProfileConfig(
+                profile=ProfileSection(name="default"),
+                key_files=KeyFilesSection(paths=paths),
+            ),
+        )
+
+    def test_section_and_line_refs(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.chdir(ctxforge_project)
+        (ctxforge_project / "A.md").write_text(
+            "# A\nintro\n## Store\n" + "stored data\n" * 40 + "## Other\nx\n"
+        )
+        (ctxforge_project / "a.py").write_text("import os\n\ndef f():\n    return 1\n")
+        self._write_key_files(ctxforge_project, ["A.md#Store", "a.py:3-4", "A.md#Nope"])
+
+        result = runner.invoke(app, ["ctx", "files"])
+        assert result.exit_code == 0, result.output
+        rows = {line.split()[1]: line for line in result.output.splitlines() if "│ " in line}
+        assert rows["A.md#Store"].split("│")[3].strip() == "41"
+        assert rows["a.py:3-4"].split("│")[3].strip() == "2"
+        assert "no section" in rows["A.md#Nope"]
+        assert (ctxforge_project / ".ctxforge" / "cache" / "headings.json").is_file()
+
+    def test_sections_breakdown(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.chdir(ctxforge_project)
+        (ctxforge_project / "A.md").write_text(
+            "# A\nintro\n## Store\n" + "stored data\n" * 40 + "### Deep\nz\n## Other\nx\n"
+        )
+        self._write_key_files(ctxforge_project, ["A.md"])
+
+        result = runner.invoke(app, ["ctx", "files", "--sections"])
+        assert result.exit_code == 0, result.output
+        assert "#Store" in result.output
+        assert "#Other" in result.output
+        assert "#Deep" not in result.output
+        assert "#Store" not in runner.invoke(app, ["ctx", "files"]).output
+
 
 class TestCtxUpdate:
     def test_update_single_profile(self, ctxforge_project: Path, monkeypatch):
@@ -115,6 +159,55 @@ class TestCtxUpdate:
             result = runner.invoke(app, ["ctx", "update", "default"])
         assert result.exit_code == 0, result.output
 
+    def test_update_lists_stale_key_files(self, ctxforge_project: Path, monkeypatch):
+        import os
+        import time
+
+        from ctxforge.analysis.git_history import FileHistory, GitHistory
+        from ctxforge.spec.schema import (
+            CURRENT_PROFILE_VERSION,
+            KeyFilesSection,
+            ProfileCliSection,
+            ProfileConfig,
+            ProfileSection,
+        )
+        from ctxforge.storage.profile_writer import write_profile
+
+        monkeypatch.chdir(ctxforge_project)
+        profile_dir = ctxforge_project / ".ctxforge" / "profiles" / "default"
+        write_profile(
+            profile_dir / "profile.toml",
+            ProfileConfig(
+                schema_version=CURRENT_PROFILE_VERSION,
+                profile=ProfileSection(name="default"),
+                key_files=KeyFilesSection(paths=["README.md", "docs/old.md"]),
+                cli=ProfileCliSection(name="claude"),
+            ),
+        )
+        journal = profile_dir / "journal.md"
+        journal.write_text("done", encoding="utf-8")
+        updated = time.time() - 10 * 86400
+        os.utime(journal, (updated, updated))
+        history = GitHistory(
+            "abc",
+            {
+                "README.md": FileHistory(7, int(time.time()) - 86400 * 3),
+                "docs/old.md": FileHistory(1, int(updated) - 86400),
+            },
+        )
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+
+        with (
+            patch("ctxforge.console.commands.ctx.GitHistory.load", return_value=history),
+            patch("ctxforge.runner.claude.subprocess.run", return_value=mock_result),
+        ):
+            result = runner.invoke(app, ["ctx", "update"])
+
+        assert result.exit_code == 0, result.output
+        assert "README.md (last commit 3 days ago, 7 commits total)" in result.output
+        assert "docs/old.md" not in result.output
+
     def test_update_profile_not_found(self, ctxforge_project: Path, monkeypatch):
         monkeypatch.chdir(ctxforge_project)
         result = runner.invoke(app, ["ctx", "update", "nonexistent"])
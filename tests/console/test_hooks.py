@@ -0,0 +1,60 @@
+"""Tests for the hooks command."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ctxforge.analysis.symbols import SymbolIndex
+from ctxforge.console.application import app
+
+runner = CliRunner()
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        check=True, capture_output=True,
+    )
+
+
+class TestHooks:
+    def test_install_and_uninstall(self, ctxforge_project: Path, monkeypatch):
+        _git(ctxforge_project, "init", "-q")
+        monkeypatch.chdir(ctxforge_project)
+        result = runner.invoke(app, ["hooks", "install"])
+        assert result.exit_code == 0, result.output
+        assert (ctxforge_project / ".git" / "hooks" / "post-commit").is_file()
+
+        result = runner.invoke(app, ["hooks", "uninstall"])
+        assert result.exit_code == 0, result.output
+        assert not (ctxforge_project / ".git" / "hooks" / "post-commit").exists()
+
+    def test_install_outside_checkout(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(ctxforge_project.parent))
+        monkeypatch.chdir(ctxforge_project)
+        result = runner.invoke(app, ["hooks", "install"])
+        assert result.exit_code == 1
+        assert "git checkout" in result.output
+
+    def test_refresh_after_commit(self, ctxforge_project: Path, monkeypatch):
+        _git(ctxforge_project, "init", "-q")
+        (ctxforge_project / "app.py").write_text("def main(): pass\n")
+        _git(ctxforge_project, "add", "app.py")
+        _git(ctxforge_project, "commit", "-q", "-m", "init")
+        monkeypatch.chdir(ctxforge_project)
+
+        result = runner.invoke(app, ["hooks", "refresh", "post-commit"])
+        assert result.exit_code == 0, result.output
+        assert "post-commit (1 paths)" in result.output
+        assert "app.py" in SymbolIndex.load(ctxforge_project).outline()
+        assert (ctxforge_project / ".ctxforge" / "cache" / "git-history.json").is_file()
+
+    def test_refresh_rejects_unknown_hook(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.chdir(ctxforge_project)
+        result = runner.invoke(app, ["hooks", "refresh", "pre-push"])
+        assert result.exit_code == 1
@@ -0,0 +1,85 @@
+"""Tests for the watch command."""
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from ctxforge.analysis.fs_watch import watcher_pid
+from ctxforge.analysis.symbols import SymbolIndex
+from ctxforge.console.application import app
+from ctxforge.console.commands.watch import watch_loop
+from ctxforge.core.project import Project
+from ctxforge.core.refresh import refresh_indexes
+from ctxforge.enhancers.repo_map import RepoMapEnhancer
+
+runner = CliRunner()
+
+
+class _FakeWatcher:
+    """Replays batches of changes, then reports quiet."""
+
+    def __init__(self, root: Path, batches: list[set[str] | None]) -> None:
+        self._root = root
+        self._batches = batches
+        self.closed = False
+
+    def changes(self, timeout: float | None = None) -> set[str] | None:
+        if timeout is None and self._batches:
+            batch = self._batches.pop(0)
+            (self._root / "src" / "mod.py").write_text("def changed(): pass\n")
+            return batch
+        return set()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestWatchLoop:
+    def test_refreshes_and_clears_state(self, ctxforge_project: Path, monkeypatch):
+        (ctxforge_project / "src").mkdir()
+        (ctxforge_project / "src" / "mod.py").write_text("def original(): pass\n")
+        project = Project.load(ctxforge_project)
+        watcher = _FakeWatcher(ctxforge_project, [{"src/mod.py"}])
+        seen_pids = []
+
+        def refresh(project, changed=None):
+            seen_pids.append(watcher_pid(ctxforge_project))
+            return refresh_indexes(project, changed)
+
+        monkeypatch.setattr("ctxforge.console.commands.watch.refresh_indexes", refresh)
+        monkeypatch.setattr("ctxforge.analysis.fs_watch._cmdline", lambda pid: b"ctxforge")
+        watch_loop(project, watcher, debounce=0.0, max_batches=1)
+
+        assert seen_pids[0] is None and seen_pids[1] is not None
+        assert watcher.closed
+        assert watcher_pid(ctxforge_project) is None
+        outline = SymbolIndex.load(ctxforge_project).outline()
+        assert [s.name for s in outline["src/mod.py"]] == ["changed"]
+
+
+class TestRepoMapWithWatcher:
+    def test_reads_cache_without_walking(self, ctxforge_project: Path, monkeypatch):
+        (ctxforge_project / "a.py").write_text("def f(): pass\n")
+        RepoMapEnhancer.collect(ctxforge_project)
+        (ctxforge_project / "b.py").write_text("def g(): pass\n")
+
+        monkeypatch.setattr("ctxforge.enhancers.repo_map.watcher_pid", lambda root: 4242)
+        assert list(RepoMapEnhancer.collect(ctxforge_project)) == ["a.py"]
+        assert list(RepoMapEnhancer.collect(ctxforge_project, use_watcher=False)) == [
+            "a.py", "b.py",
+        ]
+
+
+class TestWatchCommand:
+    def test_stop_without_watcher(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.chdir(ctxforge_project)
+        result = runner.invoke(app, ["watch", "--stop"])
+        assert result.exit_code == 0, result.output
+        assert "No watcher running" in result.output
+
+    def test_refuses_second_watcher(self, ctxforge_project: Path, monkeypatch):
+        monkeypatch.chdir(ctxforge_project)
+        monkeypatch.setattr("ctxforge.console.commands.watch.watcher_pid", lambda root: 4242)
+        result = runner.invoke(app, ["watch"])
+        assert result.exit_code == 1
+        assert "Already watching (pid 4242)" in result.output
@@ -0,0 +1,73 @@
+"""Tests for token budget fitting."""
+
+from ctxforge.core.budget import (
+    DROPPED,
+    FULL,
+    PATH,
+    SUMMARY,
+    Section,
+    Variant,
+    fit_sections,
+)
+
+
+def _file(name: str, weight: float, full: int, summary: int | None = None) -> Section:
+    def degrade() -> list[Variant]:
+        variants = [Variant(PATH, name, 5)]
+        if summary is not None:
+            variants.insert(0, Variant(SUMMARY, f"{name} outline", summary))
+        return variants
+
+    return Section(name, weight, Variant(FULL, name, full), degrade=degrade)
+
+
+class TestFitSections:
+    def test_everything_fits(self):
+        calls = []
+        section = Section("a", 1, Variant(FULL, "a", 50), degrade=lambda: calls.append(1) or [])
+        chosen, report = fit_sections([section], 100)
+        assert [v.level for v in chosen] == [FULL]
+        assert calls == []  # degraded variants are not even built
+        assert report.used_tokens == 50
+        assert report.degraded == []
+
+    def test_lower_priority_shrinks_first(self):
+        sections = [
+            _file("first", 20, 600, summary=50),
+            _file("second", 10, 600, summary=50),
+        ]
+        chosen, report = fit_sections(sections, 700)
+        assert [v.level for v in chosen] == [FULL, SUMMARY]
+        assert report.used_tokens == 650
+        assert [(d.name, d.level, d.full_tokens) for d in report.degraded] == [
+            ("second", SUMMARY, 600),
+        ]
+
+    def test_falls_back_to_path_and_drop(self):
+        sections = [
+            _file("big", 20, 5000),
+            Section("tools", 8, Variant(FULL, "tools", 300)),
+        ]
+        chosen, report = fit_sections(sections, 100)
+        assert [v.level for v in chosen] == [PATH, DROPPED]
+        assert report.used_tokens == 5
+
+    def test_many_small_beat_one_large(self):
+        sections = [_file("large", 15, 900), *(_file(f"s{i}", 10, 300) for i in range(3))]
+        chosen, _ = fit_sections(sections, 1000)
+        assert [v.level for v in chosen] == [PATH, FULL, FULL, FULL]
+
+    def test_required_kept_over_budget(self):
+        sections = [
+            Section("role", 0, Variant(FULL, "role", 200), required=True),
+            _file("doc", 20, 100),
+        ]
+        chosen, report = fit_sections(sections, 150)
+        assert [v.level for v in chosen] == [FULL, DROPPED]
+        assert report.used_tokens == 200
+
+    def test_large_frontier_stays_bounded(self):
+        sections = [_file(f"f{i}", 10 + i % 7, 100 + i * 13, summary=20 + i) for i in range(60)]
+        chosen, report = fit_sections(sections, 3000)
+        assert len(chosen) == 60
+        assert report.used_tokens <= 3000
@@ -2,8 +2,12 @@
 
 from pathlib import Path
 
-from ctxforge.core.injection import SimpleInjection
+import pytest
+
+from ctxforge.core.injection import InlineInjection, SimpleInjection
+from ctxforge.exceptions import EnhancerNotFoundError
 from ctxforge.spec.schema import (
+    EnhancersSection,
     InjectionSection,
     KeyFilesSection,
     ProfileConfig,
@@ -174,6 +178,26 @@ class TestBuildSystem:
         assert "confirm" not in result.lower()
 
 
+class TestEnhancerSections:
+    def test_repo_map_after_key_files(self, tmp_path: Path):
+        (tmp_path / "readme.md").write_text("# Project")
+        (tmp_path / "app.py").write_text("def main() -> None:\n    pass\n")
+        profile = _make_profile(role_prompt="Be helpful.", key_files=["readme.md"])
+        profile.enhancers = EnhancersSection(enabled=["repo_map"])
+
+        result = SimpleInjection(tmp_path).build_system(profile, language="English")
+
+        assert "app.py\n  def main() -> None" in result
+        assert result.index("[Key Files]") < result.index("[Repo Map]")
+        assert result.index("[Repo Map]") < result.index("[Language]")
+
+    def test_unknown_enhancer(self, tmp_path: Path):
+        profile = _make_profile()
+        profile.enhancers = EnhancersSection(enabled=["nope"])
+        with pytest.raises(EnhancerNotFoundError, match="nope"):
+            SimpleInjection(tmp_path).build_system(profile)
+
+
 class TestBuildGreeting:
     def test_greeting_default(self, tmp_path: Path):
         inj = SimpleInjection(tmp_path)
@@ -219,3 +243,174 @@ class TestBuildCompressGreeting:
         profile = _make_profile(key_files=["readme.md"])
         result = SimpleInjection.build_compress_greeting(profile)
         assert "Respond in" not in result
+
+
+class TestBudget:
+    def test_within_budget_unchanged(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("# A\n")
+        profile = _make_profile(key_files=["a.md"])
+        composed = SimpleInjection(tmp_path).compose_system(profile)
+        assert composed.text == (
+            "[Key Files]\n"
+            "Read the following files to understand the project context:\n"
+            "- a.md"
+        )
+        assert composed.budget.degraded == []
+
+    def test_over_budget_files_degrade(self, tmp_path: Path):
+        (tmp_path / "small.md").write_text("# Small\n" + "x" * 400)
+        (tmp_path / "guide.md").write_text(
+            "# Guide\n" + "text\n" * 2000 + "```\n# not a heading\n```\n## Usage\n"
+        )
+        (tmp_path / "blob.txt").write_text("y" * 40_000)
+        profile = _make_profile(key_files=["small.md", "guide.md", "blob.txt"])
+        profile.budget.max_tokens = 500
+
+        composed = SimpleInjection(tmp_path).compose_system(profile)
+
+        text = composed.text
+        assert "understand the project context:\n- small.md\n" in text
+        assert "read the parts you need:\n- guide.md\n  # Guide\n  ## Usage\n" in text
+        assert "not a heading" not in text
+        assert text.endswith("read only when needed:\n- blob.txt")
+        assert [(d.name, d.level) for d in composed.budget.degraded] == [
+            ("guide.md", "summary"),
+            ("blob.txt", "path"),
+        ]
+        assert composed.budget.used_tokens <= 500
+
+    def test_tools_section(self, tmp_path: Path):
+        profile = _make_profile(role_prompt="Be helpful.")
+        tools = [("github", "GitHub API"), ("fetch", "")]
+        result = SimpleInjection(tmp_path).build_system(profile, "English", tools)
+        assert "[Available MCP Tools]" in result
+        assert "- github — GitHub API\n- fetch" in result
+        assert result.index("[Available MCP Tools]") < result.index("[Language]")
+
+        full = SimpleInjection(tmp_path).compose_system(profile, "English", tools)
+        profile.budget.max_tokens = full.budget.used_tokens - 1
+        composed = SimpleInjection(tmp_path).compose_system(profile, "English", tools)
+        assert "- github\n- fetch" in composed.text
+        assert [(d.name, d.level) for d in composed.budget.degraded] == [("tools", "summary")]
+
+
+class TestInlineInjection:
+    def test_embeds_contents(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("# A\nalpha\n")
+        (tmp_path / "b.py").write_text("print('b')")
+        profile = _make_profile(key_files=["a.md", "b.py"])
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert result == (
+            "[Key Files]\n"
+            "The contents of these files are included below; "
+            "do not read them again unless they change:\n"
+            "### a.md\n```\n# A\nalpha\n```\n\n"
+            "### b.py\n```\nprint('b')\n```"
+        )
+
+    def test_fence_longer_than_content_fences(self, tmp_path: Path):
+        (tmp_path / "doc.md").write_text("````python\nx = 1\n````\n")
+        result = InlineInjection(tmp_path).build_system(_make_profile(key_files=["doc.md"]))
+        assert "### doc.md\n`````\n````python\nx = 1\n````\n`````" in result
+
+    def test_per_file_cap(self, tmp_path: Path):
+        (tmp_path / "big.txt").write_text("row\n" * 1000)
+        profile = _make_profile(key_files=["big.txt"])
+        profile.injection.max_file_bytes = 400
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert "row\n" * 100 + "```\n[truncated: first 400 of 4,000 bytes shown; " in result
+        assert "read big.txt for the rest]" in result
+
+    def test_total_cap_lists_remaining_files(self, tmp_path: Path):
+        for name in ("one.md", "two.md", "three.md"):
+            (tmp_path / name).write_text(f"{name}\n" * 100)
+        profile = _make_profile(key_files=["one.md", "two.md", "three.md"])
+        profile.injection.max_total_bytes = 1000
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert "### one.md\n" in result
+        assert "### two.md\n" in result
+        assert "[truncated: first 280 of 700 bytes shown; read two.md" in result
+        assert "understand the project context:\n- three.md\n" in result
+        assert "### three.md" not in result
+
+    def test_binary_and_non_utf8_listed(self, tmp_path: Path):
+        (tmp_path / "logo.png").write_bytes(b"\x89PNG\0\0")
+        (tmp_path / "old.txt").write_bytes("déjà\n".encode("latin-1"))
+        profile = _make_profile(key_files=["logo.png", "old.txt"])
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert "- logo.png\n- old.txt" in result
+        assert "###" not in result
+
+    def test_over_budget_degrades_to_outline(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text("# Guide\n" + "text\n" * 2000 + "## Usage\n")
+        profile = _make_profile(key_files=["guide.md"])
+        profile.budget.max_tokens = 100
+        composed = InlineInjection(tmp_path).compose_system(profile)
+        assert "read the parts you need:\n- guide.md\n  # Guide\n  ## Usage" in composed.text
+        assert "###" not in composed.text
+        assert [(d.name, d.level) for d in composed.budget.degraded] == [
+            ("inline:guide.md", "summary"),
+        ]
+
+    def test_build_includes_contents(self, tmp_path: Path):
+        (tmp_path / "f.txt").write_text("file content")
+        result = InlineInjection(tmp_path).build(_make_profile(key_files=["f.txt"]), "go")
+        assert "file content" in result
+        assert result.endswith("go")
+
+
+class TestKeyFileRefs:
+    _DOC = "# Guide\nintro\n## Setup\nrun make\n### Linux\napt\n## Usage\ncall it\n"
+
+    def test_listing_points_at_section(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text(self._DOC)
+        (tmp_path / "x.py").write_text("a = 1\nb = 2\nc = 3\n")
+        profile = _make_profile(key_files=["guide.md#Setup", "x.py:2-3", "guide.md#Missing"])
+        composed = SimpleInjection(tmp_path).compose_system(profile)
+        assert composed.text.endswith(
+            "understand the project context:\n"
+            '- guide.md (section "Setup", lines 3-6)\n'
+            "- x.py (lines 2-3)"
+        )
+        assert "Missing" not in composed.text
+        assert [d.name for d in composed.budget.decisions] == ["guide.md#Setup", "x.py:2-3"]
+
+    def test_section_costs_less_than_file(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text(self._DOC + "filler\n" * 2000)
+        whole = SimpleInjection(tmp_path).compose_system(_make_profile(key_files=["guide.md"]))
+        part = SimpleInjection(tmp_path).compose_system(
+            _make_profile(key_files=["guide.md#Setup"])
+        )
+        assert part.budget.used_tokens * 50 < whole.budget.used_tokens
+
+    def test_inline_embeds_section(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text(self._DOC)
+        profile = _make_profile(key_files=["guide.md#setup", "guide.md:1-2"])
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert (
+            '### guide.md (section "setup", lines 3-6)\n'
+            "```\n## Setup\nrun make\n### Linux\napt\n```\n\n"
+            "### guide.md (lines 1-2)\n```\n# Guide\nintro\n```"
+        ) in result
+        assert "call it" not in result
+
+    def test_inline_section_cap(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text("# Big\n" + "line\n" * 500 + "# Next\n")
+        profile = _make_profile(key_files=["guide.md#Big"])
+        profile.injection.max_file_bytes = 300
+        result = InlineInjection(tmp_path).build_system(profile)
+        assert '[truncated: first 296 of 2,506 bytes shown; read guide.md (section "Big"' in result
+
+    def test_section_degrades_to_outline(self, tmp_path: Path):
+        (tmp_path / "guide.md").write_text(
+            "# Guide\n## Setup\n" + "step\n" * 2000 + "### Linux\napt\n## Usage\n"
+        )
+        profile = _make_profile(key_files=["guide.md#Setup"])
+        profile.budget.max_tokens = 100
+        composed = SimpleInjection(tmp_path).compose_system(profile)
+        assert composed.text.endswith(
+            "read the parts you need:\n"
+            '- guide.md (section "Setup", lines 2-2004)\n'
+            "  ## Setup\n"
+            "  ### Linux"
+        )
@@ -2,7 +2,10 @@
 
 from pathlib import Path
 
+import pytest
+
 from ctxforge.core.prompt_builder import PromptBuilder
+from ctxforge.exceptions import StrategyNotFoundError
 from ctxforge.spec.schema import (
     ProfileConfig,
     ProfileSection,
@@ -37,6 +40,20 @@ class TestPromptBuilder:
         result = builder.build(profile, "explain")
         assert "- main.py" in result
 
+    def test_inline_strategy(self, tmp_path: Path):
+        (tmp_path / "main.py").write_text("print('hi')")
+        profile = ProfileConfig(profile=ProfileSection(name="dev"))
+        profile.key_files.paths = ["main.py"]
+        profile.injection.strategy = "inline"
+        result = PromptBuilder(tmp_path).build_system(profile)
+        assert "### main.py\n```\nprint('hi')\n```" in result
+
+    def test_unknown_strategy(self, tmp_path: Path):
+        profile = ProfileConfig(profile=ProfileSection(name="dev"))
+        profile.injection.strategy = "telepathy"
+        with pytest.raises(StrategyNotFoundError, match="telepathy"):
+            PromptBuilder(tmp_path).compose_system(profile)
+
     def test_build_system(self, tmp_path: Path):
         builder = PromptBuilder(tmp_path)
         profile = ProfileConfig(
@@ -0,0 +1,94 @@
+"""Tests for cache refresh."""
+
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis.doc_index import POSTINGS_FILE, DocSearcher
+from ctxforge.analysis.file_sections import SectionIndex
+from ctxforge.analysis.file_stats import FileStatsIndex
+from ctxforge.analysis.symbols import SymbolIndex
+from ctxforge.core.profile import ProfileManager
+from ctxforge.core.project import Project
+from ctxforge.core.refresh import hook_changes, refresh_indexes, tracked_paths
+from ctxforge.storage.cache import cache_path
+from ctxforge.storage.profile_writer import write_profile
+
+
+def _add_key_file(root: Path, rel: str) -> None:
+    pm = ProfileManager(root / ".ctxforge" / "profiles")
+    config = pm.load("default")
+    config.key_files.paths.append(rel)
+    write_profile(pm.profile_path("default"), config)
+
+
+class TestRefreshIndexes:
+    @pytest.fixture(autouse=True)
+    def _no_racy_window(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Files are written moments before indexing; let their entries persist.
+        monkeypatch.setattr("ctxforge.storage.cache.RACY_WINDOW_NS", 0)
+
+    def test_tracked_paths(self, ctxforge_project: Path):
+        _add_key_file(ctxforge_project, "docs/ARCH.md")
+        paths = tracked_paths(Project.load(ctxforge_project))
+        assert "docs/ARCH.md" in paths
+        assert any(p.startswith(".ctxforge/profiles/default/") for p in paths)
+
+    def test_tracked_paths_of_section_refs(self, ctxforge_project: Path):
+        _add_key_file(ctxforge_project, "docs/ARCH.md#Storage")
+        _add_key_file(ctxforge_project, "src/app.py:1-20")
+        paths = tracked_paths(Project.load(ctxforge_project))
+        assert "docs/ARCH.md" in paths
+        assert "src/app.py" in paths
+
+    def test_refreshes_symbols_and_stats(self, ctxforge_project: Path):
+        (ctxforge_project / "docs").mkdir()
+        (ctxforge_project / "docs" / "ARCH.md").write_text("# Arch\n")
+        (ctxforge_project / "app.py").write_text("def main(): pass\n")
+        _add_key_file(ctxforge_project, "docs/ARCH.md")
+        project = Project.load(ctxforge_project)
+
+        result = refresh_indexes(project)
+        assert result.source_files == 1
+        assert "app.py" in SymbolIndex.load(ctxforge_project).outline()
+        stats = FileStatsIndex.load(ctxforge_project)
+        assert stats._entries["docs/ARCH.md"].lines == 1
+        headings = SectionIndex.load(ctxforge_project)._entries["docs/ARCH.md"][1]
+        assert [h.title for h in headings] == ["Arch"]
+
+        (ctxforge_project / "app.py").write_text("def main(): pass\ndef helper(): pass\n")
+        refresh_indexes(project, ["app.py"])
+        names = [s.name for s in SymbolIndex.load(ctxforge_project).outline()["app.py"]]
+        assert names == ["main", "helper"]
+
+    def test_doc_index_only_for_retrieval(self, ctxforge_project: Path):
+        (ctxforge_project / "GUIDE.md").write_text("# Guide\n\nDeploy with care.\n")
+        project = Project.load(ctxforge_project)
+        assert refresh_indexes(project).doc_files == 0
+        assert not cache_path(ctxforge_project, POSTINGS_FILE).exists()
+
+        pm = ProfileManager(project.profiles_dir)
+        config = pm.load("default")
+        config.injection.strategy = "retrieval"
+        write_profile(pm.profile_path("default"), config)
+        assert refresh_indexes(project).doc_files == 1
+        with DocSearcher.open(ctxforge_project) as searcher:
+            assert searcher.search("deploy", 1)[0].path == "GUIDE.md"
+
+
+class TestHookChanges:
+    def test_file_checkout_is_unknown(self, tmp_path: Path):
+        assert hook_changes(tmp_path, "post-checkout", ["a" * 40, "a" * 40, "0"]) is None
+
+    def test_clone_is_unknown(self, tmp_path: Path):
+        assert hook_changes(tmp_path, "post-checkout", ["0" * 40, "b" * 40, "1"]) is None
+
+    def test_branch_checkout_diffs_heads(self, tmp_path: Path, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "ctxforge.core.refresh.changed_paths",
+            lambda root, old, new="HEAD": calls.append((old, new)) or ["a.py"],
+        )
+        assert hook_changes(tmp_path, "post-checkout", ["a" * 40, "b" * 40, "1"]) == ["a.py"]
+        assert hook_changes(tmp_path, "post-merge", ["0"]) == ["a.py"]
+        assert calls == [("a" * 40, "b" * 40), ("ORIG_HEAD", "HEAD")]
@@ -0,0 +1,110 @@
+"""Tests for the retrieval injection strategy."""
+
+from pathlib import Path
+
+import pytest
+
+from ctxforge.core import retrieval
+from ctxforge.core.retrieval import RetrievalInjection, retrieval_query
+from ctxforge.spec.schema import (
+    BudgetSection,
+    KeyFilesSection,
+    ProfileConfig,
+    ProfileSection,
+    RetrievalSection,
+    RoleSection,
+    WorkRecordSection,
+)
+
+_ARCH = """\
+# Architecture
+
+## Storage
+
+Caches are written atomically under the cache directory.
+
+## Scheduler
+
+Jobs are queued and retried with backoff.
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(retrieval, "current_branch", lambda root: None)
+    (tmp_path / ".ctxforge").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "ARCH.md").write_text(_ARCH)
+    (tmp_path / "docs" / "release.md").write_text("# Release\n\nTag and publish.\n")
+    return tmp_path
+
+
+def _make_profile(
+    *, role_prompt: str = "", query: str = "", key_files: list[str] | None = None
+) -> ProfileConfig:
+    return ProfileConfig(
+        profile=ProfileSection(name="test"),
+        role=RoleSection(prompt=role_prompt),
+        work_record=WorkRecordSection(files={}),
+        key_files=KeyFilesSection(paths=key_files or []),
+        retrieval=RetrievalSection(query=query),
+    )
+
+
+class TestRetrievalQuery:
+    def test_profile_task_and_branch(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(retrieval, "current_branch", lambda root: "feature/cache-eviction")
+        profile = _make_profile(role_prompt="You maintain storage.", query="ttl")
+        query = retrieval_query(profile, tmp_path, "fix the flaky test")
+        assert query.split("\n") == [
+            "test", "You maintain storage.", "ttl", "fix the flaky test", "cache-eviction",
+        ]
+
+    def test_trunk_branch_left_out(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(retrieval, "current_branch", lambda root: "main")
+        assert retrieval_query(_make_profile(), tmp_path) == "test"
+
+
+class TestRetrievalInjection:
+    def test_embeds_matching_chunks(self, project: Path):
+        profile = _make_profile(role_prompt="You own the storage caches.")
+        result = RetrievalInjection(project).build_system(profile)
+        assert result.startswith("[Role: test]\nYou own the storage caches.\n\n[Relevant Docs]\n")
+        assert (
+            '### docs/ARCH.md ("Architecture > Storage", lines 3-6)\n'
+            "```\n## Storage\n\nCaches are written atomically under the cache directory.\n```"
+        ) in result
+        assert "Scheduler" not in result
+        assert "Release" not in result
+
+    def test_task_of_one_shot_run(self, project: Path):
+        result = RetrievalInjection(project).build(_make_profile(), "how do we publish a tag?")
+        assert "### docs/release.md" in result
+        assert result.endswith("how do we publish a tag?")
+
+    def test_no_match(self, project: Path):
+        profile = _make_profile(role_prompt="Frontend styling.")
+        assert "[Relevant Docs]" not in RetrievalInjection(project).build_system(profile)
+
+    def test_whole_key_files_skipped(self, project: Path):
+        profile = _make_profile(query="storage caches", key_files=["docs/ARCH.md"])
+        result = RetrievalInjection(project).build_system(profile)
+        assert "[Relevant Docs]" not in result
+        assert "- docs/ARCH.md" in result
+
+    def test_top_k_and_token_cap(self, project: Path):
+        profile = _make_profile(query="caches jobs")
+        profile.retrieval.top_k = 1
+        result = RetrievalInjection(project).build_system(profile)
+        assert result.count("### docs/ARCH.md") == 1
+
+        profile.retrieval.top_k = 8
+        profile.retrieval.max_tokens = 1
+        assert "[Relevant Docs]" not in RetrievalInjection(project).build_system(profile)
+
+    def test_over_budget_chunks_become_pointers(self, project: Path):
+        profile = _make_profile(query="caches jobs")
+        profile.budget = BudgetSection(max_tokens=60)
+        result = RetrievalInjection(project).compose_system(profile)
+        assert "Also relevant, but over the token budget; read only when needed:\n" in result.text
+        assert "- docs/ARCH.md (" in result.text
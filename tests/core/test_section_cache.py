@@ -0,0 +1,229 @@
+"""Tests for the on-disk prompt section cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ctxforge.core import injection
+from ctxforge.core.budget import FULL, PATH, Section, Variant
+from ctxforge.core.injection import InlineInjection, SimpleInjection
+from ctxforge.core.section_cache import SECTIONS_FILE, SectionCache
+from ctxforge.spec.schema import KeyFilesSection, ProfileConfig, ProfileSection
+from ctxforge.storage.cache import cache_path
+
+
+def _profile(name: str = "dev", paths: list[str] | None = None) -> ProfileConfig:
+    return ProfileConfig(
+        profile=ProfileSection(name=name),
+        key_files=KeyFilesSection(paths=paths or []),
+    )
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # Inputs are written moments before use; let their entries persist.
+    monkeypatch.setattr("ctxforge.storage.cache.RACY_WINDOW_NS", 0)
+    (tmp_path / ".ctxforge").mkdir()
+    return tmp_path
+
+
+def _touch(path: Path, text: str) -> None:
+    """Rewrite *path* with a later mtime even on coarse-grained filesystems."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+class _Builds:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.calls = 0
+        self.degrades = 0
+
+    def __call__(self) -> Section | None:
+        self.calls += 1
+        if not self.path.exists():
+            return None
+        text = self.path.read_text()
+
+        def degrade() -> list[Variant]:
+            self.degrades += 1
+            return [Variant(PATH, "path", 1)]
+
+        return Section("a", 2.0, Variant(FULL, text, len(text)), degrade=degrade)
+
+
+class TestSectionCache:
+    def test_reused_until_input_changes(self, project: Path):
+        (project / "a.md").write_text("one")
+        build = _Builds(project / "a.md")
+        profile = _profile()
+
+        for _ in range(2):
+            cache = SectionCache.load(project, profile, "s")
+            section = cache.section("key:a", [project / "a.md"], build)
+            cache.save()
+            assert section is not None
+            assert (section.name, section.weight, section.full.text) == ("a", 2.0, "one")
+        assert build.calls == 1
+
+        _touch(project / "a.md", "two!")
+        cache = SectionCache.load(project, profile, "s")
+        section = cache.section("key:a", [project / "a.md"], build)
+        assert section is not None and section.full.text == "two!"
+        assert build.calls == 2
+
+    def test_missing_input_cached_as_none(self, project: Path):
+        build = _Builds(project / "gone.md")
+        for _ in range(2):
+            cache = SectionCache.load(project, _profile(), "s")
+            assert cache.section("key:gone", [project / "gone.md"], build) is None
+            cache.save()
+        assert build.calls == 1
+
+    def test_degraded_variants_stored(self, project: Path):
+        (project / "a.md").write_text("one")
+        build = _Builds(project / "a.md")
+        for _ in range(3):
+            cache = SectionCache.load(project, _profile(), "s")
+            section = cache.section("key:a", [project / "a.md"], build)
+            assert section is not None
+            assert section.degrade() == [Variant(PATH, "path", 1)]
+            cache.save()
+        assert (build.calls, build.degrades) == (1, 1)
+
+    def test_degrade_after_warm_hit(self, project: Path):
+        (project / "a.md").write_text("one")
+        build = _Builds(project / "a.md")
+        cache = SectionCache.load(project, _profile(), "s")
+        cache.section("key:a", [project / "a.md"], build)
+        cache.save()
+
+        for _ in range(2):
+            cache = SectionCache.load(project, _profile(), "s")
+            section = cache.section("key:a", [project / "a.md"], build)
+            assert section is not None
+            assert section.degrade() == [Variant(PATH, "path", 1)]
+            cache.save()
+        assert (build.calls, build.degrades) == (2, 1)
+
+    @pytest.mark.parametrize("change", ["profile", "strategy"])
+    def test_scope_change_invalidates(self, project: Path, change: str):
+        (project / "a.md").write_text("one")
+        build = _Builds(project / "a.md")
+        cache = SectionCache.load(project, _profile(), "s")
+        cache.section("key:a", [project / "a.md"], build)
+        cache.save()
+
+        profile, strategy = _profile(), "s"
+        if change == "profile":
+            profile.role.prompt = "Be brief."
+        else:
+            strategy = "t"
+        cache = SectionCache.load(project, profile, strategy)
+        cache.section("key:a", [project / "a.md"], build)
+        assert build.calls == 2
+
+    def test_profiles_kept_apart_and_unused_pruned(self, project: Path):
+        (project / "a.md").write_text("one")
+        (project / "b.md").write_text("two")
+        build_a, build_b = _Builds(project / "a.md"), _Builds(project / "b.md")
+        for name in ("dev", "ops"):
+            cache = SectionCache.load(project, _profile(name), "s")
+            cache.section("key:a", [project / "a.md"], build_a)
+            cache.section("key:b", [project / "b.md"], build_b)
+            cache.save()
+
+        cache = SectionCache.load(project, _profile("dev"), "s")
+        cache.section("key:a", [project / "a.md"], build_a)
+        cache.save()
+        assert build_a.calls == 2
+
+        cache = SectionCache.load(project, _profile("ops"), "s")
+        cache.section("key:b", [project / "b.md"], build_b)
+        cache = SectionCache.load(project, _profile("dev"), "s")
+        cache.section("key:b", [project / "b.md"], build_b)
+        assert build_b.calls == 3  # ops still cached; dev's pruned
+
+    def test_racy_entries_not_persisted(self, project: Path, monkeypatch):
+        monkeypatch.setattr("ctxforge.storage.cache.RACY_WINDOW_NS", 2_000_000_000)
+        (project / "old.md").write_text("old")
+        (project / "new.md").write_text("new")
+        os.utime(project / "old.md", (1_600_000_000, 1_600_000_000))
+        builds = {name: _Builds(project / name) for name in ("old.md", "new.md")}
+        for _ in range(2):
+            cache = SectionCache.load(project, _profile(), "s")
+            for name, build in builds.items():
+                cache.section(f"key:{name}", [project / name], build)
+            cache.save()
+        assert (builds["old.md"].calls, builds["new.md"].calls) == (1, 2)
+
+    def test_nothing_written_outside_project(self, tmp_path: Path):
+        (tmp_path / "a.md").write_text("one")
+        cache = SectionCache.load(tmp_path, _profile(), "s")
+        cache.section("key:a", [tmp_path / "a.md"], _Builds(tmp_path / "a.md"))
+        cache.save()
+        assert not cache_path(tmp_path, SECTIONS_FILE).exists()
+
+    def test_corrupt_entry_rebuilt(self, project: Path):
+        (project / "a.md").write_text("one")
+        build = _Builds(project / "a.md")
+        cache = SectionCache.load(project, _profile(), "s")
+        cache.section("key:a", [project / "a.md"], build)
+        cache._entries["key:a"]["section"]["full"] = ["full"]
+        cache.save()
+
+        cache = SectionCache.load(project, _profile(), "s")
+        section = cache.section("key:a", [project / "a.md"], build)
+        assert section is not None and section.full.text == "one"
+        assert build.calls == 2
+
+
+class TestInjectionUsesCache:
+    @pytest.mark.parametrize("strategy", [SimpleInjection, InlineInjection])
+    def test_only_changed_files_rebuilt(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch, strategy: type[SimpleInjection]
+    ):
+        for name in ("a.md", "b.md", "c.md"):
+            (project / name).write_text(f"# {name}\n")
+        profile = _profile(paths=["a.md", "b.md", "c.md"])
+        first = strategy(project).compose_system(profile)
+
+        read: list[str] = []
+        original = strategy._key_file_section
+
+        def spy(self, rel_path, *args):
+            read.append(rel_path)
+            return original(self, rel_path, *args)
+
+        monkeypatch.setattr(strategy, "_key_file_section", spy)
+        assert strategy(project).compose_system(profile).text == first.text
+        assert read == []
+
+        _touch(project / "b.md", "# b.md changed\n")
+        second = strategy(project).compose_system(profile)
+        assert read == ["b.md"]
+        assert ("b.md changed" in second.text) == (strategy is InlineInjection)
+
+    def test_inline_cap_change_rebuilds(self, project: Path):
+        (project / "a.md").write_text("row\n" * 200)
+        profile = _profile(paths=["a.md"])
+        assert "[truncated" not in InlineInjection(project).build_system(profile)
+        profile.injection.max_file_bytes = 400
+        result = InlineInjection(project).build_system(profile)
+        assert "[truncated: first 400 of 800 bytes" in result
+
+    def test_work_records_cached(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        record_dir = project / ".ctxforge" / "profiles" / "dev"
+        record_dir.mkdir(parents=True)
+        (record_dir / "journal.md").write_text("- did things\n")
+        profile = _profile()
+        first = SimpleInjection(project).build_system(profile)
+        assert "journal.md" in first
+
+        def fail(*args):
+            raise AssertionError("work record rebuilt")
+
+        monkeypatch.setattr(injection.SimpleInjection, "_record_section", fail)
+        assert SimpleInjection(project).build_system(profile) == first
@@ -0,0 +1,81 @@
+"""Tests for the injection strategy registry."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from ctxforge.core import strategies
+from ctxforge.core.injection import InlineInjection, SimpleInjection
+from ctxforge.core.retrieval import RetrievalInjection
+from ctxforge.core.strategies import available_strategies, get_strategy
+from ctxforge.exceptions import StrategyNotFoundError
+
+_PLUGIN = '''
+from ctxforge.core.injection import SimpleInjection
+
+
+class ShoutInjection(SimpleInjection):
+    def build(self, profile, user_prompt):
+        return super().build(profile, user_prompt).upper()
+'''
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(strategies, "_LOADED", {})
+
+
+@pytest.fixture
+def plugin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Install a distribution providing the "shout" strategy on sys.path."""
+    site = tmp_path / "site"
+    dist_info = site / "shout_plugin-0.1.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: shout-plugin\nVersion: 0.1\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[ctxforge.injection]\n"
+        "shout = shout_strategy:ShoutInjection\n"
+        "broken = shout_strategy:Missing\n"
+        "simple = shout_strategy:ShoutInjection\n"
+    )
+    (site / "shout_strategy.py").write_text(_PLUGIN)
+    monkeypatch.syspath_prepend(str(site))
+    monkeypatch.delitem(sys.modules, "shout_strategy", raising=False)
+    return "shout"
+
+
+class TestGetStrategy:
+    def test_builtins(self, tmp_path: Path):
+        assert type(get_strategy("simple", tmp_path)) is SimpleInjection
+        assert type(get_strategy("inline", tmp_path)) is InlineInjection
+        assert type(get_strategy("retrieval", tmp_path)) is RetrievalInjection
+
+    def test_unknown_strategy(self, tmp_path: Path):
+        with pytest.raises(
+            StrategyNotFoundError, match="nonexistent.*Available: simple, inline, retrieval"
+        ):
+            get_strategy("nonexistent", tmp_path)
+
+    def test_entry_point(self, tmp_path: Path, plugin: str):
+        assert "shout_strategy" not in sys.modules
+        assert plugin in available_strategies()
+        injector = get_strategy(plugin, tmp_path)
+        assert type(injector).__name__ == "ShoutInjection"
+
+    def test_builtin_wins_over_entry_point(self, tmp_path: Path, plugin: str):
+        assert type(get_strategy("simple", tmp_path)) is SimpleInjection
+        assert "shout_strategy" not in sys.modules
+
+    def test_broken_entry_point(self, tmp_path: Path, plugin: str):
+        with pytest.raises(StrategyNotFoundError, match="Cannot load injection strategy 'broken'"):
+            get_strategy("broken", tmp_path)
+
+    def test_loaded_once(self, tmp_path: Path, plugin: str):
+        first = get_strategy(plugin, tmp_path)
+        second = get_strategy(plugin, tmp_path / "other")
+        assert type(first) is type(second)
+        assert first is not second
+        assert list(strategies._LOADED) == [plugin]
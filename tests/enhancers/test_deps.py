@@ -0,0 +1,55 @@
+"""Tests for the dependencies enhancer."""
+
+from pathlib import Path
+
+from ctxforge.analysis.dep_parser import DependencySummary, Manifest
+from ctxforge.enhancers.deps import DepsEnhancer, render_summary
+from ctxforge.enhancers.registry import get_enhancer
+from ctxforge.spec.schema import ProfileConfig, ProfileSection
+
+
+def _summary(n_deps: int = 3) -> DependencySummary:
+    manifest = Manifest(
+        "pyproject.toml",
+        "python",
+        name="demo",
+        runtime="python >=3.11",
+        dependencies={f"dep{i:03d}": "1.0" for i in range(n_deps)},
+        dev_dependencies={"pytest": "8.0.0", "ruff": "*"},
+        lockfile="uv.lock",
+        locked_packages=42,
+    )
+    return DependencySummary([manifest], ["pytest"])
+
+
+class TestRenderSummary:
+    def test_full_summary(self):
+        text = render_summary(_summary(), max_tokens=500)
+        assert text.splitlines()[2:] == [
+            "Frameworks: pytest",
+            "python (pyproject.toml, uv.lock: 42 packages) — name demo — python >=3.11",
+            "  deps: dep000 1.0, dep001 1.0, dep002 1.0",
+            "  dev: pytest 8.0.0, ruff",
+        ]
+
+    def test_long_lists_truncated_within_budget(self):
+        text = render_summary(_summary(200), max_tokens=120)
+        assert len(text) <= 120 * 4
+        assert "more" in text
+        assert "dev:" not in text
+
+    def test_nothing_to_render(self):
+        assert render_summary(DependencySummary(), max_tokens=500) == ""
+        assert render_summary(_summary(), max_tokens=10) == ""
+
+
+class TestDepsEnhancer:
+    def test_registered(self):
+        assert isinstance(get_enhancer("deps"), DepsEnhancer)
+
+    def test_render_from_project(self, tmp_path: Path):
+        (tmp_path / "requirements.txt").write_text("flask>=3\n")
+        profile = ProfileConfig(profile=ProfileSection(name="p"))
+        text = DepsEnhancer().render(tmp_path, profile, 500)
+        assert text.startswith("[Dependencies]")
+        assert "Frameworks: Flask" in text
@@ -0,0 +1,79 @@
+"""Tests for the repo map enhancer."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ctxforge.analysis.symbols import Symbol
+from ctxforge.enhancers.registry import get_enhancer
+from ctxforge.enhancers.repo_map import RepoMapEnhancer, render_outline
+from ctxforge.exceptions import EnhancerNotFoundError
+from ctxforge.spec.schema import ProfileConfig, ProfileSection
+
+
+def _fn(name: str) -> Symbol:
+    return Symbol("function", name, f"def {name}(value: int) -> int", 1)
+
+
+class TestRenderOutline:
+    def test_full_outline_when_it_fits(self):
+        text = render_outline({"b.py": [_fn("g")], "a.py": [_fn("f")]}, max_tokens=500)
+        assert text.startswith("[Repo Map]")
+        assert text.endswith("a.py\n  def f(value: int) -> int\nb.py\n  def g(value: int) -> int")
+
+    def test_compact_and_truncated_over_budget(self):
+        outline = {
+            f"pkg/deep/mod{i:02d}.py": [_fn(f"func_{j}") for j in range(5)] for i in range(50)
+        }
+        outline["top.py"] = [_fn("main")]
+
+        text = render_outline(outline, max_tokens=150)
+
+        assert len(text) <= 150 * 4 + 40
+        assert "top.py: main" in text
+        assert "def " not in text
+        assert text.splitlines()[-1].endswith("more files not shown)")
+
+    def test_empty(self):
+        assert render_outline({}, max_tokens=100) == ""
+
+
+class TestRepoMapEnhancer:
+    def test_collects_source_files(self, tmp_path: Path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("class App:\n    def run(self): ...\n")
+        (tmp_path / "src" / "util.go").write_text("package util\nfunc Join() {}\n")
+        (tmp_path / "README.md").write_text("# readme")
+        (tmp_path / ".ctxforge").mkdir()
+
+        outline = RepoMapEnhancer.collect(tmp_path)
+
+        assert {p: [s.name for s in syms] for p, syms in outline.items()} == {
+            "src/app.py": ["App", "run"],
+            "src/util.go": ["Join"],
+        }
+        assert (tmp_path / ".ctxforge" / "cache" / "symbols.json").is_file()
+
+    def test_in_place_edit_is_seen(self, tmp_path: Path):
+        (tmp_path / ".ctxforge").mkdir()
+        app = tmp_path / "app.py"
+        app.write_text("def old(): ...\n")
+        for p in (app, tmp_path):
+            os.utime(p, (1_600_000_000, 1_600_000_000))
+        assert [s.name for s in RepoMapEnhancer.collect(tmp_path)["app.py"]] == ["old"]
+
+        app.write_text("def new(): ...\n")  # the directory mtime is unchanged
+        os.utime(tmp_path, (1_600_000_000, 1_600_000_000))
+        assert [s.name for s in RepoMapEnhancer.collect(tmp_path)["app.py"]] == ["new"]
+
+    def test_render(self, tmp_path: Path):
+        (tmp_path / "main.py").write_text("def main():\n    pass\n")
+        profile = ProfileConfig(profile=ProfileSection(name="p"))
+        text = get_enhancer("repo_map").render(tmp_path, profile, 1000)
+        assert "main.py\n  def main()" in text
+
+
+def test_unknown_enhancer():
+    with pytest.raises(EnhancerNotFoundError, match="repo_map"):
+        get_enhancer("unknown")
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import os
 from unittest.mock import patch
 
 import pytest
 
+from ctxforge.analysis.scanner import ScanReport
+from ctxforge.analysis.workspace import WorkspaceReport
 from ctxforge.llm.client import (
     LLMNotAvailableError,
     _parse_file_list,
     suggest_key_files,
+    suggest_key_files_for_report,
+    suggest_key_files_for_workspace,
 )
 from ctxforge.llm.provider import SDKNotInstalledError
 
@@ -78,3 +83,33 @@ class TestSuggestKeyFiles:
             )
 
         assert result == []
+
+    def test_from_scan_report(self):
+        report = ScanReport(
+            project_name="myproject",
+            dir_tree=["src"],
+            languages=["python"],
+            config_files=["pyproject.toml"],
+        )
+        with patch("ctxforge.llm.client.call_llm", return_value='["README.md"]') as mock:
+            result = suggest_key_files_for_report("gpt-4o", report)
+
+        assert result == ["README.md"]
+        assert "myproject" in mock.call_args.args[2]
+
+    def test_from_workspace_lists_package_trees(self):
+        root = ScanReport(
+            project_name="mono",
+            dir_tree=["packages", os.path.join("packages", "api")],
+            config_files=["package.json"],
+        )
+        api = ScanReport(
+            dir_tree=["src", os.path.join("src", "routes")], config_files=["package.json"]
+        )
+        workspace = WorkspaceReport(root, {"packages/api": api})
+        with patch("ctxforge.llm.client.call_llm", return_value='["README.md"]') as mock:
+            suggest_key_files_for_workspace("gpt-4o", workspace)
+
+        prompt = mock.call_args.args[2]
+        assert os.path.join("packages", "api", "src", "routes") in prompt
+        assert "packages/api/package.json" in prompt
@@ -0,0 +1,31 @@
+"""Tests for cache file helpers."""
+
+from pathlib import Path
+
+from ctxforge.storage.cache import CACHE_DIR, cache_path, read_cache, write_blob, write_cache
+
+
+class TestCache:
+    def test_roundtrip(self, tmp_path: Path):
+        path = cache_path(tmp_path, "demo.json")
+        write_cache(path, {"items": [1, 2]}, version=3)
+        assert read_cache(path, version=3) == {"items": [1, 2], "version": 3}
+
+    def test_version_mismatch(self, tmp_path: Path):
+        path = cache_path(tmp_path, "demo.json")
+        write_cache(path, {"items": []}, version=1)
+        assert read_cache(path, version=2) is None
+
+    def test_missing_file(self, tmp_path: Path):
+        assert read_cache(tmp_path / "nope.json", version=1) is None
+
+    def test_cache_dir_gitignored(self, tmp_path: Path):
+        write_cache(cache_path(tmp_path, "demo.json"), {}, version=1)
+        gitignore = tmp_path / CACHE_DIR / ".gitignore"
+        assert gitignore.read_text().strip().endswith("*")
+
+    def test_blob(self, tmp_path: Path):
+        path = cache_path(tmp_path, "x.bin")
+        write_blob(path, [b"ab", b"\0c"])
+        assert path.read_bytes() == b"ab\0c"
+        assert sorted(p.name for p in path.parent.iterdir()) == [".gitignore", "x.bin"]
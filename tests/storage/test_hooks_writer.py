@@ -0,0 +1,63 @@
+"""Tests for git hook installation."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ctxforge.exceptions import HookInstallError
+from ctxforge.storage.hooks_writer import HOOK_NAMES, install_hooks, uninstall_hooks
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    subprocess.run(["git", "-C", str(tmp_path), "init", "-q"], check=True)
+    return tmp_path
+
+
+class TestInstallHooks:
+    def test_creates_executable_hooks(self, repo: Path):
+        paths = install_hooks(repo)
+        assert [p.name for p in paths] == list(HOOK_NAMES)
+        text = (repo / ".git" / "hooks" / "post-commit").read_text()
+        assert text.startswith("#!/bin/sh\n")
+        assert "nice -n 10" in text
+        assert "hooks refresh post-commit" in text
+        assert os.access(paths[0], os.X_OK)
+
+    def test_keeps_existing_hook_and_reinstalls_once(self, repo: Path):
+        hook = repo / ".git" / "hooks" / "post-merge"
+        hook.write_text("#!/bin/sh\necho merged\n")
+        install_hooks(repo)
+        install_hooks(repo)
+        text = hook.read_text()
+        assert text.startswith("#!/bin/sh\necho merged\n")
+        assert text.count("# >>> ctxforge >>>") == 1
+
+        uninstall_hooks(repo)
+        assert hook.read_text() == "#!/bin/sh\necho merged\n"
+        assert not (repo / ".git" / "hooks" / "post-commit").exists()
+
+    def test_honours_hooks_path(self, repo: Path):
+        subprocess.run(
+            ["git", "-C", str(repo), "config", "core.hooksPath", ".githooks"], check=True
+        )
+        install_hooks(repo)
+        assert (repo / ".githooks" / "post-checkout").is_file()
+
+    def test_refuses_non_shell_hook(self, repo: Path):
+        (repo / ".git" / "hooks" / "post-commit").write_text("#!/usr/bin/env python3\n")
+        with pytest.raises(HookInstallError, match="not a shell script"):
+            install_hooks(repo)
+
+    def test_not_a_checkout(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+        with pytest.raises(HookInstallError):
+            install_hooks(tmp_path)
+
+    def test_uninstall_without_hooks(self, repo: Path):
+        assert uninstall_hooks(repo) == []
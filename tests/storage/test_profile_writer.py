@@ -14,7 +14,7 @@ from ctxforge.spec.schema import (
     ProfileSection,
     RoleSection,
 )
-from ctxforge.storage.profile_writer import write_profile
+from ctxforge.storage.profile_writer import profile_toml, write_profile
 
 
 class TestWriteProfile:
@@ -32,6 +32,12 @@ class TestWriteProfile:
         assert data["profile"]["name"] == "architect"
         assert data["role"]["prompt"] == "You are an architect."
 
+    def test_profile_toml_matches_file(self, tmp_path: Path):
+        path = tmp_path / "profile.toml"
+        config = ProfileConfig(profile=ProfileSection(name="dev", description="Développeur"))
+        write_profile(path, config)
+        assert path.read_text(encoding="utf-8") == profile_toml(config)
+
     def test_creates_parent_dirs(self, tmp_path: Path):
         path = tmp_path / "profiles" / "dev" / "profile.toml"
         config = ProfileConfig(profile=ProfileSection(name="dev"))